@@ -0,0 +1,7 @@
+"""
+Benchmarks for the Supabase MCP server.
+
+Each ``bench_*`` module can be run on its own, e.g.::
+
+    python -m benchmarks.bench_concurrency
+"""
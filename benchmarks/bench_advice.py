@@ -0,0 +1,128 @@
+"""
+Index advice benchmark: a recorded workload before and after the top suggestion.
+
+This benchmark seeds a ``bench_advice_events`` table with only a primary key
+and runs a mixed read workload through the tools with shape recording on:
+primary key lookups (already indexed), the latest events of a user, and an
+account's events in a time window. index_advice is then asked for its
+suggestions; the top one is created, the same workload is run again and the
+time spent is compared, and the index is dropped.
+
+The run fails with exit status 1 if the advice names the primary key lookups
+or the workload does not get faster.
+
+Usage:
+    python -m benchmarks.bench_advice --database-url postgresql://... \\
+        [--rows 200000] [--calls 50]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Any
+
+import asyncpg
+
+from benchmarks.common import tool_context
+from supabase_mcp.backends import PostgresBackend, PostgresConfig
+from supabase_mcp.server import SupabaseContext, index_advice, read_table_rows
+
+TABLE = "bench_advice_events"
+
+
+async def seed(conn: Any, rows: int) -> None:
+    """
+    Create the benchmark table unless it already holds ``rows`` rows.
+
+    Args:
+        conn: An asyncpg connection
+        rows: Number of rows to generate
+    """
+    exists = await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", TABLE)
+    if exists and await conn.fetchval(f"SELECT count(*) FROM {TABLE}") == rows:
+        return
+    print(f"seeding {rows} rows into {TABLE}...")
+    await conn.execute(
+        f"DROP TABLE IF EXISTS {TABLE};"
+        f"CREATE TABLE {TABLE} AS SELECT g AS id, g % 5000 AS user_id,"
+        " g % 50 AS account_id,"
+        " timestamptz '2024-01-01' + g * interval '1 minute' AS created_at,"
+        " md5(g::text) AS payload"
+        f" FROM generate_series(1, {rows}) g;"
+        f"ALTER TABLE {TABLE} ADD PRIMARY KEY (id);"
+        f"ANALYZE {TABLE}"
+    )
+
+
+async def workload(ctx: Any, calls: int, rows: int) -> float:
+    """Run the read mix and return the time it took in ms."""
+    start = time.perf_counter()
+    for i in range(calls):
+        await read_table_rows(ctx, TABLE, filters={"id": (i * 7919) % rows + 1})
+        await read_table_rows(
+            ctx, TABLE, filters={"user_id": i * 37 % 5000}, order_by="created_at",
+            ascending=False, limit=20,
+        )
+        if i % 5 == 0:
+            await read_table_rows(ctx, TABLE, filters={
+                "account_id": i % 50,
+                "created_at": {"gte": "2024-02-01", "lt": "2024-02-08"},
+            })
+    return (time.perf_counter() - start) * 1000
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    """Seed the table, run the workload around the top suggestion and return the exit status."""
+    conn = await asyncpg.connect(args.database_url)
+    await seed(conn, args.rows)
+
+    app = SupabaseContext(backend=None)
+    app.backend = app.wrap_backend(
+        await PostgresBackend.connect(PostgresConfig(args.database_url, 1, 2))
+    )
+    ctx = tool_context(app)
+
+    before = await workload(ctx, args.calls, args.rows)
+    report = await index_advice(ctx, table_name=TABLE)
+    print(f"rows={args.rows} calls={args.calls}: {report['shapes']} shapes, "
+          f"{report['indexed']} indexed")
+    for entry in report["advice"]:
+        print(f"  {entry['total_ms']:>10.1f} ms {entry['calls']:>6} calls  {entry['ddl']}")
+
+    status = 0
+    if any(entry["columns"] == ["id"] for entry in report["advice"]):
+        print("FAIL: advised an index on the primary key")
+        status = 1
+    top = report["advice"][0]
+    await conn.execute(top["ddl"].replace(" ON ", " bench_advice_top ON ", 1))
+    try:
+        after = await workload(ctx, args.calls, args.rows)
+    finally:
+        await conn.execute("DROP INDEX IF EXISTS bench_advice_top")
+    print(f"workload: {before:.1f} ms before, {after:.1f} ms with {top['columns']} "
+          f"({before / after:.1f}x)")
+    if after >= before:
+        print("FAIL: the top suggestion did not speed up the workload")
+        status = 1
+
+    await app.backend.aclose()
+    await conn.close()
+    return status
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--calls", type=int, default=50)
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
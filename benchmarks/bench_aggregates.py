@@ -0,0 +1,161 @@
+"""
+Aggregate benchmark: aggregate_table versus reading rows and counting them.
+
+Without aggregate_table, "how many orders per status" means reading every row
+with read_table_rows and counting them in the client. This benchmark reuses the
+``bench_filter_orders`` table from bench_filters and, for a few typical
+questions, compares the JSON bytes returned and the latency of:
+
+- the question asked with aggregate_table, answered by the database, and
+- read_table_rows for the needed columns followed by aggregation in Python.
+
+Both plans must give the same answer; the run fails with exit status 1 if they
+do not.
+
+Reads go through the postgres backend; pass ``--postgrest-url`` and
+``--postgrest-key`` for a PostgREST (with db-aggregates-enabled) serving the
+same database to measure the PostgREST backend as well.
+
+Usage:
+    python -m benchmarks.bench_aggregates --database-url postgresql://... \\
+        [--rows 200000] [--samples 3]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import asyncpg
+
+from benchmarks.bench_filters import TABLE, seed
+from benchmarks.common import tool_context
+from supabase_mcp.backends import PostgresBackend, PostgresConfig
+from supabase_mcp.client import create_postgrest_client
+from supabase_mcp.pool import PoolConfig
+from supabase_mcp.server import SupabaseContext, aggregate_table, read_table_rows
+
+
+def count_by_status(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Count rows per status."""
+    counts: Dict[str, int] = defaultdict(int)
+    for row in rows:
+        counts[row["status"]] += 1
+    return dict(counts)
+
+
+def revenue_by_status(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sum the amount per status, rounded to cents."""
+    totals: Dict[str, float] = defaultdict(float)
+    for row in rows:
+        totals[row["status"]] += row["amount"]
+    return {status: round(total, 2) for status, total in totals.items()}
+
+
+def scenarios() -> List[Tuple[str, List[str], Optional[Dict[str, Any]], str, Callable]]:
+    """
+    Build the questions to compare.
+
+    Returns:
+        (name, aggregates, filters, columns read by the client plan, client-side
+        aggregation) tuples; every question groups by status
+    """
+    return [
+        ("orders per status", ["count"], None, "status", count_by_status),
+        ("revenue per status", ["sum(amount)"], None, "status,amount", revenue_by_status),
+        (
+            "orders per status, amount > 400",
+            ["count"], {"amount": {"gt": 400}}, "status", count_by_status,
+        ),
+    ]
+
+
+def answer(groups: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Turn aggregate_table groups into status -> value, rounded like the client plan."""
+    return {
+        group["status"]: round(value, 2) if isinstance(value, float) else value
+        for group in groups
+        for key, value in group.items()
+        if key != "status"
+    }
+
+
+async def measure(
+    ctx: Any, plan: Callable[[Any], Any], samples: int
+) -> Tuple[float, int, Dict[str, Any]]:
+    """Run a plan and return its median latency in ms, JSON bytes and answer."""
+    result, transferred = await plan(ctx)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        await plan(ctx)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), transferred, result
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    """Seed the table, compare both plans per question and return the exit status."""
+    conn = await asyncpg.connect(args.database_url)
+    await seed(conn, args.rows)
+    await conn.close()
+
+    backend = await PostgresBackend.connect(PostgresConfig(args.database_url, 1, 2))
+    contexts = {"postgres": tool_context(SupabaseContext(backend=backend))}
+    client = None
+    if args.postgrest_url:
+        client = create_postgrest_client(args.postgrest_url, args.postgrest_key, PoolConfig())
+        contexts["postgrest"] = tool_context(SupabaseContext(client=client))
+
+    print(f"rows={args.rows} (median of {args.samples})")
+    print(f"{'backend':<10} {'question':<34} {'plan':<16} {'bytes':>12} {'ms':>10}")
+    status = 0
+    for name, ctx in contexts.items():
+        for label, aggregates, filters, columns, reduce in scenarios():
+            async def pushed_down(c: Any) -> Tuple[Dict[str, Any], int]:
+                groups = await aggregate_table(
+                    c, TABLE, aggregates, group_by=["status"], filters=filters
+                )
+                return answer(groups), len(json.dumps(groups))
+
+            async def client_side(c: Any) -> Tuple[Dict[str, Any], int]:
+                rows = await read_table_rows(c, TABLE, columns=columns, filters=filters)
+                return reduce(rows), len(json.dumps(rows))
+
+            results = {}
+            for plan_name, plan in (("aggregate", pushed_down), ("read + client", client_side)):
+                ms, transferred, result = await measure(ctx, plan, args.samples)
+                results[plan_name] = (transferred, result)
+                print(f"{name:<10} {label:<34} {plan_name:<16} {transferred:>12,} {ms:>10.1f}")
+            (agg_bytes, agg_answer), (read_bytes, read_answer) = results.values()
+            print(f"{'':<10} {'':<34} {'bytes saved':<16} {read_bytes / agg_bytes:>11.0f}x")
+            if agg_answer != read_answer:
+                print(f"FAIL: {label} gave different answers on {name}")
+                status = 1
+
+    await backend.aclose()
+    if client is not None:
+        await client.aclose()
+    return status
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--postgrest-url", default=None)
+    parser.add_argument("--postgrest-key", default=os.getenv("SUPABASE_SERVICE_KEY"))
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Backend benchmark: the same tool calls through PostgREST and through asyncpg.
+
+Seeds a ``bench_orders`` table into Postgres and runs point reads, filtered
+page reads and small batch inserts through the MCP tools with each backend,
+reporting latency percentiles and throughput.
+
+Pass ``--postgrest-url``/``--postgrest-key`` for a PostgREST serving the same
+database (e.g. a local ``supabase start``) for a like-for-like comparison.
+Without them the PostgREST backend runs against the local fake, which isolates
+the HTTP hop and JSON handling but not PostgREST's own query planning.
+
+Usage:
+    python -m benchmarks.bench_backends --database-url postgresql://... \\
+        [--rows 10000] [--calls 500] [--concurrency 20] [--latency 0]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+import asyncpg
+
+from benchmarks.common import make_rows, summarize, tool_context
+from benchmarks.fake_postgrest import FakePostgrest
+from supabase_mcp.backends import PostgresBackend, PostgresConfig
+from supabase_mcp.client import create_postgrest_client
+from supabase_mcp.pool import PoolConfig
+from supabase_mcp.server import SupabaseContext, create_table_records, read_table_rows
+
+TABLE = "bench_orders"
+
+
+async def seed(dsn: str, rows: List[Dict[str, Any]]) -> None:
+    """
+    (Re)create the benchmark table in Postgres and load the rows.
+
+    Args:
+        dsn: Postgres connection string
+        rows: Rows generated by make_rows
+    """
+    conn = await asyncpg.connect(dsn)
+    try:
+        await conn.execute(
+            f"DROP TABLE IF EXISTS {TABLE};"
+            f"CREATE TABLE {TABLE} (id bigint PRIMARY KEY, customer_id integer,"
+            " status text, amount numeric, created_at text)"
+        )
+        await conn.copy_records_to_table(
+            TABLE,
+            records=[tuple(r.values()) for r in rows],
+            columns=list(rows[0]),
+        )
+        await conn.execute(f"CREATE INDEX ON {TABLE} (status, id); ANALYZE {TABLE}")
+    finally:
+        await conn.close()
+
+
+async def measure(
+    call: Callable[[int], Awaitable[Any]], calls: int, concurrency: int
+) -> Dict[str, Any]:
+    """
+    Run ``calls`` invocations with at most ``concurrency`` in flight.
+
+    Returns:
+        Latency samples and elapsed wall-clock seconds
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    samples: List[float] = []
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await call(i)
+            samples.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    return {"samples": samples, "elapsed": time.perf_counter() - start}
+
+
+async def run_backend(
+    app: SupabaseContext, rows: int, calls: int, concurrency: int, id_offset: int
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run every workload against one backend.
+
+    Returns:
+        Measurements keyed by workload name
+    """
+    ctx = tool_context(app)
+    # Warm connections and prepared statements
+    await measure(
+        lambda i: read_table_rows(ctx, TABLE, filters={"id": i % rows + 1}),
+        concurrency, concurrency,
+    )
+    workloads = {
+        "point read": lambda i: read_table_rows(
+            ctx, TABLE, filters={"id": (i * 7919) % rows + 1}
+        ),
+        "page read (100)": lambda i: read_table_rows(
+            ctx, TABLE, filters={"status": "paid"}, order_by="id", limit=100
+        ),
+        "insert (10 rows)": lambda i: create_table_records(
+            ctx, TABLE, make_rows(10, id=lambda j: id_offset + i * 10 + j)
+        ),
+    }
+    return {name: await measure(fn, calls, concurrency) for name, fn in workloads.items()}
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    """Seed the data, run both backends and print the comparison."""
+    rows = make_rows(args.rows)
+    await seed(args.database_url, rows)
+
+    postgres = await PostgresBackend.connect(
+        PostgresConfig(args.database_url, min_size=args.concurrency, max_size=args.concurrency)
+    )
+    results = {"postgres": await run_backend(
+        SupabaseContext(backend=postgres), args.rows, args.calls, args.concurrency,
+        id_offset=args.rows * 10,
+    )}
+    await postgres.aclose()
+
+    async def run_postgrest(url: str, key: str) -> None:
+        client = create_postgrest_client(url, key, PoolConfig())
+        results["postgrest"] = await run_backend(
+            SupabaseContext(client=client), args.rows, args.calls, args.concurrency,
+            id_offset=args.rows * 100,
+        )
+        await client.aclose()
+
+    if args.postgrest_url:
+        await run_postgrest(args.postgrest_url, args.postgrest_key)
+    else:
+        print("no --postgrest-url given: PostgREST backend runs against the local fake")
+        with FakePostgrest({TABLE: rows}, latency=args.latency) as fake:
+            await run_postgrest(fake.url, fake.key)
+
+    print(f"rows={args.rows} calls={args.calls} concurrency={args.concurrency}")
+    print(f"{'workload':<18} {'backend':<10} {'calls/s':>9}  latency")
+    for workload in results["postgres"]:
+        for backend, measurements in results.items():
+            m = measurements[workload]
+            print(
+                f"{workload:<18} {backend:<10} {args.calls / m['elapsed']:>9.1f}"
+                f"  {summarize(m['samples'])}"
+            )
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--postgrest-url", default=None)
+    parser.add_argument("--postgrest-key", default=os.getenv("SUPABASE_SERVICE_KEY"))
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
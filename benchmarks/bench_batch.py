@@ -0,0 +1,97 @@
+"""
+Batch benchmark: one batch_read call versus consecutive read_table_rows calls.
+
+An agent gathering context for one customer (their profile, orders, tickets,
+invoices, ...) issues independent lookups. Without batch_read each lookup is
+its own tool call, paying one MCP round trip (``--mcp-latency``) plus one
+PostgREST round trip (the fake PostgREST's ``--latency``), one after the other.
+With batch_read the lookups share one tool call and run concurrently.
+
+For each number of lookups, reports the wall-clock time of both patterns and
+the number of tool calls. The run fails with exit status 1 if the batch
+returns different rows than the consecutive calls.
+
+Usage:
+    python -m benchmarks.bench_batch [--latency 0.05] [--mcp-latency 0.02] \\
+        [--lookups 3 10 25]
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import Any, Dict, List
+
+from benchmarks.common import Timer, make_rows, tool_context
+from benchmarks.fake_postgrest import FakePostgrest
+from supabase_mcp.client import create_postgrest_client
+from supabase_mcp.pool import PoolConfig
+from supabase_mcp.server import SupabaseContext, batch_read, read_table_rows
+
+TABLES = ["customers", "orders", "tickets", "invoices", "addresses"]
+
+
+def lookups(count: int) -> List[Dict[str, Any]]:
+    """Build ``count`` independent reads about customer 7, cycling over the tables."""
+    return [
+        {
+            "key": f"{TABLES[n % len(TABLES)]}_{n}",
+            "table_name": TABLES[n % len(TABLES)],
+            "filters": {"customer_id": 7},
+            "limit": 5 + n,
+        }
+        for n in range(count)
+    ]
+
+
+async def run(url: str, key: str, count: int, mcp_latency: float) -> int:
+    """Time both patterns for ``count`` lookups, print a row and return the exit status."""
+    client = create_postgrest_client(url, key, PoolConfig())
+    ctx = tool_context(SupabaseContext(client=client))
+    reads = lookups(count)
+    # Warm the connection pool so TCP connects are not measured
+    await batch_read(ctx, reads=reads)
+
+    with Timer() as sequential:
+        separate = {}
+        for spec in reads:
+            await asyncio.sleep(mcp_latency)
+            arguments = {name: value for name, value in spec.items() if name != "key"}
+            separate[spec["key"]] = await read_table_rows(ctx, **arguments)
+
+    with Timer() as batched:
+        await asyncio.sleep(mcp_latency)
+        result = await batch_read(ctx, reads=reads)
+
+    await client.aclose()
+    print(f"{count:>8} {count:>11} {sequential.elapsed * 1000:>14.1f} {1:>11} "
+          f"{batched.elapsed * 1000:>10.1f} {sequential.elapsed / batched.elapsed:>7.1f}x")
+    together = {name: entry.get("data") for name, entry in result["results"].items()}
+    if together != separate:
+        print(f"FAIL: batch of {count} returned different rows")
+        return 1
+    return 0
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--mcp-latency", type=float, default=0.02)
+    parser.add_argument("--lookups", type=int, nargs="+", default=[3, 10, 25])
+    args = parser.parse_args()
+
+    rows = make_rows(2000)
+    tables = {table: rows for table in TABLES}
+    status = 0
+    with FakePostgrest(tables, latency=args.latency) as fake:
+        print(f"simulated round trips: PostgREST {args.latency * 1000:.0f}ms, "
+              f"MCP {args.mcp_latency * 1000:.0f}ms")
+        print(f"{'lookups':>8} {'tool calls':>11} {'sequential ms':>14} "
+              f"{'tool calls':>11} {'batch ms':>10} {'speedup':>8}")
+        for count in args.lookups:
+            status |= asyncio.run(run(fake.url, fake.key, count, args.mcp_latency))
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Budget benchmark: one unbounded read versus byte-budgeted responses.
+
+Reuses the ``bench_filter_orders`` table from bench_filters and reads all of it
+with read_table_rows, first with no budget and then with the default 1 MiB
+budget, paginating and following next_cursor until the table is exhausted. For each it reports
+the largest single response (as the server encodes it for the client), the time to
+the first response, and the total time including that encoding. The run
+fails with exit status 1 if the budgeted walk misses or repeats a row, or if a
+budgeted response exceeds the budget.
+
+Usage:
+    python -m benchmarks.bench_budget --database-url postgresql://... \\
+        [--rows 200000] [--max-bytes 1048576]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Any, List, Tuple
+
+import asyncpg
+
+from benchmarks.bench_filters import TABLE, seed
+from benchmarks.common import tool_context
+from supabase_mcp.backends import PostgresBackend, PostgresConfig
+from supabase_mcp.codec import json_codec, to_content
+from supabase_mcp.server import SupabaseContext, read_table_rows
+
+# Rows asked for by the first budgeted page; the budget cuts it short
+FIRST_PAGE = 20_000
+
+
+def encoded_bytes(result: Any) -> int:
+    """Size of a tool result as the server sends it: text content blocks."""
+    return sum(len(content.text) for content in to_content(result, json_codec()))
+
+
+async def walk(ctx: Any, paginate: bool) -> Tuple[List[int], int, int, float, float]:
+    """
+    Read the whole table in one plain read, or in pages following their cursors.
+
+    Returns:
+        The ids in the order received, the number of responses, the largest
+        response in bytes, and the seconds to the first response and to the end
+    """
+    start = time.perf_counter()
+    # Reason: continuations fetch as many rows as fit in the first page
+    result = await read_table_rows(
+        ctx, TABLE, columns="id,created_at,status,amount,payload", paginate=paginate,
+        limit=FIRST_PAGE if paginate else None,
+    )
+    first = None
+    ids: List[int] = []
+    largest = responses = 0
+    while True:
+        responses += 1
+        largest = max(largest, encoded_bytes(result))
+        first = first if first is not None else time.perf_counter() - start
+        if isinstance(result, list):
+            ids += [row["id"] for row in result]
+            break
+        ids += [row["id"] for row in result["rows"]]
+        if result["next_cursor"] is None:
+            break
+        result = await read_table_rows(
+            ctx, TABLE, columns="id,created_at,status,amount,payload",
+            cursor=result["next_cursor"],
+        )
+    return ids, responses, largest, first, time.perf_counter() - start
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    """Seed the table, compare both reads and return the exit status."""
+    conn = await asyncpg.connect(args.database_url)
+    await seed(conn, args.rows)
+    await conn.close()
+
+    backend = await PostgresBackend.connect(PostgresConfig(args.database_url, 1, 2))
+    print(f"rows={args.rows}")
+    print(f"{'budget':<12} {'responses':>10} {'queries':>8} {'largest bytes':>14} "
+          f"{'first ms':>10} {'total ms':>10}")
+    status = 0
+    for budget in (0, args.max_bytes):
+        app = SupabaseContext(backend=backend, max_response_bytes=budget)
+        ids, responses, largest, first, total = await walk(tool_context(app), bool(budget))
+        queries, backend.queries = backend.queries, 0
+        print(f"{budget or 'none':<12} {responses:>10,} {queries:>8,} {largest:>14,} "
+              f"{first * 1000:>10.1f} {total * 1000:>10.1f}")
+        if sorted(ids) != list(range(1, args.rows + 1)) or len(set(ids)) != len(ids):
+            print(f"FAIL: budget {budget} did not return every row exactly once")
+            status = 1
+        # Reason: the cursor and flags are sent next to the budgeted rows
+        if budget and largest > budget + 1024:
+            print(f"FAIL: a response of {largest} bytes exceeded the {budget}-byte budget")
+            status = 1
+
+    await backend.aclose()
+    return status
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--max-bytes", type=int, default=1_048_576)
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
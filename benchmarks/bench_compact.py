@@ -0,0 +1,90 @@
+"""
+Compact format benchmark: payload bytes and serialization time per format.
+
+Generates ``--rows`` synthetic orders-style rows (5000 by default) with twelve
+columns, a few of them low-cardinality text, and encodes them as a
+read_table_rows result would be sent: the format is applied and the server
+encodes the result as a JSON text block with the standard library codec. For the default rows format, the
+compact format without dictionaries and the compact format with dictionaries
+it reports the payload bytes and the median time to produce them. The run
+fails with exit status 1 if a compact payload does not decode back to the
+original rows.
+
+No database is needed.
+
+Usage:
+    python -m benchmarks.bench_compact [--rows 5000] [--samples 20]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from typing import Any, Callable, List, Tuple
+
+from benchmarks.common import make_rows
+from supabase_mcp.codec import JSONCodec, to_content
+from supabase_mcp.encoding import compact, expand, formatted
+
+REGIONS = ["eu-west", "eu-central", "us-east", "us-west", "ap-south"]
+CHANNELS = ["web", "ios", "android", "partner"]
+CURRENCIES = ["EUR", "USD", "GBP"]
+
+
+def payload(result: Any) -> List[str]:
+    """Encode a tool result as the server sends it: the text of each content block."""
+    return [content.text for content in to_content(result, JSONCodec())]
+
+
+def measure(encode: Callable[[], List[str]], samples: int) -> Tuple[int, float]:
+    """Return the payload bytes and median encoding time in ms."""
+    size = sum(len(text) for text in encode())
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        encode()
+        timings.append((time.perf_counter() - start) * 1000)
+    return size, statistics.median(timings)
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--samples", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = make_rows(
+        args.rows,
+        region=lambda i: REGIONS[i % len(REGIONS)],
+        channel=lambda i: CHANNELS[i % len(CHANNELS)],
+        currency=lambda i: CURRENCIES[i % len(CURRENCIES)],
+        quantity=lambda i: i % 9 + 1,
+        sku=lambda i: f"SKU-{i % 1000:05d}",
+        email=lambda i: f"customer{i}@example.com",
+        shipped=lambda i: i % 3 == 0,
+    )
+
+    plans = {
+        "rows": lambda: payload(formatted(rows, "rows")),
+        "compact": lambda: payload(compact(rows, dictionaries=False)),
+        "compact + dict": lambda: payload(formatted(rows, "compact")),
+    }
+
+    print(f"rows={args.rows} columns={len(rows[0])} (median of {args.samples})")
+    print(f"{'format':<16} {'bytes':>12} {'ratio':>8} {'ms':>10}")
+    baseline = None
+    status = 0
+    for name, encode in plans.items():
+        size, ms = measure(encode, args.samples)
+        baseline = baseline or size
+        print(f"{name:<16} {size:>12,} {baseline / size:>7.1f}x {ms:>10.2f}")
+        if name != "rows" and expand(json.loads(encode()[0])) != rows:
+            print(f"FAIL: {name} does not decode to the original rows")
+            status = 1
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Concurrency benchmark: N simultaneous ``read_table_rows`` calls.
+
+Compares the async tool path against the previous behaviour, where every tool
+call ran the synchronous client on the event loop and therefore executed one
+round trip at a time. The fake PostgREST adds a fixed latency per request to
+model the network hop to Supabase.
+
+Usage:
+    python -m benchmarks.bench_concurrency [--latency 0.05] [--calls 1 10 50 100]
+"""
+
+import argparse
+import asyncio
+
+from supabase import acreate_client, create_client
+
+from benchmarks.common import Timer, make_rows, tool_context
+from benchmarks.fake_postgrest import FakePostgrest
+from supabase_mcp.server import SupabaseContext, read_table_rows
+
+
+async def run_async(url: str, key: str, calls: int) -> float:
+    """
+    Issue ``calls`` concurrent tool calls through the async client.
+
+    Returns:
+        Elapsed wall-clock seconds
+    """
+    client = await acreate_client(url, key)
+    ctx = tool_context(SupabaseContext(client=client))
+    # Warm the connection pool so TCP connects are not measured
+    await asyncio.gather(
+        *(read_table_rows(ctx, table_name="orders", limit=1) for _ in range(calls))
+    )
+    with Timer() as timer:
+        await asyncio.gather(
+            *(
+                read_table_rows(ctx, table_name="orders", filters={"id": i + 1})
+                for i in range(calls)
+            )
+        )
+    await client.postgrest.aclose()
+    return timer.elapsed
+
+
+def run_blocking(url: str, key: str, calls: int) -> float:
+    """
+    Issue ``calls`` tool-equivalent queries with the synchronous client.
+
+    Returns:
+        Elapsed wall-clock seconds
+    """
+    client = create_client(url, key)
+    client.table("orders").select("*").limit(1).execute()
+    with Timer() as timer:
+        for i in range(calls):
+            client.table("orders").select("*").eq("id", i + 1).execute()
+    return timer.elapsed
+
+
+def main() -> None:
+    """Run the benchmark and print a throughput table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--calls", type=int, nargs="+", default=[1, 10, 50, 100])
+    args = parser.parse_args()
+
+    with FakePostgrest({"orders": make_rows(1000)}, latency=args.latency) as fake:
+        print(f"simulated round trip: {args.latency * 1000:.0f}ms")
+        print(f"{'calls':>6} {'blocking calls/s':>18} {'async calls/s':>15} {'speedup':>8}")
+        for calls in args.calls:
+            blocking = run_blocking(fake.url, fake.key, calls)
+            concurrent = asyncio.run(run_async(fake.url, fake.key, calls))
+            print(
+                f"{calls:>6} {calls / blocking:>18.1f} {calls / concurrent:>15.1f}"
+                f" {blocking / concurrent:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
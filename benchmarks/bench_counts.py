@@ -0,0 +1,104 @@
+"""
+Count benchmark: exact, planned and estimated counts on a large table.
+
+Reuses the ``bench_events`` table from bench_pagination (one million rows by
+default) and measures count_table_rows with each count method, for the whole
+table and for a filtered slice, next to the only option before counts existed:
+reading the matching ids with read_table_rows and taking the length. Planned
+counts come from the query planner without touching the rows, so they should
+take milliseconds at any table size; their error against the exact count is
+reported. The run fails with exit status 1 if the planned whole-table count is
+not at least ``--min-speedup`` times faster than the exact one.
+
+Counts go through the postgres backend; pass ``--postgrest-url`` and
+``--postgrest-key`` for a PostgREST serving the same database to measure the
+PostgREST backend as well.
+
+Usage:
+    python -m benchmarks.bench_counts --database-url postgresql://... \\
+        [--rows 1000000] [--samples 5] [--min-speedup 10]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from typing import Any, Dict, Optional
+
+import asyncpg
+
+from benchmarks.bench_pagination import TABLE, median_ms, seed
+from benchmarks.common import tool_context
+from supabase_mcp.backends import COUNT_METHODS, PostgresBackend, PostgresConfig
+from supabase_mcp.client import create_postgrest_client
+from supabase_mcp.pool import PoolConfig
+from supabase_mcp.server import SupabaseContext, count_table_rows, read_table_rows
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    """Seed the table, time every count method and return the exit status."""
+    conn = await asyncpg.connect(args.database_url)
+    await seed(conn, args.rows)
+    await conn.close()
+
+    backend = await PostgresBackend.connect(PostgresConfig(args.database_url, 1, 2))
+    contexts = {"postgres": tool_context(SupabaseContext(backend=backend))}
+    client = None
+    if args.postgrest_url:
+        client = create_postgrest_client(args.postgrest_url, args.postgrest_key, PoolConfig())
+        contexts["postgrest"] = tool_context(SupabaseContext(client=client))
+
+    slices: Dict[str, Optional[Dict[str, Any]]] = {
+        "whole table": None,
+        "first hour": {"created_at": {"lt": "2024-01-01T01:00:00+00:00"}},
+    }
+    print(f"rows={args.rows} (median of {args.samples})")
+    print(f"{'backend':<10} {'slice':<12} {'method':<16} {'count':>10} {'error':>8} {'ms':>10}")
+    status = 0
+    for name, ctx in contexts.items():
+        for label, filters in slices.items():
+            timings = {}
+            exact = None
+            for method in COUNT_METHODS:
+                result = await count_table_rows(ctx, TABLE, filters=filters, count=method)
+                exact = result["count"] if method == "exact" else exact
+                timings[method] = await median_ms(
+                    lambda: count_table_rows(ctx, TABLE, filters=filters, count=method),
+                    args.samples,
+                )
+                error = abs(result["count"] - exact) / max(exact, 1)
+                print(f"{name:<10} {label:<12} {method:<16} {result['count']:>10,} "
+                      f"{error:>7.1%} {timings[method]:>10.1f}")
+            rows = await read_table_rows(ctx, TABLE, columns="id", filters=filters)
+            read_ms = await median_ms(
+                lambda: read_table_rows(ctx, TABLE, columns="id", filters=filters), args.samples
+            )
+            print(f"{name:<10} {label:<12} {'read ids + len':<16} {len(rows):>10,} "
+                  f"{'':>8} {read_ms:>10.1f}")
+            if filters is None and timings["exact"] < args.min_speedup * timings["planned"]:
+                print(f"FAIL: planned count on {name} is not {args.min_speedup}x faster than exact")
+                status = 1
+
+    await backend.aclose()
+    if client is not None:
+        await client.aclose()
+    return status
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--postgrest-url", default=None)
+    parser.add_argument("--postgrest-key", default=os.getenv("SUPABASE_SERVICE_KEY"))
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--min-speedup", type=float, default=10.0)
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Embed benchmark: customers with their orders in one read versus N+1 reads.
+
+Without embeds, an agent reads a page of customers and then one page of orders
+per customer: N+1 tool calls, each paying one MCP round trip (``--mcp-latency``)
+plus one PostgREST round trip (the fake PostgREST's ``--latency``). batch_read
+turns the N order reads into one call, but still sends N+1 PostgREST requests.
+With ``embed`` the orders come back nested in the customers from one request.
+
+For each number of customers, reports the tool calls, PostgREST requests and
+wall-clock time of the three patterns. The run fails with exit status 1 if they
+return different orders.
+
+Usage:
+    python -m benchmarks.bench_embeds [--latency 0.05] [--mcp-latency 0.02] \\
+        [--customers 10 50 200]
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import Any, Dict, List
+
+from benchmarks.common import Timer, make_rows, tool_context
+from benchmarks.fake_postgrest import FakePostgrest
+from supabase_mcp.batch import BatchConfig
+from supabase_mcp.client import create_postgrest_client
+from supabase_mcp.pool import PoolConfig
+from supabase_mcp.server import SupabaseContext, batch_read, read_table_rows
+
+ORDER_COLUMNS = "id,status,amount"
+
+
+def customers(count: int) -> List[Dict[str, Any]]:
+    """Generate customers with ids 0..count-1."""
+    return [{"id": n, "name": f"Customer {n}", "tier": ("gold", "basic")[n % 2]}
+            for n in range(count)]
+
+
+def by_customer(rows: List[Dict[str, Any]]) -> Dict[Any, List[Dict[str, Any]]]:
+    """Key embedded results by customer id for comparison."""
+    return {row["id"]: row["orders"] for row in rows}
+
+
+async def run(fake: FakePostgrest, count: int, mcp_latency: float) -> int:
+    """Time the three patterns for ``count`` customers, print a row and return the exit status."""
+    client = create_postgrest_client(fake.url, fake.key, PoolConfig())
+    ctx = tool_context(SupabaseContext(client=client, batch=BatchConfig(max_reads=count)))
+    page = {"table_name": "customers", "columns": "id,name", "order_by": "id", "limit": count}
+    orders = {"table_name": "orders", "columns": ORDER_COLUMNS, "order_by": "id"}
+    # Warm the connection pool so TCP connects are not measured
+    await read_table_rows(ctx, **page)
+
+    async def call(tool: Any, **arguments: Any) -> Any:
+        await asyncio.sleep(mcp_latency)
+        return await tool(ctx, **arguments)
+
+    results, timings, requests = [], [], []
+    start = fake.requests
+    with Timer() as timer:
+        rows = await call(read_table_rows, **page)
+        results.append({
+            row["id"]: await call(read_table_rows, **orders, filters={"customer_id": row["id"]})
+            for row in rows
+        })
+    timings.append(timer.elapsed)
+    requests.append(fake.requests - start)
+
+    start = fake.requests
+    with Timer() as timer:
+        rows = await call(read_table_rows, **page)
+        batch = await call(batch_read, reads=[
+            {"key": str(row["id"]), **orders, "filters": {"customer_id": row["id"]}}
+            for row in rows
+        ])
+        results.append({row["id"]: batch["results"][str(row["id"])]["data"] for row in rows})
+    timings.append(timer.elapsed)
+    requests.append(fake.requests - start)
+
+    start = fake.requests
+    with Timer() as timer:
+        embed = [{"table": "orders", "columns": ORDER_COLUMNS, "order_by": "id"}]
+        results.append(by_customer(await call(read_table_rows, **page, embed=embed)))
+    timings.append(timer.elapsed)
+    requests.append(fake.requests - start)
+
+    await client.aclose()
+    print(f"{count:>9} {count + 1:>6}/{requests[0]:<6} {timings[0] * 1000:>9.1f} "
+          f"{2:>6}/{requests[1]:<6} {timings[1] * 1000:>9.1f} "
+          f"{1:>6}/{requests[2]:<6} {timings[2] * 1000:>9.1f} "
+          f"{timings[0] / timings[2]:>7.1f}x")
+    if not results[0] == results[1] == results[2]:
+        print(f"FAIL: the patterns returned different orders for {count} customers")
+        return 1
+    return 0
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--mcp-latency", type=float, default=0.02)
+    parser.add_argument("--customers", type=int, nargs="+", default=[10, 50, 200])
+    args = parser.parse_args()
+
+    total = max(args.customers)
+    tables = {
+        "customers": customers(total),
+        "orders": make_rows(25 * total, customer_id=lambda i: i % total),
+    }
+    foreign_keys = {"orders": {"customer_id": "customers.id"}}
+    status = 0
+    with FakePostgrest(tables, latency=args.latency, foreign_keys=foreign_keys) as fake:
+        print(f"simulated round trips: PostgREST {args.latency * 1000:.0f}ms, "
+              f"MCP {args.mcp_latency * 1000:.0f}ms; tool calls/PostgREST requests")
+        print(f"{'customers':>9} {'N+1 calls':>13} {'N+1 ms':>9} {'batch calls':>13} "
+              f"{'batch ms':>9} {'embed calls':>13} {'embed ms':>9} {'speedup':>8}")
+        for count in args.customers:
+            status |= asyncio.run(run(fake, count, args.mcp_latency))
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
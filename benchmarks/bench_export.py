@@ -0,0 +1,167 @@
+"""
+Export benchmark: one sequential read versus concurrent key ranges.
+
+This benchmark exports the ``bench_filter_orders`` table (seeded as in
+bench_filters) with export_table, first as a single partition read by one
+worker (the same sequential keyset scan as stream_table_rows), then split
+into key ranges read by a growing number of workers. It reports rows/s for
+each, then fails one partition on purpose, resumes the export and checks that
+only that partition was read again and the file holds every row once.
+Last, it exports the table as NDJSON, CSV and Parquet and reports the size
+and time of each (Parquet needs pyarrow and is skipped without it).
+
+Each read is delayed by ``--latency`` seconds to stand in for the round trip
+to a database in another region; with 0 the local database and the encoding
+of rows share the CPU, and workers mostly wait for each other.
+
+The run fails with exit status 1 if an export is incomplete or its file does
+not hold every row once in key order.
+
+Usage:
+    python -m benchmarks.bench_export --database-url postgresql://... \\
+        [--rows 200000] [--partitions 8] [--workers 1,2,4,8] [--latency 0.02]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+import asyncpg
+
+from benchmarks.bench_filters import TABLE, seed
+from benchmarks.common import tool_context
+from supabase_mcp.backends import PostgresBackend, PostgresConfig
+from supabase_mcp.codec import json_codec
+from supabase_mcp.export import ExportConfig
+from supabase_mcp.export_formats import require_pyarrow
+from supabase_mcp.server import SupabaseContext, export_table
+
+
+class RemoteBackend:
+    """Backend wrapper adding a round trip to each read, and failing one key range."""
+
+    def __init__(self, inner: Any, latency: float) -> None:
+        self.inner = inner
+        self.latency = latency
+        self.fail_from: Any = None
+        self.reads: List[Any] = []
+
+    async def read(self, query: Any) -> List[Dict[str, Any]]:
+        """Read through the wrapped backend after the round trip."""
+        self.reads.append(query)
+        await asyncio.sleep(self.latency)
+        if self.fail_from is not None and f"'gte': {self.fail_from!r}" in repr(query.filters):
+            raise ConnectionError("connection reset")
+        return await self.inner.read(query)
+
+
+def check(path: str, rows: int) -> bool:
+    """Tell whether a file holds ids 1..rows once each, in order."""
+    with open(path, encoding="utf-8") as handle:
+        return [json.loads(line)["id"] for line in handle] == list(range(1, rows + 1))
+
+
+def count_rows(path: str, pyarrow: Any) -> int:
+    """Count the rows of an NDJSON, CSV (less its header) or Parquet file."""
+    if pyarrow is not None:
+        return pyarrow.parquet.ParquetFile(path).metadata.num_rows
+    with open(path, "rb") as handle:
+        lines = sum(1 for _ in handle)
+    return lines - 1 if path.endswith(".csv") else lines
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    """Seed the table, time the exports, check a resumed export and return the exit status."""
+    conn = await asyncpg.connect(args.database_url)
+    await seed(conn, args.rows)
+    await conn.close()
+
+    workers = [int(w) for w in args.workers.split(",")]
+    codec = json_codec()
+    postgres = await PostgresBackend.connect(
+        PostgresConfig(args.database_url, 1, max(workers)), codec
+    )
+    backend = RemoteBackend(postgres, args.latency)
+    directory = tempfile.mkdtemp(prefix="bench_export_")
+    status = 0
+    print(f"rows={args.rows} latency={args.latency * 1000:.0f}ms")
+    print(f"{'partitions':>10} {'workers':>8} {'seconds':>9} {'rows/s':>10} {'speedup':>8}")
+    baseline = None
+    for partitions, concurrency in [(1, 1)] + [(args.partitions, w) for w in workers]:
+        app = SupabaseContext(backend=backend, codec=codec, exports=ExportConfig(
+            directory=directory, partitions=partitions, concurrency=concurrency
+        ))
+        result = await export_table(
+            tool_context(app), TABLE, "orders.ndjson", overwrite=True, timeout_seconds=300
+        )
+        baseline = baseline or result["seconds"]
+        print(f"{partitions:>10} {concurrency:>8} {result['seconds']:>9.2f} "
+              f"{result['rows_per_second']:>10,} {baseline / result['seconds']:>7.1f}x")
+        if not result["complete"] or not check(result["path"], args.rows):
+            print("FAIL: the export is incomplete or out of order")
+            status = 1
+
+    # Fail the third partition, then resume without it failing
+    backend.fail_from = args.rows // args.partitions * 2 + 1
+    app = SupabaseContext(backend=backend, codec=codec, exports=ExportConfig(
+        directory=directory, partitions=args.partitions, concurrency=max(workers)
+    ))
+    failed = await export_table(
+        tool_context(app), TABLE, "orders.ndjson", overwrite=True, timeout_seconds=300
+    )
+    backend.fail_from, first_reads = None, len(backend.reads)
+    resumed = await export_table(
+        tool_context(app), TABLE, "orders.ndjson", resume=True, timeout_seconds=300
+    )
+    print(f"failed partitions: {[f['partition'] for f in failed['failed']]}, "
+          f"{failed['rows']:,} rows kept; resumed {resumed['resumed']} partitions with "
+          f"{len(backend.reads) - first_reads} reads in {resumed['seconds']:.2f}s")
+    if not resumed["complete"] or not check(resumed["path"], args.rows) or not failed["failed"]:
+        print("FAIL: the resumed export is incomplete")
+        status = 1
+
+    os.remove(resumed["path"])
+
+    backend.latency = 0
+    print(f"{'format':>10} {'seconds':>9} {'MB':>8} {'rows':>8}")
+    for name in ("ndjson", "csv", "parquet"):
+        try:
+            pyarrow = require_pyarrow() if name == "parquet" else None
+        except ValueError as exc:
+            print(f"{name:>10} skipped: {exc}")
+            continue
+        result = await export_table(
+            tool_context(app), TABLE, f"orders.{name}", timeout_seconds=300
+        )
+        print(f"{name:>10} {result['seconds']:>9.2f} {result['bytes'] / 1e6:>8.1f} "
+              f"{count_rows(result['path'], pyarrow):>8,}")
+        if not result["complete"] or count_rows(result["path"], pyarrow) != args.rows:
+            print(f"FAIL: the {name} export is incomplete")
+            status = 1
+        os.remove(result["path"])
+
+    os.rmdir(directory)
+    await postgres.aclose()
+    return status
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--partitions", type=int, default=8)
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
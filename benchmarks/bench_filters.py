@@ -0,0 +1,181 @@
+"""
+Filter benchmark: server-side operators versus equality-only reads.
+
+Before the filter grammar, read_table_rows could only test equality, so a
+range, IN or OR condition meant reading every candidate row and filtering it
+in the client (or the agent's context window). This benchmark seeds a
+``bench_filter_orders`` table and, for a few typical conditions, compares the
+JSON bytes returned and the latency of:
+
+- the condition sent as a filter expression and evaluated in the database, and
+- the best equality-only plan (one eq read per value of an IN list, otherwise
+  the whole table) followed by filtering in Python.
+
+Both plans must return the same rows; the run fails with exit status 1 if they
+do not.
+
+Reads go through the postgres backend; pass ``--postgrest-url`` and
+``--postgrest-key`` for a PostgREST serving the same database to measure the
+PostgREST backend as well.
+
+Usage:
+    python -m benchmarks.bench_filters --database-url postgresql://... \\
+        [--rows 200000] [--samples 3]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import asyncpg
+
+from benchmarks.common import tool_context
+from supabase_mcp.backends import PostgresBackend, PostgresConfig
+from supabase_mcp.client import create_postgrest_client
+from supabase_mcp.pool import PoolConfig
+from supabase_mcp.server import SupabaseContext, read_table_rows
+
+TABLE = "bench_filter_orders"
+STATUSES = ["pending", "paid", "shipped", "delivered", "returned", "cancelled", "held", "void"]
+
+
+async def seed(conn: Any, rows: int) -> None:
+    """
+    Create the benchmark table unless it already holds ``rows`` rows.
+
+    Args:
+        conn: An asyncpg connection
+        rows: Number of rows to generate
+    """
+    exists = await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", TABLE)
+    if exists and await conn.fetchval(f"SELECT count(*) FROM {TABLE}") == rows:
+        return
+    print(f"seeding {rows} rows into {TABLE}...")
+    statuses = ",".join(f"'{s}'" for s in STATUSES)
+    await conn.execute(
+        f"DROP TABLE IF EXISTS {TABLE};"
+        f"CREATE TABLE {TABLE} AS SELECT g AS id,"
+        " timestamptz '2024-01-01' + g * interval '1 minute' AS created_at,"
+        f" (ARRAY[{statuses}])[g % {len(STATUSES)} + 1] AS status,"
+        " round(((g * 7.31) % 500)::numeric, 2) AS amount,"
+        " md5(g::text) AS payload"
+        f" FROM generate_series(1, {rows}) g;"
+        f"ALTER TABLE {TABLE} ADD PRIMARY KEY (id);"
+        f"CREATE INDEX ON {TABLE} (created_at);"
+        f"CREATE INDEX ON {TABLE} (status);"
+        f"ANALYZE {TABLE}"
+    )
+
+
+def scenarios(rows: int) -> List[Tuple[str, Dict[str, Any], List[Dict[str, Any]], Callable]]:
+    """
+    Build the conditions to compare.
+
+    Returns:
+        (name, filter expression, equality-only reads, client-side predicate) tuples
+    """
+    last_day = (
+        time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime(1704067200 + (rows - 1440) * 60))
+    )
+    return [
+        (
+            "created_at >= last day",
+            {"created_at": {"gte": last_day}},
+            [{}],
+            lambda row: row["created_at"] >= last_day,
+        ),
+        (
+            "status in (returned, void)",
+            {"status": {"in": ["returned", "void"]}},
+            [{"status": "returned"}, {"status": "void"}],
+            lambda row: row["status"] in ("returned", "void"),
+        ),
+        (
+            "status = held or amount > 495",
+            {"or": [{"status": "held"}, {"amount": {"gt": 495}}]},
+            [{}],
+            lambda row: row["status"] == "held" or row["amount"] > 495,
+        ),
+    ]
+
+
+async def measure(
+    ctx: Any, plan: Callable[[Any], Any], samples: int
+) -> Tuple[float, int, List[Dict[str, Any]]]:
+    """Run a read plan and return its median latency in ms, JSON bytes and rows."""
+    rows, transferred = await plan(ctx)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        await plan(ctx)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), transferred, rows
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    """Seed the table, compare both plans per scenario and return the exit status."""
+    conn = await asyncpg.connect(args.database_url)
+    await seed(conn, args.rows)
+    await conn.close()
+
+    backend = await PostgresBackend.connect(PostgresConfig(args.database_url, 1, 2))
+    contexts = {"postgres": tool_context(SupabaseContext(backend=backend))}
+    client = None
+    if args.postgrest_url:
+        client = create_postgrest_client(args.postgrest_url, args.postgrest_key, PoolConfig())
+        contexts["postgrest"] = tool_context(SupabaseContext(client=client))
+
+    print(f"rows={args.rows} (median of {args.samples})")
+    print(f"{'backend':<10} {'condition':<32} {'plan':<16} {'bytes':>12} {'rows':>8} {'ms':>10}")
+    status = 0
+    for name, ctx in contexts.items():
+        for label, filters, eq_reads, predicate in scenarios(args.rows):
+            async def server_side(c: Any) -> Tuple[List[Dict[str, Any]], int]:
+                rows = await read_table_rows(c, TABLE, filters=filters)
+                return rows, len(json.dumps(rows))
+
+            async def eq_only(c: Any) -> Tuple[List[Dict[str, Any]], int]:
+                fetched = []
+                for eq in eq_reads:
+                    fetched += await read_table_rows(c, TABLE, filters=eq or None)
+                return [row for row in fetched if predicate(row)], len(json.dumps(fetched))
+
+            results = {}
+            for plan_name, plan in (("filter", server_side), ("eq + client", eq_only)):
+                ms, transferred, rows = await measure(ctx, plan, args.samples)
+                results[plan_name] = (transferred, rows)
+                print(f"{name:<10} {label:<32} {plan_name:<16} {transferred:>12,} "
+                      f"{len(rows):>8,} {ms:>10.1f}")
+            (filter_bytes, filter_rows), (eq_bytes, eq_rows) = results.values()
+            print(f"{'':<10} {'':<32} {'bytes saved':<16} {eq_bytes / filter_bytes:>11.1f}x")
+            if sorted(r["id"] for r in filter_rows) != sorted(r["id"] for r in eq_rows):
+                print(f"FAIL: {label} returned different rows on {name}")
+                status = 1
+
+    await backend.aclose()
+    if client is not None:
+        await client.aclose()
+    return status
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--postgrest-url", default=None)
+    parser.add_argument("--postgrest-key", default=os.getenv("SUPABASE_SERVICE_KEY"))
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+JSON codec benchmark: decoding PostgREST bodies and encoding tool results.
+
+For 10,000 and 100,000 synthetic orders-style rows, measures the two JSON
+steps of a large read_table_rows call:
+
+- decode: parsing the PostgREST response body, with httpx's default (the json
+  module) and with each codec
+- encode: turning the rows into MCP content, with FastMCP's default (one text
+  block per row via pydantic and json) and with each codec (one text block)
+
+and reports the median time of each plus their sum. The run fails with exit
+status 1 if a codec decodes or encodes the rows differently from the json
+module.
+
+No database is needed.
+
+Usage:
+    python -m benchmarks.bench_json [--rows 10000 100000] [--samples 5]
+"""
+
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+from mcp.server.fastmcp.server import _convert_to_content
+
+from benchmarks.common import make_rows
+from supabase_mcp.codec import JSONCodec, OrjsonCodec, to_content
+
+
+def median_ms(fn: Callable[[], Any], samples: int) -> float:
+    """Run a function ``samples`` times and return its median time in ms."""
+    timings = []
+    for _ in range(samples):
+        # Reason: start each sample without garbage left over by the previous one
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run(count: int, samples: int) -> int:
+    """Benchmark one payload size and return the exit status."""
+    rows = make_rows(
+        count,
+        email=lambda i: f"customer{i}@example.com",
+        note=lambda i: None if i % 3 else "gift wrap",
+        tags=lambda i: ["priority", "export"][: i % 3],
+    )
+    body = json.dumps(rows).encode()
+
+    plans: Dict[str, Dict[str, Callable[[], Any]]] = {
+        "fastmcp default": {
+            "decode": lambda: json.loads(body),
+            "encode": lambda: _convert_to_content(rows),
+        },
+    }
+    for codec in (JSONCodec(), OrjsonCodec()):
+        plans[codec.name] = {
+            "decode": lambda codec=codec: codec.loads(body),
+            "encode": lambda codec=codec: to_content(rows, codec),
+        }
+
+    print(f"rows={count} body={len(body):,} bytes (median of {samples})")
+    print(f"{'codec':<16} {'decode ms':>10} {'encode ms':>10} {'total ms':>10} {'speedup':>8}")
+    status = 0
+    baseline = None
+    for name, steps in plans.items():
+        decode, encode = (median_ms(steps[step], samples) for step in ("decode", "encode"))
+        baseline = baseline or decode + encode
+        print(f"{name:<16} {decode:>10.1f} {encode:>10.1f} {decode + encode:>10.1f} "
+              f"{baseline / (decode + encode):>7.1f}x")
+        content: List[Any] = steps["encode"]()
+        sent = [json.loads(block.text) for block in content]
+        if steps["decode"]() != rows or (sent if len(sent) > 1 else sent[0]) != rows:
+            print(f"FAIL: {name} does not round-trip the rows")
+            status = 1
+    return status
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--samples", type=int, default=5)
+    args = parser.parse_args()
+    status = 0
+    for count in args.rows:
+        status |= run(count, args.samples)
+        print()
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
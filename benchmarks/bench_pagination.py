@@ -0,0 +1,172 @@
+"""
+Pagination benchmark: keyset cursors versus OFFSET on a large table.
+
+Seeds a ``bench_events`` table (one million rows by default) with an index on
+``(created_at, id)`` and measures the latency of reading page N through
+``read_table_rows`` with a cursor, next to the same page fetched with OFFSET.
+Keyset pages should cost the same at any depth while OFFSET grows linearly.
+The run fails with exit status 1 if the deepest keyset page is more than
+``--max-ratio`` times slower than the first.
+
+Pages are read through the postgres backend; pass ``--postgrest-url`` and
+``--postgrest-key`` for a PostgREST serving the same database to measure the
+PostgREST backend as well.
+
+Usage:
+    python -m benchmarks.bench_pagination --database-url postgresql://... \\
+        [--rows 1000000] [--page-size 100] [--samples 5] [--max-ratio 3]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+import asyncpg
+
+from benchmarks.common import tool_context
+from supabase_mcp.backends import PostgresBackend, PostgresConfig
+from supabase_mcp.client import create_postgrest_client
+from supabase_mcp.pagination import Cursor, encode_cursor, query_fingerprint
+from supabase_mcp.pool import PoolConfig
+from supabase_mcp.server import SupabaseContext, read_table_rows
+
+TABLE = "bench_events"
+KEYS = ["created_at", "id"]
+
+
+async def seed(conn: Any, rows: int) -> None:
+    """
+    Create the benchmark table unless it already holds ``rows`` rows.
+
+    Args:
+        conn: An asyncpg connection
+        rows: Number of rows to generate
+    """
+    exists = await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", TABLE)
+    if exists and await conn.fetchval(f"SELECT count(*) FROM {TABLE}") == rows:
+        return
+    print(f"seeding {rows} rows into {TABLE}...")
+    await conn.execute(
+        f"DROP TABLE IF EXISTS {TABLE};"
+        f"CREATE TABLE {TABLE} AS SELECT g AS id,"
+        " timestamptz '2024-01-01' + (g / 3) * interval '1 second' AS created_at,"
+        " md5(g::text) AS payload"
+        f" FROM generate_series(1, {rows}) g;"
+        f"ALTER TABLE {TABLE} ADD PRIMARY KEY (id);"
+        f"CREATE INDEX ON {TABLE} (created_at, id);"
+        f"ANALYZE {TABLE}"
+    )
+
+
+async def cursor_for_page(conn: Any, page: int, page_size: int) -> str:
+    """
+    Build the cursor a client would hold after reading ``page - 1`` pages.
+
+    Returns:
+        The cursor token, or an empty string for the first page
+    """
+    if page == 1:
+        return ""
+    created_at, row_id = await conn.fetchrow(
+        f"SELECT created_at, id FROM {TABLE} ORDER BY created_at, id "
+        "OFFSET $1 LIMIT 1",
+        (page - 1) * page_size - 1,
+    )
+    return encode_cursor(Cursor(
+        keys=KEYS,
+        ascending=True,
+        values=[created_at.isoformat(), row_id],
+        fingerprint=query_fingerprint(TABLE, None),
+    ))
+
+
+async def median_ms(fn: Callable[[], Awaitable[Any]], samples: int) -> float:
+    """Run ``fn`` ``samples`` times after a warm-up and return the median in ms."""
+    await fn()
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    """Seed the table, measure each depth and return the exit status."""
+    conn = await asyncpg.connect(args.database_url)
+    await seed(conn, args.rows)
+    last_page = args.rows // args.page_size
+    depths = sorted({1, 10, 100, 1000, last_page // 2, last_page} & set(range(1, last_page + 1)))
+    cursors = {page: await cursor_for_page(conn, page, args.page_size) for page in depths}
+
+    backend = await PostgresBackend.connect(PostgresConfig(args.database_url, 1, 2))
+    contexts = {"postgres": tool_context(SupabaseContext(backend=backend))}
+    client = None
+    if args.postgrest_url:
+        client = create_postgrest_client(args.postgrest_url, args.postgrest_key, PoolConfig())
+        contexts["postgrest"] = tool_context(SupabaseContext(client=client))
+
+    async def offset_page(page: int) -> Any:
+        return await conn.fetch(
+            f"SELECT * FROM {TABLE} ORDER BY created_at, id LIMIT $1 OFFSET $2",
+            args.page_size, (page - 1) * args.page_size,
+        )
+
+    results: Dict[str, List[float]] = {"offset (SQL)": []}
+    for name in contexts:
+        results[f"keyset ({name})"] = []
+    for page in depths:
+        results["offset (SQL)"].append(
+            await median_ms(lambda: offset_page(page), args.samples)
+        )
+        for name, ctx in contexts.items():
+            results[f"keyset ({name})"].append(await median_ms(
+                lambda: read_table_rows(
+                    ctx, TABLE, order_by="created_at", limit=args.page_size,
+                    paginate=True, cursor=cursors[page] or None,
+                ),
+                args.samples,
+            ))
+
+    await backend.aclose()
+    if client is not None:
+        await client.aclose()
+    await conn.close()
+
+    print(f"rows={args.rows} page_size={args.page_size} (median of {args.samples})")
+    print(f"{'page':>8} " + " ".join(f"{name:>18}" for name in results))
+    for i, page in enumerate(depths):
+        print(f"{page:>8} " + " ".join(f"{r[i]:>16.2f}ms" for r in results.values()))
+
+    status = 0
+    for name, timings in results.items():
+        ratio = timings[-1] / timings[0]
+        print(f"{name}: deepest/first = {ratio:.1f}x")
+        if name.startswith("keyset") and ratio > args.max_ratio:
+            print(f"FAIL: {name} page latency grew {ratio:.1f}x with depth")
+            status = 1
+    return status
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--postgrest-url", default=None)
+    parser.add_argument("--postgrest-key", default=os.getenv("SUPABASE_SERVICE_KEY"))
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--max-ratio", type=float, default=3.0)
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
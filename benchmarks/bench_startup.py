@@ -0,0 +1,125 @@
+"""
+Cold-start benchmark: import, lifespan startup and first tool call.
+
+Each sample runs in a fresh interpreter, the way an MCP host spawns the server
+per session over stdio. The default mode is compared with fast-start mode
+(SUPABASE_MCP_FAST_START=1), and the run fails with exit status 1 if fast-start
+mode imports the heavy supabase sub-packages or if its import + startup time
+exceeds the budget.
+
+Usage:
+    python -m benchmarks.bench_startup [--samples 7] [--budget-ms 1500]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+from benchmarks.common import make_rows
+from benchmarks.fake_postgrest import FakePostgrest
+
+HEAVY_MODULES = ["supabase", "realtime", "storage3", "gotrue", "supafunc", "websockets"]
+
+# Runs inside the child interpreter; prints one JSON object of timings.
+PROBE = """
+import asyncio, json, sys, time
+start = time.perf_counter()
+import supabase_mcp.server as server
+imported = time.perf_counter()
+
+async def main():
+    async with server.supabase_lifespan(server.mcp) as app:
+        started = time.perf_counter()
+        heavy = [m for m in %(heavy)r if m in sys.modules]
+        ctx = type("Ctx", (), {})()
+        ctx.request_context = type("Req", (), {"lifespan_context": app})()
+        await server.read_table_rows(ctx, table_name="orders", limit=1)
+        first_call = time.perf_counter()
+    return started, first_call, heavy
+
+started, first_call, heavy = asyncio.run(main())
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "startup_ms": (started - imported) * 1000,
+    "first_call_ms": (first_call - started) * 1000,
+    "heavy_at_startup": heavy,
+}))
+""" % {"heavy": HEAVY_MODULES}
+
+
+def sample(url: str, key: str, fast_start: bool, samples: int) -> Dict[str, float]:
+    """
+    Run the probe in fresh interpreters and return median timings.
+
+    Args:
+        url: Fake PostgREST base URL
+        key: API key accepted by the fake
+        fast_start: Whether to enable fast-start mode
+        samples: Number of interpreter launches
+
+    Returns:
+        Median timings in milliseconds plus the heavy modules seen at startup
+    """
+    env = dict(
+        os.environ,
+        SUPABASE_URL=url,
+        SUPABASE_SERVICE_KEY=key,
+        SUPABASE_MCP_FAST_START="1" if fast_start else "0",
+    )
+    runs: List[Dict] = []
+    for _ in range(samples):
+        result = subprocess.run(
+            [sys.executable, "-c", PROBE], env=env, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr)
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    summary = {
+        name: statistics.median(run[name] for run in runs)
+        for name in ("import_ms", "startup_ms", "first_call_ms")
+    }
+    summary["heavy_at_startup"] = sorted({m for run in runs for m in run["heavy_at_startup"]})
+    return summary
+
+
+def main() -> None:
+    """Run the benchmark, print a comparison and enforce the budget."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--samples", type=int, default=7)
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    args = parser.parse_args()
+
+    with FakePostgrest({"orders": make_rows(10)}) as fake:
+        results = {
+            "default": sample(fake.url, fake.key, False, args.samples),
+            "fast-start": sample(fake.url, fake.key, True, args.samples),
+        }
+
+    print(f"{'mode':<11} {'import':>9} {'startup':>9} {'1st call':>9} {'total':>9}")
+    for mode, r in results.items():
+        total = r["import_ms"] + r["startup_ms"] + r["first_call_ms"]
+        print(
+            f"{mode:<11} {r['import_ms']:>7.1f}ms {r['startup_ms']:>7.1f}ms"
+            f" {r['first_call_ms']:>7.1f}ms {total:>7.1f}ms"
+        )
+
+    fast = results["fast-start"]
+    failures = []
+    if fast["heavy_at_startup"]:
+        failures.append(f"fast-start imported {', '.join(fast['heavy_at_startup'])}")
+    cold_start = fast["import_ms"] + fast["startup_ms"]
+    if cold_start > args.budget_ms:
+        failures.append(
+            f"fast-start cold start {cold_start:.1f}ms exceeds budget {args.budget_ms:.0f}ms"
+        )
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Streaming benchmark: peak memory and time to first rows for a large read.
+
+Reads ``--rows`` rows (200k by default) from the ``bench_events`` table once
+with ``read_table_rows``, which returns everything in one result, and once
+with ``stream_table_rows``, which sends chunks as notifications. Each result
+or notification is JSON-encoded, as the MCP transport would do, and dropped.
+Peak Python heap is measured with tracemalloc.
+
+Usage:
+    python -m benchmarks.bench_streaming --database-url postgresql://... \\
+        [--rows 200000] [--chunk-size 1000]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict
+
+import asyncpg
+
+from benchmarks.bench_pagination import TABLE, seed
+from supabase_mcp.backends import PostgresBackend, PostgresConfig
+from supabase_mcp.server import SupabaseContext, read_table_rows, stream_table_rows
+
+
+def streaming_context(app: SupabaseContext, first: Dict[str, float]) -> Any:
+    """
+    Build a tool context whose notifications are encoded and discarded.
+
+    Args:
+        app: The lifespan context the tools should see
+        first: Receives the time the first chunk was sent under "at"
+
+    Returns:
+        An object standing in for the MCP ``Context``
+    """
+    async def send_log_message(level: str, data: Any, logger: str) -> None:
+        first.setdefault("at", time.perf_counter())
+        json.dumps(data)
+
+    async def report_progress(progress: float, total: Any = None) -> None:
+        return None
+
+    return SimpleNamespace(
+        request_context=SimpleNamespace(lifespan_context=app),
+        request_id="1",
+        session=SimpleNamespace(send_log_message=send_log_message),
+        report_progress=report_progress,
+    )
+
+
+async def measure(call: Callable[[Dict[str, float]], Awaitable[Any]]) -> Dict[str, float]:
+    """
+    Run one read and report elapsed time, time to first rows and peak heap.
+
+    Returns:
+        Timings in milliseconds and peak traced memory in MiB
+    """
+    first: Dict[str, float] = {}
+    tracemalloc.start()
+    start = time.perf_counter()
+    await call(first)
+    end = time.perf_counter()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "total_ms": (end - start) * 1000,
+        "first_ms": (first.get("at", end) - start) * 1000,
+        "peak_mib": peak / 2 ** 20,
+    }
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    """Seed the table if needed and compare both read modes."""
+    conn = await asyncpg.connect(args.database_url)
+    await seed(conn, max(args.rows, 1_000_000))
+    await conn.close()
+
+    backend = await PostgresBackend.connect(PostgresConfig(args.database_url, 1, 1))
+    app = SupabaseContext(backend=backend)
+
+    async def whole(first: Dict[str, float]) -> None:
+        ctx = streaming_context(app, first)
+        rows = await read_table_rows(ctx, TABLE, limit=args.rows, order_by="id",
+                                     timeout_seconds=300)
+        json.dumps(rows)
+        first["at"] = time.perf_counter()
+
+    async def streamed(first: Dict[str, float]) -> None:
+        ctx = streaming_context(app, first)
+        await stream_table_rows(ctx, TABLE, chunk_size=args.chunk_size,
+                                max_rows=args.rows, timeout_seconds=300)
+
+    results = {"read_table_rows": await measure(whole),
+               "stream_table_rows": await measure(streamed)}
+    await backend.aclose()
+
+    print(f"rows={args.rows} chunk_size={args.chunk_size}")
+    print(f"{'mode':<18} {'total':>10} {'first rows':>11} {'peak heap':>10}")
+    for mode, r in results.items():
+        print(f"{mode:<18} {r['total_ms']:>8.0f}ms {r['first_ms']:>9.0f}ms"
+              f" {r['peak_mib']:>7.1f}MiB")
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
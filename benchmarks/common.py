@@ -0,0 +1,80 @@
+"""
+Shared helpers for the benchmarks.
+"""
+
+import logging
+import statistics
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+
+from supabase_mcp.server import SupabaseContext
+
+# Reason: FastMCP configures INFO logging on import, and httpx logs every request.
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def tool_context(app: SupabaseContext) -> Any:
+    """
+    Build a minimal stand-in for the MCP ``Context`` passed to tools.
+
+    Args:
+        app: The lifespan context the tools should see
+
+    Returns:
+        An object exposing ``request_context.lifespan_context``
+    """
+    return SimpleNamespace(request_context=SimpleNamespace(lifespan_context=app))
+
+
+def make_rows(count: int, **extra: Callable[[int], Any]) -> List[Dict[str, Any]]:
+    """
+    Generate synthetic ``orders``-style rows.
+
+    Args:
+        count: Number of rows to generate
+        **extra: Additional columns, each computed from the row index
+
+    Returns:
+        List of row dictionaries with sequential ids
+    """
+    statuses = ["pending", "paid", "shipped", "cancelled"]
+    rows = []
+    for i in range(1, count + 1):
+        row = {
+            "id": i,
+            "customer_id": i % 97,
+            "status": statuses[i % len(statuses)],
+            "amount": round((i * 7.31) % 500, 2),
+            "created_at": f"2024-01-{(i % 28) + 1:02d}T12:00:00+00:00",
+        }
+        for column, fn in extra.items():
+            row[column] = fn(i)
+        rows.append(row)
+    return rows
+
+
+class Timer:
+    """Context manager measuring wall-clock time in seconds."""
+
+    def __enter__(self) -> "Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.elapsed = time.perf_counter() - self.start
+
+
+def summarize(samples: List[float]) -> str:
+    """
+    Format latency samples (seconds) as a short p50/p95 summary in milliseconds.
+
+    Args:
+        samples: Latency samples in seconds
+
+    Returns:
+        Human-readable summary string
+    """
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"p50={statistics.median(ordered) * 1000:.2f}ms p95={p95 * 1000:.2f}ms"
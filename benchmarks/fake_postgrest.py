@@ -0,0 +1,367 @@
+"""
+A small, local stand-in for PostgREST used by the benchmarks.
+
+The fake keeps its tables in an in-memory SQLite database and understands the
+subset of the PostgREST URL grammar that the MCP tools generate (``select``,
+``order``, ``limit``, ``offset`` and ``column=op.value`` filters). Given the
+foreign keys, it also resolves one level of embedded resources such as
+``select=*,customers(name)`` with their ``customers.<param>`` filters, order
+and limit. An optional per-request latency simulates the network round trip to
+Supabase.
+
+Example:
+    with FakePostgrest({"users": [{"id": 1, "name": "Ada"}]}, latency=0.02) as fake:
+        client = await acreate_client(fake.url, fake.key)
+"""
+
+import asyncio
+import json
+import re
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+# Reason: supabase-py validates that the key looks like a JWT before use.
+FAKE_KEY = "fake.fake.fake"
+
+_OPERATORS = {
+    "eq": "=",
+    "neq": "!=",
+    "gt": ">",
+    "gte": ">=",
+    "lt": "<",
+    "lte": "<=",
+    "like": "LIKE",
+    "ilike": "LIKE",
+}
+
+_RESERVED_PARAMS = {"select", "order", "limit", "offset", "columns"}
+
+# "[alias:]table[!hint][!inner](columns)" in a select list
+_EMBED = re.compile(r"^(?:(\w+):)?(\w+)((?:!\w+)*)\((.*)\)$")
+
+
+def _split_select(select: str) -> List[str]:
+    """Split a select list on the commas that are not inside an embed."""
+    items, depth, start = [], 0, 0
+    for index, char in enumerate(select):
+        depth += {"(": 1, ")": -1}.get(char, 0)
+        if char == "," and depth == 0:
+            items.append(select[start:index])
+            start = index + 1
+    return items + [select[start:]]
+
+
+def _sqlite_type(value: Any) -> str:
+    """
+    Map a Python sample value to a SQLite column type.
+
+    Args:
+        value: A sample value from the seed rows
+
+    Returns:
+        The SQLite type name giving the column the right comparison affinity
+    """
+    if isinstance(value, bool) or isinstance(value, int):
+        return "INTEGER"
+    if isinstance(value, float):
+        return "REAL"
+    return "TEXT"
+
+
+def _coerce(raw: str) -> Any:
+    """
+    Convert a PostgREST literal into a SQLite parameter.
+
+    Args:
+        raw: The literal as it appears in the query string
+
+    Returns:
+        The value to bind in SQL
+    """
+    if raw == "true":
+        return 1
+    if raw == "false":
+        return 0
+    return raw
+
+
+def _storable(value: Any) -> Any:
+    """Serialize nested JSON values so SQLite can store them."""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+class FakePostgrest:
+    """
+    SQLite-backed PostgREST stand-in served by uvicorn on a background thread.
+
+    Args:
+        tables: Table name to seed rows
+        latency: Seconds each request is delayed
+        foreign_keys: Per table, the columns referencing another table's column,
+            e.g. ``{"orders": {"customer_id": "customers.id"}}``, used to embed
+
+    Attributes:
+        url: Base URL to pass to ``acreate_client``
+        key: A JWT-shaped API key accepted by supabase-py
+        requests: Number of HTTP requests served so far
+        bytes_sent: Total response body bytes served so far
+    """
+
+    def __init__(
+        self,
+        tables: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+        latency: float = 0.0,
+        foreign_keys: Optional[Dict[str, Dict[str, str]]] = None,
+    ) -> None:
+        self.latency = latency
+        # table -> {column: "other_table.column"}
+        self.foreign_keys = foreign_keys or {}
+        self.key = FAKE_KEY
+        self.requests = 0
+        self.bytes_sent = 0
+        self._db = sqlite3.connect(":memory:", check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        for table, rows in (tables or {}).items():
+            self.create_table(table, rows)
+
+        port = self._free_port()
+        self.url = f"http://127.0.0.1:{port}"
+        app = Starlette(
+            routes=[
+                Route(
+                    "/rest/v1/{table}",
+                    self._handle,
+                    methods=["GET", "HEAD", "POST", "PATCH", "DELETE"],
+                )
+            ]
+        )
+        config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="error")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @staticmethod
+    def _free_port() -> int:
+        """Ask the OS for an unused localhost port."""
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    def create_table(self, table: str, rows: List[Dict[str, Any]]) -> None:
+        """
+        Create a table and seed it with rows.
+
+        Args:
+            table: Name of the table
+            rows: Seed rows; the first row determines the column types
+        """
+        if not rows:
+            raise ValueError(f"Cannot infer columns for empty table {table!r}")
+        columns = list(rows[0].keys())
+        column_sql = ", ".join(f'"{c}" {_sqlite_type(rows[0][c])}' for c in columns)
+        with self._lock:
+            self._db.execute(f'CREATE TABLE "{table}" ({column_sql})')
+            for column in columns:
+                self._db.execute(
+                    f'CREATE INDEX "{table}_{column}_idx" ON "{table}" ("{column}")'
+                )
+            placeholders = ", ".join("?" for _ in columns)
+            quoted = ", ".join(f'"{c}"' for c in columns)
+            self._db.executemany(
+                f'INSERT INTO "{table}" ({quoted}) VALUES ({placeholders})',
+                [tuple(_storable(row.get(c)) for c in columns) for row in rows],
+            )
+            self._db.commit()
+
+    def __enter__(self) -> "FakePostgrest":
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("Fake PostgREST did not start")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=10)
+        self._db.close()
+
+    def _where(self, request: Request, path: str = "") -> Tuple[str, List[Any]]:
+        """
+        Translate PostgREST filter parameters into a SQL WHERE clause.
+
+        Args:
+            request: The incoming HTTP request
+            path: The embed whose ``<path>.<column>`` filters to translate
+                (default: the table requested)
+
+        Returns:
+            The WHERE clause (possibly empty) and its bound parameters
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, expression in request.query_params.multi_items():
+            scope, _, column = column.rpartition(".")
+            if scope != path or column in _RESERVED_PARAMS:
+                continue
+            operator, _, raw = expression.partition(".")
+            if operator == "in":
+                values = [v.strip('"') for v in raw.strip("()").split(",") if v]
+                clauses.append(f'"{column}" IN ({", ".join("?" for _ in values)})')
+                params.extend(_coerce(v) for v in values)
+            elif operator == "is":
+                clauses.append(f'"{column}" IS {"NULL" if raw == "null" else "?"}')
+                if raw != "null":
+                    params.append(_coerce(raw))
+            elif operator in _OPERATORS:
+                value = raw.replace("*", "%") if "like" in operator else raw
+                clauses.append(f'"{column}" {_OPERATORS[operator]} ?')
+                params.append(_coerce(value))
+            else:
+                raise ValueError(f"Unsupported operator {operator!r}")
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def _query(
+        self, table: str, columns: List[str], where: str, params: List[Any],
+        order: Optional[str], limit: Optional[str] = None, offset: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Run a SELECT of some columns with a WHERE clause and PostgREST order and limit."""
+        select_sql = "*" if columns == ["*"] else ", ".join(f'"{c}"' for c in columns)
+        sql = f'SELECT {select_sql} FROM "{table}"{where}'
+        if order:
+            terms = []
+            for term in order.split(","):
+                column, _, direction = term.partition(".")
+                terms.append(f'"{column}" {"DESC" if direction.startswith("desc") else "ASC"}')
+            sql += f" ORDER BY {', '.join(terms)}"
+        if limit or offset:
+            sql += f" LIMIT {int(limit) if limit else -1} OFFSET {int(offset or 0)}"
+        with self._lock:
+            return [dict(row) for row in self._db.execute(sql, params)]
+
+    def _join(self, table: str, other: str) -> Tuple[str, str, bool]:
+        """
+        Find the foreign key between two tables.
+
+        Returns:
+            The joining column of ``table``, that of ``other``, and whether
+            ``other`` is on the one side (one related row per row of ``table``)
+        """
+        for column, target in self.foreign_keys.get(table, {}).items():
+            if target.split(".")[0] == other:
+                return column, target.split(".")[1], True
+        for column, target in self.foreign_keys.get(other, {}).items():
+            if target.split(".")[0] == table:
+                return target.split(".")[1], column, False
+        raise ValueError(f"Could not find a relationship between {table!r} and {other!r}")
+
+    def _embed(self, table: str, rows: List[Dict[str, Any]], item: str, request: Request) -> str:
+        """Nest the related rows of one embed in ``rows`` and return its key."""
+        alias, other, flags, columns = _EMBED.match(item).groups()
+        path = alias or other
+        local, remote, to_one = self._join(table, other)
+        keys = sorted({row[local] for row in rows if row[local] is not None})
+        where, params = self._where(request, path)
+        where += f'{" AND" if where else " WHERE"} "{remote}" IN ({", ".join("?" for _ in keys)})'
+        related: Dict[Any, List[Dict[str, Any]]] = {}
+        order = request.query_params.get(f"{path}.order")
+        for row in self._query(other, ["*"], where, params + keys, order):
+            related.setdefault(row[remote], []).append(row)
+        limit = request.query_params.get(f"{path}.limit")
+        wanted = columns.split(",")
+        for row in rows:
+            matches = related.get(row[local], [])[:int(limit) if limit else None]
+            matches = [m if wanted == ["*"] else {c: m[c] for c in wanted} for m in matches]
+            row[path] = (matches[0] if matches else None) if to_one else matches
+        if "!inner" in flags:
+            rows[:] = [row for row in rows if row[path]]
+        return path
+
+    def _select(self, table: str, request: Request) -> List[Dict[str, Any]]:
+        """Run a GET request as a SQL SELECT, then resolve its embeds."""
+        items = _split_select(request.query_params.get("select", "*"))
+        embeds = [item for item in items if "(" in item]
+        columns = [item for item in items if "(" not in item]
+        where, params = self._where(request)
+        order = request.query_params.get("order")
+        limit = request.query_params.get("limit")
+        offset = request.query_params.get("offset")
+        if not embeds:
+            return self._query(table, columns, where, params, order, limit, offset)
+        # Reason: embeds join on columns the select list may leave out, and inner
+        # embeds drop rows before the limit applies
+        rows = self._query(table, ["*"], where, params, order)
+        keep = [self._embed(table, rows, item, request) for item in embeds]
+        start = int(offset or 0)
+        rows = rows[start:start + int(limit) if limit else None]
+        if columns != ["*"]:
+            rows = [{c: row[c] for c in columns + keep} for row in rows]
+        return rows
+
+    def _insert(self, table: str, body: Any) -> List[Dict[str, Any]]:
+        """Run a POST request as a SQL INSERT."""
+        rows = body if isinstance(body, list) else [body]
+        inserted = []
+        with self._lock:
+            for row in rows:
+                columns = ", ".join(f'"{c}"' for c in row)
+                placeholders = ", ".join("?" for _ in row)
+                cursor = self._db.execute(
+                    f'INSERT INTO "{table}" ({columns}) VALUES ({placeholders}) RETURNING *',
+                    [_storable(v) for v in row.values()],
+                )
+                inserted.extend(dict(r) for r in cursor.fetchall())
+            self._db.commit()
+        return inserted
+
+    def _mutate(self, table: str, request: Request, body: Any) -> List[Dict[str, Any]]:
+        """Run a PATCH or DELETE request as the matching SQL statement."""
+        where, params = self._where(request)
+        if request.method == "PATCH":
+            assignments = ", ".join(f'"{c}" = ?' for c in body)
+            sql = f'UPDATE "{table}" SET {assignments}{where} RETURNING *'
+            params = [_storable(v) for v in body.values()] + params
+        else:
+            sql = f'DELETE FROM "{table}"{where} RETURNING *'
+        with self._lock:
+            rows = [dict(r) for r in self._db.execute(sql, params).fetchall()]
+            self._db.commit()
+        return rows
+
+    async def _handle(self, request: Request) -> Response:
+        """Dispatch a PostgREST-style request to SQLite."""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        table = request.path_params["table"]
+        try:
+            if request.method in ("GET", "HEAD"):
+                rows = self._select(table, request)
+            elif request.method == "POST":
+                rows = self._insert(table, json.loads(await request.body()))
+            else:
+                body = json.loads(await request.body() or b"null")
+                rows = self._mutate(table, request, body)
+        except (sqlite3.Error, ValueError) as exc:
+            payload = json.dumps({"message": str(exc), "code": "PGRST000"})
+            return Response(payload, status_code=400, media_type="application/json")
+
+        payload = json.dumps(rows).encode()
+        self.requests += 1
+        self.bytes_sent += len(payload)
+        status = 201 if request.method == "POST" else 200
+        if request.method == "HEAD":
+            payload = b""
+        return Response(payload, status_code=status, media_type="application/json")
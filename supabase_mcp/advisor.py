@@ -0,0 +1,176 @@
+"""
+Index advice from recorded query shapes.
+
+Each recorded shape (see shapes.py) is turned into the b-tree index that
+would serve it: its equality columns, followed by its order columns, or by
+its first range column if it is not ordered. Shapes an existing index already
+serves are left out. A unique index whose columns are all tested for equality
+serves any shape, since it finds at most one row. The remaining suggestions
+are merged when one is a prefix of another, since the longer index serves
+both, and ranked by the total time their shapes took.
+
+Without the index catalog (the PostgREST backend cannot read it), every
+suggestion is returned with "indexed" unknown.
+
+The report can also be computed offline from a shapes file saved by the
+server (SUPABASE_MCP_SHAPES_FILE) and a Postgres catalog:
+
+    python -m supabase_mcp.advisor shapes.json --database-url postgresql://...
+"""
+
+import argparse
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from .backends.sql import quote_ident
+from .shapes import Shape, ShapeRecorder, ShapeStats
+
+Indexes = Dict[str, List[Dict[str, Any]]]
+
+
+def suggested_columns(shape: Shape) -> Tuple[str, ...]:
+    """
+    Work out the index columns that would serve a shape.
+
+    Args:
+        shape: The query shape
+
+    Returns:
+        Equality columns, then the order columns or the first range column;
+        empty if the shape filters and orders by nothing
+    """
+    tail = tuple(column for column in shape.order if column not in shape.equal)
+    return shape.equal + (tail or shape.ranges[:1])
+
+
+def serves(index: Dict[str, Any], shape: Shape, columns: Tuple[str, ...]) -> bool:
+    """
+    Tell whether an existing index serves a shape as well as the suggestion would.
+
+    Args:
+        index: {"columns": [...], "unique": bool} from the catalog
+        shape: The query shape
+        columns: The suggested columns for the shape
+
+    Returns:
+        Whether the index leads with the equality columns in any order and
+        continues with the rest of the suggestion, or is unique and fully
+        pinned by equality
+    """
+    existing = tuple(index["columns"])
+    if index["unique"] and existing and set(existing) <= set(shape.equal):
+        return True
+    pinned = len(shape.equal)
+    return (
+        len(existing) >= len(columns)
+        and set(existing[:pinned]) == set(shape.equal)
+        and existing[pinned:len(columns)] == columns[pinned:]
+    )
+
+
+def advise(
+    shapes: Dict[Shape, ShapeStats],
+    indexes: Optional[Indexes],
+    limit: int = 10,
+    min_calls: int = 1,
+) -> Dict[str, Any]:
+    """
+    Suggest missing indexes for recorded shapes, ranked by total time.
+
+    Args:
+        shapes: Recorded shapes and their stats
+        indexes: Each table's indexes, or None if the catalog is unavailable
+        limit: Maximum suggestions returned
+        min_calls: Ignore shapes called fewer times than this
+
+    Returns:
+        Dictionary with the "advice" (each with "table", "columns", "ddl",
+        "calls", "total_ms", "mean_ms", "operations" and "shapes"), and counts
+        of the shapes considered, already "indexed" and "unindexable"
+    """
+    counts = {"shapes": 0, "indexed": 0, "unindexable": 0}
+    wanted: Dict[Tuple[str, Tuple[str, ...]], List[Tuple[Shape, ShapeStats]]] = {}
+    for shape, stats in shapes.items():
+        if stats.calls < min_calls:
+            continue
+        counts["shapes"] += 1
+        columns = suggested_columns(shape)
+        if not columns:
+            counts["unindexable"] += 1
+        elif indexes is not None and any(
+            serves(index, shape, columns) for index in indexes.get(shape.table, [])
+        ):
+            counts["indexed"] += 1
+        else:
+            wanted.setdefault((shape.table, columns), []).append((shape, stats))
+
+    # Reason: an index on (a, b) also serves shapes that want (a), so fold
+    # shorter suggestions into the longest one they prefix
+    for table, columns in sorted(wanted, key=lambda key: -len(key[1])):
+        longer = [
+            other for other in wanted
+            if other[0] == table and len(other[1]) > len(columns)
+            and other[1][:len(columns)] == columns
+        ]
+        if longer:
+            wanted[longer[0]].extend(wanted.pop((table, columns)))
+
+    advice = []
+    for (table, columns), served in wanted.items():
+        calls = sum(stats.calls for _, stats in served)
+        total = sum(stats.total_ms for _, stats in served)
+        operations: Dict[str, int] = {}
+        for _, stats in served:
+            for operation, count in stats.operations.items():
+                operations[operation] = operations.get(operation, 0) + count
+        advice.append({
+            "table": table,
+            "columns": list(columns),
+            "ddl": f"CREATE INDEX CONCURRENTLY ON {quote_ident(table)} "
+                   f"({', '.join(quote_ident(column) for column in columns)})",
+            "calls": calls,
+            "total_ms": round(total, 3),
+            "mean_ms": round(total / calls, 3),
+            "operations": operations,
+            "shapes": len(served),
+        })
+    advice.sort(key=lambda entry: -entry["total_ms"])
+    return {
+        "advice": advice[:limit],
+        **counts,
+        "indexed": counts["indexed"] if indexes is not None else None,
+    }
+
+
+async def _report(path: str, database_url: Optional[str], limit: int, min_calls: int) -> Dict:
+    """Load a shapes file and advise against the catalog of a database, if given."""
+    recorder = ShapeRecorder()
+    with open(path, encoding="utf-8") as handle:
+        recorder.load(json.load(handle))
+    indexes = None
+    if database_url:
+        from .backends import PostgresBackend, PostgresConfig
+
+        backend = await PostgresBackend.connect(PostgresConfig(database_url, 1, 1))
+        try:
+            indexes = await backend.indexes(sorted({s.table for s in recorder.shapes}))
+        finally:
+            await backend.aclose()
+    return advise(recorder.shapes, indexes, limit, min_calls)
+
+
+def main() -> None:
+    """Print index advice for a saved shapes file as JSON."""
+    parser = argparse.ArgumentParser(description="Suggest indexes for recorded query shapes")
+    parser.add_argument("shapes", help="JSON file written by the server (SUPABASE_MCP_SHAPES_FILE)")
+    parser.add_argument("--database-url", help="Postgres whose catalog lists existing indexes")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--min-calls", type=int, default=1)
+    args = parser.parse_args()
+    report = asyncio.run(_report(args.shapes, args.database_url, args.limit, args.min_calls))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
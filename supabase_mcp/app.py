@@ -0,0 +1,36 @@
+"""
+The FastMCP application the tools register on.
+"""
+
+from typing import Any, Dict, Sequence
+
+from dotenv import load_dotenv
+from mcp.server.fastmcp import FastMCP
+
+from .codec import Content, JSONCodec, to_content
+from .context import supabase_lifespan
+
+# Load environment variables
+load_dotenv()
+
+
+class SupabaseMCP(FastMCP):
+    """FastMCP server that encodes tool results with the orjson codec when it is selected."""
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Sequence[Content]:
+        """Call a tool by name; with orjson, encode its result as one JSON text block."""
+        context = self.get_context()
+        codec = getattr(context.request_context.lifespan_context, "codec", None)
+        if codec is None or codec.name == JSONCodec.name:
+            # Reason: the json codec keeps FastMCP's content, one text block per list item
+            return await super().call_tool(name, arguments)
+        result = await self._tool_manager.call_tool(name, arguments, context=context)
+        return to_content(result, codec)
+
+
+# Create the MCP server
+mcp = SupabaseMCP(
+    "Supabase Database",
+    description="MCP server for interacting with Supabase databases",
+    lifespan=supabase_lifespan
+)
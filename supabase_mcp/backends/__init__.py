@@ -0,0 +1,56 @@
+"""
+Pluggable execution backends for the table tools.
+
+- postgrest (default): queries go through Supabase's PostgREST API over HTTP
+- postgres: queries go straight to Postgres over an asyncpg pool
+
+Environment variables:
+- SUPABASE_MCP_BACKEND: Which backend to use, "postgrest" or "postgres" (default: postgrest)
+"""
+
+import os
+from typing import Mapping, Optional
+
+from .base import COUNT_METHODS, Aggregate, AggregateQuery, Backend, ReadQuery, Records, Row
+from .postgres import PostgresBackend, PostgresConfig
+from .postgrest import PostgrestBackend
+
+BACKENDS = ("postgrest", "postgres")
+
+
+def selected_backend(env: Optional[Mapping[str, str]] = None) -> str:
+    """
+    Read which backend to use from SUPABASE_MCP_BACKEND.
+
+    Args:
+        env: Mapping to read from (default: os.environ)
+
+    Returns:
+        The backend name
+
+    Raises:
+        ValueError: If the name is not a known backend
+    """
+    value = (os.environ if env is None else env).get("SUPABASE_MCP_BACKEND", "")
+    name = value.strip().lower() or "postgrest"
+    if name not in BACKENDS:
+        raise ValueError(
+            f"SUPABASE_MCP_BACKEND must be one of {', '.join(BACKENDS)}, got {value!r}"
+        )
+    return name
+
+
+__all__ = [
+    "Aggregate",
+    "AggregateQuery",
+    "BACKENDS",
+    "Backend",
+    "COUNT_METHODS",
+    "PostgresBackend",
+    "PostgresConfig",
+    "PostgrestBackend",
+    "ReadQuery",
+    "Records",
+    "Row",
+    "selected_backend",
+]
@@ -0,0 +1,210 @@
+"""
+The backend interface the MCP tools execute against.
+"""
+
+import asyncio
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from ..embeds import Embed
+
+Row = Dict[str, Any]
+Records = Union[Row, List[Row]]
+
+
+@dataclass
+class ReadQuery:
+    """
+    A read_table_rows request, independent of how it is executed.
+
+    For keyset pagination, rows are ordered by order_by then tiebreaker (both in
+    the same direction) and only rows after the ``after`` values are returned;
+    NULLs of order_by sort last ascending and first descending, as in Postgres.
+    Embeds nest rows of related tables in each row (see embeds.py).
+    """
+    table: str
+    columns: str = "*"
+    filters: Optional[Dict[str, Any]] = None
+    order_by: Optional[str] = None
+    ascending: bool = True
+    limit: Optional[int] = None
+    tiebreaker: Optional[str] = None
+    after: Optional[List[Any]] = None
+    embeds: List[Embed] = field(default_factory=list)
+
+    @property
+    def order_keys(self) -> List[str]:
+        """The ordering columns, including the tiebreaker."""
+        keys = [self.order_by] if self.order_by else []
+        return keys + ([self.tiebreaker] if self.tiebreaker else [])
+
+
+# How row counts are computed, as in PostgREST's Prefer: count=... header:
+# exact runs count(*), planned reads the planner's estimate, and estimated is
+# exact for small results and planned for large ones
+COUNT_METHODS = ("exact", "planned", "estimated")
+
+AGGREGATE_FUNCTIONS = ("count", "sum", "avg", "min", "max")
+
+# "count", "count(*)", "sum(amount)", ...
+_AGGREGATE = re.compile(
+    r"^\s*(count|sum|avg|min|max)\s*(?:\(\s*(\*|[A-Za-z_]\w*)?\s*\))?\s*$", re.IGNORECASE
+)
+
+
+@dataclass(frozen=True)
+class Aggregate:
+    """One aggregate function, e.g. ``sum(amount)``; no column means ``count(*)``."""
+    function: str
+    column: Optional[str] = None
+
+    @classmethod
+    def parse(cls, spec: str) -> "Aggregate":
+        """
+        Parse an aggregate written as ``function(column)``.
+
+        Args:
+            spec: Text such as "count", "count(*)", "count(email)" or "sum(amount)"
+
+        Returns:
+            Aggregate: The parsed aggregate
+
+        Raises:
+            ValueError: If the function is unknown or needs a column it was not given
+        """
+        match = _AGGREGATE.match(spec) if isinstance(spec, str) else None
+        if not match:
+            raise ValueError(
+                f"Invalid aggregate {spec!r}; use function(column) with one of "
+                f"{', '.join(AGGREGATE_FUNCTIONS)}, e.g. 'count' or 'sum(amount)'"
+            )
+        function, column = match.group(1).lower(), match.group(2)
+        column = None if column == "*" else column
+        if column is None and function != "count":
+            raise ValueError(f"Aggregate {function} needs a column, e.g. '{function}(amount)'")
+        return cls(function, column)
+
+    @property
+    def alias(self) -> str:
+        """The result column name: "count", or function_column such as "sum_amount"."""
+        return self.function if self.column is None else f"{self.function}_{self.column}"
+
+
+@dataclass
+class AggregateQuery:
+    """
+    An aggregate_table request: aggregates over the rows matching the filters,
+    one result row per distinct combination of the group_by columns.
+    """
+    table: str
+    aggregates: List[Aggregate]
+    group_by: List[str] = field(default_factory=list)
+    filters: Optional[Dict[str, Any]] = None
+    limit: Optional[int] = None
+
+
+class Backend(ABC):
+    """
+    Executes table operations for the tools.
+
+    Write methods return the affected rows as reported by the database, or None
+    if the database returned no representation.
+    """
+
+    name: str = "backend"
+
+    @abstractmethod
+    async def read(self, query: ReadQuery) -> List[Row]:
+        """Return the rows matching a read query."""
+
+    @abstractmethod
+    async def insert(self, table: str, records: Records) -> Optional[List[Row]]:
+        """Insert one or more records and return the created rows."""
+
+    @abstractmethod
+    async def update(
+        self, table: str, updates: Row, filters: Dict[str, Any]
+    ) -> Optional[List[Row]]:
+        """Update rows matching the filters and return the updated rows."""
+
+    @abstractmethod
+    async def delete(self, table: str, filters: Dict[str, Any]) -> Optional[List[Row]]:
+        """Delete rows matching the filters and return the deleted rows."""
+
+    async def count(self, query: ReadQuery, method: str = "exact") -> Optional[int]:
+        """
+        Count the rows matching a read query's filters.
+
+        Columns, ordering, limit and keyset position are ignored.
+
+        Args:
+            query: The read query
+            method: One of COUNT_METHODS
+
+        Returns:
+            The row count, or None if the database did not report one
+        """
+        raise NotImplementedError(f"The {self.name} backend does not support counts")
+
+    async def read_counted(
+        self, query: ReadQuery, method: str = "exact"
+    ) -> Tuple[List[Row], Optional[int]]:
+        """
+        Return the rows of a read query together with the count of all matching rows.
+
+        Args:
+            query: The read query
+            method: One of COUNT_METHODS
+
+        Returns:
+            The rows and the count
+        """
+        rows, total = await asyncio.gather(self.read(query), self.count(query, method))
+        return rows, total
+
+    async def aggregate(self, query: AggregateQuery) -> List[Row]:
+        """Return one row of aggregates per group of the rows matching the query."""
+        raise NotImplementedError(f"The {self.name} backend does not support aggregates")
+
+    async def explain(
+        self,
+        operation: str,
+        query: ReadQuery,
+        updates: Optional[Row] = None,
+        analyze: bool = False,
+    ) -> Row:
+        """
+        Return the Postgres plan of a read, update or delete.
+
+        Args:
+            operation: "read", "update" or "delete"
+            query: The query; updates and deletes use its table and filters
+            updates: Column-value pairs of an update
+            analyze: Run the query and include actual rows and timings
+
+        Returns:
+            The plan as one EXPLAIN (FORMAT JSON) entry: {"Plan": {...}, ...}
+        """
+        raise NotImplementedError(f"The {self.name} backend does not support query plans")
+
+    async def aclose(self) -> None:
+        """Release any resources held by the backend."""
+
+    async def indexes(self, tables: Sequence[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Return the indexes of tables from the database catalog.
+
+        Args:
+            tables: Names of the tables
+
+        Returns:
+            Table name to its indexes, each {"name", "columns", "unique"}; the key
+            columns are in index order and stop at the first expression
+        """
+        raise NotImplementedError(f"The {self.name} backend cannot read the index catalog")
+
+    def stats(self) -> Dict[str, Any]:
+        """Report backend-specific metrics."""
+        return {"name": self.name}
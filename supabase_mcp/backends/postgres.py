@@ -0,0 +1,346 @@
+"""
+Backend that talks to Postgres directly through an asyncpg connection pool.
+
+This skips the PostgREST HTTP hop and its JSON encode/decode. Every query is
+generated from a fixed template per query shape with all values bound as
+parameters, so asyncpg's per-connection statement cache prepares each shape
+once and reuses it.
+
+SQL generation lives in sql.py. Values arrive from MCP clients as JSON, so
+they are sent as text and cast to each column's declared type.
+
+Environment variables:
+- DATABASE_URL: Postgres connection string (required for this backend)
+- DATABASE_POOL_MIN_SIZE: Minimum pooled connections (default: 1)
+- DATABASE_POOL_MAX_SIZE: Maximum pooled connections (default: 10)
+- DATABASE_STATEMENT_CACHE_SIZE: Prepared statements cached per connection
+  (default: 100; set to 0 behind PgBouncer in transaction mode)
+- DATABASE_STATEMENT_TIMEOUT: Postgres statement_timeout in seconds for pooled
+  connections, so the database stops runaway queries itself (default: unset)
+
+A tool call that is cancelled or runs past its deadline cancels the awaiting
+asyncpg query, which sends Postgres a cancel request for the running statement.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Set
+
+from ..config import env_float, env_int
+from .base import AggregateQuery, Backend, ReadQuery, Records, Row
+from .sql import (
+    build_aggregate,
+    build_count,
+    build_delete,
+    build_insert,
+    build_select,
+    build_update,
+    check_no_embeds,
+    quote_ident,
+    to_json_value,
+)
+
+# Key columns of each index, in order; expression keys have a NULL name
+_INDEXES_SQL = (
+    "SELECT t.name, c.relname, i.indisunique, array_agg(a.attname ORDER BY k.ord) "
+    "FROM unnest($1::text[]) AS t(name) "
+    "JOIN pg_index i ON i.indrelid = to_regclass(quote_ident(t.name)) "
+    "JOIN pg_class c ON c.oid = i.indexrelid "
+    "CROSS JOIN LATERAL unnest(i.indkey::int2[]) WITH ORDINALITY AS k(attnum, ord) "
+    "LEFT JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum "
+    "WHERE k.ord <= i.indnkeyatts AND i.indpred IS NULL AND i.indisvalid "
+    "GROUP BY t.name, c.relname, i.indisunique ORDER BY t.name, c.relname"
+)
+
+if TYPE_CHECKING:
+    from ..codec import JSONCodec
+
+# Maximum number of distinct query shapes remembered for metrics
+_MAX_TRACKED_SHAPES = 10_000
+
+# Estimated counts above this many planned rows are not counted exactly, matching
+# Supabase's default PostgREST db-max-rows
+_ESTIMATED_EXACT_LIMIT = 1000
+
+
+@dataclass
+class PostgresConfig:
+    """Connection settings for the asyncpg backend."""
+    dsn: str
+    min_size: int = 1
+    max_size: int = 10
+    statement_cache_size: int = 100
+    statement_timeout: Optional[float] = None
+
+    @classmethod
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "PostgresConfig":
+        """
+        Build the configuration from environment variables.
+
+        Args:
+            env: Mapping to read from (default: os.environ)
+
+        Returns:
+            PostgresConfig: The configuration
+
+        Raises:
+            ValueError: If DATABASE_URL is missing or a size is invalid
+        """
+        dsn = (os.environ if env is None else env).get("DATABASE_URL", "").strip()
+        if not dsn:
+            raise ValueError(
+                "Missing environment variable. Please set DATABASE_URL to use the "
+                "postgres backend."
+            )
+        config = cls(
+            dsn=dsn,
+            min_size=env_int("DATABASE_POOL_MIN_SIZE", 1, env),
+            max_size=env_int("DATABASE_POOL_MAX_SIZE", 10, env),
+            statement_cache_size=env_int("DATABASE_STATEMENT_CACHE_SIZE", 100, env),
+            statement_timeout=env_float("DATABASE_STATEMENT_TIMEOUT", None, env),
+        )
+        if not 0 <= config.min_size <= config.max_size or config.max_size < 1:
+            raise ValueError(
+                "DATABASE_POOL_MIN_SIZE must be between 0 and DATABASE_POOL_MAX_SIZE"
+            )
+        if config.statement_timeout is not None and config.statement_timeout < 0:
+            raise ValueError("DATABASE_STATEMENT_TIMEOUT must not be negative")
+        return config
+
+    @property
+    def server_settings(self) -> Dict[str, str]:
+        """Session settings applied to every pooled connection."""
+        if not self.statement_timeout:
+            return {}
+        return {"statement_timeout": str(int(self.statement_timeout * 1000))}
+
+
+async def _init_connection(conn: Any, codec: Optional["JSONCodec"] = None) -> None:
+    """Decode json/jsonb columns to Python objects, as PostgREST would."""
+    encoder, decoder = (codec.dumps, codec.loads) if codec else (json.dumps, json.loads)
+    for pg_type in ("json", "jsonb"):
+        await conn.set_type_codec(
+            pg_type, encoder=encoder, decoder=decoder, schema="pg_catalog"
+        )
+
+
+class PostgresBackend(Backend):
+    """
+    Executes table operations as SQL over an asyncpg pool.
+
+    Args:
+        pool: An asyncpg connection pool
+        config: The configuration the pool was created from
+    """
+
+    name = "postgres"
+
+    def __init__(self, pool: Any, config: PostgresConfig) -> None:
+        self.pool = pool
+        self.config = config
+        self._types: Dict[str, Dict[str, str]] = {}
+        self._shapes: Set[str] = set()
+        self.queries = 0
+
+    @classmethod
+    async def connect(
+        cls, config: PostgresConfig, codec: Optional["JSONCodec"] = None
+    ) -> "PostgresBackend":
+        """
+        Create the asyncpg pool and the backend.
+
+        Args:
+            config: The connection settings
+            codec: Codec for json and jsonb values (default: the json module)
+
+        Returns:
+            PostgresBackend: The connected backend
+
+        Raises:
+            ValueError: If asyncpg is not installed
+        """
+        try:
+            import asyncpg
+        except ImportError:
+            raise ValueError(
+                "The postgres backend requires asyncpg; install it with "
+                "'pip install asyncpg'."
+            ) from None
+        pool = await asyncpg.create_pool(
+            config.dsn,
+            min_size=config.min_size,
+            max_size=config.max_size,
+            statement_cache_size=config.statement_cache_size,
+            server_settings=config.server_settings,
+            init=partial(_init_connection, codec=codec),
+        )
+        return cls(pool, config)
+
+    async def column_types(self, table: str) -> Dict[str, str]:
+        """
+        Look up (and cache) the declared type of each column of a table.
+
+        Args:
+            table: Name of the table
+
+        Returns:
+            Column name to type, e.g. {"id": "bigint", "tags": "text[]"}
+
+        Raises:
+            ValueError: If the table does not exist
+        """
+        if table not in self._types:
+            rows = await self.pool.fetch(
+                "SELECT a.attname, format_type(a.atttypid, a.atttypmod) "
+                "FROM pg_attribute a "
+                "WHERE a.attrelid = to_regclass($1) AND a.attnum > 0 "
+                "AND NOT a.attisdropped ORDER BY a.attnum",
+                quote_ident(table),
+            )
+            if not rows:
+                raise ValueError(f"Table {table!r} does not exist")
+            self._types[table] = {name: pg_type for name, pg_type in rows}
+        return self._types[table]
+
+    async def indexes(self, tables: Sequence[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Read the valid, non-partial indexes of tables from pg_index.
+
+        Args:
+            tables: Names of the tables
+
+        Returns:
+            Table name to its indexes, each {"name", "columns", "unique"}; tables
+            that do not exist map to an empty list
+        """
+        rows = await self.pool.fetch(_INDEXES_SQL, list(tables))
+        found: Dict[str, List[Dict[str, Any]]] = {table: [] for table in tables}
+        for table, name, unique, columns in rows:
+            # Reason: an expression key (NULL name) ends the usable column prefix
+            usable = columns[:columns.index(None)] if None in columns else columns
+            found[table].append({"name": name, "columns": usable, "unique": unique})
+        return found
+
+    def _track(self, sql: str) -> None:
+        """Count a statement and remember its shape."""
+        if len(self._shapes) < _MAX_TRACKED_SHAPES:
+            self._shapes.add(sql)
+        self.queries += 1
+
+    async def _fetch(self, sql: str, args: List[Any]) -> List[Row]:
+        """Run a statement through the pool's statement cache and convert rows."""
+        self._track(sql)
+        records = await self.pool.fetch(sql, *args)
+        return [{k: to_json_value(v) for k, v in record.items()} for record in records]
+
+    async def _fetchval(self, sql: str, args: List[Any]) -> Any:
+        """Run a statement through the pool's statement cache and return one value."""
+        self._track(sql)
+        return await self.pool.fetchval(sql, *args)
+
+    async def read(self, query: ReadQuery) -> List[Row]:
+        """Run a read query as a SELECT."""
+        sql, args = build_select(query, await self.column_types(query.table))
+        return await self._fetch(sql, args)
+
+    async def count(self, query: ReadQuery, method: str = "exact") -> Optional[int]:
+        """
+        Count matching rows with count(*), or from the planner's row estimate.
+
+        Args:
+            query: The read query
+            method: One of COUNT_METHODS
+
+        Returns:
+            The row count
+        """
+        check_no_embeds(query)
+        types = await self.column_types(query.table)
+        if method != "exact":
+            sql, args = build_count(query.table, query.filters, types, planned=True)
+            plan = await self._fetchval(sql, args)
+            planned = int(plan[0]["Plan"]["Plan Rows"])
+            if method == "planned" or planned > _ESTIMATED_EXACT_LIMIT:
+                return planned
+        sql, args = build_count(query.table, query.filters, types)
+        return await self._fetchval(sql, args)
+
+    async def aggregate(self, query: AggregateQuery) -> List[Row]:
+        """Run an aggregate query as a SELECT ... GROUP BY."""
+        sql, args = build_aggregate(query, await self.column_types(query.table))
+        return await self._fetch(sql, args)
+
+    async def explain(
+        self,
+        operation: str,
+        query: ReadQuery,
+        updates: Optional[Row] = None,
+        analyze: bool = False,
+    ) -> Row:
+        """
+        Plan the statement a read, update or delete would run with EXPLAIN (FORMAT JSON).
+
+        Args:
+            operation: "read", "update" or "delete"
+            query: The query; updates and deletes use its table and filters
+            updates: Column-value pairs of an update
+            analyze: Run the statement and include actual rows and timings
+
+        Returns:
+            The plan entry: {"Plan": {...}, ...}
+        """
+        types = await self.column_types(query.table)
+        if operation == "read":
+            sql, args = build_select(query, types)
+        elif operation == "update":
+            sql, args = build_update(query.table, updates or {}, query.filters, types)
+        else:
+            sql, args = build_delete(query.table, query.filters, types)
+        options = "ANALYZE, FORMAT JSON" if analyze else "FORMAT JSON"
+        plan = await self._fetchval(f"EXPLAIN ({options}) {sql}", args)
+        return plan[0]
+
+    async def insert(self, table: str, records: Records) -> Optional[List[Row]]:
+        """Insert records with INSERT ... RETURNING."""
+        rows = records if isinstance(records, list) else [records]
+        if not rows:
+            return []
+        sql, args = build_insert(table, rows, await self.column_types(table))
+        return await self._fetch(sql, args)
+
+    async def update(
+        self, table: str, updates: Row, filters: Dict[str, Any]
+    ) -> Optional[List[Row]]:
+        """Update rows with UPDATE ... RETURNING."""
+        sql, args = build_update(table, updates, filters, await self.column_types(table))
+        return await self._fetch(sql, args)
+
+    async def delete(self, table: str, filters: Dict[str, Any]) -> Optional[List[Row]]:
+        """Delete rows with DELETE ... RETURNING."""
+        sql, args = build_delete(table, filters, await self.column_types(table))
+        return await self._fetch(sql, args)
+
+    async def aclose(self) -> None:
+        """Close all pooled connections."""
+        await self.pool.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report pool usage and prepared statement metrics.
+
+        Returns:
+            Dictionary with pool sizes, query count and distinct statement shapes
+        """
+        return {
+            "name": self.name,
+            "pool_size": self.pool.get_size(),
+            "pool_idle": self.pool.get_idle_size(),
+            "pool_min": self.config.min_size,
+            "pool_max": self.config.max_size,
+            "queries": self.queries,
+            "statement_shapes": len(self._shapes),
+            "statement_cache_size": self.config.statement_cache_size,
+            "statement_timeout": self.config.statement_timeout,
+        }
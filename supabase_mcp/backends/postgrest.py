@@ -0,0 +1,467 @@
+"""
+Backend that executes table operations through PostgREST over HTTP.
+"""
+
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from postgrest import APIError
+from postgrest.types import CountMethod
+
+from ..embeds import Embed
+from ..filters import Condition, Filter, Group, parse_filters
+from .base import AggregateQuery, Backend, ReadQuery, Records, Row
+
+# PostgREST's error code when db-aggregates-enabled is off
+_AGGREGATES_DISABLED = "PGRST123"
+
+# Media type of EXPLAIN output; PostgREST only serves it with db-plan-enabled
+_PLAN_MEDIA_TYPE = "application/vnd.pgrst.plan+json"
+
+_PLAIN_COLUMN = re.compile(r"^[A-Za-z_]\w*$")
+
+
+def quote_value(value: Any) -> str:
+    """
+    Quote a value for use inside a PostgREST logic tree such as ``or=(...)``.
+
+    Args:
+        value: The filter value
+
+    Returns:
+        The value in double quotes with quotes and backslashes escaped
+    """
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
+
+
+def _text(value: Any) -> str:
+    """Render a filter operand as PostgREST expects it."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+def criteria(condition: Condition, in_tree: bool = False) -> str:
+    """
+    Render the value part of a PostgREST filter such as ``gte.<criteria>``.
+
+    Args:
+        condition: The condition to render
+        in_tree: Whether the condition sits inside an ``or``/``and`` logic tree,
+            where values are quoted so reserved characters are taken literally
+
+    Returns:
+        The criteria text
+    """
+    value = condition.value
+    if condition.op == "in":
+        return "(" + ",".join(quote_value(_text(v)) for v in value) + ")"
+    if condition.op == "is":
+        return value
+    if condition.op == "contains" and isinstance(value, list):
+        text = "{" + ",".join(quote_value(_text(v)) for v in value) + "}"
+    else:
+        text = _text(value)
+    return quote_value(text) if in_tree else text
+
+
+# Filter operators whose PostgREST name differs from the grammar's
+_POSTGREST_OPS = {"contains": "cs"}
+
+
+def render_tree(item: Filter) -> str:
+    """
+    Render a condition or group in PostgREST's logic tree syntax.
+
+    Args:
+        item: The condition or group
+
+    Returns:
+        Text such as ``status.eq."open"`` or ``and(a.gt."1",b.lt."2")``
+    """
+    if isinstance(item, Group):
+        return f"{item.kind}({','.join(render_tree(member) for member in item.items)})"
+    op = _POSTGREST_OPS.get(item.op, item.op)
+    return f"{item.column}.{op}.{criteria(item, in_tree=True)}"
+
+
+def apply_filters(
+    request: Any, filters: Optional[Dict[str, Any]], reference: Optional[str] = None
+) -> Any:
+    """
+    Apply a filter expression to a PostgREST request.
+
+    Top-level conditions become query parameters such as ``age=gte.18``, and
+    "or" groups become an ``or=(...)`` logic tree.
+
+    Args:
+        request: The PostgREST request builder
+        filters: The tool's filters argument
+        reference: Path of an embedded resource the filters apply to, such as
+            ``customers`` or ``customers.addresses`` (default: the table read)
+
+    Returns:
+        The request builder with the filters applied
+
+    Raises:
+        ValueError: If the filters are invalid
+    """
+    prefix = f"{reference}." if reference else ""
+    groups = []
+    for item in parse_filters(filters):
+        if isinstance(item, Group):
+            groups.append(item)
+        elif item.op == "eq":
+            request = request.eq(prefix + item.column, item.value)
+        else:
+            op = _POSTGREST_OPS.get(item.op, item.op)
+            request = request.filter(prefix + item.column, op, criteria(item))
+    if len(groups) == 1:
+        tree = ",".join(render_tree(member) for member in groups[0].items)
+        request = request.or_(tree, reference_table=reference)
+    elif groups:
+        # Several "or" groups must all hold: wrap them in one and(...) tree
+        request = request.or_(render_tree(Group("and", groups)), reference_table=reference)
+    return request
+
+
+def embed_select(columns: str, embeds: List[Embed]) -> str:
+    """
+    Render a select list with embedded resources appended.
+
+    Args:
+        columns: The columns of the table read
+        embeds: Its embeds
+
+    Returns:
+        Text such as ``id,total,buyer:customers!buyer_id!inner(name,email)``
+    """
+    items = [columns] if columns.strip() else []
+    for embed in embeds:
+        name = f"{embed.alias}:{embed.table}" if embed.alias else embed.table
+        if embed.hint:
+            name += f"!{embed.hint}"
+        if embed.inner:
+            name += "!inner"
+        items.append(f"{name}({embed_select(embed.columns, embed.embeds)})")
+    return ",".join(items)
+
+
+def apply_embeds(request: Any, embeds: List[Embed], parent: str = "") -> Any:
+    """
+    Apply the filters, ordering and limits of embedded resources to a request.
+
+    Each applies to the embedded rows under the embed's path, e.g.
+    ``customers.status=eq.active`` or ``orders.limit=5``. Without ``inner``, an
+    embed's filters only narrow the related rows, not the rows of the table read.
+
+    Args:
+        request: The PostgREST select request builder
+        embeds: The embeds, whose select list is already in the request
+        parent: Path of the resource the embeds belong to (default: the table read)
+
+    Returns:
+        The request builder with the embeds' parameters applied
+    """
+    for embed in embeds:
+        path = parent + embed.path
+        request = apply_filters(request, embed.filters, path)
+        if embed.order_by:
+            request = request.order(embed.order_by, desc=not embed.ascending, foreign_table=path)
+        if embed.limit:
+            request = request.limit(embed.limit, foreign_table=path)
+        request = apply_embeds(request, embed.embeds, f"{path}.")
+    return request
+
+
+def aggregate_select(query: AggregateQuery) -> str:
+    """
+    Render the select parameter for an aggregate query.
+
+    PostgREST groups by every plain column in the select list, so
+    ``status,count(),total_amount:amount.sum()`` counts and sums per status.
+
+    Args:
+        query: The aggregate query
+
+    Returns:
+        The select text
+
+    Raises:
+        ValueError: If a group_by column is not a plain column name
+    """
+    for column in query.group_by:
+        if not isinstance(column, str) or not _PLAIN_COLUMN.match(column):
+            raise ValueError(f"Invalid group_by column {column!r}")
+    items = list(query.group_by)
+    for aggregate in query.aggregates:
+        if aggregate.column is None:
+            items.append("count()")
+        else:
+            items.append(f"{aggregate.alias}:{aggregate.column}.{aggregate.function}()")
+    return ",".join(items)
+
+
+def apply_keyset(request: Any, keys: List[str], values: List[Any], ascending: bool) -> Any:
+    """
+    Restrict a request to rows after a keyset position.
+
+    Two keys ``(a, b)`` become ``a > va OR (a = va AND b > vb)``; the
+    expansion is what PostgREST's grammar allows in place of a row comparison.
+    NULLs of ``a`` sort last ascending and first descending, and no comparison
+    with NULL is true, so NULL rows are matched with ``is.null`` branches.
+
+    Args:
+        request: The PostgREST select request builder
+        keys: Ordering columns, ending with a unique column
+        values: The last row's values for those columns
+        ascending: Whether the order is ascending
+
+    Returns:
+        The request builder with the keyset filter applied
+    """
+    op = "gt" if ascending else "lt"
+    if len(keys) == 1:
+        return request.filter(keys[0], op, values[0])
+    (first, second), (v1, v2) = keys, values
+    if v1 is None:
+        # Among the NULL rows; descending, every non-NULL row is still to come
+        if ascending:
+            return request.is_(first, "null").filter(second, op, v2)
+        return request.or_(f"{first}.not.is.null,{second}.{op}.{quote_value(v2)}")
+    branches = (
+        f"{first}.{op}.{quote_value(v1)},"
+        f"and({first}.eq.{quote_value(v1)},{second}.{op}.{quote_value(v2)})"
+    )
+    if ascending:
+        # The NULL rows come after every non-NULL one
+        branches += f",{first}.is.null"
+    return request.or_(branches)
+
+
+class PostgrestBackend(Backend):
+    """
+    Builds PostgREST queries with the Supabase client's query builder.
+
+    Args:
+        get_client: Returns the client to use; called per operation so a
+            fast-start client is only built when first needed
+    """
+
+    name = "postgrest"
+
+    def __init__(self, get_client: Callable[[], Any]) -> None:
+        self._get_client = get_client
+
+    async def read(self, query: ReadQuery) -> List[Row]:
+        """
+        Run a read query as a PostgREST GET request.
+
+        Args:
+            query: The read query
+
+        Returns:
+            List of rows
+        """
+        response = await self._select(query).execute()
+        return response.data
+
+    def _select(self, query: ReadQuery, method: Optional[str] = None) -> Any:
+        """Build the GET request for a read query, asking for a count if a method is given."""
+        # Start building the query
+        request = self._get_client().table(query.table)
+        columns = embed_select(query.columns, query.embeds)
+        if method:
+            request = request.select(columns, count=CountMethod(method))
+        else:
+            request = request.select(columns)
+
+        # Apply filters if provided
+        request = apply_filters(request, query.filters)
+        request = apply_embeds(request, query.embeds)
+
+        # Resume after the previous page's last row
+        if query.after is not None:
+            request = apply_keyset(request, query.order_keys, query.after, query.ascending)
+
+        # Apply ordering if provided
+        for column in query.order_keys:
+            if query.tiebreaker:
+                # Pages rely on where NULLs sort, so spell out Postgres's default
+                request = request.order(
+                    column, desc=not query.ascending, nullsfirst=not query.ascending
+                )
+            else:
+                request = request.order(column, desc=not query.ascending)
+
+        # Apply limit if provided
+        if query.limit:
+            request = request.limit(query.limit)
+        return request
+
+    async def count(self, query: ReadQuery, method: str = "exact") -> Optional[int]:
+        """
+        Count matching rows with a HEAD request; the total comes back in Content-Range.
+
+        Inner embeds are part of the request, so rows without a matching related
+        row are not counted.
+
+        Args:
+            query: The read query
+            method: One of COUNT_METHODS
+
+        Returns:
+            The row count
+        """
+        request = self._get_client().table(query.table).select(
+            embed_select("*", query.embeds), count=CountMethod(method), head=True
+        )
+        request = apply_embeds(apply_filters(request, query.filters), query.embeds)
+        response = await request.execute()
+        return response.count
+
+    async def read_counted(
+        self, query: ReadQuery, method: str = "exact"
+    ) -> Tuple[List[Row], Optional[int]]:
+        """
+        Read rows and take the count from the same response's Content-Range header.
+
+        A keyset position is a filter to PostgREST and would shrink the count, so
+        reads resuming after a cursor count with a separate HEAD request.
+
+        Args:
+            query: The read query
+            method: One of COUNT_METHODS
+
+        Returns:
+            The rows and the count of all rows matching the filters
+        """
+        if query.after is not None:
+            return await super().read_counted(query, method)
+        response = await self._select(query, method).execute()
+        return response.data, response.count
+
+    async def aggregate(self, query: AggregateQuery) -> List[Row]:
+        """
+        Run an aggregate query as a PostgREST GET request with aggregate functions.
+
+        Args:
+            query: The aggregate query
+
+        Returns:
+            One row per group, ordered by the group_by columns
+
+        Raises:
+            ValueError: If the PostgREST server does not allow aggregate functions
+        """
+        request = self._get_client().table(query.table).select(aggregate_select(query))
+        request = apply_filters(request, query.filters)
+        for column in query.group_by:
+            request = request.order(column)
+        if query.limit:
+            request = request.limit(query.limit)
+        try:
+            response = await request.execute()
+        except APIError as exc:
+            if exc.code != _AGGREGATES_DISABLED:
+                raise
+            raise ValueError(
+                "This PostgREST server does not allow aggregate functions; set "
+                "db-aggregates-enabled (pgrst.db_aggregates_enabled) or use "
+                "SUPABASE_MCP_BACKEND=postgres"
+            ) from exc
+        return response.data
+
+    async def explain(
+        self,
+        operation: str,
+        query: ReadQuery,
+        updates: Optional[Row] = None,
+        analyze: bool = False,
+    ) -> Row:
+        """
+        Ask PostgREST for the plan of the request a read, update or delete would send.
+
+        Args:
+            operation: "read", "update" or "delete"
+            query: The query; updates and deletes use its table and filters
+            updates: Column-value pairs of an update
+            analyze: Run the query and include actual rows and timings
+
+        Returns:
+            The plan entry: {"Plan": {...}, ...}
+
+        Raises:
+            ValueError: If the PostgREST server does not serve plans
+        """
+        table = self._get_client().table(query.table)
+        if operation == "read":
+            request = self._select(query)
+        elif operation == "update":
+            request = apply_filters(table.update(updates or {}), query.filters)
+        else:
+            request = apply_filters(table.delete(), query.filters)
+        # Reason: set the header directly since only select builders have explain()
+        options = "; options=analyze" if analyze else ""
+        request.headers["Accept"] = _PLAN_MEDIA_TYPE + options
+        try:
+            response = await request.execute()
+        except APIError as exc:
+            if "vnd.pgrst.plan" not in str(exc.message):
+                raise
+            raise ValueError(
+                "This PostgREST server does not return query plans; set db-plan-enabled "
+                "(pgrst.db_plan_enabled) or use SUPABASE_MCP_BACKEND=postgres"
+            ) from exc
+        return response.data[0]
+
+    async def insert(self, table: str, records: Records) -> Optional[List[Row]]:
+        """
+        Insert records with a PostgREST POST request.
+
+        Args:
+            table: Name of the table
+            records: A single record or a list of records
+
+        Returns:
+            The created rows
+        """
+        response = await self._get_client().table(table).insert(records).execute()
+        return response.data
+
+    async def update(
+        self, table: str, updates: Row, filters: Dict[str, Any]
+    ) -> Optional[List[Row]]:
+        """
+        Update rows with a PostgREST PATCH request.
+
+        Args:
+            table: Name of the table
+            updates: Column-value pairs to set
+            filters: Filter expression selecting the rows
+
+        Returns:
+            The updated rows
+        """
+        request = apply_filters(self._get_client().table(table).update(updates), filters)
+        response = await request.execute()
+        return response.data
+
+    async def delete(self, table: str, filters: Dict[str, Any]) -> Optional[List[Row]]:
+        """
+        Delete rows with a PostgREST DELETE request.
+
+        Args:
+            table: Name of the table
+            filters: Filter expression selecting the rows
+
+        Returns:
+            The deleted rows
+        """
+        request = apply_filters(self._get_client().table(table).delete(), filters)
+        response = await request.execute()
+        return response.data
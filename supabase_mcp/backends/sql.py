@@ -0,0 +1,399 @@
+"""
+SQL generation for the postgres backend.
+
+Every statement is built from a fixed template per query shape, with all
+values bound as parameters. Values arrive from MCP clients as JSON, so they are
+sent as text and cast to each column's declared type in SQL, the same way
+PostgREST coerces values.
+"""
+
+import datetime
+import json
+import uuid
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..filters import Filter, Group, parse_filters
+from .base import AggregateQuery, ReadQuery, Row
+
+
+def quote_ident(name: str) -> str:
+    """
+    Quote an SQL identifier.
+
+    Args:
+        name: A table or column name
+
+    Returns:
+        The name as a double-quoted identifier
+    """
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _array_literal(values: Any) -> str:
+    """Render a Python sequence as a Postgres array literal."""
+    items = []
+    for value in values:
+        if value is None:
+            items.append("NULL")
+        else:
+            text = to_pg_text(value, "")
+            items.append('"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"')
+    return "{" + ",".join(items) + "}"
+
+
+def to_pg_text(value: Any, pg_type: str) -> Optional[str]:
+    """
+    Convert a JSON value to the text form Postgres will cast to ``pg_type``.
+
+    Args:
+        value: The value from the tool arguments
+        pg_type: The column's declared type, e.g. "integer[]" or "jsonb"
+
+    Returns:
+        The text representation, or None for SQL NULL
+    """
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if pg_type.endswith("[]") and isinstance(value, (list, tuple)):
+        return _array_literal(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+def to_json_value(value: Any) -> Any:
+    """
+    Convert a value decoded by asyncpg to what PostgREST would return in JSON.
+
+    Args:
+        value: A column value from an asyncpg record
+
+    Returns:
+        A JSON-compatible value
+    """
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, datetime.timedelta):
+        return str(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "\\x" + bytes(value).hex()
+    if isinstance(value, list):
+        return [to_json_value(v) for v in value]
+    return value
+
+
+class _Params:
+    """Collects bound parameters and renders typed placeholders."""
+
+    def __init__(self) -> None:
+        self.values: List[Optional[str]] = []
+
+    def add(self, value: Any, pg_type: str) -> str:
+        """
+        Bind a value and return its placeholder, cast to the column type.
+
+        Args:
+            value: The value to bind
+            pg_type: The column's declared type
+
+        Returns:
+            SQL placeholder such as ``$1::text::integer``
+        """
+        self.values.append(to_pg_text(value, pg_type))
+        return f"${len(self.values)}::text::{pg_type}"
+
+
+def _select_list(columns: str, types: Dict[str, str], table: str) -> str:
+    """
+    Render the SELECT list for a comma-separated column string.
+
+    Raises:
+        ValueError: If a column is unknown or uses PostgREST-only syntax
+    """
+    if columns.strip() == "*":
+        return "*"
+    names = [c.strip() for c in columns.split(",") if c.strip()]
+    for name in names:
+        if name not in types:
+            raise ValueError(
+                f"Column {name!r} does not exist on table {table!r} "
+                "(the postgres backend only supports plain column lists)"
+            )
+    return ", ".join(quote_ident(n) for n in names)
+
+
+# SQL for the comparison operators of the filter grammar
+_COMPARISONS = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+
+def _condition(
+    item: Filter, types: Dict[str, str], table: str, params: _Params
+) -> str:
+    """
+    Render one filter condition or group as an SQL boolean expression.
+
+    Raises:
+        ValueError: If a filter column is unknown, or "in" is used on an array column
+    """
+    if isinstance(item, Group):
+        joiner = f" {item.kind.upper()} "
+        return "(" + joiner.join(_condition(i, types, table, params) for i in item.items) + ")"
+    if item.column not in types:
+        raise ValueError(f"Column {item.column!r} does not exist on table {table!r}")
+    column, pg_type = quote_ident(item.column), types[item.column]
+    if item.op in _COMPARISONS:
+        return f"{column} {_COMPARISONS[item.op]} {params.add(item.value, pg_type)}"
+    if item.op in ("like", "ilike"):
+        return f"{column}::text {item.op.upper()} {params.add(item.value, 'text')}"
+    if item.op == "is":
+        return f"{column} IS {item.value.upper()}"
+    if item.op == "in":
+        if pg_type.endswith("[]"):
+            raise ValueError(
+                f"'in' cannot filter the array column {item.column!r}; "
+                "use 'eq' for one value or 'contains' for its elements"
+            )
+        # One array parameter keeps a single statement shape for any list length
+        return f"{column} = ANY({params.add(item.value, pg_type + '[]')})"
+    # contains: array containment, or jsonb containment for objects
+    return f"{column} @> {params.add(item.value, pg_type)}"
+
+
+def _where(
+    filters: Optional[Dict[str, Any]], types: Dict[str, str], table: str, params: _Params
+) -> str:
+    """
+    Render a WHERE clause for a filter expression.
+
+    Raises:
+        ValueError: If the filters are invalid or a filter column is unknown
+    """
+    clauses = [_condition(item, types, table, params) for item in parse_filters(filters)]
+    return " WHERE " + " AND ".join(clauses) if clauses else ""
+
+
+def check_no_embeds(query: ReadQuery) -> None:
+    """
+    Reject reads with embedded resources, which only PostgREST resolves.
+
+    Raises:
+        ValueError: If the query embeds related tables
+    """
+    if query.embeds:
+        raise ValueError(
+            "Embedded resources need the postgrest backend (SUPABASE_MCP_BACKEND=postgrest)"
+        )
+
+
+def _seek(
+    keys: List[str], values: List[Any], ascending: bool, types: Dict[str, str], params: _Params
+) -> str:
+    """
+    Build the predicate for rows after a keyset position.
+
+    NULLs of the ordering column sort last ascending and first descending, and
+    no comparison with NULL is true, so NULL rows are matched with IS NULL.
+    """
+    op = ">" if ascending else "<"
+    if len(keys) > 1 and values[0] is None:
+        first, second = quote_ident(keys[0]), quote_ident(keys[1])
+        rest = f"{second} {op} {params.add(values[1], types[keys[1]])}"
+        # Among the NULL rows; descending, every non-NULL row is still to come
+        if ascending:
+            return f"{first} IS NULL AND {rest}"
+        return f"({first} IS NOT NULL OR {rest})"
+    # A row comparison lets Postgres seek with a composite index on the keys
+    row = ", ".join(quote_ident(c) for c in keys)
+    bound = ", ".join(params.add(v, types[c]) for c, v in zip(keys, values))
+    if len(keys) > 1 and ascending:
+        # The NULL rows come after every non-NULL one
+        return f"(({row}) {op} ({bound}) OR {quote_ident(keys[0])} IS NULL)"
+    return f"({row}) {op} ({bound})"
+
+
+def build_select(query: ReadQuery, types: Dict[str, str]) -> Tuple[str, List[Any]]:
+    """
+    Build the SQL for a read query.
+
+    Args:
+        query: The read query
+        types: Column name to declared type for the table
+
+    Returns:
+        The SQL text and its bound parameters
+
+    Raises:
+        ValueError: If a column is unknown or the query embeds related tables
+    """
+    check_no_embeds(query)
+    params = _Params()
+    keys = query.order_keys
+    for column in keys:
+        if column not in types:
+            raise ValueError(f"Column {column!r} does not exist on table {query.table!r}")
+    where = _where(query.filters, types, query.table, params)
+    if query.after is not None:
+        seek = _seek(keys, query.after, query.ascending, types, params)
+        where += f"{' AND' if where else ' WHERE'} {seek}"
+    sql = (
+        f"SELECT {_select_list(query.columns, types, query.table)} "
+        f"FROM {quote_ident(query.table)}{where}"
+    )
+    if keys:
+        direction = "ASC" if query.ascending else "DESC"
+        if query.tiebreaker:
+            # Pages rely on where NULLs sort, so spell out Postgres's default
+            direction += " NULLS LAST" if query.ascending else " NULLS FIRST"
+        sql += " ORDER BY " + ", ".join(f"{quote_ident(c)} {direction}" for c in keys)
+    if query.limit:
+        params.values.append(str(int(query.limit)))
+        sql += f" LIMIT ${len(params.values)}::text::bigint"
+    return sql, params.values
+
+
+def build_count(
+    table: str, filters: Optional[Dict[str, Any]], types: Dict[str, str], planned: bool = False
+) -> Tuple[str, List[Any]]:
+    """
+    Build the statement counting the rows that match a filter expression.
+
+    Args:
+        table: Name of the table
+        filters: The tool's filters argument
+        types: Column name to declared type for the table
+        planned: Return an EXPLAIN whose top plan node holds the planner's row
+            estimate instead of running count(*)
+
+    Returns:
+        The SQL text and its bound parameters
+    """
+    params = _Params()
+    where = _where(filters, types, table, params)
+    if planned:
+        return f"EXPLAIN (FORMAT JSON) SELECT 1 FROM {quote_ident(table)}{where}", params.values
+    return f"SELECT count(*) FROM {quote_ident(table)}{where}", params.values
+
+
+def build_aggregate(query: AggregateQuery, types: Dict[str, str]) -> Tuple[str, List[Any]]:
+    """
+    Build a SELECT ... GROUP BY statement for an aggregate query.
+
+    Result columns are the group_by columns followed by each aggregate under its
+    alias, e.g. ``"count"`` and ``"sum_amount"``; groups are ordered by the
+    group_by columns.
+
+    Args:
+        query: The aggregate query
+        types: Column name to declared type for the table
+
+    Returns:
+        The SQL text and its bound parameters
+
+    Raises:
+        ValueError: If there are no aggregates or a column is unknown
+    """
+    if not query.aggregates:
+        raise ValueError("aggregate_table requires at least one aggregate")
+    for column in query.group_by + [a.column for a in query.aggregates if a.column]:
+        if column not in types:
+            raise ValueError(f"Column {column!r} does not exist on table {query.table!r}")
+    params = _Params()
+    groups = [quote_ident(c) for c in query.group_by]
+    items = groups + [
+        f"{a.function}({quote_ident(a.column) if a.column else '*'}) AS {quote_ident(a.alias)}"
+        for a in query.aggregates
+    ]
+    sql = (
+        f"SELECT {', '.join(items)} FROM {quote_ident(query.table)}"
+        f"{_where(query.filters, types, query.table, params)}"
+    )
+    if groups:
+        sql += f" GROUP BY {', '.join(groups)} ORDER BY {', '.join(groups)}"
+    if query.limit:
+        params.values.append(str(int(query.limit)))
+        sql += f" LIMIT ${len(params.values)}::text::bigint"
+    return sql, params.values
+
+
+def build_insert(
+    table: str, records: List[Row], types: Dict[str, str]
+) -> Tuple[str, List[Any]]:
+    """
+    Build a multi-row INSERT ... RETURNING statement.
+
+    Columns missing from a record are inserted as NULL, matching PostgREST.
+
+    Args:
+        table: Name of the table
+        records: The records to insert
+        types: Column name to declared type for the table
+
+    Returns:
+        The SQL text and its bound parameters
+    """
+    columns: List[str] = []
+    for record in records:
+        for column in record:
+            if column not in columns:
+                if column not in types:
+                    raise ValueError(f"Column {column!r} does not exist on table {table!r}")
+                columns.append(column)
+    params = _Params()
+    rows_sql = []
+    for record in records:
+        placeholders = [params.add(record.get(c), types[c]) for c in columns]
+        rows_sql.append("(" + ", ".join(placeholders) + ")")
+    sql = (
+        f"INSERT INTO {quote_ident(table)} ({', '.join(quote_ident(c) for c in columns)}) "
+        f"VALUES {', '.join(rows_sql)} RETURNING *"
+    )
+    return sql, params.values
+
+
+def build_update(
+    table: str, updates: Row, filters: Dict[str, Any], types: Dict[str, str]
+) -> Tuple[str, List[Any]]:
+    """
+    Build an UPDATE ... RETURNING statement.
+
+    Raises:
+        ValueError: If there are no updates or no filters, or a column is unknown
+    """
+    if not updates:
+        raise ValueError("update_table_records requires at least one column to update")
+    if not filters:
+        raise ValueError("UPDATE requires a WHERE clause; provide at least one filter")
+    params = _Params()
+    assignments = []
+    for column, value in updates.items():
+        if column not in types:
+            raise ValueError(f"Column {column!r} does not exist on table {table!r}")
+        assignments.append(f"{quote_ident(column)} = {params.add(value, types[column])}")
+    sql = (
+        f"UPDATE {quote_ident(table)} SET {', '.join(assignments)}"
+        f"{_where(filters, types, table, params)} RETURNING *"
+    )
+    return sql, params.values
+
+
+def build_delete(
+    table: str, filters: Dict[str, Any], types: Dict[str, str]
+) -> Tuple[str, List[Any]]:
+    """
+    Build a DELETE ... RETURNING statement.
+
+    Raises:
+        ValueError: If there are no filters or a column is unknown
+    """
+    if not filters:
+        raise ValueError("DELETE requires a WHERE clause; provide at least one filter")
+    params = _Params()
+    sql = f"DELETE FROM {quote_ident(table)}{_where(filters, types, table, params)} RETURNING *"
+    return sql, params.values
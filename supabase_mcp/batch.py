@@ -0,0 +1,120 @@
+"""
+Concurrent execution of batched reads.
+
+An agent that needs several unrelated lookups pays one MCP round trip per
+read_table_rows call. batch_read takes the reads as a list of specs and runs
+them concurrently over the shared backend, at most ``max_concurrency`` at a
+time, so the batch costs about as long as its slowest read. Each entry reports
+its own result or error and its duration; one failing read does not fail the
+others.
+
+Environment variables:
+- SUPABASE_MCP_BATCH_CONCURRENCY: Reads of one batch run at the same time (default: 8)
+- SUPABASE_MCP_BATCH_MAX_READS: Maximum reads in one batch (default: 50)
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional
+
+from .config import env_int
+
+Reader = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+@dataclass
+class BatchConfig:
+    """Limits for batch_read."""
+    max_concurrency: int = 8
+    max_reads: int = 50
+
+    @classmethod
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "BatchConfig":
+        """
+        Build the configuration from environment variables.
+
+        Args:
+            env: Mapping to read from (default: os.environ)
+
+        Returns:
+            BatchConfig: The configuration, with defaults for unset variables
+
+        Raises:
+            ValueError: If a variable is malformed or not positive
+        """
+        defaults = cls()
+        config = cls(
+            max_concurrency=env_int(
+                "SUPABASE_MCP_BATCH_CONCURRENCY", defaults.max_concurrency, env
+            ),
+            max_reads=env_int("SUPABASE_MCP_BATCH_MAX_READS", defaults.max_reads, env),
+        )
+        if config.max_concurrency < 1:
+            raise ValueError("SUPABASE_MCP_BATCH_CONCURRENCY must be at least 1")
+        if config.max_reads < 1:
+            raise ValueError("SUPABASE_MCP_BATCH_MAX_READS must be at least 1")
+        return config
+
+
+def batch_keys(specs: List[Dict[str, Any]], max_reads: int) -> List[str]:
+    """
+    Validate read specs and work out the key each result is returned under.
+
+    Args:
+        specs: The read specs; each may name its result with "key"
+        max_reads: Maximum number of specs
+
+    Returns:
+        The key of each spec: its "key", or its position in the list
+
+    Raises:
+        ValueError: If there are no specs or too many, a spec is not an object,
+            or two specs share a key
+    """
+    if not specs:
+        raise ValueError("batch_read requires at least one read")
+    if len(specs) > max_reads:
+        raise ValueError(f"batch_read accepts at most {max_reads} reads, got {len(specs)}")
+    keys = []
+    for index, spec in enumerate(specs):
+        if not isinstance(spec, dict):
+            raise ValueError(f"Read {index} must be an object, got {type(spec).__name__}")
+        key = str(spec.get("key", index))
+        if key in keys:
+            raise ValueError(f"Duplicate read key {key!r}")
+        keys.append(key)
+    return keys
+
+
+async def run_batch(
+    specs: List[Dict[str, Any]], keys: List[str], read: Reader, max_concurrency: int
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run reads concurrently and collect their outcomes.
+
+    Args:
+        specs: The read specs
+        keys: The key of each spec, from batch_keys
+        read: Runs one spec and returns its result
+        max_concurrency: Reads running at the same time
+
+    Returns:
+        Key to {"data": result, "ms": duration} for reads that succeeded, or
+        {"error": message, "ms": duration} for reads that raised
+    """
+    limit = asyncio.Semaphore(max_concurrency)
+
+    async def run(spec: Dict[str, Any]) -> Dict[str, Any]:
+        async with limit:
+            start = time.perf_counter()
+            try:
+                outcome = {"data": await read(spec)}
+            except Exception as exc:
+                # Reason: one bad read is reported in its entry instead of failing the batch
+                outcome = {"error": f"{type(exc).__name__}: {exc}"}
+            outcome["ms"] = round((time.perf_counter() - start) * 1000, 3)
+            return outcome
+
+    outcomes = await asyncio.gather(*(run(spec) for spec in specs))
+    return dict(zip(keys, outcomes))
@@ -0,0 +1,75 @@
+"""
+Byte budgets for read_table_rows responses.
+
+A read without a limit returns every matching row, which can exceed the MCP
+client's message size limit and the model's context window. With a budget, the
+server keeps adding rows to the response only while their encoded JSON fits;
+the rest is left for a continuation cursor that resumes after the last row
+sent. At least one row is always sent so a continuation always makes progress.
+
+Environment variables:
+- SUPABASE_MCP_MAX_RESPONSE_BYTES: Byte budget for the rows of one response
+  (default: 1048576; 0 disables the budget)
+"""
+
+import json
+from typing import List, Mapping, Optional
+
+from .backends.base import Row
+from .config import env_int
+
+DEFAULT_MAX_RESPONSE_BYTES = 1_048_576
+
+
+def max_response_bytes(env: Optional[Mapping[str, str]] = None) -> int:
+    """
+    Read the server-wide response byte budget.
+
+    Args:
+        env: Mapping to read from (default: os.environ)
+
+    Returns:
+        The budget in bytes, or 0 for no budget
+
+    Raises:
+        ValueError: If the value is negative or not an integer
+    """
+    budget = env_int("SUPABASE_MCP_MAX_RESPONSE_BYTES", DEFAULT_MAX_RESPONSE_BYTES, env)
+    if budget < 0:
+        raise ValueError("SUPABASE_MCP_MAX_RESPONSE_BYTES must not be negative")
+    return budget
+
+
+def encoded_size(row: Row) -> int:
+    """
+    Measure a row as it is sent to the client.
+
+    Args:
+        row: The row
+
+    Returns:
+        The length of its JSON encoding
+    """
+    return len(json.dumps(row, default=str))
+
+
+def rows_within(rows: List[Row], max_bytes: int) -> int:
+    """
+    Count the leading rows whose encoding fits in a byte budget.
+
+    Args:
+        rows: The rows in response order
+        max_bytes: The budget, or 0 for no budget
+
+    Returns:
+        How many rows to send; at least one when there are any rows
+    """
+    if max_bytes <= 0:
+        return len(rows)
+    # Reason: the enclosing "[" and "]" plus one separator per row
+    used = 1
+    for index, row in enumerate(rows):
+        used += encoded_size(row) + 1
+        if used > max_bytes:
+            return max(index, 1)
+    return len(rows)
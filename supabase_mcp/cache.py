@@ -0,0 +1,474 @@
+"""
+In-process result cache for read_table_rows.
+
+Reads are keyed by a canonical form of the query: whitespace-normalized
+column lists, filters sorted by column, and ordering only when it affects the
+result. Entries expire after a TTL and the least recently used entries are
+evicted to stay within a maximum entry count and byte size. The byte size of
+an entry is the length of its JSON encoding.
+
+Caching is off unless a TTL is configured, globally or per table.
+
+Writes made through this server invalidate the cached reads they could have
+changed, so a read after a write sees the write. Each write describes the rows
+it touched as column-value patterns (the inserted or returned rows, or the
+filters and updates of a write). A cached read is kept only if the columns its
+filters pin with equality contradict every pattern, and otherwise dropped.
+Reads that were in flight when a table was written are not cached. Writes
+made outside this process are only seen once the TTL expires, unless
+change_feed.py is subscribed to the table; an update it reports is then
+patched into cached reads that contain the row where that is exact.
+
+Identical reads that arrive while one is already in flight share its request
+instead of sending their own, whether or not caching is enabled. A read never
+joins a request that started before a write to its table.
+
+Reads with embedded resources bypass both: their rows also depend on the
+related tables, which invalidation by table does not track.
+
+Environment variables:
+- SUPABASE_MCP_CACHE_TTL: Seconds a read is cached, 0 disables (default: 0)
+- SUPABASE_MCP_CACHE_MAX_ENTRIES: Maximum cached reads (default: 1000)
+- SUPABASE_MCP_CACHE_MAX_BYTES: Maximum total size of cached rows (default: 67108864)
+- SUPABASE_MCP_CACHE_TABLES: JSON object of per-table TTLs overriding the default,
+  e.g. {"countries": 3600, "events": 0}
+"""
+
+import asyncio
+import json
+import os
+import re
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime
+from dataclasses import dataclass, field
+from typing import (
+    Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+)
+
+from .backends.base import ReadQuery, Row
+from .config import env_float, env_int
+from .filters import equalities, only_equalities
+
+Loader = Callable[[ReadQuery], Awaitable[List[Row]]]
+
+# Select list entries that can be filled from a full row (no renames, casts or embeds)
+_PLAIN_COLUMN = re.compile(r"^\w+$")
+
+
+@dataclass
+class CacheConfig:
+    """Result cache limits and TTLs."""
+    ttl: float = 0.0
+    max_entries: int = 1000
+    max_bytes: int = 64 * 1024 * 1024
+    table_ttls: Dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "CacheConfig":
+        """
+        Build the configuration from environment variables.
+
+        Args:
+            env: Mapping to read from (default: os.environ)
+
+        Returns:
+            CacheConfig: The configuration, with defaults for unset variables
+
+        Raises:
+            ValueError: If a variable is malformed or negative
+        """
+        defaults = cls()
+        raw_tables = (os.environ if env is None else env).get("SUPABASE_MCP_CACHE_TABLES", "")
+        try:
+            table_ttls = json.loads(raw_tables) if raw_tables.strip() else {}
+            if not isinstance(table_ttls, dict):
+                raise ValueError("expected a JSON object")
+            table_ttls = {str(t): float(ttl) for t, ttl in table_ttls.items()}
+        except (ValueError, TypeError) as e:
+            raise ValueError(
+                f"SUPABASE_MCP_CACHE_TABLES must be a JSON object of table TTLs: {e}"
+            ) from None
+        config = cls(
+            ttl=env_float("SUPABASE_MCP_CACHE_TTL", defaults.ttl, env),
+            max_entries=env_int("SUPABASE_MCP_CACHE_MAX_ENTRIES", defaults.max_entries, env),
+            max_bytes=env_int("SUPABASE_MCP_CACHE_MAX_BYTES", defaults.max_bytes, env),
+            table_ttls=table_ttls,
+        )
+        if min(config.ttl, config.max_entries, config.max_bytes, *table_ttls.values()) < 0:
+            raise ValueError("SUPABASE_MCP_CACHE_* values must not be negative")
+        return config
+
+    def ttl_for(self, table: str) -> float:
+        """Seconds reads of a table are cached; 0 means not cached."""
+        return self.table_ttls.get(table, self.ttl)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any table can be cached."""
+        return bool(self.max_entries and self.max_bytes) and (
+            self.ttl > 0 or any(ttl > 0 for ttl in self.table_ttls.values())
+        )
+
+
+def _columns(columns: str) -> str:
+    """Normalize whitespace in a select list."""
+    return ",".join(part.strip() for part in columns.split(",") if part.strip())
+
+
+def cache_key(query: ReadQuery) -> str:
+    """
+    Canonicalize a read so equivalent calls share a cache entry.
+
+    Args:
+        query: The read query
+
+    Returns:
+        A string key
+    """
+    return json.dumps(
+        [
+            query.table,
+            _columns(query.columns),
+            sorted((query.filters or {}).items()),
+            query.order_keys,
+            query.ascending if query.order_keys else None,
+            query.limit or None,
+            query.after,
+        ],
+        sort_keys=True,
+        default=str,
+        separators=(",", ":"),
+    )
+
+
+def _canonical(value: Any) -> Any:
+    """Map a scalar to a comparable form, or None if equality cannot be judged."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return value
+    return None
+
+
+def _distinct(a: Any, b: Any) -> bool:
+    """Whether two values certainly differ; unlike or unknown types may be equal."""
+    a, b = _canonical(a), _canonical(b)
+    if a is None or b is None or type(a) is not type(b):
+        return False
+    if isinstance(a, datetime) and (a.tzinfo is None) != (b.tzinfo is None):
+        # Reason: a naive timestamp has no known offset from an aware one
+        return False
+    return a != b
+
+
+def _same(a: Any, b: Any) -> bool:
+    """Whether two non-null values are certainly equal."""
+    a, b = _canonical(a), _canonical(b)
+    return a is not None and type(a) is type(b) and a == b
+
+
+def _contradicts(equal: Dict[str, Any], row: Row) -> bool:
+    """Whether a row pattern has a different value in some pinned column."""
+    return any(column in row and _distinct(value, row[column]) for column, value in equal.items())
+
+
+def disjoint(filters: Optional[Dict[str, Any]], row: Row) -> bool:
+    """
+    Whether no row matching a pattern can satisfy a read's filters.
+
+    Only equality conditions are used; other operators never prove disjointness.
+
+    Args:
+        filters: The cached read's filters
+        row: Column-value pattern of a written row; missing columns match anything
+
+    Returns:
+        True if some column the filters pin to a value has a different value in the pattern
+    """
+    return _contradicts(equalities(filters), row)
+
+
+def _patched(
+    query: ReadQuery, rows: List[Row], identity: Row, record: Row
+) -> Optional[List[Row]]:
+    """Rows of a cached read with one row replaced, or None if that is not exact."""
+    selected = _columns(query.columns).split(",")
+    if selected != ["*"] and not all(
+        _PLAIN_COLUMN.match(column) and column in record for column in selected
+    ):
+        return None
+    if not identity or not only_equalities(query.filters) or not all(
+        _same(value, record.get(column)) for column, value in equalities(query.filters).items()
+    ):
+        return None
+    for index, row in enumerate(rows):
+        if all(_same(row.get(column), value) for column, value in identity.items()):
+            if not all(_same(row.get(key), record.get(key)) for key in query.order_keys):
+                return None
+            new = dict(record) if selected == ["*"] else {c: record[c] for c in selected}
+            return rows[:index] + [new] + rows[index + 1:]
+    return None
+
+
+# Result handed to coalesced readers when the shared request was cancelled
+_ABANDONED: Any = object()
+
+
+@dataclass
+class _Flight:
+    """A read in progress that identical reads can wait on."""
+    generation: int
+    future: "asyncio.Future[Any]"
+
+
+@dataclass
+class _Entry:
+    """A cached result."""
+    table: str
+    query: ReadQuery
+    rows: List[Row]
+    size: int
+    expires_at: float
+    # Columns the read's filters pin to one value
+    equal: Dict[str, Any] = field(default_factory=dict)
+
+
+class QueryCache:
+    """
+    TTL + LRU cache of read results.
+
+    Args:
+        config: Cache limits and TTLs
+        clock: Monotonic clock, replaceable in tests
+    """
+
+    def __init__(
+        self,
+        config: Optional[CacheConfig] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.config = config or CacheConfig()
+        self.clock = clock
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        # Keys of cached reads per table, and a per-table write counter that
+        # keeps reads overlapping a write out of the cache
+        self._tables: Dict[str, Set[str]] = {}
+        self._generations: Counter = Counter()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.oversized = 0
+        self.invalidated = 0
+        self._flights: Dict[str, _Flight] = {}
+        self.coalesced = 0
+
+    async def get_or_load(self, query: ReadQuery, loader: Loader) -> List[Row]:
+        """
+        Return cached rows for a query, or load and cache them.
+
+        Concurrent identical reads share a single load.
+
+        Args:
+            query: The read query
+            loader: Reads the rows on a miss
+
+        Returns:
+            The rows; callers must not mutate them
+        """
+        if query.embeds:
+            return await loader(query)
+        ttl = self.config.ttl_for(query.table) if self.config.enabled else 0
+        key = cache_key(query)
+        if ttl > 0:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.rows
+                self._remove(key)
+                self.expirations += 1
+            self.misses += 1
+
+        rows, generation = await self._load(key, query, loader)
+        if ttl > 0 and generation is not None and self._generations[query.table] == generation:
+            self._store(key, query, rows, ttl)
+        return rows
+
+    async def _load(
+        self, key: str, query: ReadQuery, loader: Loader
+    ) -> Tuple[List[Row], Optional[int]]:
+        """
+        Load rows, or wait for an identical load already in flight.
+
+        Returns:
+            The rows, and the table generation the load started at if this call
+            performed it (None if it shared another call's load)
+        """
+        generation = self._generations[query.table]
+        while True:
+            flight = self._flights.get(key)
+            if flight is None or flight.generation != generation:
+                break
+            # Reason: shield so cancelling one waiter does not cancel the shared load
+            rows = await asyncio.shield(flight.future)
+            if rows is not _ABANDONED:
+                self.coalesced += 1
+                return rows, None
+            # The loading call was cancelled; take over the load
+
+        flight = _Flight(generation, asyncio.get_running_loop().create_future())
+        self._flights[key] = flight
+        try:
+            rows = await loader(query)
+        except Exception as e:
+            flight.future.set_exception(e)
+            # Mark the exception retrieved in case nobody was waiting
+            flight.future.exception()
+            raise
+        except BaseException:
+            flight.future.set_result(_ABANDONED)
+            raise
+        finally:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.future.set_result(rows)
+        return rows, generation
+
+    def invalidate(self, table: str, rows: Optional[Iterable[Row]] = None) -> int:
+        """
+        Drop cached reads of a table that a write could have changed.
+
+        Args:
+            table: The written table
+            rows: Every row the write touched, before or after the write, as
+                column-value patterns; columns left out may hold any value.
+                None drops every cached read of the table.
+
+        Returns:
+            The number of cached reads dropped
+        """
+        self._generations[table] += 1
+        keys = self._tables.get(table)
+        if not keys:
+            return 0
+        patterns = None if rows is None else list(rows)
+        stale = [
+            key for key in keys
+            if patterns is None
+            or not all(_contradicts(self._entries[key].equal, row) for row in patterns)
+        ]
+        for key in stale:
+            self._remove(key)
+        self.invalidated += len(stale)
+        return len(stale)
+
+    def apply_update(self, table: str, identity: Row, record: Row) -> Dict[str, int]:
+        """
+        Bring cached reads up to date with an update made elsewhere.
+
+        A cached read that holds the updated row, still matches it afterwards and
+        keeps its position (the ordering values are unchanged) is patched in place.
+        Every other read the update could have changed is dropped.
+
+        Args:
+            table: The updated table
+            identity: Columns identifying the row, usually its primary key
+            record: The row after the update, with every column
+
+        Returns:
+            Dictionary with the number of cached reads "patched" and "invalidated"
+        """
+        self._generations[table] += 1
+        patched = stale = 0
+        for key in list(self._tables.get(table, ())):
+            entry = self._entries[key]
+            rows = _patched(entry.query, entry.rows, identity, record)
+            if rows is not None:
+                size = len(json.dumps(rows, default=str))
+                self.bytes += size - entry.size
+                entry.rows, entry.size = rows, size
+                patched += 1
+            elif not (
+                _contradicts(entry.equal, identity) and _contradicts(entry.equal, record)
+            ):
+                self._remove(key)
+                stale += 1
+        self.invalidated += stale
+        return {"patched": patched, "invalidated": stale}
+
+    def _store(self, key: str, query: ReadQuery, rows: List[Row], ttl: float) -> None:
+        """Add an entry, evicting least recently used entries to make room."""
+        size = len(json.dumps(rows, default=str))
+        if size > self.config.max_bytes:
+            self.oversized += 1
+            return
+        if key in self._entries:
+            self._remove(key)
+        while self._entries and (
+            len(self._entries) >= self.config.max_entries
+            or self.bytes + size > self.config.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+        self._entries[key] = _Entry(
+            query.table, query, rows, size, self.clock() + ttl, equalities(query.filters)
+        )
+        self._tables.setdefault(query.table, set()).add(key)
+        self.bytes += size
+
+    def _remove(self, key: str) -> None:
+        """Drop an entry and release its bytes."""
+        entry = self._entries.pop(key)
+        self.bytes -= entry.size
+        keys = self._tables[entry.table]
+        keys.discard(key)
+        if not keys:
+            del self._tables[entry.table]
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+        self._tables.clear()
+        self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report cache effectiveness and size.
+
+        Returns:
+            Dictionary with hit/miss/eviction/expiration/invalidation counts, reads
+            coalesced into another read's request, entries and bytes held,
+            the hit ratio, and the configured limits
+        """
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.config.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "oversized": self.oversized,
+            "invalidated": self.invalidated,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._flights),
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_entries": self.config.max_entries,
+            "max_bytes": self.config.max_bytes,
+            "ttl": self.config.ttl,
+            "table_ttls": dict(self.config.table_ttls),
+        }
@@ -0,0 +1,244 @@
+"""
+Realtime change feed that keeps the result cache in step with other writers.
+
+Writes made by other services never pass through this server, so without this
+feed their effect on cached reads is only seen once the cache TTL expires. When
+tables are configured, a background task subscribes to Supabase Realtime
+postgres_changes for them and applies each event to the cache:
+
+- INSERT and DELETE drop the cached reads the row could belong to.
+- UPDATE patches the row in place in cached reads that hold it, when that is
+  exact, and drops the other reads it could have changed.
+
+Events missed while the socket was down cannot be replayed, so every
+(re)subscription drops all cached reads of the subscribed tables. The lag
+between each change's commit and its application to the cache is reported.
+
+The realtime package is imported only when the feed starts, so fast-start mode
+stays free of it unless the feed is configured.
+
+Environment variables:
+- SUPABASE_MCP_REALTIME_TABLES: Comma-separated tables to follow (default: none,
+  feed disabled)
+- SUPABASE_MCP_REALTIME_SCHEMA: Schema of those tables (default: public)
+- SUPABASE_MCP_REALTIME_URL: Realtime endpoint (default: SUPABASE_URL/realtime/v1)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from .cache import QueryCache
+
+logger = logging.getLogger(__name__)
+
+_TOPIC = "supabase-mcp-cache"
+
+
+@dataclass
+class ChangeFeedConfig:
+    """Tables followed by the change feed and where to reach Realtime."""
+    tables: List[str] = field(default_factory=list)
+    schema: str = "public"
+    url: Optional[str] = None
+
+    @classmethod
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "ChangeFeedConfig":
+        """
+        Build the configuration from environment variables.
+
+        Args:
+            env: Mapping to read from (default: os.environ)
+
+        Returns:
+            ChangeFeedConfig: The configuration; no tables means the feed is off
+        """
+        source = os.environ if env is None else env
+        tables = source.get("SUPABASE_MCP_REALTIME_TABLES", "")
+        url = source.get("SUPABASE_MCP_REALTIME_URL") or None
+        if url is None and source.get("SUPABASE_URL"):
+            # Reason: Supabase serves Realtime under /realtime/v1 of the project URL,
+            # which is also where supabase-py's client connects
+            url = f"{source['SUPABASE_URL'].rstrip('/')}/realtime/v1"
+        return cls(
+            tables=[table.strip() for table in tables.split(",") if table.strip()],
+            schema=source.get("SUPABASE_MCP_REALTIME_SCHEMA", "").strip() or "public",
+            url=url,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any table is followed."""
+        return bool(self.tables)
+
+
+def _commit_time(value: Any) -> Optional[float]:
+    """Parse a change's commit_timestamp to epoch seconds."""
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+class ChangeFeed:
+    """
+    Applies Realtime postgres_changes events to the result cache.
+
+    Args:
+        cache: The cache to keep up to date
+        config: The tables to follow and the Realtime endpoint
+        key: API key used to authenticate the socket
+        client_factory: Builds the realtime client from a URL and key, replaceable in tests
+        clock: Wall clock used to measure lag against commit timestamps
+    """
+
+    def __init__(
+        self,
+        cache: QueryCache,
+        config: ChangeFeedConfig,
+        key: Optional[str] = None,
+        client_factory: Optional[Callable[[str, Optional[str]], Any]] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.cache = cache
+        self.config = config
+        self.key = key
+        self.client_factory = client_factory
+        self.clock = clock
+        self.client: Any = None
+        self.subscribed = False
+        self._task: Optional[asyncio.Task] = None
+        self.events = 0
+        self.patched = 0
+        self.invalidated = 0
+        self.resyncs = 0
+        self.ignored = 0
+        self._lag_last: Optional[float] = None
+        self._lag_total = 0.0
+        self._lag_count = 0
+        self._lag_max = 0.0
+
+    def start(self) -> None:
+        """Connect and subscribe in the background; startup does not wait for it."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        """Connect to Realtime and subscribe to every configured table."""
+        if not self.config.url:
+            logger.warning("Change feed has no Realtime URL; cached reads rely on their TTL")
+            return
+        try:
+            if self.client_factory is None:
+                from realtime import AsyncRealtimeClient
+
+                self.client = AsyncRealtimeClient(self.config.url, self.key)
+            else:
+                self.client = self.client_factory(self.config.url, self.key)
+            channel = self.client.channel(_TOPIC)
+            for table in self.config.tables:
+                channel.on_postgres_changes(
+                    "*", self.handle, table=table, schema=self.config.schema
+                )
+            await channel.subscribe(self._on_state)
+        except Exception:
+            logger.warning(
+                "Change feed could not subscribe; cached reads rely on their TTL",
+                exc_info=True,
+            )
+
+    def _on_state(self, state: Any, error: Optional[Exception] = None) -> None:
+        """Track the subscription; resync the cache whenever it (re)joins."""
+        subscribed = str(getattr(state, "value", state)) == "SUBSCRIBED"
+        if subscribed:
+            # Reason: changes made while the socket was down are never delivered
+            for table in self.config.tables:
+                self.cache.invalidate(table)
+            self.resyncs += 1
+        elif error is not None:
+            logger.warning("Change feed subscription failed: %s", error)
+        self.subscribed = subscribed
+
+    def handle(self, payload: Dict[str, Any]) -> None:
+        """
+        Apply one postgres_changes event to the cache.
+
+        Args:
+            payload: The event payload; the change itself may be nested under "data"
+        """
+        change = payload.get("data", payload)
+        table = change.get("table")
+        kind = str(change.get("type") or change.get("eventType") or "").upper()
+        record = change.get("record") or {}
+        old = change.get("old_record") or change.get("old") or {}
+        if table not in self.config.tables or kind not in ("INSERT", "UPDATE", "DELETE"):
+            self.ignored += 1
+            return
+
+        self.events += 1
+        if kind == "UPDATE":
+            result = self.cache.apply_update(table, old, record)
+            self.patched += result["patched"]
+            self.invalidated += result["invalidated"]
+        else:
+            self.invalidated += self.cache.invalidate(
+                table, [record if kind == "INSERT" else old]
+            )
+
+        committed = _commit_time(change.get("commit_timestamp"))
+        if committed is not None:
+            lag = max(self.clock() - committed, 0.0)
+            self._lag_total += lag
+            self._lag_count += 1
+            self._lag_max = max(self._lag_max, lag)
+            self._lag_last = lag
+
+    async def aclose(self) -> None:
+        """Stop the subscription and close the socket."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.client is not None:
+            try:
+                await self.client.close()
+            except Exception:
+                logger.warning("Failed to close the change feed socket", exc_info=True)
+            self.client = None
+        self.subscribed = False
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report change events applied to the cache and how far behind they were.
+
+        Returns:
+            Dictionary with the followed tables, subscription state, event,
+            patch, invalidation and resync counts, and commit-to-cache lag in
+            milliseconds (last, mean over all events, and max)
+        """
+        def ms(seconds: Optional[float]) -> Optional[float]:
+            return None if seconds is None else round(seconds * 1000, 2)
+
+        return {
+            "tables": list(self.config.tables),
+            "subscribed": self.subscribed,
+            "events": self.events,
+            "patched": self.patched,
+            "invalidated": self.invalidated,
+            "resyncs": self.resyncs,
+            "ignored": self.ignored,
+            "lag_ms": {
+                "last": ms(self._lag_last),
+                "mean": ms(self._lag_total / self._lag_count if self._lag_count else None),
+                "max": ms(self._lag_max if self._lag_count else None),
+            },
+        }
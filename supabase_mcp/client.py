@@ -0,0 +1,104 @@
+"""
+Construction of the client the tools use to reach Supabase.
+
+By default the server builds a full supabase AsyncClient at startup. In
+fast-start mode it skips that: the supabase package (and with it realtime,
+storage3, gotrue, supafunc and websockets) is never imported, and a
+PostgREST-only client is built on the first tool call instead. This keeps
+cold start cheap for MCP hosts that spawn one server per session.
+
+Environment variables:
+- SUPABASE_MCP_FAST_START: Defer client creation and skip heavy imports (default: false)
+"""
+
+import re
+from typing import TYPE_CHECKING, Any, Mapping, Optional
+
+from postgrest import AsyncPostgrestClient
+
+from .codec import JSONCodec
+from .config import env_bool
+from .pool import PoolConfig, PooledPostgrestClient, attach_pool
+
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+
+
+def fast_start_enabled(env: Optional[Mapping[str, str]] = None) -> bool:
+    """
+    Check whether fast-start mode is enabled.
+
+    Args:
+        env: Mapping to read from (default: os.environ)
+
+    Returns:
+        True if SUPABASE_MCP_FAST_START is set to a true value
+    """
+    return env_bool("SUPABASE_MCP_FAST_START", False, env)
+
+
+async def create_supabase_client(
+    url: str, key: str, pool: PoolConfig, codec: Optional[JSONCodec] = None
+) -> "AsyncClient":
+    """
+    Create a full supabase AsyncClient with a pooled PostgREST session.
+
+    Args:
+        url: The Supabase project URL
+        key: The service role key
+        pool: The HTTP pool configuration
+        codec: Codec that decodes PostgREST responses (default: httpx's)
+
+    Returns:
+        AsyncClient: The initialized Supabase client
+    """
+    # Reason: importing supabase pulls in every sub-client; keep it off the
+    # import path of server.py so fast-start mode never pays for it.
+    from supabase import acreate_client
+
+    client = await acreate_client(url, key)
+    attach_pool(client, pool, codec)
+    return client
+
+
+def create_postgrest_client(
+    url: str, key: str, pool: PoolConfig, codec: Optional[JSONCodec] = None
+) -> PooledPostgrestClient:
+    """
+    Create a PostgREST-only client for fast-start mode.
+
+    Args:
+        url: The Supabase project URL
+        key: The service role key
+        pool: The HTTP pool configuration
+        codec: Codec that decodes PostgREST responses (default: httpx's)
+
+    Returns:
+        PooledPostgrestClient: A client exposing the same table() API the tools use
+
+    Raises:
+        ValueError: If the URL is not an http(s) URL
+    """
+    if not re.match(r"^https?://.+", url):
+        raise ValueError("SUPABASE_URL must be an http(s) URL")
+    return PooledPostgrestClient(
+        f"{url}/rest/v1",
+        pool=pool,
+        codec=codec,
+        headers={"apiKey": key, "Authorization": f"Bearer {key}"},
+    )
+
+
+def postgrest_of(client: Any) -> AsyncPostgrestClient:
+    """
+    Return the PostgREST client behind either kind of server client.
+
+    Args:
+        client: A supabase AsyncClient or a PostgREST client
+
+    Returns:
+        AsyncPostgrestClient: The client that executes table operations
+    """
+    if isinstance(client, AsyncPostgrestClient):
+        return client
+    return client.postgrest
@@ -0,0 +1,204 @@
+"""
+JSON codecs for PostgREST responses and tool results.
+
+On large reads most of the server's CPU time goes to JSON: decoding the
+PostgREST response body and encoding the tool result for the MCP client.
+FastMCP also wraps every row of a list result in its own text content block,
+which costs more than the encoding itself. With orjson, the server therefore
+encodes each tool result as a single JSON text block, and the PostgREST client
+decodes response bodies with it. The json codec keeps FastMCP's and httpx's
+defaults, so results keep their format.
+
+- orjson: several times faster than the standard library; used when installed
+- json: the standard library
+
+Both encode datetimes, dates and times as ISO 8601 strings, UUIDs as strings
+and Decimals as numbers, like PostgREST does. orjson decodes integers wider
+than 64 bits as floats; if a numeric column stores such values, select the
+json codec. Values orjson cannot encode (such as integers wider than 64 bits)
+fall back to the standard library.
+
+Environment variables:
+- SUPABASE_MCP_JSON_CODEC: auto (orjson when installed, otherwise json),
+  orjson or json (default: auto)
+"""
+
+import datetime
+import json
+import os
+from decimal import Decimal
+from typing import Any, Mapping, Optional, Sequence, Union
+
+import httpx
+from mcp.server.fastmcp.server import _convert_to_content
+from mcp.server.fastmcp.utilities.types import Image
+from mcp.types import EmbeddedResource, ImageContent, TextContent
+
+CODECS = ("auto", "orjson", "json")
+
+Content = Union[TextContent, ImageContent, EmbeddedResource]
+
+
+def _default(value: Any) -> Any:
+    """Encode values JSON has no type for, as PostgREST would return them."""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "\\x" + bytes(value).hex()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    # Reason: UUIDs, timedeltas and anything unknown; FastMCP also falls back to str
+    return str(value)
+
+
+class JSONCodec:
+    """Standard library JSON codec."""
+
+    name = "json"
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        """
+        Decode a JSON document.
+
+        Args:
+            data: The document
+
+        Returns:
+            The decoded value
+
+        Raises:
+            json.JSONDecodeError: If the document is not valid JSON
+        """
+        return json.loads(data)
+
+    def dumps(self, value: Any) -> str:
+        """
+        Encode a value as JSON.
+
+        Args:
+            value: The value
+
+        Returns:
+            The JSON text
+        """
+        return json.dumps(value, default=_default)
+
+
+class OrjsonCodec(JSONCodec):
+    """orjson codec falling back to the standard library where orjson cannot."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        """Decode a JSON document with orjson."""
+        try:
+            return self._orjson.loads(data)
+        except self._orjson.JSONDecodeError:
+            # Reason: orjson rejects numbers outside the double range, which json accepts
+            return super().loads(data)
+
+    def dumps(self, value: Any) -> str:
+        """Encode a value as JSON with orjson."""
+        try:
+            return self._orjson.dumps(
+                value, default=_default, option=self._orjson.OPT_NON_STR_KEYS
+            ).decode()
+        except TypeError:
+            return super().dumps(value)
+
+
+def json_codec(env: Optional[Mapping[str, str]] = None) -> JSONCodec:
+    """
+    Select the JSON codec from SUPABASE_MCP_JSON_CODEC.
+
+    Args:
+        env: Mapping to read from (default: os.environ)
+
+    Returns:
+        The codec
+
+    Raises:
+        ValueError: If the name is unknown, or orjson is selected but not installed
+    """
+    value = (os.environ if env is None else env).get("SUPABASE_MCP_JSON_CODEC", "")
+    name = value.strip().lower() or "auto"
+    if name not in CODECS:
+        raise ValueError(
+            f"SUPABASE_MCP_JSON_CODEC must be one of {', '.join(CODECS)}, got {value!r}"
+        )
+    if name == "json":
+        return JSONCodec()
+    try:
+        return OrjsonCodec()
+    except ImportError:
+        if name == "orjson":
+            raise ValueError(
+                "SUPABASE_MCP_JSON_CODEC=orjson requires orjson; install it with "
+                "'pip install orjson'."
+            ) from None
+        return JSONCodec()
+
+
+class CodecResponse(httpx.Response):
+    """httpx response whose json() decodes with a codec."""
+
+    codec: JSONCodec = JSONCodec()
+
+    def json(self, **kwargs: Any) -> Any:
+        """Decode the body with the response's codec."""
+        if kwargs:
+            return super().json(**kwargs)
+        return self.codec.loads(self.content)
+
+
+class CodecTransport(httpx.AsyncHTTPTransport):
+    """
+    httpx transport whose responses decode JSON with a codec.
+
+    Args:
+        codec: The codec for response bodies
+        **kwargs: Passed to httpx.AsyncHTTPTransport
+    """
+
+    def __init__(self, codec: JSONCodec, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.response_class = type("CodecResponse", (CodecResponse,), {"codec": codec})
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request and wrap the response."""
+        response = await super().handle_async_request(request)
+        return self.response_class(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=response.stream,
+            extensions=response.extensions,
+        )
+
+
+def to_content(result: Any, codec: JSONCodec) -> Sequence[Content]:
+    """
+    Convert a tool result to MCP content.
+
+    Args:
+        result: The value a tool returned
+        codec: The codec for the JSON text
+
+    Returns:
+        One text block holding the result as JSON (or as is, for a string);
+        content objects are passed to FastMCP's conversion unchanged
+    """
+    content_types = (TextContent, ImageContent, EmbeddedResource, Image)
+    if result is None or isinstance(result, content_types) or (
+        isinstance(result, (list, tuple))
+        and any(isinstance(item, content_types) for item in result)
+    ):
+        return _convert_to_content(result)
+    text = result if isinstance(result, str) else codec.dumps(result)
+    return [TextContent(type="text", text=text)]
@@ -0,0 +1,101 @@
+"""
+Helpers for reading typed configuration values from environment variables.
+"""
+
+import os
+from typing import Mapping, Optional
+
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+_FALSE_VALUES = {"0", "false", "no", "off"}
+
+
+def _raw(name: str, env: Optional[Mapping[str, str]]) -> Optional[str]:
+    """
+    Look up a variable, treating empty strings as unset.
+
+    Args:
+        name: Name of the environment variable
+        env: Mapping to read from (default: os.environ)
+
+    Returns:
+        The stripped value, or None if the variable is unset or empty
+    """
+    value = (os.environ if env is None else env).get(name)
+    if value is None or not value.strip():
+        return None
+    return value.strip()
+
+
+def env_int(name: str, default: int, env: Optional[Mapping[str, str]] = None) -> int:
+    """
+    Read an integer environment variable.
+
+    Args:
+        name: Name of the environment variable
+        default: Value to use when the variable is unset
+        env: Mapping to read from (default: os.environ)
+
+    Returns:
+        The parsed integer
+
+    Raises:
+        ValueError: If the variable is set but is not an integer
+    """
+    value = _raw(name, env)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {value!r}") from None
+
+
+def env_float(
+    name: str, default: Optional[float], env: Optional[Mapping[str, str]] = None
+) -> Optional[float]:
+    """
+    Read a float environment variable.
+
+    Args:
+        name: Name of the environment variable
+        default: Value to use when the variable is unset
+        env: Mapping to read from (default: os.environ)
+
+    Returns:
+        The parsed float
+
+    Raises:
+        ValueError: If the variable is set but is not a number
+    """
+    value = _raw(name, env)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number, got {value!r}") from None
+
+
+def env_bool(name: str, default: bool, env: Optional[Mapping[str, str]] = None) -> bool:
+    """
+    Read a boolean environment variable (1/0, true/false, yes/no, on/off).
+
+    Args:
+        name: Name of the environment variable
+        default: Value to use when the variable is unset
+        env: Mapping to read from (default: os.environ)
+
+    Returns:
+        The parsed boolean
+
+    Raises:
+        ValueError: If the variable is set to an unrecognized value
+    """
+    value = _raw(name, env)
+    if value is None:
+        return default
+    if value.lower() in _TRUE_VALUES:
+        return True
+    if value.lower() in _FALSE_VALUES:
+        return False
+    raise ValueError(f"{name} must be a boolean, got {value!r}")
@@ -0,0 +1,222 @@
+"""
+Application context and lifespan for the Supabase MCP server.
+
+The lifespan reads the configuration, builds the Supabase client and the
+backend the tools execute against, and shuts everything down gracefully.
+"""
+
+import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, List, Optional
+
+import anyio
+from mcp.server.fastmcp import FastMCP
+
+from .backends import (
+    Backend,
+    PostgresBackend,
+    PostgresConfig,
+    PostgrestBackend,
+    selected_backend,
+)
+from .batch import BatchConfig
+from .budget import DEFAULT_MAX_RESPONSE_BYTES, max_response_bytes
+from .cache import CacheConfig, QueryCache
+from .change_feed import ChangeFeed, ChangeFeedConfig
+from .client import create_postgrest_client, create_supabase_client, fast_start_enabled
+from .codec import JSONCodec, json_codec
+from .config import env_float
+from .deadlines import DeadlineConfig, Deadlines
+from .export import ExportConfig
+from .lifecycle import (
+    CallTracker,
+    ShutdownHook,
+    exit_if_signalled,
+    install_sigterm_handler,
+    shutdown,
+)
+from .plans import PlanConfig
+from .pool import PoolConfig
+from .resilience import ResilienceConfig, ResilientBackend
+from .shapes import ShapeConfig, ShapeRecorder, ShapeRecordingBackend
+
+# Set while a tool call holds its admission, so tools it calls are not admitted again
+_admitted: ContextVar[bool] = ContextVar("supabase_mcp_admitted", default=False)
+
+# Create a dataclass for our application context
+@dataclass
+class SupabaseContext:
+    """Context for the Supabase MCP server."""
+    client: Any = None
+    pool: PoolConfig = field(default_factory=PoolConfig)
+    calls: CallTracker = field(default_factory=CallTracker)
+    shutdown_hooks: List[ShutdownHook] = field(default_factory=list)
+    client_factory: Optional[Callable[[], Any]] = None
+    backend: Optional[Backend] = None
+    resilience: ResilienceConfig = field(default_factory=ResilienceConfig)
+    deadlines: Deadlines = field(default_factory=Deadlines)
+    cache: QueryCache = field(default_factory=QueryCache)
+    change_feed: Optional[ChangeFeed] = None
+    max_response_bytes: int = DEFAULT_MAX_RESPONSE_BYTES
+    codec: JSONCodec = field(default_factory=JSONCodec)
+    batch: BatchConfig = field(default_factory=BatchConfig)
+    plans: PlanConfig = field(default_factory=PlanConfig)
+    shapes: ShapeRecorder = field(default_factory=ShapeRecorder)
+    exports: ExportConfig = field(default_factory=ExportConfig)
+
+    def get_client(self) -> Any:
+        """
+        Return the Supabase client, building it on first use in fast-start mode.
+        
+        Returns:
+            The supabase AsyncClient, or a PostgREST-only client in fast-start mode
+            
+        Raises:
+            RuntimeError: If there is neither a client nor a way to build one
+        """
+        if self.client is None:
+            if self.client_factory is None:
+                raise RuntimeError("Supabase client is not configured")
+            self.client = self.client_factory()
+        return self.client
+
+    def get_backend(self) -> Backend:
+        """
+        Return the backend the tools execute against.
+        
+        Returns:
+            The configured backend, or a PostgREST backend over get_client()
+            wrapped by wrap_backend
+        """
+        if self.backend is None:
+            self.backend = self.wrap_backend(PostgrestBackend(self.get_client))
+        return self.backend
+
+    def wrap_backend(self, backend: Backend) -> Backend:
+        """
+        Add query shape recording and retries around a backend.
+        
+        Args:
+            backend: The backend that executes queries
+            
+        Returns:
+            The backend with retries and a circuit breaker, recording the shape
+            and duration of each attempt when shape recording is enabled
+        """
+        if self.shapes.config.enabled:
+            backend = ShapeRecordingBackend(backend, self.shapes)
+        return ResilientBackend(backend, self.resilience)
+
+    @asynccontextmanager
+    async def tool_call(
+        self, tool_name: str, timeout_seconds: Optional[float] = None
+    ) -> AsyncIterator[None]:
+        """
+        Run a tool call as tracked work under its deadline.
+        
+        A tool called by another tool, such as the reads of batch_read, runs under
+        the outer call's admission: it is neither tracked again nor refused once
+        shutdown starts, so draining lets the outer call finish.
+        
+        Args:
+            tool_name: Name of the tool being called
+            timeout_seconds: The caller's deadline override, if any
+            
+        Raises:
+            ShuttingDownError: If the server has stopped accepting calls
+            ToolTimeoutError: If the call did not finish before its deadline
+        """
+        if _admitted.get():
+            async with self.deadlines.scope(tool_name, timeout_seconds):
+                yield
+            return
+        async with self.calls.track(tool_name):
+            token = _admitted.set(True)
+            try:
+                async with self.deadlines.scope(tool_name, timeout_seconds):
+                    yield
+            finally:
+                _admitted.reset(token)
+
+
+@asynccontextmanager
+async def supabase_lifespan(server: FastMCP) -> AsyncIterator[SupabaseContext]:
+    """
+    Manages the Supabase client lifecycle.
+    
+    Args:
+        server: The FastMCP server instance
+        
+    Yields:
+        SupabaseContext: The context containing the Supabase client
+    """
+    # Get environment variables
+    supabase_url = os.getenv("SUPABASE_URL")
+    supabase_key = os.getenv("SUPABASE_SERVICE_KEY")
+    backend_name = selected_backend()
+    
+    # The postgres backend only needs DATABASE_URL; the Supabase client is optional
+    if backend_name == "postgrest" and (not supabase_url or not supabase_key):
+        raise ValueError(
+            "Missing environment variables. Please set SUPABASE_URL and SUPABASE_SERVICE_KEY."
+        )
+    
+    pool_config = PoolConfig.from_env()
+    drain_timeout = env_float("SUPABASE_MCP_DRAIN_TIMEOUT", 8.0)
+    postgres_config = PostgresConfig.from_env() if backend_name == "postgres" else None
+    app = SupabaseContext(
+        pool=pool_config,
+        resilience=ResilienceConfig.from_env(),
+        deadlines=Deadlines(DeadlineConfig.from_env()),
+        cache=QueryCache(CacheConfig.from_env()),
+        max_response_bytes=max_response_bytes(),
+        codec=json_codec(),
+        batch=BatchConfig.from_env(),
+        plans=PlanConfig.from_env(),
+        shapes=ShapeRecorder(ShapeConfig.from_env()),
+        exports=ExportConfig.from_env(),
+    )
+    # Continue from the shapes recorded by earlier runs, and save them on exit
+    app.shapes.load_file()
+    if app.shapes.config.path:
+        app.shutdown_hooks.append(app.shapes.save_file)
+    
+    if supabase_url and supabase_key:
+        if fast_start_enabled():
+            # Defer heavy imports and client creation until the first tool call
+            app.client_factory = partial(
+                create_postgrest_client, supabase_url, supabase_key, pool_config, app.codec
+            )
+        else:
+            # Initialize the async Supabase client so tool calls never block the event loop
+            app.client = await create_supabase_client(
+                supabase_url, supabase_key, pool_config, app.codec
+            )
+    
+    if postgres_config is not None:
+        app.backend = app.wrap_backend(
+            await PostgresBackend.connect(postgres_config, app.codec)
+        )
+        app.shutdown_hooks.append(app.backend.aclose)
+    
+    # Follow changes made by other writers so cached reads do not wait for their TTL
+    feed_config = ChangeFeedConfig.from_env()
+    if feed_config.enabled and app.cache.config.enabled:
+        app.change_feed = ChangeFeed(app.cache, feed_config, supabase_key)
+        app.change_feed.start()
+        app.shutdown_hooks.append(app.change_feed.aclose)
+    remove_sigterm_handler = install_sigterm_handler(app.calls, drain_timeout)
+    
+    try:
+        yield app
+    finally:
+        remove_sigterm_handler()
+        # Reason: cleanup can run while the server task is being cancelled, so
+        # shield it to make sure sockets are closed and writes are not dropped.
+        with anyio.CancelScope(shield=True):
+            await shutdown(app.calls, app.client, app.shutdown_hooks, drain_timeout)
+        exit_if_signalled(app.calls)
@@ -0,0 +1,165 @@
+"""
+Deadlines for tool calls.
+
+Every tool call runs inside a cancel scope with a deadline. When the deadline
+passes, or the MCP client sends a cancellation notification (which the MCP
+session turns into cancelling the call's task), the backend call is cancelled
+where it is awaiting I/O: httpx closes the in-flight PostgREST connection, and
+asyncpg asks Postgres to cancel the running statement.
+
+Environment variables:
+- SUPABASE_MCP_TIMEOUT: Default deadline for every tool in seconds, 0 disables (default: 30)
+- SUPABASE_MCP_TIMEOUT_<TOOL>: Deadline for one tool, e.g.
+  SUPABASE_MCP_TIMEOUT_READ_TABLE_ROWS=60
+- SUPABASE_MCP_MAX_TIMEOUT: Largest timeout_seconds a caller may request, 0 for no
+  limit (default: 300)
+"""
+
+import os
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Mapping, Optional
+
+import anyio
+
+from .config import env_float
+
+_TOOL_PREFIX = "SUPABASE_MCP_TIMEOUT_"
+
+
+class ToolTimeoutError(TimeoutError):
+    """Raised when a tool call does not finish before its deadline."""
+
+
+@dataclass
+class DeadlineConfig:
+    """Default and per-tool deadlines in seconds; None means no deadline."""
+    default: Optional[float] = 30.0
+    per_tool: Dict[str, Optional[float]] = field(default_factory=dict)
+    max_timeout: Optional[float] = 300.0
+
+    @classmethod
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "DeadlineConfig":
+        """
+        Build the configuration from environment variables.
+
+        Args:
+            env: Mapping to read from (default: os.environ)
+
+        Returns:
+            DeadlineConfig: The configuration, with defaults for unset variables
+
+        Raises:
+            ValueError: If a variable is malformed or negative
+        """
+        source = os.environ if env is None else env
+        defaults = cls()
+        per_tool = {}
+        for name in source:
+            if name.startswith(_TOOL_PREFIX):
+                per_tool[name[len(_TOOL_PREFIX):].lower()] = _deadline(
+                    env_float(name, None, source), name
+                )
+        return cls(
+            default=_deadline(
+                env_float("SUPABASE_MCP_TIMEOUT", defaults.default, source),
+                "SUPABASE_MCP_TIMEOUT",
+            ),
+            per_tool=per_tool,
+            max_timeout=_deadline(
+                env_float("SUPABASE_MCP_MAX_TIMEOUT", defaults.max_timeout, source),
+                "SUPABASE_MCP_MAX_TIMEOUT",
+            ),
+        )
+
+    def resolve(self, tool_name: str, override: Optional[float] = None) -> Optional[float]:
+        """
+        Work out the deadline for one call.
+
+        Args:
+            tool_name: Name of the tool being called
+            override: The caller's timeout_seconds argument, if any
+
+        Returns:
+            Seconds until the deadline, or None for no deadline
+
+        Raises:
+            ValueError: If the override is not positive or exceeds max_timeout
+        """
+        if override is not None:
+            if override <= 0:
+                raise ValueError("timeout_seconds must be greater than 0")
+            if self.max_timeout is not None and override > self.max_timeout:
+                raise ValueError(f"timeout_seconds must be at most {self.max_timeout:g}")
+            return override
+        return self.per_tool.get(tool_name, self.default)
+
+
+def _deadline(value: Optional[float], name: str) -> Optional[float]:
+    """Validate a configured deadline, mapping 0 to no deadline."""
+    if value is not None and value < 0:
+        raise ValueError(f"{name} must not be negative")
+    return value or None
+
+
+class Deadlines:
+    """
+    Applies deadlines to tool calls and counts timeouts and cancellations.
+
+    Args:
+        config: The deadline configuration
+    """
+
+    def __init__(self, config: Optional[DeadlineConfig] = None) -> None:
+        self.config = config or DeadlineConfig()
+        self.timed_out: Counter = Counter()
+        self.cancelled: Counter = Counter()
+
+    @asynccontextmanager
+    async def scope(
+        self, tool_name: str, override: Optional[float] = None
+    ) -> AsyncIterator[None]:
+        """
+        Run a tool call under its deadline.
+
+        Args:
+            tool_name: Name of the tool being called
+            override: The caller's timeout_seconds argument, if any
+
+        Raises:
+            ToolTimeoutError: If the call did not finish in time
+            ValueError: If the override is out of range
+        """
+        seconds = self.config.resolve(tool_name, override)
+        with anyio.CancelScope(
+            deadline=anyio.current_time() + seconds if seconds else float("inf")
+        ) as scope:
+            try:
+                yield
+            except anyio.get_cancelled_exc_class():
+                if not scope.cancel_called:
+                    # Cancelled from outside: an MCP cancellation or shutdown
+                    self.cancelled[tool_name] += 1
+                raise
+        if scope.cancelled_caught:
+            self.timed_out[tool_name] += 1
+            raise ToolTimeoutError(
+                f"{tool_name} did not finish within {seconds:g}s and was cancelled"
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report configured deadlines and how often they were hit.
+
+        Returns:
+            Dictionary with the default and per-tool deadlines, the largest
+            allowed override, and timeout and cancellation counts per tool
+        """
+        return {
+            "default": self.config.default,
+            "per_tool": dict(self.config.per_tool),
+            "max_timeout": self.config.max_timeout,
+            "timed_out": dict(self.timed_out),
+            "cancelled": dict(self.cancelled),
+        }
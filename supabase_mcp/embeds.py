@@ -0,0 +1,129 @@
+"""
+Embedded resources for reads: related rows returned with each row.
+
+An embed follows a foreign key from the table being read to another table and
+nests the related rows in each result row, so an order comes back with its
+customer, or a customer with their orders, in a single request instead of one
+request per row. Each embed is an object:
+
+- ``table``: the related table (required)
+- ``columns``: columns to return from it (default: ``*``)
+- ``alias``: the key the related rows are returned under (default: the table)
+- ``hint``: the foreign key constraint or column to join on, when the tables
+  are related through more than one foreign key
+- ``inner``: only return rows that have a related row matching the embed's
+  filters, like an inner join (default: false)
+- ``filters``: a filter expression on the related rows, in the same form as
+  read_table_rows filters
+- ``order_by``, ``ascending``, ``limit``: order and limit the related rows
+- ``embed``: embeds of the related table, nested the same way
+
+A row's many-to-one relation (an order's customer) is returned as an object,
+or null; a one-to-many relation (a customer's orders) as a list.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .filters import parse_filters
+
+EMBED_KEYS = (
+    "table", "columns", "alias", "hint", "inner", "filters", "order_by", "ascending", "limit",
+    "embed",
+)
+
+
+def _identifier(spec: Dict[str, Any], key: str) -> Optional[str]:
+    """Validate a name that is spliced into the select list."""
+    value = spec.get(key)
+    if value is None and key != "table":
+        return None
+    if not isinstance(value, str) or not value.isidentifier():
+        raise ValueError(f"Embed {key} must be a table, column or constraint name, got {value!r}")
+    return value
+
+
+@dataclass
+class Embed:
+    """One embedded resource of a read, with its own columns, filters and embeds."""
+    table: str
+    columns: str = "*"
+    alias: Optional[str] = None
+    hint: Optional[str] = None
+    inner: bool = False
+    filters: Optional[Dict[str, Any]] = None
+    order_by: Optional[str] = None
+    ascending: bool = True
+    limit: Optional[int] = None
+    embeds: List["Embed"] = field(default_factory=list)
+
+    @property
+    def path(self) -> str:
+        """The name the related rows are returned and filtered under."""
+        return self.alias or self.table
+
+    @classmethod
+    def parse(cls, spec: Dict[str, Any]) -> "Embed":
+        """
+        Parse and validate one embed object.
+
+        Args:
+            spec: The embed as passed to the tool
+
+        Returns:
+            Embed: The parsed embed, with nested embeds parsed
+
+        Raises:
+            ValueError: If a key is unknown or a value is invalid
+        """
+        if not isinstance(spec, dict):
+            raise ValueError(f"Embed must be an object, got {type(spec).__name__}")
+        unknown = sorted(set(spec) - set(EMBED_KEYS))
+        if unknown:
+            raise ValueError(f"Unknown embed keys: {', '.join(unknown)}")
+        columns = spec.get("columns", "*")
+        if not isinstance(columns, str) or not columns.strip():
+            raise ValueError("Embed columns must be a non-empty comma-separated list")
+        limit = spec.get("limit")
+        if limit is not None and (isinstance(limit, bool) or not isinstance(limit, int)
+                                  or limit < 1):
+            raise ValueError(f"Embed limit must be a positive integer, got {limit!r}")
+        # Reason: parse now so invalid filters fail before any request is sent
+        parse_filters(spec.get("filters"))
+        return cls(
+            table=_identifier(spec, "table"),
+            columns=columns,
+            alias=_identifier(spec, "alias"),
+            hint=_identifier(spec, "hint"),
+            inner=bool(spec.get("inner", False)),
+            filters=spec.get("filters"),
+            order_by=_identifier(spec, "order_by"),
+            ascending=bool(spec.get("ascending", True)),
+            limit=limit,
+            embeds=parse_embeds(spec.get("embed")),
+        )
+
+
+def parse_embeds(specs: Optional[List[Dict[str, Any]]]) -> List[Embed]:
+    """
+    Parse the embed argument of a read.
+
+    Args:
+        specs: The embed objects, or None
+
+    Returns:
+        The parsed embeds (empty for none)
+
+    Raises:
+        ValueError: If an embed is invalid or two embeds share a name
+    """
+    if specs is None:
+        return []
+    if not isinstance(specs, list):
+        raise ValueError(f"embed must be a list of objects, got {type(specs).__name__}")
+    embeds = [Embed.parse(spec) for spec in specs]
+    paths = [embed.path for embed in embeds]
+    for path in paths:
+        if paths.count(path) > 1:
+            raise ValueError(f"Two embeds are named {path!r}; give one an alias")
+    return embeds
@@ -0,0 +1,144 @@
+"""
+Result formats for rows returned by the tools.
+
+- rows (default): a list of objects, one per row, each repeating every column name
+- compact: a "columns" header and each row as an array of values in that order
+
+In the compact format, text columns with few distinct values are also
+dictionary encoded: the column's distinct values are listed once under
+"dictionaries" and each row holds an index into that list. For a result of
+many rows and columns, most of the default format's bytes are repeated column
+names and repeated values, so the compact format is several times smaller and
+faster to serialize. ``expand`` decodes a compact result back to rows.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from .backends.base import Row
+
+FORMATS = ("rows", "compact")
+
+# A text column is dictionary encoded when it has at most this many distinct values...
+MAX_DICTIONARY_SIZE = 256
+
+# ...and each distinct value appears on average at least this many times
+_MIN_REPEATS = 2
+
+
+def check_format(result_format: str) -> str:
+    """
+    Validate a tool's format argument.
+
+    Args:
+        result_format: The requested format
+
+    Returns:
+        The format
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    if result_format not in FORMATS:
+        raise ValueError(
+            f"format must be one of {', '.join(FORMATS)}, got {result_format!r}"
+        )
+    return result_format
+
+
+def _dictionary(values: List[Any]) -> Optional[List[str]]:
+    """Return a column's distinct values if it is worth dictionary encoding."""
+    distinct: Dict[str, None] = {}
+    for value in values:
+        if value is None:
+            continue
+        if not isinstance(value, str):
+            return None
+        distinct[value] = None
+        if len(distinct) > MAX_DICTIONARY_SIZE:
+            return None
+    if not distinct or len(distinct) * _MIN_REPEATS > len(values):
+        return None
+    return list(distinct)
+
+
+def compact(rows: List[Row], dictionaries: bool = True) -> Dict[str, Any]:
+    """
+    Encode rows in the compact format.
+
+    Args:
+        rows: The rows; keys missing from a row are encoded as null
+        dictionaries: Dictionary encode low-cardinality text columns
+
+    Returns:
+        Dictionary with "columns", "rows" as arrays of values, and
+        "dictionaries" when any column was dictionary encoded
+    """
+    columns: Dict[str, None] = {}
+    for row in rows:
+        for column in row:
+            columns.setdefault(column, None)
+    names = list(columns)
+    table = [[row.get(column) for column in names] for row in rows]
+
+    encoded: Dict[str, List[str]] = {}
+    if dictionaries:
+        for position, column in enumerate(names):
+            dictionary = _dictionary([cells[position] for cells in table])
+            if dictionary is None:
+                continue
+            index = {value: i for i, value in enumerate(dictionary)}
+            for cells in table:
+                if cells[position] is not None:
+                    cells[position] = index[cells[position]]
+            encoded[column] = dictionary
+
+    result: Dict[str, Any] = {"columns": names, "rows": table}
+    if encoded:
+        result["dictionaries"] = encoded
+    return result
+
+
+def expand(result: Dict[str, Any]) -> List[Row]:
+    """
+    Decode a compact result back to rows.
+
+    Args:
+        result: A dictionary produced by ``compact``
+
+    Returns:
+        The rows as objects
+    """
+    names = result["columns"]
+    lookups = [result.get("dictionaries", {}).get(column) for column in names]
+    return [
+        {
+            column: (lookup[value] if lookup is not None and value is not None else value)
+            for column, lookup, value in zip(names, lookups, values)
+        }
+        for values in result["rows"]
+    ]
+
+
+def formatted(result: Any, result_format: str, key: str = "rows") -> Any:
+    """
+    Apply a result format to a tool result.
+
+    Args:
+        result: A list of rows, or a dictionary holding the rows under ``key``
+        result_format: One of FORMATS
+        key: Where a dictionary result holds its rows
+
+    Returns:
+        The result unchanged for the rows format; otherwise the compact
+        encoding, merged into a dictionary result in place of its rows
+    """
+    if result_format == "rows":
+        return result
+    if isinstance(result, list):
+        return compact(result)
+    if result.get(key) is None:
+        return result
+    encoded = compact(result[key])
+    if key == "rows":
+        return {**result, **encoded}
+    return {**result, key: encoded}
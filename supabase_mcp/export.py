@@ -0,0 +1,431 @@
+"""
+Parallel, range-partitioned table exports for export_table.
+
+Reading a large table through read_table_rows is one sequential request.
+export_table instead finds the smallest and largest value of a key column (the
+primary key, or any monotonic integer, numeric or timestamp column), splits
+that span into equal key ranges, and reads the ranges concurrently, at most
+``concurrency`` at a time. Each partition is read in keyset-paginated chunks
+into its own part file beside the output, so memory holds about one chunk per
+worker. Part files are written to the output in key order as soon as every
+earlier partition is complete, as NDJSON, CSV or Parquet (see
+export_formats.py).
+
+Progress is kept in a manifest beside the output (``<output>.export.json``):
+the key ranges, the row count of each complete partition, and how much of the
+output has been written. When a partition fails the others still finish, and
+the export reports which failed. Calling export_table again with resume=True
+reads only the missing partitions, over the ranges of the first attempt. The
+manifest and part files are removed once the output is complete.
+
+Rows inserted into a range while it is read may or may not be exported, and
+rows past the largest key found at the start are not.
+
+Output paths are relative to SUPABASE_MCP_EXPORT_DIR and may not leave it.
+
+Environment variables:
+- SUPABASE_MCP_EXPORT_DIR: Directory exports are written under (default: exports)
+- SUPABASE_MCP_EXPORT_PARTITIONS: Key ranges an export is split into (default: 8)
+- SUPABASE_MCP_EXPORT_CONCURRENCY: Partitions read at the same time (default: 4)
+- SUPABASE_MCP_EXPORT_CHUNK_SIZE: Rows per read within a partition (default: 5000)
+"""
+
+import asyncio
+import datetime
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from decimal import Decimal
+from functools import partial
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .backends.base import Backend, ReadQuery
+from .codec import JSONCodec
+from .config import env_int
+from .export_formats import (
+    append_csv,
+    append_ndjson,
+    merge_row_types,
+    merge_type,
+    write_parquet,
+)
+from .streaming import stream_rows
+
+MANIFEST_SUFFIX = ".export.json"
+
+
+@dataclass
+class ExportConfig:
+    """Where exports are written and how they are split."""
+    directory: str = "exports"
+    partitions: int = 8
+    concurrency: int = 4
+    chunk_size: int = 5000
+
+    @classmethod
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "ExportConfig":
+        """
+        Build the configuration from environment variables.
+
+        Args:
+            env: Mapping to read from (default: os.environ)
+
+        Returns:
+            ExportConfig: The configuration, with defaults for unset variables
+
+        Raises:
+            ValueError: If a variable is malformed or not positive
+        """
+        env = os.environ if env is None else env
+        config = cls(
+            directory=env.get("SUPABASE_MCP_EXPORT_DIR") or cls.directory,
+            partitions=env_int("SUPABASE_MCP_EXPORT_PARTITIONS", cls.partitions, env),
+            concurrency=env_int("SUPABASE_MCP_EXPORT_CONCURRENCY", cls.concurrency, env),
+            chunk_size=env_int("SUPABASE_MCP_EXPORT_CHUNK_SIZE", cls.chunk_size, env),
+        )
+        for name in ("partitions", "concurrency", "chunk_size"):
+            if getattr(config, name) < 1:
+                raise ValueError(f"SUPABASE_MCP_EXPORT_{name.upper()} must be at least 1")
+        return config
+
+
+@dataclass
+class ExportManifest:
+    """Progress of an export, saved beside its output."""
+    table: str
+    key: str
+    cursor_key: str
+    columns: str
+    filters: Optional[Dict[str, Any]]
+    format: str
+    bounds: List[Any]
+    rows: Dict[str, int] = field(default_factory=dict)
+    types: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    header: List[str] = field(default_factory=list)
+    written: int = 0
+    bytes: int = 0
+
+    @property
+    def partitions(self) -> int:
+        """Number of key ranges."""
+        return max(len(self.bounds) - 1, 0)
+
+    def schema(self) -> List[Dict[str, str]]:
+        """The column types of the complete partitions, in key order."""
+        types: Dict[str, str] = {}
+        for index in sorted(self.types, key=int):
+            for name, kind in self.types[index].items():
+                types[name] = merge_type(types[name], kind) if name in types else kind
+        return [{"name": name, "type": kind} for name, kind in types.items()]
+
+
+def export_path(directory: str, path: str) -> str:
+    """
+    Resolve an output path inside the export directory.
+
+    Args:
+        directory: The export directory
+        path: The caller's path, relative to the directory
+
+    Returns:
+        The absolute output path
+
+    Raises:
+        ValueError: If the path is empty, absolute or leads outside the directory
+    """
+    if not path or os.path.isabs(path):
+        raise ValueError(f"path must be relative to the export directory, got {path!r}")
+    root = os.path.realpath(directory)
+    target = os.path.realpath(os.path.join(root, path))
+    if target == root or os.path.commonpath([root, target]) != root:
+        raise ValueError(f"path {path!r} leads outside the export directory")
+    return target
+
+
+def _timestamp(value: Any, key: str) -> datetime.datetime:
+    """Read a timestamp key value returned by either backend."""
+    if isinstance(value, datetime.datetime):
+        return value
+    if isinstance(value, datetime.date):
+        return datetime.datetime.combine(value, datetime.time())
+    if isinstance(value, str):
+        try:
+            return datetime.datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    raise ValueError(
+        f"Cannot split {key!r} into ranges: use an integer, numeric or timestamp column, "
+        f"got {type(value).__name__} values"
+    )
+
+
+def split_range(low: Any, high: Any, partitions: int, key: str = "key") -> List[Any]:
+    """
+    Split the span of a key column into equal ranges.
+
+    Range ``i`` holds keys from ``bounds[i]`` up to but excluding
+    ``bounds[i + 1]``; the last range also holds ``bounds[-1]``.
+
+    Args:
+        low: Smallest key
+        high: Largest key
+        partitions: Ranges wanted; fewer are returned if the span is too small
+        key: Name of the key column, for errors
+
+    Returns:
+        The bounds, ascending; timestamps as ISO 8601 strings
+
+    Raises:
+        ValueError: If the key is not an integer, numeric or timestamp
+    """
+    numbers = (int, float, Decimal)
+    if isinstance(low, bool) or isinstance(high, bool):
+        raise ValueError(f"Cannot split boolean column {key!r} into ranges")
+    if isinstance(low, int) and isinstance(high, int):
+        count = max(1, min(partitions, high - low + 1))
+        step = (high - low + 1) / count
+        bounds = [low + round(step * i) for i in range(count)] + [high]
+    elif isinstance(low, numbers) and isinstance(high, numbers):
+        span = float(high) - float(low)
+        bounds = [low] + [float(low) + span * i / partitions for i in range(1, partitions)]
+        bounds.append(high)
+    else:
+        start, end = _timestamp(low, key), _timestamp(high, key)
+        bounds = [start + (end - start) * i / partitions for i in range(partitions)] + [end]
+        bounds = [bound.isoformat() for bound in bounds]
+    # Reason: a span narrower than the partition count repeats bounds
+    unique = [bound for i, bound in enumerate(bounds) if i == 0 or bound != bounds[i - 1]]
+    return unique if len(unique) > 1 else [unique[0], unique[0]]
+
+
+def partition_filters(
+    filters: Optional[Dict[str, Any]], key: str, bounds: List[Any], index: int
+) -> Dict[str, Any]:
+    """Combine the caller's filters with the key range of one partition."""
+    upper = "lte" if index == len(bounds) - 2 else "lt"
+    condition = {key: {"gte": bounds[index], upper: bounds[index + 1]}}
+    return {"and": [filters, condition]} if filters else condition
+
+
+async def key_bounds(
+    backend: Backend, table: str, key: str, filters: Optional[Dict[str, Any]]
+) -> Optional[Tuple[Any, Any]]:
+    """
+    Find the smallest and largest key of the rows to export.
+
+    Returns:
+        (low, high), or None if no row matches
+
+    Raises:
+        ValueError: If the key column holds NULLs, which no range would export
+    """
+    ends = []
+    for ascending in (True, False):
+        rows = await backend.read(ReadQuery(
+            table=table, columns=key, filters=filters, order_by=key, ascending=ascending,
+            limit=1,
+        ))
+        if not rows:
+            return None
+        ends.append(rows[0][key])
+    # Reason: NULLs sort last ascending and first descending
+    if ends[1] is None:
+        raise ValueError(f"Key column {key!r} has NULL values; choose a NOT NULL column")
+    return ends[0], ends[1]
+
+
+def _load_manifest(path: str, codec: JSONCodec) -> Optional[ExportManifest]:
+    """Read a manifest, or return None if there is none."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as handle:
+        return ExportManifest(**codec.loads(handle.read()))
+
+
+def _save_manifest(path: str, manifest: ExportManifest, codec: JSONCodec) -> None:
+    """Replace a manifest atomically, so a crash leaves the old or the new one."""
+    with open(path + ".tmp", "w", encoding="utf-8") as handle:
+        handle.write(codec.dumps(asdict(manifest)))
+    os.replace(path + ".tmp", path)
+
+
+async def export_partitioned(
+    backend: Backend,
+    config: ExportConfig,
+    codec: JSONCodec,
+    path: str,
+    table: str,
+    key: str = "id",
+    cursor_key: str = "id",
+    columns: str = "*",
+    filters: Optional[Dict[str, Any]] = None,
+    file_format: str = "ndjson",
+    partitions: Optional[int] = None,
+    resume: bool = False,
+    overwrite: bool = False,
+) -> Dict[str, Any]:
+    """
+    Export the rows of a table to a file, reading key ranges concurrently.
+
+    Args:
+        backend: The backend to read from
+        config: Partitioning, concurrency and chunk size
+        codec: Encodes each row
+        path: Absolute output path, from export_path
+        table: Name of the table
+        key: Column the table is split on
+        cursor_key: Unique column that orders rows sharing a key value
+        columns: Columns to export
+        filters: Filter expression selecting the rows
+        file_format: "ndjson", "csv" or "parquet", from file_format_of
+        partitions: Key ranges (default: config.partitions)
+        resume: Continue the unfinished export to path, if there is one
+        overwrite: Replace an existing output file
+
+    Returns:
+        Summary with the "path", "format", "rows" and "bytes" exported, the
+        "schema", the "partitions", "seconds" and "rows_per_second" of this
+        call, how many partitions were "resumed", whether the export is
+        "complete", and the "failed" partitions
+
+    Raises:
+        ValueError: If the output exists, an unfinished export would be
+            replaced, the resumed export had other arguments, or the key
+            column cannot be split
+    """
+    start = time.perf_counter()
+    manifest_path = path + MANIFEST_SUFFIX
+    manifest = _load_manifest(manifest_path, codec)
+    arguments = {"table": table, "key": key, "cursor_key": cursor_key, "columns": columns,
+                 "filters": codec.loads(codec.dumps(filters)), "format": file_format}
+    if manifest is not None:
+        if not resume:
+            raise ValueError(
+                f"An unfinished export to {path} exists; pass resume=True to continue it "
+                f"or delete {manifest_path}"
+            )
+        started = {name: getattr(manifest, name) for name in arguments}
+        if started != arguments:
+            raise ValueError(
+                f"The unfinished export to {path} was started with other arguments: {started}"
+            )
+    else:
+        if os.path.exists(path) and not overwrite:
+            raise ValueError(f"{path} already exists; pass overwrite=True to replace it")
+        count = partitions or config.partitions
+        if count < 1:
+            raise ValueError("partitions must be at least 1")
+        span = await key_bounds(backend, table, key, filters)
+        bounds = split_range(span[0], span[1], count, key) if span else []
+        manifest = ExportManifest(**arguments, bounds=bounds)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, "wb").close()
+        _save_manifest(manifest_path, manifest, codec)
+
+    # Reason: bytes past the last recorded append are from an interrupted copy
+    with open(path, "r+b") as out:
+        out.truncate(manifest.bytes)
+    for index in range(manifest.written, manifest.partitions):
+        if not os.path.exists(f"{path}.part{index}"):
+            manifest.rows.pop(str(index), None)
+            manifest.types.pop(str(index), None)
+    resumed = len(manifest.rows)
+    done = {index: asyncio.Event() for index in range(manifest.partitions)}
+    for index in manifest.rows:
+        done[int(index)].set()
+    failed: Dict[int, str] = {}
+    fetched = 0
+    limit = asyncio.Semaphore(config.concurrency)
+
+    async def fetch(index: int) -> None:
+        nonlocal fetched
+        async with limit:
+            query = ReadQuery(
+                table=table, columns=columns, order_by=key,
+                filters=partition_filters(filters, key, manifest.bounds, index),
+            )
+            types: Dict[str, str] = {}
+            try:
+                with open(f"{path}.part{index}", "w", encoding="utf-8") as part:
+                    async def emit(chunk: int, rows: List[Dict[str, Any]], total: int) -> None:
+                        merge_row_types(types, rows)
+                        part.write("".join(codec.dumps(row) + "\n" for row in rows))
+
+                    summary = await stream_rows(
+                        backend, query, emit, config.chunk_size, cursor_key
+                    )
+            except Exception as exc:
+                # Reason: the other partitions finish so a resumed export skips them
+                failed[index] = f"{type(exc).__name__}: {exc}"
+            else:
+                manifest.rows[str(index)] = summary["rows_streamed"]
+                manifest.types[str(index)] = types
+                fetched += summary["rows_streamed"]
+                _save_manifest(manifest_path, manifest, codec)
+            finally:
+                done[index].set()
+
+    async def write_parquet_file() -> None:
+        # Reason: Parquet cannot be appended to, and its schema needs every partition
+        for event in done.values():
+            await event.wait()
+        if failed:
+            return
+        parts = [f"{path}.part{index}" for index in range(manifest.partitions)]
+        types = {column["name"]: column["type"] for column in manifest.schema()}
+        manifest.bytes = await asyncio.to_thread(
+            write_parquet, parts, path, types, codec, config.chunk_size
+        )
+        manifest.written = manifest.partitions
+        _save_manifest(manifest_path, manifest, codec)
+        for part in parts:
+            os.remove(part)
+
+    async def write() -> None:
+        if file_format == "parquet":
+            await write_parquet_file()
+            return
+        with open(path, "ab") as out:
+            for index in range(manifest.written, manifest.partitions):
+                await done[index].wait()
+                if index in failed:
+                    return
+                part = f"{path}.part{index}"
+                append = append_ndjson
+                if file_format == "csv":
+                    if not manifest.header and manifest.rows[str(index)]:
+                        manifest.header = list(manifest.types[str(index)])
+                    append = partial(
+                        append_csv, header=manifest.header, codec=codec,
+                        chunk_size=config.chunk_size,
+                    )
+                manifest.bytes = await asyncio.to_thread(append, part, out)
+                manifest.written = index + 1
+                _save_manifest(manifest_path, manifest, codec)
+                os.remove(part)
+
+    pending = [index for index in range(manifest.partitions) if str(index) not in manifest.rows]
+    await asyncio.gather(write(), *(fetch(index) for index in pending))
+
+    complete = manifest.written == manifest.partitions
+    if complete:
+        os.remove(manifest_path)
+    seconds = time.perf_counter() - start
+    return {
+        "path": path,
+        "table": table,
+        "format": file_format,
+        "rows": sum(manifest.rows.values()),
+        "bytes": manifest.bytes,
+        "schema": manifest.schema(),
+        "partitions": manifest.partitions,
+        "resumed": resumed,
+        "seconds": round(seconds, 4),
+        "rows_per_second": round(fetched / seconds) if seconds else None,
+        "complete": complete,
+        "failed": [
+            {"partition": index, "from": manifest.bounds[index],
+             "to": manifest.bounds[index + 1], "error": error}
+            for index, error in sorted(failed.items())
+        ],
+    }
@@ -0,0 +1,263 @@
+"""
+Output formats of export_table: NDJSON, CSV and Parquet.
+
+Partitions are spooled as NDJSON part files (see export.py), and each format
+turns the part files into the output, reading them ``chunk_size`` lines at a
+time so memory stays flat however large the export is.
+
+- ndjson: one JSON object per line; part files are copied as they are
+- csv: a header row, then one line per row; NULL is an empty field, and JSON
+  objects and arrays are written as JSON text
+- parquet: columnar and zstd-compressed, one row group per chunk. Needs
+  pyarrow, which is only imported for Parquet exports. The column types are
+  only known once every row is read, so the file is written once every
+  partition is complete rather than as partitions finish.
+
+Column types are collected from every row as it is read and reported as the
+export's schema: integer, number, boolean, string, date, timestamp (without
+time zone), timestamptz, json, or null for a column holding only NULLs. Dates
+and timestamps are recognised from the ISO 8601 text both backends return.
+Text and time values in one column make it a string column, and other
+disagreeing values make it json.
+"""
+
+import csv
+import datetime
+import io
+import itertools
+import os
+import shutil
+from decimal import Decimal
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+from .backends.base import Row
+from .codec import JSONCodec
+
+FORMATS = ("ndjson", "csv", "parquet")
+
+_EXTENSIONS = {".csv": "csv", ".parquet": "parquet"}
+
+_JSON_TYPES = {
+    int: "integer", float: "number", bool: "boolean", type(None): "null",
+    dict: "json", list: "json",
+}
+
+_TEXT_TYPES = {"string", "date", "timestamp", "timestamptz"}
+
+
+def require_pyarrow() -> Any:
+    """
+    Import pyarrow for a Parquet export.
+
+    Returns:
+        The pyarrow module
+
+    Raises:
+        ValueError: If pyarrow is not installed
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise ValueError(
+            "Parquet exports require pyarrow; install it with 'pip install pyarrow'."
+        ) from None
+    return pyarrow
+
+
+def file_format_of(path: str, file_format: Optional[str]) -> str:
+    """
+    Work out the format of an export.
+
+    Args:
+        path: The output path
+        file_format: The caller's format, or None to go by the path's extension
+
+    Returns:
+        "ndjson", "csv" or "parquet"; ndjson for paths without a known extension
+
+    Raises:
+        ValueError: If the format is unknown, or is Parquet and pyarrow is missing
+    """
+    if file_format is None:
+        name = _EXTENSIONS.get(os.path.splitext(path)[1].lower(), "ndjson")
+    else:
+        name = file_format.strip().lower()
+        if name not in FORMATS:
+            raise ValueError(
+                f"file_format must be one of {', '.join(FORMATS)}, got {file_format!r}"
+            )
+    if name == "parquet":
+        require_pyarrow()
+    return name
+
+
+def _text_type(value: str) -> str:
+    """Tell ISO 8601 dates and timestamps apart from other text."""
+    if len(value) == 10 and value[4] == "-" and value[7] == "-":
+        try:
+            datetime.date.fromisoformat(value)
+        except ValueError:
+            return "string"
+        return "date"
+    if len(value) >= 19 and value[4] == "-" and value[10] in "T ":
+        try:
+            parsed = datetime.datetime.fromisoformat(value)
+        except ValueError:
+            return "string"
+        return "timestamp" if parsed.tzinfo is None else "timestamptz"
+    return "string"
+
+
+def value_type(value: Any) -> str:
+    """Name the schema type of one value."""
+    kind = _JSON_TYPES.get(type(value))
+    if kind is not None:
+        return kind
+    if isinstance(value, str):
+        return _text_type(value)
+    if isinstance(value, Decimal):
+        return "number"
+    if isinstance(value, datetime.datetime):
+        return "timestamp" if value.tzinfo is None else "timestamptz"
+    if isinstance(value, datetime.date):
+        return "date"
+    return "string"
+
+
+def merge_type(current: str, kind: str) -> str:
+    """Combine the type of a column so far with the type of another value."""
+    if current == kind or kind == "null":
+        return current
+    if current == "null":
+        return kind
+    if {current, kind} == {"integer", "number"}:
+        return "number"
+    if current in _TEXT_TYPES and kind in _TEXT_TYPES:
+        return "string"
+    return "json"
+
+
+def merge_row_types(types: Dict[str, str], rows: List[Row]) -> None:
+    """Fold the values of rows into column types, keeping columns in first-seen order."""
+    for row in rows:
+        for name, value in row.items():
+            kind = value_type(value)
+            current = types.get(name)
+            if current != kind:
+                types[name] = kind if current is None else merge_type(current, kind)
+
+
+def read_chunks(part: str, codec: JSONCodec, size: int) -> Iterator[List[Row]]:
+    """Read the rows of an NDJSON part file, size rows at a time."""
+    with open(part, encoding="utf-8") as handle:
+        while True:
+            lines = list(itertools.islice(handle, size))
+            if not lines:
+                return
+            yield [codec.loads(line) for line in lines]
+
+
+def append_ndjson(part: str, out: BinaryIO) -> int:
+    """Copy an NDJSON part file to the end of the output and return the output size."""
+    with open(part, "rb") as handle:
+        shutil.copyfileobj(handle, out)
+    out.flush()
+    return out.tell()
+
+
+def _csv_value(value: Any, codec: JSONCodec) -> Any:
+    """Render one value as a CSV field."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return codec.dumps(value)
+    return value
+
+
+def append_csv(
+    part: str, out: BinaryIO, header: List[str], codec: JSONCodec, chunk_size: int
+) -> int:
+    """
+    Append the rows of an NDJSON part file to a CSV output.
+
+    The header row is written first if the output is empty and a header is known.
+
+    Returns:
+        The output size
+    """
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="", write_through=True)
+    try:
+        writer = csv.writer(text)
+        if out.tell() == 0 and header:
+            writer.writerow(header)
+        for rows in read_chunks(part, codec, chunk_size):
+            writer.writerows([[_csv_value(row.get(name), codec) for name in header]
+                              for row in rows])
+        text.flush()
+    finally:
+        # Reason: closing the wrapper would close the output it wraps
+        text.detach()
+    out.flush()
+    return out.tell()
+
+
+def _arrow_type(pa: Any, kind: str) -> Any:
+    """Map a schema type to an Arrow type."""
+    return {
+        "integer": pa.int64(),
+        "number": pa.float64(),
+        "boolean": pa.bool_(),
+        "date": pa.date32(),
+        "timestamp": pa.timestamp("us"),
+        "timestamptz": pa.timestamp("us", tz="UTC"),
+        "null": pa.null(),
+    }.get(kind, pa.string())
+
+
+def _arrow_values(values: List[Any], kind: str, codec: JSONCodec) -> List[Any]:
+    """Convert the JSON values of one column to what pyarrow expects for its type."""
+    if kind == "json":
+        return [None if value is None else codec.dumps(value) for value in values]
+    if kind == "date":
+        return [None if value is None else datetime.date.fromisoformat(value)
+                for value in values]
+    if kind in ("timestamp", "timestamptz"):
+        return [None if value is None else datetime.datetime.fromisoformat(value)
+                for value in values]
+    if kind == "string":
+        return [None if value is None else str(value) for value in values]
+    return values
+
+
+def write_parquet(
+    parts: List[str], path: str, types: Dict[str, str], codec: JSONCodec, chunk_size: int
+) -> int:
+    """
+    Write NDJSON part files, in order, to one zstd-compressed Parquet file.
+
+    Args:
+        parts: The part files
+        path: The output path; replaced once the file is complete
+        types: Column types from merge_row_types
+        codec: Decodes the part files
+        chunk_size: Rows per row group
+
+    Returns:
+        The output size
+    """
+    pa = require_pyarrow()
+    schema = pa.schema([(name, _arrow_type(pa, kind)) for name, kind in types.items()])
+    with pa.parquet.ParquetWriter(path + ".tmp", schema, compression="zstd") as writer:
+        for part in parts:
+            for rows in read_chunks(part, codec, chunk_size):
+                columns = [
+                    pa.array(_arrow_values([row.get(name) for row in rows], kind, codec),
+                             type=field.type)
+                    for (name, kind), field in zip(types.items(), schema)
+                ]
+                writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+    os.replace(path + ".tmp", path)
+    return os.path.getsize(path)
@@ -0,0 +1,209 @@
+"""
+Filter expressions for reads, updates and deletes.
+
+A filter is a mapping from column names to conditions, all of which must hold:
+
+- A plain value means equality: ``{"status": "open"}``; ``None`` means IS NULL.
+- A mapping of operators applies each of them:
+  ``{"created_at": {"gte": "2024-01-01", "lt": "2024-02-01"}}``.
+- ``"or"`` and ``"and"`` take a list of filters and combine them:
+  ``{"or": [{"status": "open"}, {"priority": {"gte": 3}}]}``. Groups nest.
+
+Operators:
+
+- ``eq``, ``neq``, ``gt``, ``gte``, ``lt``, ``lte``: comparisons
+- ``in``: the column equals one of a list of values
+- ``like``, ``ilike``: SQL pattern match (case-insensitive for ilike), ``%`` wildcard
+- ``is``: ``null``, ``true``, ``false`` or ``unknown``
+- ``range``: ``[low, high]``, inclusive; either bound may be null to leave it open
+- ``contains``: an array column contains the listed elements, or a jsonb column
+  contains the given object
+
+Filters are parsed once into a small tree of conditions and groups that each
+backend compiles to its own query language, so filtering runs in the database
+and can use its indexes.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Set, Union
+
+OPERATORS = (
+    "eq", "neq", "gt", "gte", "lt", "lte", "in", "like", "ilike", "is", "range", "contains",
+)
+
+# Values accepted by the "is" operator, keyed by their canonical spelling
+_IS_VALUES = {"null": None, "true": True, "false": False, "unknown": "unknown"}
+
+# Characters PostgREST reserves in column names inside filters
+_RESERVED = set(",()")
+
+
+@dataclass(frozen=True)
+class Condition:
+    """One column test, e.g. ``created_at gte "2024-01-01"``."""
+    column: str
+    op: str
+    value: Any
+
+
+@dataclass(frozen=True)
+class Group:
+    """Conditions combined with "and" or "or"."""
+    kind: str
+    items: List[Union[Condition, "Group"]]
+
+
+Filter = Union[Condition, Group]
+
+
+def _column(name: Any) -> str:
+    """Validate a column name used in a filter."""
+    if not isinstance(name, str) or not name.strip() or _RESERVED & set(name):
+        raise ValueError(f"Invalid filter column {name!r}")
+    return name
+
+
+def _conditions(column: str, op: str, value: Any) -> List[Condition]:
+    """Validate one operator and expand it to conditions."""
+    if op == "in":
+        if not isinstance(value, (list, tuple)) or any(v is None for v in value):
+            raise ValueError(
+                f"Filter {column}.in needs a list of non-null values (use is: null for NULL)"
+            )
+        return [Condition(column, op, list(value))]
+    if op == "is":
+        key = str(value).lower() if value is not None else "null"
+        if key not in _IS_VALUES:
+            raise ValueError(f"Filter {column}.is must be null, true, false or unknown")
+        return [Condition(column, op, key)]
+    if op == "range":
+        if not isinstance(value, (list, tuple)) or len(value) != 2:
+            raise ValueError(f"Filter {column}.range needs [low, high]")
+        low, high = value
+        bounds = [("gte", low), ("lte", high)]
+        return [Condition(column, bound_op, v) for bound_op, v in bounds if v is not None]
+    if op in ("like", "ilike") and not isinstance(value, str):
+        raise ValueError(f"Filter {column}.{op} needs a pattern string")
+    if op == "contains" and not isinstance(value, (list, tuple, dict, str)):
+        raise ValueError(f"Filter {column}.contains needs a list, an object or a string")
+    if op == "contains" and isinstance(value, tuple):
+        value = list(value)
+    if value is None and op != "eq":
+        raise ValueError(f"Filter {column}.{op} needs a value (use is: null for NULL)")
+    if op == "eq" and value is None:
+        return [Condition(column, "is", "null")]
+    return [Condition(column, op, value)]
+
+
+def _is_operator_map(value: Any) -> bool:
+    """Whether a filter value is a mapping of operators rather than a literal."""
+    return isinstance(value, dict) and bool(value) and all(key in OPERATORS for key in value)
+
+
+def _parse(filters: Mapping[str, Any]) -> List[Filter]:
+    """Parse one filter mapping into the conditions and groups it ANDs together."""
+    if not isinstance(filters, Mapping):
+        raise ValueError(f"Filters must be an object, got {type(filters).__name__}")
+    items: List[Filter] = []
+    for key, value in filters.items():
+        if key in ("and", "or") and isinstance(value, list):
+            if not value:
+                raise ValueError(f"Filter group {key!r} needs at least one filter")
+            members = [_group("and", _parse(member)) for member in value]
+            group = _group(key, members)
+            if isinstance(group, Group) and group.kind == "and":
+                items.extend(group.items)
+            else:
+                items.append(group)
+        elif _is_operator_map(value):
+            for op, operand in value.items():
+                items.extend(_conditions(_column(key), op, operand))
+        else:
+            items.extend(_conditions(_column(key), "eq", value))
+    return items
+
+
+def _group(kind: str, items: List[Filter]) -> Filter:
+    """Build a group, flattening single members and nested groups of the same kind."""
+    flat: List[Filter] = []
+    for item in items:
+        if isinstance(item, Group) and item.kind == kind:
+            flat.extend(item.items)
+        else:
+            flat.append(item)
+    return flat[0] if len(flat) == 1 else Group(kind, flat)
+
+
+def parse_filters(filters: Optional[Mapping[str, Any]]) -> List[Filter]:
+    """
+    Parse a filter mapping.
+
+    Args:
+        filters: The tool's filters argument
+
+    Returns:
+        The conditions and "or" groups that must all hold (empty for no filters)
+
+    Raises:
+        ValueError: If a column, operator or operand is invalid
+    """
+    return _parse(filters) if filters else []
+
+
+def equalities(filters: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    """
+    Collect the columns a filter pins to one value.
+
+    Args:
+        filters: The tool's filters argument
+
+    Returns:
+        Column to value for every top-level equality condition
+
+    Raises:
+        ValueError: If the filters are invalid
+    """
+    return {
+        item.column: item.value
+        for item in parse_filters(filters)
+        if isinstance(item, Condition) and item.op == "eq"
+    }
+
+
+def only_equalities(filters: Optional[Mapping[str, Any]]) -> bool:
+    """
+    Check whether a filter is nothing but equality conditions.
+
+    Args:
+        filters: The tool's filters argument
+
+    Returns:
+        True if every condition is a top-level equality
+    """
+    return all(
+        isinstance(item, Condition) and item.op == "eq" for item in parse_filters(filters)
+    )
+
+
+def filter_columns(filters: Optional[Mapping[str, Any]]) -> Set[str]:
+    """
+    Collect every column a filter tests, inside groups too.
+
+    Args:
+        filters: The tool's filters argument
+
+    Returns:
+        The names of the tested columns
+
+    Raises:
+        ValueError: If the filters are invalid
+    """
+    columns: Set[str] = set()
+    pending = parse_filters(filters)
+    while pending:
+        item = pending.pop()
+        if isinstance(item, Group):
+            pending.extend(item.items)
+        else:
+            columns.add(item.column)
+    return columns
@@ -0,0 +1,282 @@
+"""
+Graceful shutdown support for the Supabase MCP server.
+
+Tool calls run inside CallTracker.track so that, on shutdown, the server can
+stop accepting new calls, wait (up to a deadline) for in-flight calls to
+finish, run shutdown hooks that flush buffered work, and finally close the
+client's HTTP and websocket transports.
+
+Environment variables:
+- SUPABASE_MCP_DRAIN_TIMEOUT: Seconds to wait for in-flight calls on shutdown (default: 8)
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import sys
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from postgrest import AsyncPostgrestClient
+
+logger = logging.getLogger(__name__)
+
+ShutdownHook = Callable[[], Awaitable[None]]
+
+# Seconds to let finished calls write their responses before the server stops
+RESPONSE_FLUSH_GRACE = 0.2
+
+
+class ShuttingDownError(RuntimeError):
+    """Raised when a tool call arrives after shutdown has started."""
+
+
+@dataclass
+class DrainReport:
+    """Outcome of draining in-flight tool calls."""
+    seconds: float
+    in_flight_at_start: int
+    completed: int
+    abandoned: int
+    timed_out: bool
+
+
+class CallTracker:
+    """
+    Tracks in-flight tool calls and drains them on shutdown.
+
+    Attributes:
+        started: Number of tool calls admitted
+        completed: Number of admitted tool calls that have finished
+        rejected: Number of tool calls refused because shutdown had started
+        last_drain: Report from the most recent drain, if any
+    """
+
+    def __init__(self) -> None:
+        self.accepting = True
+        self.signalled = False
+        self.started = 0
+        self.completed = 0
+        self.rejected = 0
+        self.last_drain: Optional[DrainReport] = None
+        self._in_flight: Dict[int, str] = {}
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of tool calls currently running."""
+        return len(self._in_flight)
+
+    @asynccontextmanager
+    async def track(self, tool_name: str) -> AsyncIterator[None]:
+        """
+        Run a tool call as tracked work.
+
+        Args:
+            tool_name: Name of the tool being called
+
+        Raises:
+            ShuttingDownError: If the server has stopped accepting calls
+        """
+        if not self.accepting:
+            self.rejected += 1
+            raise ShuttingDownError(
+                f"Server is shutting down; {tool_name} was not started"
+            )
+        call_id = self.started
+        self.started += 1
+        self._in_flight[call_id] = tool_name
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            del self._in_flight[call_id]
+            self.completed += 1
+            if not self._in_flight:
+                self._idle.set()
+
+    async def drain(self, timeout: float) -> DrainReport:
+        """
+        Stop accepting calls and wait for in-flight calls to finish.
+
+        Args:
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            DrainReport: How long the drain took and how many calls it abandoned
+        """
+        self.accepting = False
+        start = time.monotonic()
+        in_flight_at_start = self.in_flight
+        completed_before = self.completed
+        timed_out = False
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+        self.last_drain = DrainReport(
+            seconds=round(time.monotonic() - start, 4),
+            in_flight_at_start=in_flight_at_start,
+            completed=self.completed - completed_before,
+            abandoned=self.in_flight,
+            timed_out=timed_out,
+        )
+        return self.last_drain
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report call counters and the last drain outcome.
+
+        Returns:
+            Dictionary of tracker metrics
+        """
+        return {
+            "accepting": self.accepting,
+            "in_flight": self.in_flight,
+            "started": self.started,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "last_drain": asdict(self.last_drain) if self.last_drain else None,
+        }
+
+
+async def close_client(client: Any) -> List[str]:
+    """
+    Close the transports owned by a Supabase client.
+
+    Only components that were actually created are closed, and a failure in one
+    component does not prevent the others from being closed.
+
+    Args:
+        client: A supabase AsyncClient, a PostgREST-only client, or None if the
+            client was never built
+
+    Returns:
+        Names of the components that were closed
+    """
+    closers: Dict[str, Optional[Callable[[], Awaitable[None]]]] = {}
+    if client is None:
+        return []
+    if isinstance(client, AsyncPostgrestClient):
+        closers["postgrest"] = client.aclose
+    else:
+        # Reason: read the private attribute so a lazily-built PostgREST client is
+        # not created just to be closed.
+        postgrest = getattr(client, "_postgrest", None)
+        closers["postgrest"] = postgrest.aclose if postgrest is not None else None
+        auth = getattr(client, "auth", None)
+        closers["auth"] = getattr(auth, "close", None)
+        realtime = getattr(client, "realtime", None)
+        if realtime is not None and getattr(realtime, "is_connected", False):
+            closers["realtime"] = realtime.close
+
+    closed = []
+    for name, close in closers.items():
+        if close is None:
+            continue
+        try:
+            await close()
+            closed.append(name)
+        except Exception:
+            logger.warning("Failed to close Supabase %s transport", name, exc_info=True)
+    return closed
+
+
+async def shutdown(
+    tracker: CallTracker,
+    client: Any,
+    hooks: List[ShutdownHook],
+    timeout: float,
+) -> DrainReport:
+    """
+    Run the full shutdown sequence: drain, flush hooks, close transports.
+
+    Args:
+        tracker: The call tracker to drain
+        client: The Supabase client whose transports should be closed
+        hooks: Coroutine functions that flush buffered work
+        timeout: Drain deadline in seconds
+
+    Returns:
+        DrainReport: The drain outcome (reused if a drain already ran)
+    """
+    report = tracker.last_drain if not tracker.accepting else None
+    if report is None:
+        report = await tracker.drain(timeout)
+    for hook in hooks:
+        try:
+            await hook()
+        except Exception:
+            logger.warning("Shutdown hook %r failed", hook, exc_info=True)
+    closed = await close_client(client)
+    logger.info(
+        "Shutdown complete: drained %d call(s) in %.3fs, abandoned %d, closed %s",
+        report.completed,
+        report.seconds,
+        report.abandoned,
+        ", ".join(closed) or "nothing",
+    )
+    return report
+
+
+def install_sigterm_handler(tracker: CallTracker, timeout: float) -> Callable[[], None]:
+    """
+    Drain in-flight calls on SIGTERM before letting the server stop.
+
+    The default SIGTERM behaviour kills the process immediately. Instead, this
+    handler drains the tracker and then cancels the task running the server, so
+    the lifespan's cleanup still runs.
+
+    Args:
+        tracker: The call tracker to drain
+        timeout: Drain deadline in seconds
+
+    Returns:
+        A function that removes the handler again
+    """
+    loop = asyncio.get_running_loop()
+    server_task = asyncio.current_task()
+    # Reason: the event loop only keeps weak references to tasks.
+    pending: List["asyncio.Task[None]"] = []
+
+    async def drain_then_stop() -> None:
+        await tracker.drain(timeout)
+        # Reason: a call leaves the tracker just before FastMCP sends its response,
+        # so give the transport a moment to flush before cancelling the server.
+        await asyncio.sleep(RESPONSE_FLUSH_GRACE)
+        if server_task is not None:
+            server_task.cancel()
+
+    def on_sigterm() -> None:
+        if tracker.accepting:
+            tracker.signalled = True
+            logger.info("SIGTERM received; draining %d in-flight call(s)", tracker.in_flight)
+            pending.append(loop.create_task(drain_then_stop()))
+
+    try:
+        loop.add_signal_handler(signal.SIGTERM, on_sigterm)
+    except (NotImplementedError, RuntimeError):
+        # Signal handlers are unavailable on Windows and outside the main thread
+        logger.debug("SIGTERM handler not installed")
+        return lambda: None
+    return lambda: loop.remove_signal_handler(signal.SIGTERM)
+
+
+def exit_if_signalled(tracker: CallTracker) -> None:
+    """
+    Terminate the process once cleanup has finished after a SIGTERM.
+
+    Args:
+        tracker: The call tracker whose SIGTERM handler may have fired
+    """
+    if not tracker.signalled:
+        return
+    sys.stdout.flush()
+    sys.stderr.flush()
+    # Reason: mcp's stdio transport reads stdin in a worker thread that cannot be
+    # cancelled, so without this the process would linger until the host closes stdin.
+    os._exit(0)
@@ -0,0 +1,241 @@
+"""
+Keyset (cursor) pagination for read_table_rows.
+
+A page is read with ``WHERE (order key, tiebreaker) > (last seen values)``
+instead of OFFSET, so the database seeks straight to the page through an index
+on the ordering columns and page N costs the same as page 1.
+
+Cursors are opaque to callers: URL-safe base64 of a small JSON document
+holding the ordering columns, their direction, the last row's values, and a
+fingerprint of the table and filters so a cursor cannot be replayed against a
+different query. The cursor also records the page size, which is the number
+of rows that fitted when the response byte budget cut the page short; it
+becomes the next page's size when the call passes no limit.
+"""
+
+import base64
+import hashlib
+import json
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+from .backends.base import ReadQuery, Row
+from .budget import rows_within
+
+# Page size used when a paginated read does not pass a limit
+DEFAULT_PAGE_SIZE = 100
+
+_CURSOR_VERSION = 1
+
+
+@dataclass
+class Cursor:
+    """Position after the last row of a page."""
+    keys: List[str]
+    ascending: bool
+    values: List[Any]
+    fingerprint: str
+    limit: Optional[int] = None
+
+
+def query_fingerprint(table: str, filters: Optional[Dict[str, Any]]) -> str:
+    """
+    Identify the row set a cursor pages through.
+
+    Args:
+        table: Name of the table
+        filters: The read's filters
+
+    Returns:
+        A short hex digest of the table and filters
+    """
+    payload = json.dumps([table, filters or {}], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    """
+    Serialize a cursor to an opaque token.
+
+    Args:
+        cursor: The cursor
+
+    Returns:
+        URL-safe base64 token
+    """
+    document = {
+        "v": _CURSOR_VERSION,
+        "k": cursor.keys,
+        "a": cursor.ascending,
+        "after": cursor.values,
+        "f": cursor.fingerprint,
+    }
+    if cursor.limit:
+        document["n"] = cursor.limit
+    raw = json.dumps(document, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Cursor:
+    """
+    Parse a token produced by encode_cursor.
+
+    Args:
+        token: The cursor token
+
+    Returns:
+        Cursor: The decoded cursor
+
+    Raises:
+        ValueError: If the token is malformed or from an unsupported version
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        document = json.loads(raw)
+        if document["v"] != _CURSOR_VERSION:
+            raise ValueError("unsupported cursor version")
+        cursor = Cursor(
+            keys=list(document["k"]),
+            ascending=bool(document["a"]),
+            values=list(document["after"]),
+            fingerprint=str(document["f"]),
+            limit=int(document["n"]) if document.get("n") else None,
+        )
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}") from None
+    if not cursor.keys or len(cursor.keys) != len(cursor.values):
+        raise ValueError("Invalid cursor: keys and values do not match")
+    return cursor
+
+
+def keyset_columns(order_by: Optional[str], cursor_key: str) -> List[str]:
+    """
+    Work out the columns that define the page order.
+
+    Args:
+        order_by: The caller's ordering column, if any
+        cursor_key: Unique column used to break ties
+
+    Returns:
+        The ordering columns, ending with the unique tiebreaker
+    """
+    if order_by and order_by != cursor_key:
+        return [order_by, cursor_key]
+    return [cursor_key]
+
+
+def _selected(columns: str) -> List[str]:
+    """Top-level names in a select list (embedded resources kept whole)."""
+    names, depth, current = [], 0, ""
+    for char in columns:
+        if char == "," and depth == 0:
+            names.append(current.strip())
+            current = ""
+            continue
+        depth += char == "("
+        depth -= char == ")"
+        current += char
+    names.append(current.strip())
+    return names
+
+
+def prepare_page(
+    query: ReadQuery, cursor_key: str, token: Optional[str]
+) -> Tuple[ReadQuery, List[str], List[str]]:
+    """
+    Turn a read into a keyset page read.
+
+    Args:
+        query: The caller's read
+        cursor_key: Unique column used to break ties
+        token: The cursor from the previous page, or None for the first page
+
+    Returns:
+        The page query, its ordering columns, and key columns added to the
+        select list that must be removed from the returned rows
+
+    Raises:
+        ValueError: If the cursor is malformed or was issued for another query
+    """
+    keys = keyset_columns(query.order_by, cursor_key)
+    after, limit = None, query.limit
+    if token:
+        cursor = decode_cursor(token)
+        if (
+            cursor.keys != keys
+            or cursor.ascending != query.ascending
+            or cursor.fingerprint != query_fingerprint(query.table, query.filters)
+        ):
+            raise ValueError(
+                "cursor was issued for a different table, filter or ordering; "
+                "repeat the original arguments with the cursor"
+            )
+        after = cursor.values
+        limit = limit or cursor.limit
+
+    columns, added = query.columns, []
+    selected = _selected(columns)
+    if "*" not in selected:
+        added = [key for key in keys if key not in selected]
+        columns = ",".join(selected + added)
+
+    page = replace(
+        query,
+        columns=columns,
+        order_by=keys[0],
+        tiebreaker=keys[1] if len(keys) > 1 else None,
+        after=after,
+        limit=limit or DEFAULT_PAGE_SIZE,
+    )
+    return page, keys, added
+
+
+def finish_page(
+    page: ReadQuery,
+    rows: List[Row],
+    keys: List[str],
+    added: List[str],
+    max_bytes: int = 0,
+) -> Dict[str, Any]:
+    """
+    Build the paginated result and the cursor for the next page.
+
+    Args:
+        page: The query that produced the rows
+        rows: The rows returned by the backend
+        keys: The ordering columns
+        added: Key columns that were added to the select list
+        max_bytes: Response byte budget for the rows, or 0 for none
+
+    Returns:
+        Dictionary with "rows" and "next_cursor" (None on the last page), and
+        "truncated": True when the budget cut the page short
+
+    Raises:
+        ValueError: If the unique column of the last row is NULL
+    """
+    next_cursor = None
+    fit = rows_within(rows, max_bytes)
+    truncated = fit < len(rows)
+    rows = rows[:fit]
+    if rows and (truncated or len(rows) >= page.limit):
+        last = rows[-1]
+        values = [last.get(key) for key in keys]
+        # Reason: NULLs of order_by are paged through, but the unique key breaks ties
+        if values[-1] is None:
+            raise ValueError(
+                f"Cannot page on {keys[-1]}: the last row has a NULL value; "
+                "use a NOT NULL cursor_key"
+            )
+        next_cursor = encode_cursor(Cursor(
+            keys=keys,
+            ascending=page.ascending,
+            values=values,
+            fingerprint=query_fingerprint(page.table, page.filters),
+            limit=len(rows) if truncated else page.limit,
+        ))
+    if added:
+        rows = [{k: v for k, v in row.items() if k not in added} for row in rows]
+    if truncated:
+        return {"rows": rows, "next_cursor": next_cursor, "truncated": True}
+    return {"rows": rows, "next_cursor": next_cursor}
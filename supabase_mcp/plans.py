@@ -0,0 +1,185 @@
+"""
+Query plans for the read, update and delete tools, and an optional cost limit.
+
+explain_query asks Postgres how it would run the query a tool builds: through
+PostgREST's ``application/vnd.pgrst.plan+json`` output on the postgrest
+backend (which needs ``db-plan-enabled`` on the PostgREST server), or with
+``EXPLAIN (FORMAT JSON)`` on the postgres backend. The summary names every
+table scan, so a sequential scan over a large table is easy to spot.
+
+With SUPABASE_MCP_MAX_QUERY_COST set, read_table_rows, update_table_records
+and delete_table_records plan each query first. Queries whose estimated total
+cost exceeds the limit are logged (action "warn") or refused before they run
+(action "refuse"). Planning costs one extra round trip per call.
+
+Environment variables:
+- SUPABASE_MCP_MAX_QUERY_COST: Estimated cost above which queries are flagged, 0 disables
+  (default: 0)
+- SUPABASE_MCP_QUERY_COST_ACTION: "warn" or "refuse" (default: warn)
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+from .backends.base import Backend, ReadQuery, Row
+from .config import env_float
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_OPERATIONS = ("read", "update", "delete")
+
+COST_ACTIONS = ("warn", "refuse")
+
+
+@dataclass
+class PlanConfig:
+    """Cost limit for the queries the tools run."""
+    max_cost: float = 0.0
+    action: str = "warn"
+
+    @classmethod
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "PlanConfig":
+        """
+        Build the configuration from environment variables.
+
+        Args:
+            env: Mapping to read from (default: os.environ)
+
+        Returns:
+            PlanConfig: The configuration, with defaults for unset variables
+
+        Raises:
+            ValueError: If a variable is malformed
+        """
+        env = os.environ if env is None else env
+        config = cls(
+            max_cost=env_float("SUPABASE_MCP_MAX_QUERY_COST", cls.max_cost, env),
+            action=(env.get("SUPABASE_MCP_QUERY_COST_ACTION") or cls.action).strip().lower(),
+        )
+        if config.max_cost < 0:
+            raise ValueError("SUPABASE_MCP_MAX_QUERY_COST must not be negative")
+        if config.action not in COST_ACTIONS:
+            raise ValueError(
+                f"SUPABASE_MCP_QUERY_COST_ACTION must be one of {', '.join(COST_ACTIONS)}, "
+                f"got {config.action!r}"
+            )
+        return config
+
+
+def check_operation(operation: str, analyze: bool) -> None:
+    """
+    Validate what explain_query is asked to plan.
+
+    Raises:
+        ValueError: If the operation is unknown, or ANALYZE is asked of a write,
+            which would perform it
+    """
+    if operation not in EXPLAIN_OPERATIONS:
+        raise ValueError(
+            f"operation must be one of {', '.join(EXPLAIN_OPERATIONS)}, got {operation!r}"
+        )
+    if analyze and operation != "read":
+        raise ValueError(
+            f"analyze runs the query, so it is only allowed for reads, not {operation}"
+        )
+
+
+def _nodes(node: Row) -> Iterator[Row]:
+    """Yield a plan node and all nodes below it."""
+    yield node
+    for child in node.get("Plans", []):
+        yield from _nodes(child)
+
+
+def summarize(plan: Row) -> Dict[str, Any]:
+    """
+    Pick the figures an agent needs out of a JSON plan.
+
+    Args:
+        plan: One EXPLAIN (FORMAT JSON) entry: {"Plan": {...}, ...}
+
+    Returns:
+        Dictionary with the top node's "node_type", "startup_cost", "total_cost"
+        and estimated "rows", the "scans" of tables and indexes, and with ANALYZE
+        the "actual_rows", "planning_ms" and "execution_ms"
+    """
+    top = plan["Plan"]
+    scans: List[Dict[str, Any]] = []
+    for node in _nodes(top):
+        # Reason: ModifyTable nodes also name a relation but do not read it
+        if "Relation Name" in node and node["Node Type"].endswith("Scan"):
+            scan = {"node_type": node["Node Type"], "table": node["Relation Name"],
+                    "rows": node.get("Plan Rows")}
+            if "Index Name" in node:
+                scan["index"] = node["Index Name"]
+            if "Filter" in node:
+                scan["filter"] = node["Filter"]
+            scans.append(scan)
+    summary = {
+        "node_type": top["Node Type"],
+        "startup_cost": top.get("Startup Cost"),
+        "total_cost": top.get("Total Cost"),
+        "rows": top.get("Plan Rows"),
+        "scans": scans,
+    }
+    if "Actual Rows" in top:
+        summary["actual_rows"] = top["Actual Rows"]
+        summary["planning_ms"] = plan.get("Planning Time")
+        summary["execution_ms"] = plan.get("Execution Time")
+    return summary
+
+
+def cost_warning(summary: Dict[str, Any], config: PlanConfig) -> Optional[str]:
+    """
+    Describe a plan whose estimated cost exceeds the configured limit.
+
+    Returns:
+        The warning, or None if there is no limit or the cost is within it
+    """
+    cost = summary.get("total_cost") or 0
+    if not config.max_cost or cost <= config.max_cost:
+        return None
+    seq = [scan["table"] for scan in summary["scans"] if scan["node_type"] == "Seq Scan"]
+    hint = f"; sequential scan of {', '.join(seq)}" if seq else ""
+    return (
+        f"Estimated cost {cost:.0f} exceeds SUPABASE_MCP_MAX_QUERY_COST "
+        f"({config.max_cost:.0f}){hint}"
+    )
+
+
+async def enforce_cost(
+    backend: Backend,
+    config: PlanConfig,
+    operation: str,
+    query: ReadQuery,
+    updates: Optional[Row] = None,
+) -> None:
+    """
+    Plan a tool's query and act on a cost above the configured limit.
+
+    Does nothing unless a limit is configured.
+
+    Args:
+        backend: The backend that will run the query
+        config: The cost limit and action
+        operation: "read", "update" or "delete"
+        query: The query; updates and deletes use its table and filters
+        updates: Column-value pairs of an update
+
+    Raises:
+        ValueError: If the action is "refuse" and the cost exceeds the limit
+    """
+    if not config.max_cost:
+        return
+    plan = await backend.explain(operation, query, updates)
+    warning = cost_warning(summarize(plan), config)
+    if warning is None:
+        return
+    if config.action == "refuse":
+        raise ValueError(
+            f"Refusing this {operation} of {query.table!r}: {warning}. Narrow the filters, "
+            "add a limit or an index; explain_query shows the plan"
+        )
+    logger.warning("%s of %r: %s", operation, query.table, warning)
@@ -0,0 +1,244 @@
+"""
+HTTP connection pool configuration for the PostgREST client.
+
+supabase-py builds its PostgREST session with library defaults. This module
+replaces that session with an httpx client whose pool limits, keep-alive
+expiry, HTTP/2 support and timeouts come from environment variables, and
+reports live pool statistics for sizing.
+
+Environment variables:
+- SUPABASE_POOL_MAX_CONNECTIONS: Maximum open connections (default: 100)
+- SUPABASE_POOL_MAX_KEEPALIVE: Maximum idle keep-alive connections (default: 20)
+- SUPABASE_POOL_KEEPALIVE_EXPIRY: Seconds an idle connection is kept (default: 30)
+- SUPABASE_HTTP2: Enable HTTP/2 multiplexing (default: true)
+- SUPABASE_CONNECT_TIMEOUT: Connect timeout in seconds (default: 5)
+- SUPABASE_READ_TIMEOUT: Read timeout in seconds (default: 120)
+- SUPABASE_WRITE_TIMEOUT: Write timeout in seconds (default: 120)
+- SUPABASE_POOL_TIMEOUT: Seconds to wait for a free connection (default: 10)
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Union
+
+import httpx
+from httpx._utils import get_environment_proxies
+from postgrest import AsyncPostgrestClient
+
+from .codec import CodecTransport, JSONCodec
+from .config import env_bool, env_float, env_int
+
+
+@dataclass
+class PoolConfig:
+    """Connection pool and timeout settings for the PostgREST HTTP client."""
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: Optional[float] = 30.0
+    http2: bool = True
+    connect_timeout: Optional[float] = 5.0
+    read_timeout: Optional[float] = 120.0
+    write_timeout: Optional[float] = 120.0
+    pool_timeout: Optional[float] = 10.0
+
+    @classmethod
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "PoolConfig":
+        """
+        Build a pool configuration from environment variables.
+
+        Args:
+            env: Mapping to read from (default: os.environ)
+
+        Returns:
+            PoolConfig: The configuration, with defaults for unset variables
+
+        Raises:
+            ValueError: If a variable is malformed or a limit is not positive
+        """
+        defaults = cls()
+        config = cls(
+            max_connections=env_int(
+                "SUPABASE_POOL_MAX_CONNECTIONS", defaults.max_connections, env
+            ),
+            max_keepalive_connections=env_int(
+                "SUPABASE_POOL_MAX_KEEPALIVE", defaults.max_keepalive_connections, env
+            ),
+            keepalive_expiry=env_float(
+                "SUPABASE_POOL_KEEPALIVE_EXPIRY", defaults.keepalive_expiry, env
+            ),
+            http2=env_bool("SUPABASE_HTTP2", defaults.http2, env),
+            connect_timeout=env_float(
+                "SUPABASE_CONNECT_TIMEOUT", defaults.connect_timeout, env
+            ),
+            read_timeout=env_float("SUPABASE_READ_TIMEOUT", defaults.read_timeout, env),
+            write_timeout=env_float(
+                "SUPABASE_WRITE_TIMEOUT", defaults.write_timeout, env
+            ),
+            pool_timeout=env_float("SUPABASE_POOL_TIMEOUT", defaults.pool_timeout, env),
+        )
+        if config.max_connections < 1:
+            raise ValueError("SUPABASE_POOL_MAX_CONNECTIONS must be at least 1")
+        if not 0 <= config.max_keepalive_connections <= config.max_connections:
+            raise ValueError(
+                "SUPABASE_POOL_MAX_KEEPALIVE must be between 0 and "
+                "SUPABASE_POOL_MAX_CONNECTIONS"
+            )
+        return config
+
+    @property
+    def limits(self) -> httpx.Limits:
+        """The httpx pool limits for this configuration."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    @property
+    def timeout(self) -> httpx.Timeout:
+        """The httpx timeouts for this configuration."""
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.write_timeout,
+            pool=self.pool_timeout,
+        )
+
+
+def build_http_client(
+    config: PoolConfig,
+    base_url: str,
+    headers: Mapping[str, str],
+    verify: bool = True,
+    proxy: Optional[str] = None,
+    codec: Optional[JSONCodec] = None,
+) -> httpx.AsyncClient:
+    """
+    Create an httpx client with explicit pool limits, HTTP/2 and timeouts.
+
+    Args:
+        config: The pool configuration
+        base_url: Base URL for all requests
+        headers: Default headers sent with every request
+        verify: Whether to verify TLS certificates
+        proxy: Optional proxy URL; without one, the proxy environment variables
+            (HTTPS_PROXY, ALL_PROXY, NO_PROXY, ...) apply as they do in httpx
+        codec: Codec that decodes JSON response bodies (default: httpx's, which the
+            json codec also keeps)
+
+    Returns:
+        httpx.AsyncClient: The configured client
+    """
+    if codec is not None and codec.name != JSONCodec.name:
+
+        def transport(url: Optional[str]) -> CodecTransport:
+            return CodecTransport(
+                codec, verify=verify, http2=config.http2, limits=config.limits, proxy=url
+            )
+
+        mounts: Dict[str, Optional[httpx.AsyncBaseTransport]] = {}
+        if proxy is None:
+            # Reason: httpx only reads the proxy environment when it builds the transport
+            mounts = {
+                pattern: transport(url) if url else None
+                for pattern, url in get_environment_proxies().items()
+            }
+        return httpx.AsyncClient(
+            base_url=base_url,
+            headers=dict(headers),
+            timeout=config.timeout,
+            transport=transport(proxy),
+            mounts=mounts,
+            follow_redirects=True,
+        )
+    return httpx.AsyncClient(
+        base_url=base_url,
+        headers=dict(headers),
+        limits=config.limits,
+        timeout=config.timeout,
+        http2=config.http2,
+        verify=verify,
+        proxy=proxy,
+        follow_redirects=True,
+    )
+
+
+class PooledPostgrestClient(AsyncPostgrestClient):
+    """AsyncPostgrestClient whose session is built from a PoolConfig."""
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        pool: PoolConfig,
+        codec: Optional[JSONCodec] = None,
+        **kwargs: Any,
+    ) -> None:
+        # Reason: the base constructor calls create_session, which needs the pool.
+        self.pool = pool
+        self.codec = codec
+        super().__init__(base_url, timeout=pool.timeout, **kwargs)
+
+    def create_session(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        timeout: Union[int, float, httpx.Timeout],
+        verify: bool = True,
+        proxy: Optional[str] = None,
+    ) -> httpx.AsyncClient:
+        """Create the pooled httpx session used for all PostgREST requests."""
+        return build_http_client(self.pool, base_url, headers, verify, proxy, self.codec)
+
+
+def attach_pool(
+    client: Any, config: PoolConfig, codec: Optional[JSONCodec] = None
+) -> PooledPostgrestClient:
+    """
+    Replace a Supabase client's PostgREST client with a pooled one.
+
+    Args:
+        client: A supabase AsyncClient
+        config: The pool configuration
+        codec: Codec that decodes JSON response bodies (default: httpx's)
+
+    Returns:
+        PooledPostgrestClient: The client now used for table operations
+    """
+    postgrest = PooledPostgrestClient(
+        client.rest_url,
+        pool=config,
+        codec=codec,
+        headers=client.options.headers,
+        schema=client.options.schema,
+    )
+    # Reason: supabase-py creates its PostgREST client lazily into _postgrest
+    # and offers no hook for supplying a custom httpx session.
+    client._postgrest = postgrest
+    return postgrest
+
+
+def pool_stats(session: Optional[httpx.AsyncClient]) -> Dict[str, int]:
+    """
+    Report the live state of an httpx client's connection pool.
+
+    Args:
+        session: The httpx client to inspect, or None if none has been created
+
+    Returns:
+        Dictionary with counts of open, idle, active and HTTP/2 connections,
+        plus requests in flight and requests waiting for a connection
+    """
+    # Reason: httpx exposes no public pool API; httpcore's pool is the source of truth.
+    pool = getattr(getattr(session, "_transport", None), "_pool", None)
+    connections = [c for c in getattr(pool, "connections", []) if not c.is_closed()]
+    requests = list(getattr(pool, "_requests", []))
+    idle = sum(1 for c in connections if c.is_idle())
+    waiting = sum(1 for r in requests if r.is_queued())
+    return {
+        "open": len(connections),
+        "idle": idle,
+        "active": len(connections) - idle,
+        "http2": sum(1 for c in connections if "HTTP/2" in c.info()),
+        "in_flight": len(requests) - waiting,
+        "waiting": waiting,
+    }
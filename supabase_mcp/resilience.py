@@ -0,0 +1,432 @@
+"""
+Retries and a circuit breaker around backend calls.
+
+Failures are classified before anything is retried:
+
+- unsent: the request provably never executed (connect failures, pool
+  timeouts, PostgREST unable to reach the database, rate limiting, rolled-back
+  serialization failures and deadlocks). Any operation may be retried.
+- transient: the backend may be recovering but the request may have executed
+  (read timeouts, dropped connections, 5xx gateway errors). Only idempotent
+  operations are retried: reads, and updates whose filters test none of the
+  columns they set.
+- permanent: everything else, e.g. bad filters or constraint violations.
+  Never retried, and treated as proof the backend is reachable.
+
+Inserts, deletes and other updates are therefore only retried on unsent
+failures, so a retry can never insert a row twice or report a completed delete
+or update as a miss: once ``status: pending -> done`` has committed, a replay
+of it matches no rows.
+
+Each backend has a circuit breaker. After a run of consecutive unsent or
+transient failures it opens and calls fail fast with CircuitOpenError. Once
+the reset timeout passes a single half-open probe is let through; its success
+closes the breaker and its failure reopens it.
+
+Environment variables:
+- SUPABASE_MCP_RETRY_ATTEMPTS: Total attempts per call, 1 disables retries (default: 3)
+- SUPABASE_MCP_RETRY_BASE_DELAY: First backoff ceiling in seconds (default: 0.1)
+- SUPABASE_MCP_RETRY_MAX_DELAY: Largest backoff ceiling in seconds (default: 2)
+- SUPABASE_MCP_BREAKER_THRESHOLD: Consecutive failures that open the breaker,
+  0 disables it (default: 5)
+- SUPABASE_MCP_BREAKER_RESET: Seconds the breaker stays open before probing (default: 30)
+"""
+
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import anyio
+import httpx
+from postgrest import APIError
+
+from .backends.base import AggregateQuery, Backend, ReadQuery, Records, Row
+from .config import env_float, env_int
+from .filters import filter_columns
+
+logger = logging.getLogger(__name__)
+
+UNSENT = "unsent"
+TRANSIENT = "transient"
+
+# HTTP statuses reported when PostgREST or the gateway returned a non-JSON body
+_UNSENT_STATUSES = {429}
+_TRANSIENT_STATUSES = {408, 500, 502, 503, 504, 520, 521, 522, 523, 524}
+
+# PostgREST could not get a database connection, so the query never ran
+_UNSENT_PGRST_CODES = {"PGRST000", "PGRST001", "PGRST002", "PGRST003"}
+
+# SQLSTATEs for work that was rolled back or never started
+_UNSENT_SQLSTATES = {"40001", "40P01", "53300", "57P03", "08001", "08004"}
+_TRANSIENT_SQLSTATE_CLASSES = ("08", "57P")
+
+_UNSENT_HTTP_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+_TRANSIENT_HTTP_ERRORS = (
+    httpx.ReadTimeout,
+    httpx.WriteTimeout,
+    httpx.ReadError,
+    httpx.WriteError,
+    httpx.RemoteProtocolError,
+)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a backend whose circuit breaker is open."""
+
+
+def _classify_code(code: Any) -> Optional[str]:
+    """Classify a PostgREST error code, SQLSTATE or HTTP status."""
+    if code is None:
+        return None
+    text = str(code)
+    if text.isdigit() and len(text) == 3:
+        status = int(text)
+        if status in _UNSENT_STATUSES:
+            return UNSENT
+        if status in _TRANSIENT_STATUSES:
+            return TRANSIENT
+        return None
+    if text in _UNSENT_PGRST_CODES or text in _UNSENT_SQLSTATES:
+        return UNSENT
+    if text.startswith(_TRANSIENT_SQLSTATE_CLASSES):
+        return TRANSIENT
+    return None
+
+
+def classify(exc: BaseException) -> Optional[str]:
+    """
+    Decide whether a failed backend call may be retried.
+
+    Args:
+        exc: The exception raised by the backend
+
+    Returns:
+        UNSENT, TRANSIENT, or None for permanent failures
+    """
+    if isinstance(exc, _UNSENT_HTTP_ERRORS):
+        return UNSENT
+    if isinstance(exc, _TRANSIENT_HTTP_ERRORS):
+        return TRANSIENT
+    if isinstance(exc, APIError):
+        return _classify_code(exc.code)
+    # asyncpg errors carry a SQLSTATE; checked by attribute to avoid importing it
+    sqlstate = getattr(exc, "sqlstate", None)
+    if sqlstate:
+        return _classify_code(sqlstate)
+    if isinstance(exc, (ConnectionRefusedError, ConnectionResetError)):
+        return UNSENT if isinstance(exc, ConnectionRefusedError) else TRANSIENT
+    return None
+
+
+@dataclass
+class ResilienceConfig:
+    """Retry and circuit breaker settings."""
+    max_attempts: int = 3
+    base_delay: float = 0.1
+    max_delay: float = 2.0
+    breaker_threshold: int = 5
+    breaker_reset: float = 30.0
+
+    @classmethod
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "ResilienceConfig":
+        """
+        Build the configuration from environment variables.
+
+        Args:
+            env: Mapping to read from (default: os.environ)
+
+        Returns:
+            ResilienceConfig: The configuration, with defaults for unset variables
+
+        Raises:
+            ValueError: If a variable is malformed or out of range
+        """
+        defaults = cls()
+        config = cls(
+            max_attempts=env_int("SUPABASE_MCP_RETRY_ATTEMPTS", defaults.max_attempts, env),
+            base_delay=env_float("SUPABASE_MCP_RETRY_BASE_DELAY", defaults.base_delay, env),
+            max_delay=env_float("SUPABASE_MCP_RETRY_MAX_DELAY", defaults.max_delay, env),
+            breaker_threshold=env_int(
+                "SUPABASE_MCP_BREAKER_THRESHOLD", defaults.breaker_threshold, env
+            ),
+            breaker_reset=env_float("SUPABASE_MCP_BREAKER_RESET", defaults.breaker_reset, env),
+        )
+        if config.max_attempts < 1:
+            raise ValueError("SUPABASE_MCP_RETRY_ATTEMPTS must be at least 1")
+        if config.base_delay < 0 or config.max_delay < config.base_delay:
+            raise ValueError(
+                "SUPABASE_MCP_RETRY_BASE_DELAY must be between 0 and SUPABASE_MCP_RETRY_MAX_DELAY"
+            )
+        if config.breaker_threshold < 0 or config.breaker_reset < 0:
+            raise ValueError("SUPABASE_MCP_BREAKER_* values must not be negative")
+        return config
+
+    def backoff(self, retry: int, rng: random.Random) -> float:
+        """
+        Compute the delay before a retry using exponential backoff with full jitter.
+
+        Args:
+            retry: Zero-based retry number
+            rng: Random source
+
+        Returns:
+            Seconds to wait
+        """
+        return rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** retry))
+
+
+class CircuitBreaker:
+    """
+    Tracks consecutive failures of one backend and fails fast while it is down.
+
+    Args:
+        name: Backend name used in error messages
+        threshold: Consecutive failures that open the breaker (0 disables it)
+        reset_timeout: Seconds to stay open before a half-open probe
+        clock: Monotonic clock, replaceable in tests
+    """
+
+    def __init__(
+        self,
+        name: str,
+        threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = "closed"
+        self.failures = 0
+        self.trips = 0
+        self.rejected = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    def acquire(self) -> bool:
+        """
+        Admit a call, or raise if the breaker is open.
+
+        Returns:
+            True if the call is the half-open probe
+
+        Raises:
+            CircuitOpenError: If the breaker is open or a probe is already running
+        """
+        if self.state == "open" and self.clock() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+        if self.state == "closed":
+            return False
+        if self.state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        self.rejected += 1
+        retry_in = max(0.0, self.opened_at + self.reset_timeout - self.clock())
+        raise CircuitOpenError(
+            f"The {self.name} backend is unavailable after {self.failures} consecutive "
+            f"failures; failing fast for another {retry_in:.1f}s"
+        )
+
+    def release(self, probe: bool, failed: Optional[bool]) -> None:
+        """
+        Record the outcome of an admitted call.
+
+        Args:
+            probe: Whether the call was the half-open probe
+            failed: True for a retryable failure, False for a response from the
+                backend, None if the call was cancelled before an outcome
+        """
+        if probe:
+            self._probing = False
+        if failed is None:
+            return
+        if not failed:
+            self.failures = 0
+            if probe:
+                self.state = "closed"
+            return
+        self.failures += 1
+        if self.threshold and (probe or self.failures >= self.threshold):
+            if self.state != "open":
+                self.trips += 1
+                logger.warning(
+                    "Circuit breaker for %s backend opened after %d failure(s)",
+                    self.name, self.failures,
+                )
+            self.state = "open"
+            self.opened_at = self.clock()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report the breaker's state.
+
+        Returns:
+            Dictionary with state, consecutive failures, trip and rejection counts
+        """
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
+
+
+class ResilientBackend(Backend):
+    """
+    Wraps a backend with classified retries and a circuit breaker.
+
+    Args:
+        inner: The backend that executes the operations
+        config: Retry and breaker settings
+        rng: Random source for jitter, replaceable in tests
+        clock: Monotonic clock for the breaker, replaceable in tests
+    """
+
+    def __init__(
+        self,
+        inner: Backend,
+        config: ResilienceConfig,
+        rng: Optional[random.Random] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.inner = inner
+        self.name = inner.name
+        self.config = config
+        self.rng = rng or random.Random()
+        self.breaker = CircuitBreaker(
+            inner.name, config.breaker_threshold, config.breaker_reset, clock
+        )
+        self.retries = 0
+        self.recovered = 0
+        self.exhausted = 0
+
+    async def _call(
+        self, operation: str, idempotent: bool, fn: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Run an operation, retrying classified failures with backoff.
+
+        Args:
+            operation: Name used in log messages
+            idempotent: Whether transient (possibly executed) failures may be retried
+            fn: Performs one attempt
+
+        Returns:
+            The operation's result
+        """
+        retryable = {UNSENT, TRANSIENT} if idempotent else {UNSENT}
+        attempt = 0
+        last_error: Optional[Exception] = None
+        while True:
+            try:
+                probe = self.breaker.acquire()
+            except CircuitOpenError as exc:
+                if last_error is None:
+                    raise
+                raise exc from last_error
+            failed: Optional[bool] = None
+            try:
+                result = await fn()
+                failed = False
+            except Exception as exc:
+                last_error = exc
+                kind = classify(exc)
+                failed = kind is not None
+                attempt += 1
+                if kind not in retryable:
+                    raise
+                if attempt >= self.config.max_attempts:
+                    self.exhausted += 1
+                    raise
+                delay = self.config.backoff(attempt - 1, self.rng)
+                logger.warning(
+                    "%s on %s backend failed (%s: %s); retry %d in %.2fs",
+                    operation, self.name, kind, type(exc).__name__, attempt, delay,
+                )
+            finally:
+                self.breaker.release(probe, failed)
+            if failed is False:
+                if attempt:
+                    self.recovered += 1
+                return result
+            self.retries += 1
+            await anyio.sleep(delay)
+
+    async def read(self, query: ReadQuery) -> List[Row]:
+        """Read rows, retrying unsent and transient failures."""
+        return await self._call("read", True, lambda: self.inner.read(query))
+
+    async def count(self, query: ReadQuery, method: str = "exact") -> Optional[int]:
+        """Count rows, retrying unsent and transient failures."""
+        return await self._call("count", True, lambda: self.inner.count(query, method))
+
+    async def read_counted(
+        self, query: ReadQuery, method: str = "exact"
+    ) -> Tuple[List[Row], Optional[int]]:
+        """Read rows with their count, retrying unsent and transient failures."""
+        return await self._call(
+            "read", True, lambda: self.inner.read_counted(query, method)
+        )
+
+    async def aggregate(self, query: AggregateQuery) -> List[Row]:
+        """Aggregate rows, retrying unsent and transient failures."""
+        return await self._call("aggregate", True, lambda: self.inner.aggregate(query))
+
+    async def explain(
+        self,
+        operation: str,
+        query: ReadQuery,
+        updates: Optional[Row] = None,
+        analyze: bool = False,
+    ) -> Row:
+        """Plan a query, retrying unsent and transient failures; ANALYZE only runs reads."""
+        return await self._call(
+            "explain", True, lambda: self.inner.explain(operation, query, updates, analyze)
+        )
+
+    async def indexes(self, tables: Sequence[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Read the index catalog, retrying unsent and transient failures."""
+        return await self._call("indexes", True, lambda: self.inner.indexes(tables))
+
+    async def insert(self, table: str, records: Records) -> Optional[List[Row]]:
+        """Insert records, retrying only failures where nothing was sent."""
+        return await self._call("insert", False, lambda: self.inner.insert(table, records))
+
+    async def update(
+        self, table: str, updates: Row, filters: Dict[str, Any]
+    ) -> Optional[List[Row]]:
+        """Update rows; transient failures retry only if the filters test no updated column."""
+        # Reason: setting fixed values is idempotent, but a replay of an update that
+        # changed a filtered column would match none of the rows it already updated
+        idempotent = not filter_columns(filters) & set(updates)
+        return await self._call(
+            "update", idempotent, lambda: self.inner.update(table, updates, filters)
+        )
+
+    async def delete(self, table: str, filters: Dict[str, Any]) -> Optional[List[Row]]:
+        """Delete rows, retrying only failures where nothing was sent."""
+        return await self._call("delete", False, lambda: self.inner.delete(table, filters))
+
+    async def aclose(self) -> None:
+        """Close the wrapped backend."""
+        await self.inner.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report the wrapped backend's metrics plus retry and breaker counters.
+
+        Returns:
+            The inner backend's stats with "retries" and "breaker" sections
+        """
+        return {
+            **self.inner.stats(),
+            "retries": {
+                "attempted": self.retries,
+                "recovered": self.recovered,
+                "exhausted": self.exhausted,
+            },
+            "breaker": self.breaker.stats(),
+        }
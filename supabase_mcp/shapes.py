@@ -0,0 +1,292 @@
+"""
+Recording of the query shapes the tools run, for index advice.
+
+A shape is a query with its values removed: the table, the columns its
+filters test for equality (eq, in, is), the columns they compare as ranges
+(gt, gte, lt, lte, range), and the columns it is ordered or grouped by. Each
+backend call is recorded under its shape with its operation and duration, so
+the shapes that cost the most time in total can be matched against the
+table's indexes (see advisor.py).
+
+Conditions inside "or" groups, pattern and containment filters, and the
+filters of embedded resources are not recorded: a plain b-tree index on the
+table does not serve them.
+
+Shapes are kept in memory, up to a maximum count; calls with new shapes past
+it are only counted as dropped. With SUPABASE_MCP_SHAPES_FILE set, shapes are
+loaded from the file at startup and written back on shutdown, so advice can
+also be computed offline with ``python -m supabase_mcp.advisor``.
+
+Environment variables:
+- SUPABASE_MCP_SHAPES: Record query shapes (default: true)
+- SUPABASE_MCP_SHAPES_MAX: Maximum distinct shapes kept (default: 1000)
+- SUPABASE_MCP_SHAPES_FILE: JSON file shapes are loaded from and saved to (default: none)
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .backends.base import AggregateQuery, Backend, ReadQuery, Records, Row
+from .config import env_bool, env_int
+from .filters import Condition, parse_filters
+
+_EQUALITY_OPS = {"eq", "in", "is"}
+_RANGE_OPS = {"gt", "gte", "lt", "lte", "range"}
+
+
+@dataclass
+class ShapeConfig:
+    """Query shape recording settings."""
+    enabled: bool = True
+    max_shapes: int = 1000
+    path: Optional[str] = None
+
+    @classmethod
+    def from_env(cls, env: Optional[Mapping[str, str]] = None) -> "ShapeConfig":
+        """
+        Build the configuration from environment variables.
+
+        Args:
+            env: Mapping to read from (default: os.environ)
+
+        Returns:
+            ShapeConfig: The configuration, with defaults for unset variables
+
+        Raises:
+            ValueError: If a variable is malformed
+        """
+        env = os.environ if env is None else env
+        config = cls(
+            enabled=env_bool("SUPABASE_MCP_SHAPES", cls.enabled, env),
+            max_shapes=env_int("SUPABASE_MCP_SHAPES_MAX", cls.max_shapes, env),
+            path=env.get("SUPABASE_MCP_SHAPES_FILE") or None,
+        )
+        if config.max_shapes < 1:
+            raise ValueError("SUPABASE_MCP_SHAPES_MAX must be at least 1")
+        return config
+
+
+@dataclass(frozen=True)
+class Shape:
+    """A query without its values."""
+    table: str
+    equal: Tuple[str, ...] = ()
+    ranges: Tuple[str, ...] = ()
+    order: Tuple[str, ...] = ()
+
+    @classmethod
+    def of(
+        cls, table: str, filters: Optional[Dict[str, Any]], order: Sequence[str] = ()
+    ) -> "Shape":
+        """
+        Normalize a query into its shape.
+
+        Args:
+            table: Name of the table
+            filters: The tool's filters argument
+            order: Ordering or grouping columns, in order
+
+        Returns:
+            Shape: Equality and range columns sorted, order kept
+        """
+        equal, ranges = set(), set()
+        for item in parse_filters(filters):
+            if isinstance(item, Condition):
+                if item.op in _EQUALITY_OPS:
+                    equal.add(item.column)
+                elif item.op in _RANGE_OPS:
+                    ranges.add(item.column)
+        return cls(table, tuple(sorted(equal)), tuple(sorted(ranges - equal)), tuple(order))
+
+
+@dataclass
+class ShapeStats:
+    """How often a shape ran and how long it took."""
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    operations: Dict[str, int] = field(default_factory=dict)
+
+
+class ShapeRecorder:
+    """
+    Aggregates backend calls by query shape.
+
+    Args:
+        config: Recording settings
+    """
+
+    def __init__(self, config: Optional[ShapeConfig] = None) -> None:
+        self.config = config or ShapeConfig()
+        self.shapes: Dict[Shape, ShapeStats] = {}
+        self.dropped = 0
+
+    def record(self, operation: str, shape: Shape, ms: float) -> None:
+        """Add one call of a shape."""
+        stats = self.shapes.get(shape)
+        if stats is None:
+            if len(self.shapes) >= self.config.max_shapes:
+                self.dropped += 1
+                return
+            stats = self.shapes[shape] = ShapeStats()
+        stats.calls += 1
+        stats.total_ms += ms
+        stats.max_ms = max(stats.max_ms, ms)
+        stats.operations[operation] = stats.operations.get(operation, 0) + 1
+
+    def dump(self) -> List[Dict[str, Any]]:
+        """Return the shapes and their stats as JSON-ready dictionaries."""
+        return [
+            {
+                "table": shape.table,
+                "equal": list(shape.equal),
+                "ranges": list(shape.ranges),
+                "order": list(shape.order),
+                "calls": stats.calls,
+                "total_ms": round(stats.total_ms, 3),
+                "max_ms": round(stats.max_ms, 3),
+                "operations": stats.operations,
+            }
+            for shape, stats in self.shapes.items()
+        ]
+
+    def load(self, entries: List[Dict[str, Any]]) -> None:
+        """Merge shapes previously returned by dump."""
+        for entry in entries:
+            shape = Shape(
+                entry["table"], tuple(entry["equal"]), tuple(entry["ranges"]),
+                tuple(entry["order"]),
+            )
+            stats = self.shapes.setdefault(shape, ShapeStats())
+            stats.calls += entry["calls"]
+            stats.total_ms += entry["total_ms"]
+            stats.max_ms = max(stats.max_ms, entry["max_ms"])
+            for operation, calls in entry["operations"].items():
+                stats.operations[operation] = stats.operations.get(operation, 0) + calls
+
+    def load_file(self) -> None:
+        """Load shapes from the configured file, if it exists."""
+        if self.config.path and os.path.exists(self.config.path):
+            with open(self.config.path, encoding="utf-8") as handle:
+                self.load(json.load(handle))
+
+    async def save_file(self) -> None:
+        """Write the shapes to the configured file; used as a shutdown hook."""
+        if self.config.path:
+            with open(self.config.path, "w", encoding="utf-8") as handle:
+                json.dump(self.dump(), handle)
+
+    def stats(self) -> Dict[str, Any]:
+        """Report how many shapes and calls were recorded."""
+        return {
+            "enabled": self.config.enabled,
+            "shapes": len(self.shapes),
+            "calls": sum(stats.calls for stats in self.shapes.values()),
+            "dropped": self.dropped,
+        }
+
+
+class ShapeRecordingBackend(Backend):
+    """
+    Records the shape and duration of each call to a wrapped backend.
+
+    Inserts are not recorded: they have no filters for an index to serve.
+
+    Args:
+        inner: The backend to record
+        recorder: Where shapes are recorded
+    """
+
+    def __init__(self, inner: Backend, recorder: ShapeRecorder) -> None:
+        self.inner = inner
+        self.name = inner.name
+        self.recorder = recorder
+
+    async def _timed(
+        self, operation: str, shape: Callable[[], Shape], fn: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Run a call and record its shape, whether or not it succeeds."""
+        start = time.perf_counter()
+        try:
+            return await fn()
+        finally:
+            ms = (time.perf_counter() - start) * 1000
+            try:
+                self.recorder.record(operation, shape(), ms)
+            except ValueError:
+                # Invalid filters: the call itself reports the error
+                pass
+
+    async def read(self, query: ReadQuery) -> List[Row]:
+        """Read rows and record the read's shape."""
+        return await self._timed(
+            "read", lambda: Shape.of(query.table, query.filters, query.order_keys),
+            lambda: self.inner.read(query),
+        )
+
+    async def count(self, query: ReadQuery, method: str = "exact") -> Optional[int]:
+        """Count rows and record the count's shape."""
+        return await self._timed(
+            "count", lambda: Shape.of(query.table, query.filters),
+            lambda: self.inner.count(query, method),
+        )
+
+    async def read_counted(
+        self, query: ReadQuery, method: str = "exact"
+    ) -> Tuple[List[Row], Optional[int]]:
+        """Read rows with their count and record the read's shape."""
+        return await self._timed(
+            "read", lambda: Shape.of(query.table, query.filters, query.order_keys),
+            lambda: self.inner.read_counted(query, method),
+        )
+
+    async def aggregate(self, query: AggregateQuery) -> List[Row]:
+        """Aggregate rows and record the shape, with the group_by columns as its order."""
+        return await self._timed(
+            "aggregate", lambda: Shape.of(query.table, query.filters, query.group_by),
+            lambda: self.inner.aggregate(query),
+        )
+
+    async def explain(
+        self,
+        operation: str,
+        query: ReadQuery,
+        updates: Optional[Row] = None,
+        analyze: bool = False,
+    ) -> Row:
+        """Plan a query without recording it."""
+        return await self.inner.explain(operation, query, updates, analyze)
+
+    async def indexes(self, tables: Sequence[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Return the wrapped backend's indexes."""
+        return await self.inner.indexes(tables)
+
+    async def insert(self, table: str, records: Records) -> Optional[List[Row]]:
+        """Insert records without recording them."""
+        return await self.inner.insert(table, records)
+
+    async def update(
+        self, table: str, updates: Row, filters: Dict[str, Any]
+    ) -> Optional[List[Row]]:
+        """Update rows and record the update's shape."""
+        return await self._timed(
+            "update", lambda: Shape.of(table, filters),
+            lambda: self.inner.update(table, updates, filters),
+        )
+
+    async def delete(self, table: str, filters: Dict[str, Any]) -> Optional[List[Row]]:
+        """Delete rows and record the delete's shape."""
+        return await self._timed(
+            "delete", lambda: Shape.of(table, filters), lambda: self.inner.delete(table, filters)
+        )
+
+    async def aclose(self) -> None:
+        """Close the wrapped backend."""
+        await self.inner.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        """Report the wrapped backend's metrics."""
+        return self.inner.stats()
@@ -0,0 +1,76 @@
+"""
+Streaming reads for stream_table_rows.
+
+Rows are fetched in keyset-paginated chunks and each chunk is handed to the
+caller's emitter as soon as it arrives, then dropped. Only one chunk is held
+in memory at a time, however many rows the read covers.
+"""
+
+import time
+from dataclasses import replace
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .backends.base import Backend, ReadQuery, Row
+from .pagination import finish_page, prepare_page
+
+# Called with the zero-based chunk number, its rows and the running row count
+ChunkEmitter = Callable[[int, List[Row], int], Awaitable[None]]
+
+
+async def stream_rows(
+    backend: Backend,
+    query: ReadQuery,
+    emit: ChunkEmitter,
+    chunk_size: int,
+    cursor_key: str = "id",
+    max_rows: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Read rows in chunks and emit each chunk as it arrives.
+
+    Args:
+        backend: The backend to read from
+        query: The read; its limit is ignored in favour of chunk_size and max_rows
+        emit: Receives each chunk
+        chunk_size: Rows fetched per round trip
+        cursor_key: Unique column that breaks ties in the chunk order
+        max_rows: Stop after this many rows (default: no limit)
+        cursor: Resume a previous stream from its next_cursor
+
+    Returns:
+        Summary with the rows and chunks streamed, elapsed seconds, whether the
+        read completed, and a next_cursor to resume from if it stopped at max_rows
+
+    Raises:
+        ValueError: If chunk_size or max_rows is not positive, or the cursor is invalid
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if max_rows is not None and max_rows < 1:
+        raise ValueError("max_rows must be at least 1")
+
+    start = time.perf_counter()
+    streamed = chunks = 0
+    next_cursor = cursor
+    while True:
+        size = chunk_size if max_rows is None else min(chunk_size, max_rows - streamed)
+        page, keys, added = prepare_page(replace(query, limit=size), cursor_key, next_cursor)
+        result = finish_page(page, await backend.read(page), keys, added)
+        next_cursor = result["next_cursor"]
+        if result["rows"]:
+            streamed += len(result["rows"])
+            await emit(chunks, result["rows"], streamed)
+            chunks += 1
+        del result
+        if next_cursor is None or (max_rows is not None and streamed >= max_rows):
+            break
+
+    return {
+        "table": query.table,
+        "rows_streamed": streamed,
+        "chunks": chunks,
+        "seconds": round(time.perf_counter() - start, 4),
+        "complete": next_cursor is None,
+        "next_cursor": next_cursor,
+    }
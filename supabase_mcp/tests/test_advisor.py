@@ -0,0 +1,259 @@
+"""
+Tests for index advice.
+
+This module contains tests for:
+- Normalizing queries into shapes and recording them through a backend
+- The shape limit and saving and loading shapes
+- Matching shapes against existing indexes and ranking suggestions
+- The index_advice tool, with and without an index catalog
+- Reading the index catalog from a live database (set TEST_DATABASE_URL to run)
+"""
+
+import json
+import os
+
+import pytest
+from unittest.mock import MagicMock
+from mcp.server.fastmcp import Context
+
+from supabase_mcp.advisor import advise, serves, suggested_columns
+from supabase_mcp.backends import PostgresConfig, ReadQuery
+from supabase_mcp.backends.base import Backend
+from supabase_mcp.server import SupabaseContext, index_advice, read_table_rows
+from supabase_mcp.shapes import (
+    Shape, ShapeConfig, ShapeRecorder, ShapeRecordingBackend, ShapeStats
+)
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+class CatalogBackend(Backend):
+    """Backend that returns no rows and a fixed index catalog."""
+
+    name = "catalog"
+
+    def __init__(self, catalog=None):
+        self.catalog = catalog
+
+    async def read(self, query):
+        return []
+
+    async def indexes(self, tables):
+        if self.catalog is None:
+            raise NotImplementedError
+        return {table: self.catalog.get(table, []) for table in tables}
+
+    async def insert(self, table, records):
+        raise NotImplementedError
+
+    async def update(self, table, updates, filters):
+        raise NotImplementedError
+
+    async def delete(self, table, filters):
+        raise NotImplementedError
+
+
+def stats(calls, total_ms):
+    """Build the stats of a shape read calls times."""
+    return ShapeStats(calls=calls, total_ms=total_ms, max_ms=total_ms, operations={"read": calls})
+
+
+def index(*columns, unique=False):
+    """Build a catalog entry."""
+    return {"name": "_".join(columns) + "_idx", "columns": list(columns), "unique": unique}
+
+
+class TestShapes:
+    """Tests for normalizing and recording query shapes."""
+
+    def test_shape_of(self):
+        """Test that values are dropped and columns split by operator."""
+        shape = Shape.of("events", {
+            "user_id": 7,
+            "kind": {"in": ["a", "b"]},
+            "created_at": {"gte": "2024-01-01", "lt": "2024-02-01"},
+            "title": {"ilike": "%x%"},
+            "or": [{"a": 1}, {"b": 2}],
+        }, ["created_at"])
+
+        assert shape == Shape("events", ("kind", "user_id"), ("created_at",), ("created_at",))
+        assert Shape.of("events", {"user_id": 8}) == Shape.of("events", {"user_id": {"eq": 9}})
+
+    @pytest.mark.asyncio
+    async def test_recording_backend(self):
+        """Test that reads, even failing ones, are recorded under their shape."""
+        recorder = ShapeRecorder()
+        backend = ShapeRecordingBackend(CatalogBackend(), recorder)
+
+        await backend.read(ReadQuery(table="events", filters={"user_id": 1}, order_by="id"))
+        await backend.read(ReadQuery(table="events", filters={"user_id": 2}, order_by="id"))
+        with pytest.raises(NotImplementedError):
+            await backend.delete("events", {"user_id": 3})
+
+        # Verify the two reads share a shape and the failed delete is counted
+        assert recorder.shapes[Shape("events", ("user_id",), (), ("id",))].calls == 2
+        assert recorder.shapes[Shape("events", ("user_id",))].operations == {"delete": 1}
+        assert recorder.stats() == {"enabled": True, "shapes": 2, "calls": 3, "dropped": 0}
+
+    @pytest.mark.asyncio
+    async def test_limit_and_round_trip(self, tmp_path):
+        """Test that new shapes past the limit are dropped, and shapes survive a file."""
+        path = str(tmp_path / "shapes.json")
+        recorder = ShapeRecorder(ShapeConfig(max_shapes=1, path=path))
+        recorder.record("read", Shape("a", ("x",)), 5.0)
+        recorder.record("read", Shape("b", ("x",)), 5.0)
+        recorder.record("count", Shape("a", ("x",)), 1.0)
+
+        assert recorder.dropped == 1
+        await recorder.save_file()
+
+        # Verify loading merges into what is already recorded
+        loaded = ShapeRecorder(ShapeConfig(path=path))
+        loaded.load_file()
+        loaded.load_file()
+        assert loaded.shapes == {Shape("a", ("x",)): ShapeStats(
+            calls=4, total_ms=12.0, max_ms=5.0, operations={"read": 2, "count": 2}
+        )}
+        with open(path, encoding="utf-8") as handle:
+            assert json.load(handle)[0]["table"] == "a"
+
+    def test_config(self):
+        """Test the defaults and that the limit must be positive."""
+        assert ShapeConfig.from_env({}) == ShapeConfig(enabled=True, max_shapes=1000, path=None)
+        assert not ShapeConfig.from_env({"SUPABASE_MCP_SHAPES": "false"}).enabled
+        with pytest.raises(ValueError, match="at least 1"):
+            ShapeConfig.from_env({"SUPABASE_MCP_SHAPES_MAX": "0"})
+
+
+class TestAdvise:
+    """Tests for matching shapes against indexes."""
+
+    @pytest.mark.parametrize("shape, columns", [
+        (Shape("t", ("a", "b"), ("c",), ("d",)), ("a", "b", "d")),
+        (Shape("t", ("a",), ("c", "e")), ("a", "c")),
+        (Shape("t", ("a",), (), ("a", "d")), ("a", "d")),
+        (Shape("t"), ()),
+    ])
+    def test_suggested_columns(self, shape, columns):
+        """Test that equality columns lead, then order or the first range column."""
+        assert suggested_columns(shape) == columns
+
+    @pytest.mark.parametrize("existing, served", [
+        (index("b", "a", "d"), True),
+        (index("a", "b", "d", "e"), True),
+        (index("a", "b"), False),
+        (index("a", "d", "b"), False),
+        (index("a", unique=True), True),
+        (index("a", "z", unique=True), False),
+    ])
+    def test_serves(self, existing, served):
+        """Test which indexes serve a shape filtering a and b, ordered by d."""
+        shape = Shape("t", ("a", "b"), (), ("d",))
+        assert serves(existing, shape, suggested_columns(shape)) is served
+
+    def test_ranking_and_merging(self):
+        """Test that prefixes merge and suggestions are ranked by total time."""
+        shapes = {
+            Shape("events", ("user_id",)): stats(10, 100.0),
+            Shape("events", ("user_id",), (), ("created_at",)): stats(5, 50.0),
+            Shape("orders", ("status",)): stats(2, 400.0),
+            Shape("orders", ("id",)): stats(50, 900.0),
+            Shape("orders"): stats(3, 30.0),
+            Shape("rare", ("x",)): stats(1, 5000.0),
+        }
+        report = advise(shapes, {"orders": [index("id", unique=True)]}, min_calls=2)
+
+        # Verify the primary key lookups are covered and the scans are unindexable
+        assert (report["shapes"], report["indexed"], report["unindexable"]) == (5, 1, 1)
+        assert [(a["table"], a["columns"]) for a in report["advice"]] == [
+            ("orders", ["status"]), ("events", ["user_id", "created_at"]),
+        ]
+        events = report["advice"][1]
+        assert (events["calls"], events["total_ms"], events["mean_ms"]) == (15, 150.0, 10.0)
+        assert events["shapes"] == 2
+        assert events["ddl"] == (
+            'CREATE INDEX CONCURRENTLY ON "events" ("user_id", "created_at")'
+        )
+
+    def test_without_catalog(self):
+        """Test that nothing counts as indexed when the catalog is unknown."""
+        report = advise({Shape("orders", ("id",)): stats(1, 1.0)}, None, limit=1)
+
+        assert report["indexed"] is None
+        assert report["advice"][0]["columns"] == ["id"]
+
+
+class TestIndexAdviceTool:
+    """Tests for the index_advice tool."""
+
+    @staticmethod
+    def context(catalog):
+        """Create a mock MCP context whose backend records shapes."""
+        mock_context = MagicMock(spec=Context)
+        app = SupabaseContext(backend=None)
+        app.backend = app.wrap_backend(CatalogBackend(catalog))
+        mock_context.request_context.lifespan_context = app
+        return mock_context
+
+    @pytest.mark.asyncio
+    async def test_advice_from_tool_calls(self):
+        """Test that reads made through the tools are advised on."""
+        # Create mock context with an index on events.id
+        mock_context = self.context({"events": [index("id", unique=True)]})
+
+        for user in range(3):
+            await read_table_rows(ctx=mock_context, table_name="events", filters={"user_id": user})
+        await read_table_rows(ctx=mock_context, table_name="events", filters={"id": 1})
+        await read_table_rows(ctx=mock_context, table_name="users", filters={"name": "x"})
+        result = await index_advice(ctx=mock_context, table_name="events")
+
+        # Verify only the events shapes were considered and the key lookup is covered
+        assert (result["shapes"], result["indexed"]) == (2, 1)
+        assert [entry["columns"] for entry in result["advice"]] == [["user_id"]]
+        assert result["advice"][0]["calls"] == 3
+
+    @pytest.mark.asyncio
+    async def test_no_catalog(self):
+        """Test that a backend without a catalog still gets advice."""
+        mock_context = self.context(None)
+
+        await read_table_rows(ctx=mock_context, table_name="events", filters={"id": 1})
+        result = await index_advice(ctx=mock_context)
+
+        assert result["indexed"] is None
+        assert len(result["advice"]) == 1
+
+        with pytest.raises(ValueError, match="at least 1"):
+            await index_advice(ctx=mock_context, limit=0)
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+class TestIndexCatalogLive:
+    """Tests for reading indexes from a real database."""
+
+    @pytest.mark.asyncio
+    async def test_indexes(self):
+        """Test that key columns are listed and partial and expression indexes skipped."""
+        from supabase_mcp.backends import PostgresBackend
+
+        backend = await PostgresBackend.connect(PostgresConfig(TEST_DATABASE_URL, 1, 1))
+        try:
+            await backend.pool.execute(
+                "DROP TABLE IF EXISTS mcp_test_advice;"
+                "CREATE TABLE mcp_test_advice (id bigint PRIMARY KEY, a int, b text);"
+                "CREATE INDEX mcp_test_advice_ab ON mcp_test_advice (a, b) INCLUDE (id);"
+                "CREATE INDEX mcp_test_advice_partial ON mcp_test_advice (b) WHERE a > 0;"
+                "CREATE INDEX mcp_test_advice_expr ON mcp_test_advice (a, lower(b))"
+            )
+
+            indexes = await backend.indexes(["mcp_test_advice", "mcp_test_missing"])
+
+            assert sorted(indexes["mcp_test_advice"], key=lambda i: i["name"]) == [
+                {"name": "mcp_test_advice_ab", "columns": ["a", "b"], "unique": False},
+                {"name": "mcp_test_advice_expr", "columns": ["a"], "unique": False},
+                {"name": "mcp_test_advice_pkey", "columns": ["id"], "unique": True},
+            ]
+            assert indexes["mcp_test_missing"] == []
+        finally:
+            await backend.pool.execute("DROP TABLE IF EXISTS mcp_test_advice")
+            await backend.aclose()
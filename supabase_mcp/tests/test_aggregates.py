@@ -0,0 +1,217 @@
+"""
+Tests for server-side aggregation.
+
+This module contains tests for:
+- Parsing aggregate specifications
+- The PostgREST select and SQL generated for aggregate queries
+- The aggregate_table MCP tool
+- Aggregates against a live database (set TEST_DATABASE_URL to run)
+"""
+
+import os
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from mcp.server.fastmcp import Context
+from postgrest import APIError, AsyncPostgrestClient
+
+from supabase_mcp.backends import PostgrestBackend, PostgresConfig
+from supabase_mcp.backends.base import Aggregate, AggregateQuery
+from supabase_mcp.backends.postgrest import aggregate_select, apply_filters
+from supabase_mcp.backends.sql import build_aggregate
+from supabase_mcp.server import SupabaseContext, aggregate_table
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+TYPES = {"id": "bigint", "status": "text", "amount": "numeric", "customer": "integer"}
+
+
+class TestAggregateParse:
+    """Tests for parsing aggregate specifications."""
+
+    @pytest.mark.parametrize("spec, expected, alias", [
+        ("count", Aggregate("count"), "count"),
+        ("COUNT(*)", Aggregate("count"), "count"),
+        ("count(email)", Aggregate("count", "email"), "count_email"),
+        (" sum( amount ) ", Aggregate("sum", "amount"), "sum_amount"),
+        ("max(created_at)", Aggregate("max", "created_at"), "max_created_at"),
+    ])
+    def test_parses(self, spec, expected, alias):
+        """Test that supported forms parse and get stable result names."""
+        aggregate = Aggregate.parse(spec)
+
+        assert aggregate == expected
+        assert aggregate.alias == alias
+
+    @pytest.mark.parametrize("spec, message", [
+        ("median(amount)", "Invalid aggregate"),
+        ("sum(amount); drop table x", "Invalid aggregate"),
+        ("sum", "needs a column"),
+        ("avg(*)", "needs a column"),
+    ])
+    def test_rejects_invalid(self, spec, message):
+        """Test that unknown functions and missing columns raise ValueError."""
+        with pytest.raises(ValueError, match=message):
+            Aggregate.parse(spec)
+
+
+def aggregate_query(**kwargs):
+    """Build an aggregate query over the orders table."""
+    specs = kwargs.pop("aggregates", ["count", "sum(amount)"])
+    return AggregateQuery(
+        table="orders", aggregates=[Aggregate.parse(s) for s in specs], **kwargs
+    )
+
+
+class TestPostgrestAggregates:
+    """Tests for the PostgREST requests generated for aggregates."""
+
+    def test_select(self):
+        """Test that group columns and aliased aggregates form the select list."""
+        query = aggregate_query(aggregates=["count", "avg(amount)"], group_by=["status"])
+
+        assert aggregate_select(query) == "status,count(),avg_amount:amount.avg()"
+
+    def test_rejects_non_column_group(self):
+        """Test that group_by cannot smuggle in PostgREST select syntax."""
+        with pytest.raises(ValueError, match="Invalid group_by column"):
+            aggregate_select(aggregate_query(group_by=["status,secret"]))
+
+    def test_filters_reuse_read_grammar(self):
+        """Test that aggregate filters compile exactly like read filters."""
+        query = aggregate_query(group_by=["status"], filters={"amount": {"gt": 10}})
+        request = AsyncPostgrestClient("http://localhost").table("orders")
+        request = apply_filters(request.select(aggregate_select(query)), query.filters)
+
+        assert str(request.params) == (
+            "select=status%2Ccount%28%29%2Csum_amount%3Aamount.sum%28%29&amount=gt.10"
+        )
+
+    @pytest.mark.asyncio
+    async def test_disabled_aggregates_explain_the_fix(self):
+        """Test that PostgREST's aggregates-disabled error becomes a clear ValueError."""
+        client = MagicMock()
+        request = client.table.return_value.select.return_value
+        request.order.return_value = request
+        request.execute = AsyncMock(side_effect=APIError({
+            "code": "PGRST123", "message": "Use of aggregate functions is not allowed",
+        }))
+
+        with pytest.raises(ValueError, match="db-aggregates-enabled"):
+            await PostgrestBackend(lambda: client).aggregate(aggregate_query(group_by=["status"]))
+
+
+class TestSqlAggregates:
+    """Tests for the SQL generated for aggregates."""
+
+    def test_group_by(self):
+        """Test that aggregates, filters, grouping and limit compile to one statement."""
+        sql, args = build_aggregate(aggregate_query(
+            aggregates=["count", "sum(amount)", "max(id)"],
+            group_by=["customer", "status"],
+            filters={"status": {"neq": "void"}},
+            limit=5,
+        ), TYPES)
+
+        assert sql == (
+            'SELECT "customer", "status", count(*) AS "count", sum("amount") AS "sum_amount", '
+            'max("id") AS "max_id" FROM "orders" WHERE "status" <> $1::text::text '
+            'GROUP BY "customer", "status" ORDER BY "customer", "status" '
+            'LIMIT $2::text::bigint'
+        )
+        assert args == ["void", "5"]
+
+    def test_without_group_by(self):
+        """Test that no group_by aggregates the whole selection into one row."""
+        sql, args = build_aggregate(aggregate_query(aggregates=["count"]), TYPES)
+
+        assert sql == 'SELECT count(*) AS "count" FROM "orders"'
+        assert args == []
+
+    @pytest.mark.parametrize("kwargs", [
+        {"group_by": ["nope"]},
+        {"aggregates": ["sum(nope)"]},
+    ])
+    def test_rejects_unknown_columns(self, kwargs):
+        """Test that unknown group or aggregate columns raise ValueError."""
+        with pytest.raises(ValueError, match="does not exist"):
+            build_aggregate(aggregate_query(**kwargs), TYPES)
+
+
+class TestAggregateTable:
+    """Tests for the aggregate_table MCP tool."""
+
+    @pytest.mark.asyncio
+    async def test_counts_per_group(self):
+        """Test that the tool sends one aggregate request and returns its groups."""
+        # Create mock context
+        mock_context = MagicMock(spec=Context)
+        mock_supabase = MagicMock()
+        mock_context.request_context.lifespan_context = SupabaseContext(client=mock_supabase)
+
+        # Mock the Supabase query chain
+        mock_query = MagicMock()
+        mock_supabase.table.return_value.select.return_value = mock_query
+        mock_query.filter.return_value = mock_query
+        mock_query.order.return_value = mock_query
+        groups = [{"status": "open", "count": 3}, {"status": "paid", "count": 5}]
+        mock_query.execute = AsyncMock(return_value=MagicMock(data=groups))
+
+        result = await aggregate_table(
+            ctx=mock_context,
+            table_name="orders",
+            aggregates=["count"],
+            group_by=["status"],
+            filters={"amount": {"gte": 10}},
+        )
+
+        # Verify the aggregate was pushed down with the filter
+        assert result == groups
+        mock_supabase.table.return_value.select.assert_called_once_with("status,count()")
+        mock_query.filter.assert_called_once_with("amount", "gte", "10")
+        mock_query.order.assert_called_once_with("status")
+
+    @pytest.mark.asyncio
+    async def test_requires_an_aggregate(self):
+        """Test that an empty aggregate list is rejected before any request."""
+        # Create mock context
+        mock_context = MagicMock(spec=Context)
+        mock_supabase = MagicMock()
+        mock_context.request_context.lifespan_context = SupabaseContext(client=mock_supabase)
+
+        with pytest.raises(ValueError, match="at least one aggregate"):
+            await aggregate_table(ctx=mock_context, table_name="orders", aggregates=[])
+        mock_supabase.table.assert_not_called()
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+class TestPostgresAggregatesLive:
+    """Tests for aggregates against a live Postgres database."""
+
+    @pytest.mark.asyncio
+    async def test_group_by(self):
+        """Test that aggregates return JSON-friendly values per group."""
+        from supabase_mcp.backends import PostgresBackend
+
+        backend = await PostgresBackend.connect(PostgresConfig(TEST_DATABASE_URL, 1, 1))
+        try:
+            await backend.pool.execute(
+                "DROP TABLE IF EXISTS mcp_test_aggregates;"
+                "CREATE TABLE mcp_test_aggregates AS SELECT g AS id,"
+                " CASE WHEN g % 2 = 0 THEN 'even' ELSE 'odd' END AS parity,"
+                " (g * 1.5)::numeric AS amount FROM generate_series(1, 10) g"
+            )
+            query = AggregateQuery(
+                table="mcp_test_aggregates",
+                aggregates=[Aggregate.parse(s) for s in ("count", "sum(amount)", "max(id)")],
+                group_by=["parity"],
+                filters={"id": {"lte": 9}},
+            )
+
+            assert await backend.aggregate(query) == [
+                {"parity": "even", "count": 4, "sum_amount": 30, "max_id": 8},
+                {"parity": "odd", "count": 5, "sum_amount": 37.5, "max_id": 9},
+            ]
+        finally:
+            await backend.pool.execute("DROP TABLE IF EXISTS mcp_test_aggregates")
+            await backend.aclose()
@@ -0,0 +1,329 @@
+"""
+Tests for the execution backends.
+
+This module contains tests for:
+- selected_backend
+- PostgresConfig.from_env
+- SQL generation for the postgres backend
+- The postgres backend against a live database (set TEST_DATABASE_URL to run)
+"""
+
+import asyncio
+import os
+from decimal import Decimal
+
+import anyio
+import pytest
+
+from supabase_mcp.backends import PostgresConfig, ReadQuery, selected_backend
+from supabase_mcp.backends.sql import (
+    build_count,
+    build_delete,
+    build_insert,
+    build_select,
+    build_update,
+    quote_ident,
+    to_json_value,
+    to_pg_text,
+)
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+TYPES = {"id": "bigint", "name": "text", "tags": "text[]", "meta": "jsonb", "active": "boolean"}
+
+
+class TestSelectedBackend:
+    """Tests for choosing the backend."""
+
+    def test_defaults_to_postgrest(self):
+        """Test that PostgREST is used when the variable is unset."""
+        assert selected_backend({}) == "postgrest"
+
+    def test_reads_variable(self):
+        """Test that the postgres backend can be selected."""
+        assert selected_backend({"SUPABASE_MCP_BACKEND": " Postgres "}) == "postgres"
+
+    def test_rejects_unknown_backend(self):
+        """Test that an unknown backend name raises ValueError."""
+        with pytest.raises(ValueError, match="SUPABASE_MCP_BACKEND"):
+            selected_backend({"SUPABASE_MCP_BACKEND": "mysql"})
+
+
+class TestPostgresConfig:
+    """Tests for the asyncpg backend configuration."""
+
+    def test_requires_database_url(self):
+        """Test that DATABASE_URL is required."""
+        with pytest.raises(ValueError, match="DATABASE_URL"):
+            PostgresConfig.from_env({})
+
+    def test_reads_all_variables(self):
+        """Test that every variable is applied."""
+        config = PostgresConfig.from_env({
+            "DATABASE_URL": "postgresql://localhost/db",
+            "DATABASE_POOL_MIN_SIZE": "2",
+            "DATABASE_POOL_MAX_SIZE": "5",
+            "DATABASE_STATEMENT_CACHE_SIZE": "0",
+            "DATABASE_STATEMENT_TIMEOUT": "2.5",
+        })
+
+        assert config == PostgresConfig("postgresql://localhost/db", 2, 5, 0, 2.5)
+        assert config.server_settings == {"statement_timeout": "2500"}
+
+    def test_rejects_min_above_max(self):
+        """Test that the minimum pool size cannot exceed the maximum."""
+        with pytest.raises(ValueError):
+            PostgresConfig.from_env({
+                "DATABASE_URL": "postgresql://localhost/db",
+                "DATABASE_POOL_MIN_SIZE": "6",
+                "DATABASE_POOL_MAX_SIZE": "5",
+            })
+
+
+class TestSqlGeneration:
+    """Tests for the SQL built by the postgres backend."""
+
+    def test_quote_ident_escapes_quotes(self):
+        """Test that identifiers cannot break out of their quotes."""
+        assert quote_ident('a"b') == '"a""b"'
+
+    def test_select_binds_filters_and_limit(self):
+        """Test that filter values and the limit are bound, never interpolated."""
+        query = ReadQuery(
+            table="users", columns="id, name", filters={"name": "x'; --", "active": None},
+            order_by="id", ascending=False, limit=10,
+        )
+
+        sql, args = build_select(query, TYPES)
+
+        assert sql == (
+            'SELECT "id", "name" FROM "users" WHERE "name" = $1::text::text '
+            'AND "active" IS NULL ORDER BY "id" DESC LIMIT $2::text::bigint'
+        )
+        assert args == ["x'; --", "10"]
+
+    def test_select_rejects_unknown_column(self):
+        """Test that PostgREST-only select syntax is rejected clearly."""
+        with pytest.raises(ValueError, match="plain column lists"):
+            build_select(ReadQuery(table="users", columns="id,orders(*)"), TYPES)
+
+    def test_insert_fills_missing_columns_with_null(self):
+        """Test that a multi-row insert uses the union of the records' columns."""
+        sql, args = build_insert("users", [{"id": 1}, {"id": 2, "name": "b"}], TYPES)
+
+        assert sql == (
+            'INSERT INTO "users" ("id", "name") VALUES ($1::text::bigint, $2::text::text), '
+            '($3::text::bigint, $4::text::text) RETURNING *'
+        )
+        assert args == ["1", None, "2", "b"]
+
+    def test_update_and_delete_require_filters(self):
+        """Test that unfiltered writes are refused."""
+        with pytest.raises(ValueError, match="WHERE"):
+            build_update("users", {"name": "x"}, {}, TYPES)
+        with pytest.raises(ValueError, match="WHERE"):
+            build_delete("users", {}, TYPES)
+
+    def test_count(self):
+        """Test that counts bind filters and planned counts only EXPLAIN."""
+        assert build_count("users", {"active": True}, TYPES) == (
+            'SELECT count(*) FROM "users" WHERE "active" = $1::text::boolean', ["true"]
+        )
+        assert build_count("users", None, TYPES, planned=True) == (
+            'EXPLAIN (FORMAT JSON) SELECT 1 FROM "users"', []
+        )
+
+    def test_value_conversion(self):
+        """Test conversion of JSON values to and from Postgres text."""
+        assert to_pg_text(True, "boolean") == "true"
+        assert to_pg_text(["a", 'b"c'], "text[]") == '{"a","b\\"c"}'
+        assert to_pg_text({"k": [1]}, "jsonb") == '{"k": [1]}'
+        assert to_json_value(Decimal("7.50")) == 7.5
+        assert to_json_value(Decimal("3")) == 3
+        assert to_json_value(b"\x01\xff") == "\\x01ff"
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+class TestPostgresBackendLive:
+    """Tests for the postgres backend against a real database."""
+
+    @pytest.mark.asyncio
+    async def test_crud_round_trip(self):
+        """Test insert, read, update and delete through the asyncpg pool."""
+        from supabase_mcp.backends import PostgresBackend
+
+        backend = await PostgresBackend.connect(PostgresConfig(TEST_DATABASE_URL, 1, 2))
+        try:
+            await backend.pool.execute(
+                "DROP TABLE IF EXISTS mcp_test_items;"
+                "CREATE TABLE mcp_test_items (id bigint PRIMARY KEY, name text,"
+                " tags text[], meta jsonb, price numeric, created_at timestamptz DEFAULT now())"
+            )
+
+            created = await backend.insert("mcp_test_items", [
+                {"id": 1, "name": "a", "tags": ["x", "y"], "meta": {"k": 1}, "price": "1.50"},
+                {"id": 2, "name": "b"},
+            ])
+            assert [row["id"] for row in created] == [1, 2]
+            assert created[0]["tags"] == ["x", "y"]
+            assert created[0]["meta"] == {"k": 1}
+            assert created[0]["price"] == 1.5
+            assert isinstance(created[0]["created_at"], str)
+
+            rows = await backend.read(ReadQuery(
+                table="mcp_test_items", columns="id,name", filters={"name": "b"}
+            ))
+            assert rows == [{"id": 2, "name": "b"}]
+
+            updated = await backend.update("mcp_test_items", {"name": "c"}, {"id": 2})
+            assert updated[0]["name"] == "c"
+
+            deleted = await backend.delete("mcp_test_items", {"id": 1})
+            assert [row["id"] for row in deleted] == [1]
+
+            stats = backend.stats()
+            assert stats["name"] == "postgres"
+            assert stats["queries"] == 4
+        finally:
+            await backend.pool.execute("DROP TABLE IF EXISTS mcp_test_items")
+            await backend.aclose()
+
+    @pytest.mark.asyncio
+    async def test_keyset_pages_cover_table(self):
+        """Test that following cursors visits every row once, in order."""
+        from supabase_mcp.backends import PostgresBackend
+        from supabase_mcp.pagination import finish_page, prepare_page
+
+        backend = await PostgresBackend.connect(PostgresConfig(TEST_DATABASE_URL, 1, 1))
+        try:
+            await backend.pool.execute(
+                "DROP TABLE IF EXISTS mcp_test_pages;"
+                "CREATE TABLE mcp_test_pages AS SELECT g AS id, g % 3 AS bucket"
+                " FROM generate_series(1, 25) g"
+            )
+            query = ReadQuery(table="mcp_test_pages", columns="id", order_by="bucket",
+                              ascending=False, limit=4)
+            seen, cursor = [], None
+            while True:
+                page, keys, added = prepare_page(query, "id", cursor)
+                result = finish_page(page, await backend.read(page), keys, added)
+                seen += [row["id"] for row in result["rows"]]
+                cursor = result["next_cursor"]
+                if cursor is None:
+                    break
+
+            expected = sorted(range(1, 26), key=lambda i: (i % 3, i), reverse=True)
+            assert seen == expected
+        finally:
+            await backend.pool.execute("DROP TABLE IF EXISTS mcp_test_pages")
+            await backend.aclose()
+
+    @pytest.mark.asyncio
+    async def test_cancellation_stops_statement(self):
+        """Test that cancelling a call cancels the statement in Postgres."""
+        from supabase_mcp.backends import PostgresBackend
+
+        backend = await PostgresBackend.connect(PostgresConfig(TEST_DATABASE_URL, 1, 2))
+        try:
+            await backend.pool.execute(
+                "CREATE OR REPLACE VIEW mcp_test_slow AS SELECT 1 AS id, pg_sleep(5)::text AS slept"
+            )
+            with anyio.move_on_after(0.2):
+                await backend.read(ReadQuery(table="mcp_test_slow"))
+
+            # Verify the database is no longer running the query
+            await asyncio.sleep(0.2)
+            running = await backend.pool.fetchval(
+                "SELECT count(*) FROM pg_stat_activity "
+                "WHERE query LIKE '%mcp_test_slow%' AND state = 'active' "
+                "AND pid <> pg_backend_pid()"
+            )
+            assert running == 0
+        finally:
+            await backend.pool.execute("DROP VIEW IF EXISTS mcp_test_slow")
+            await backend.aclose()
+
+    @pytest.mark.asyncio
+    async def test_statement_timeout(self):
+        """Test that DATABASE_STATEMENT_TIMEOUT is applied to pooled connections."""
+        from supabase_mcp.backends import PostgresBackend
+
+        backend = await PostgresBackend.connect(
+            PostgresConfig(TEST_DATABASE_URL, 1, 1, statement_timeout=1.5)
+        )
+        try:
+            assert await backend.pool.fetchval("SHOW statement_timeout") == "1500ms"
+        finally:
+            await backend.aclose()
+
+    @pytest.mark.asyncio
+    async def test_unknown_table(self):
+        """Test that a missing table raises ValueError."""
+        from supabase_mcp.backends import PostgresBackend
+
+        backend = await PostgresBackend.connect(PostgresConfig(TEST_DATABASE_URL, 1, 1))
+        try:
+            with pytest.raises(ValueError, match="does not exist"):
+                await backend.read(ReadQuery(table="no_such_table"))
+        finally:
+            await backend.aclose()
+
+    @pytest.mark.asyncio
+    async def test_count_methods(self):
+        """Test exact, planned and estimated counts."""
+        from supabase_mcp.backends import PostgresBackend
+
+        backend = await PostgresBackend.connect(PostgresConfig(TEST_DATABASE_URL, 1, 1))
+        try:
+            await backend.pool.execute(
+                "DROP TABLE IF EXISTS mcp_test_counts;"
+                "CREATE TABLE mcp_test_counts AS SELECT g AS id FROM generate_series(1, 5000) g;"
+                "ANALYZE mcp_test_counts"
+            )
+            everything = ReadQuery(table="mcp_test_counts")
+            few = ReadQuery(table="mcp_test_counts", filters={"id": {"lte": 10}}, limit=3)
+
+            assert await backend.count(everything) == 5000
+            assert await backend.count(few) == 10
+            assert await backend.count(everything, "planned") == 5000
+            # Small results are counted exactly, large ones are planned
+            assert await backend.count(few, "estimated") == 10
+            assert await backend.count(everything, "estimated") == 5000
+
+            rows, total = await backend.read_counted(few)
+            assert [row["id"] for row in rows] == [1, 2, 3] and total == 10
+        finally:
+            await backend.pool.execute("DROP TABLE IF EXISTS mcp_test_counts")
+            await backend.aclose()
+
+    @pytest.mark.asyncio
+    async def test_filter_operators(self):
+        """Test that the filter grammar runs against real column types."""
+        from supabase_mcp.backends import PostgresBackend
+
+        backend = await PostgresBackend.connect(PostgresConfig(TEST_DATABASE_URL, 1, 1))
+        try:
+            await backend.pool.execute(
+                "DROP TABLE IF EXISTS mcp_test_filters;"
+                "CREATE TABLE mcp_test_filters AS SELECT g AS id,"
+                " timestamptz '2024-01-01' + g * interval '1 day' AS created_at,"
+                " CASE WHEN g % 2 = 0 THEN 'even' ELSE 'odd' END AS parity,"
+                " ARRAY['t' || (g % 3)] AS tags, jsonb_build_object('g', g) AS meta"
+                " FROM generate_series(1, 10) g"
+            )
+
+            async def ids(filters):
+                rows = await backend.read(ReadQuery(
+                    table="mcp_test_filters", columns="id", filters=filters, order_by="id"
+                ))
+                return [row["id"] for row in rows]
+
+            assert await ids({"created_at": {"gt": "2024-01-08"}}) == [8, 9, 10]
+            assert await ids({"id": {"in": [2, 3, 99]}}) == [2, 3]
+            assert await ids({"id": {"range": [4, 6]}, "parity": {"like": "ev%"}}) == [4, 6]
+            assert await ids({"tags": {"contains": ["t0"]}}) == [3, 6, 9]
+            assert await ids({"meta": {"contains": {"g": 7}}}) == [7]
+            assert await ids({"or": [{"id": 1}, {"parity": "even", "id": {"gte": 9}}]}) == [1, 10]
+        finally:
+            await backend.pool.execute("DROP TABLE IF EXISTS mcp_test_filters")
+            await backend.aclose()
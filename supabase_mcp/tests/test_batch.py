@@ -0,0 +1,209 @@
+"""
+Tests for batched reads.
+
+This module contains tests for:
+- Reading the batch limits from the environment
+- Validating read specs and their keys
+- batch_read running reads concurrently under a cap with isolated errors
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import MagicMock
+from mcp.server.fastmcp import Context
+
+from supabase_mcp.backends.base import Backend
+from supabase_mcp.batch import BatchConfig, batch_keys
+from supabase_mcp.server import SupabaseContext, batch_read
+
+TABLES = {
+    "users": [{"id": 7, "name": "Ada"}],
+    "orders": [{"id": n, "user_id": 7} for n in range(1, 4)],
+}
+
+
+class SlowBackend(Backend):
+    """In-memory backend whose reads take a while and record their concurrency."""
+
+    name = "slow"
+
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+
+    async def read(self, query):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(0.02)
+            if query.table not in TABLES:
+                raise ValueError(f"relation {query.table!r} does not exist")
+            rows = TABLES[query.table]
+            return rows[:query.limit] if query.limit else rows
+        finally:
+            self.running -= 1
+
+    async def count(self, query, method="exact"):
+        return len(TABLES[query.table])
+
+    async def insert(self, table, records):
+        raise NotImplementedError
+
+    async def update(self, table, updates, filters):
+        raise NotImplementedError
+
+    async def delete(self, table, filters):
+        raise NotImplementedError
+
+
+def batch_context(**config):
+    """Create a mock MCP context over a SlowBackend."""
+    mock_context = MagicMock(spec=Context)
+    backend = SlowBackend()
+    mock_context.request_context.lifespan_context = SupabaseContext(
+        backend=backend, batch=BatchConfig(**config)
+    )
+    return mock_context, backend
+
+
+class TestBatchConfig:
+    """Tests for the batch limits."""
+
+    def test_defaults_and_env(self):
+        """Test the defaults and that variables override them."""
+        assert BatchConfig.from_env({}) == BatchConfig(max_concurrency=8, max_reads=50)
+        assert BatchConfig.from_env({"SUPABASE_MCP_BATCH_CONCURRENCY": "2"}).max_concurrency == 2
+
+    def test_rejects_non_positive(self):
+        """Test that limits below one are rejected."""
+        with pytest.raises(ValueError, match="SUPABASE_MCP_BATCH_MAX_READS"):
+            BatchConfig.from_env({"SUPABASE_MCP_BATCH_MAX_READS": "0"})
+
+
+class TestBatchKeys:
+    """Tests for validating read specs."""
+
+    def test_named_and_positional_keys(self):
+        """Test that reads without a key are keyed by their position."""
+        assert batch_keys([{"key": "user"}, {}, {"key": 5}], 10) == ["user", "1", "5"]
+
+    @pytest.mark.parametrize("specs, message", [
+        ([], "at least one read"),
+        ([{}] * 3, "at most 2 reads"),
+        ([{"key": "a"}, {"key": "a"}], "Duplicate read key 'a'"),
+        (["users"], "Read 0 must be an object"),
+    ])
+    def test_rejects_invalid(self, specs, message):
+        """Test that malformed batches are rejected as a whole."""
+        with pytest.raises(ValueError, match=message):
+            batch_keys(specs, 2)
+
+
+class TestBatchRead:
+    """Tests for the batch_read MCP tool."""
+
+    @pytest.mark.asyncio
+    async def test_reads_run_concurrently(self):
+        """Test that the reads overlap and their results are keyed by spec."""
+        # Create mock context
+        mock_context, backend = batch_context()
+
+        result = await batch_read(ctx=mock_context, reads=[
+            {"key": "user", "table_name": "users", "filters": {"id": 7}},
+            {"key": "orders", "table_name": "orders", "limit": 2},
+            {"table_name": "orders", "count": "exact"},
+        ])
+
+        # Verify each result and that all reads ran at once
+        results = result["results"]
+        assert results["user"]["data"] == TABLES["users"]
+        assert results["orders"]["data"] == TABLES["orders"][:2]
+        assert results["2"]["data"]["rows"] == TABLES["orders"]
+        assert all(entry["ms"] > 0 for entry in results.values())
+        assert backend.peak == 3
+        assert result["ms"] < 3 * 20
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self):
+        """Test that no more reads run at once than the cap allows."""
+        # Create mock context with a server cap of 2
+        mock_context, backend = batch_context(max_concurrency=2)
+
+        reads = [{"table_name": "orders", "limit": n} for n in range(1, 7)]
+
+        await batch_read(ctx=mock_context, reads=reads, max_concurrency=10)
+
+        # Verify the server cap wins over a larger request
+        assert backend.peak == 2
+
+        backend.peak = 0
+        await batch_read(ctx=mock_context, reads=reads, max_concurrency=1)
+
+        # Verify a smaller request lowers the cap
+        assert backend.peak == 1
+
+    @pytest.mark.asyncio
+    async def test_errors_are_isolated(self):
+        """Test that failing reads report errors while the others succeed."""
+        # Create mock context
+        mock_context, _ = batch_context()
+
+        result = await batch_read(ctx=mock_context, reads=[
+            {"key": "ok", "table_name": "users"},
+            {"key": "missing", "table_name": "nope"},
+            {"key": "typo", "table_name": "users", "filter": {"id": 7}},
+            {"key": "no_table", "columns": "id"},
+        ])
+
+        # Verify each failure is reported in its own entry
+        results = result["results"]
+        assert results["ok"]["data"] == TABLES["users"]
+        assert results["missing"]["error"] == "ValueError: relation 'nope' does not exist"
+        assert results["typo"]["error"] == "ValueError: Unknown read arguments: filter"
+        assert results["no_table"]["error"] == "ValueError: Each read needs a table_name"
+
+    @pytest.mark.asyncio
+    async def test_specs_are_validated_like_tool_arguments(self):
+        """Test that spec arguments are coerced and checked as read_table_rows' are."""
+        # Create mock context
+        mock_context, _ = batch_context()
+
+        result = await batch_read(ctx=mock_context, reads=[
+            {"key": "coerced", "table_name": "orders", "limit": "2"},
+            {"key": "invalid", "table_name": "orders", "limit": "lots"},
+        ])
+
+        # Verify the numeric string was accepted and the bad value rejected up front
+        results = result["results"]
+        assert results["coerced"]["data"] == TABLES["orders"][:2]
+        assert results["invalid"]["error"].startswith("ValidationError: 1 validation error")
+
+    @pytest.mark.asyncio
+    async def test_drain_lets_admitted_batch_finish(self):
+        """Test that reads queued inside a running batch still run during a drain."""
+        # Create mock context running one read at a time
+        mock_context, backend = batch_context()
+        app = mock_context.request_context.lifespan_context
+        reads = [{"key": str(n), "table_name": "users"} for n in range(3)]
+
+        batch = asyncio.create_task(
+            batch_read(ctx=mock_context, reads=reads, max_concurrency=1)
+        )
+        while not backend.running:
+            await asyncio.sleep(0)
+        report = await app.calls.drain(timeout=5)
+        result = await batch
+
+        # Verify every read ran and the drain counted the batch as one completed call
+        assert all("data" in entry for entry in result["results"].values())
+        assert (report.in_flight_at_start, report.completed, report.abandoned) == (1, 1, 0)
+
+    @pytest.mark.asyncio
+    async def test_rejects_invalid_concurrency(self):
+        """Test that a concurrency below one is rejected."""
+        # Create mock context
+        mock_context, _ = batch_context()
+
+        with pytest.raises(ValueError, match="max_concurrency must be at least 1"):
+            await batch_read(ctx=mock_context, reads=[{"table_name": "users"}], max_concurrency=0)
@@ -0,0 +1,210 @@
+"""
+Tests for response byte budgets.
+
+This module contains tests for:
+- Reading SUPABASE_MCP_MAX_RESPONSE_BYTES
+- Fitting rows into a budget
+- Truncated pages and their continuation cursors
+- read_table_rows walking a table through truncated pages
+- Truncated plain reads, which keep their order and read once
+"""
+
+import json
+
+import pytest
+from unittest.mock import MagicMock
+from mcp.server.fastmcp import Context
+
+from supabase_mcp.backends.base import Backend, ReadQuery
+from supabase_mcp.budget import (
+    DEFAULT_MAX_RESPONSE_BYTES,
+    encoded_size,
+    max_response_bytes,
+    rows_within,
+)
+from supabase_mcp.pagination import decode_cursor, finish_page, prepare_page
+from supabase_mcp.server import SupabaseContext, read_table_rows
+
+
+class TestMaxResponseBytes:
+    """Tests for reading the server-wide budget."""
+
+    def test_default(self):
+        """Test that the budget defaults to 1 MiB."""
+        assert max_response_bytes({}) == DEFAULT_MAX_RESPONSE_BYTES == 1_048_576
+
+    def test_reads_and_validates(self):
+        """Test that the variable is read and negative values are rejected."""
+        assert max_response_bytes({"SUPABASE_MCP_MAX_RESPONSE_BYTES": "0"}) == 0
+        with pytest.raises(ValueError, match="must not be negative"):
+            max_response_bytes({"SUPABASE_MCP_MAX_RESPONSE_BYTES": "-1"})
+
+
+class TestRowsWithin:
+    """Tests for fitting rows into a budget."""
+
+    def test_counts_rows_that_fit(self):
+        """Test that rows are added until the encoded array would exceed the budget."""
+        rows = [{"id": n} for n in range(10)]
+        size = encoded_size(rows[0]) + 1
+
+        assert rows_within(rows, 1 + 3 * size) == 3
+        assert rows_within(rows, 1 + 3 * size - 1) == 2
+
+    def test_no_budget_and_oversized_first_row(self):
+        """Test that 0 means no budget and at least one row is always sent."""
+        rows = [{"payload": "x" * 100}, {"payload": "y"}]
+
+        assert rows_within(rows, 0) == 2
+        assert rows_within(rows, 10) == 1
+        assert rows_within([], 10) == 0
+
+
+class TestTruncatedPage:
+    """Tests for pages cut short by the budget."""
+
+    def test_cursor_resumes_after_last_row_sent(self):
+        """Test that a truncated page's cursor starts after its last kept row."""
+        rows = [{"id": n, "note": "x" * 20} for n in range(1, 6)]
+        page, keys, added = prepare_page(ReadQuery(table="notes", limit=5), "id", None)
+
+        budget = 1 + 2 * (encoded_size(rows[0]) + 1)
+
+        result = finish_page(page, rows, keys, added, max_bytes=budget)
+
+        assert [row["id"] for row in result["rows"]] == [1, 2]
+        assert result["truncated"] is True
+        cursor = decode_cursor(result["next_cursor"])
+        assert cursor.values == [2]
+        assert cursor.limit == 2
+
+    def test_cursor_page_size_applies_without_limit(self):
+        """Test that the recorded page size is used when the call passes no limit."""
+        first, keys, added = prepare_page(ReadQuery(table="notes", limit=3), "id", None)
+        token = finish_page(first, [{"id": 1}, {"id": 2}, {"id": 3}], keys, added)["next_cursor"]
+
+        page, _, _ = prepare_page(ReadQuery(table="notes"), "id", token)
+
+        assert page.limit == 3
+        assert page.after == [3]
+
+
+class ListBackend(Backend):
+    """In-memory backend that honours ordering, keyset position and limit."""
+
+    name = "list"
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.reads = []
+
+    async def read(self, query):
+        self.reads.append(query)
+        rows = list(self.rows)
+        keys = query.order_keys
+        if keys:
+            # Sort NULLs last ascending and first descending, as Postgres does
+            rows.sort(key=lambda row: [(row[k] is None, row[k] or 0) for k in keys],
+                      reverse=not query.ascending)
+        if query.after is not None:
+            after = list(query.after)
+            rows = [
+                row for row in rows
+                if ([row[k] for k in keys] > after if query.ascending
+                    else [row[k] for k in keys] < after)
+            ]
+        return rows[:query.limit] if query.limit else rows
+
+    async def insert(self, table, records):
+        raise NotImplementedError
+
+    async def update(self, table, updates, filters):
+        raise NotImplementedError
+
+    async def delete(self, table, filters):
+        raise NotImplementedError
+
+
+class TestReadTableRowsBudget:
+    """Tests for read_table_rows under a byte budget."""
+
+    @pytest.mark.asyncio
+    async def test_small_reads_are_unchanged(self):
+        """Test that a read within the budget is still a plain list."""
+        # Create mock context
+        mock_context = MagicMock(spec=Context)
+        backend = ListBackend([{"id": 1}, {"id": 2}])
+        mock_context.request_context.lifespan_context = SupabaseContext(backend=backend)
+
+        assert await read_table_rows(ctx=mock_context, table_name="t") == [{"id": 1}, {"id": 2}]
+
+    @pytest.mark.asyncio
+    async def test_continuations_cover_every_row_once(self):
+        """Test that following next_cursor returns every row exactly once within budget."""
+        # Create mock context with a small budget
+        mock_context = MagicMock(spec=Context)
+        rows = [{"id": n, "body": "x" * (n % 7) * 10} for n in range(100, 0, -1)]
+        backend = ListBackend(rows)
+        mock_context.request_context.lifespan_context = SupabaseContext(
+            backend=backend, max_response_bytes=600
+        )
+
+        result = await read_table_rows(ctx=mock_context, table_name="t", paginate=True)
+        seen = []
+        while True:
+            assert len(json.dumps(result["rows"])) <= 600
+            seen += [row["id"] for row in result["rows"]]
+            if result["next_cursor"] is None:
+                break
+            result = await read_table_rows(
+                ctx=mock_context, table_name="t", cursor=result["next_cursor"]
+            )
+
+        # Verify the walk returned each row once, in keyset order
+        assert seen == list(range(1, 101))
+
+    @pytest.mark.asyncio
+    async def test_per_call_override(self):
+        """Test that max_bytes overrides the server default, and 0 disables it."""
+        # Create mock context
+        mock_context = MagicMock(spec=Context)
+        backend = ListBackend([{"id": n, "body": "x" * 50} for n in range(1, 21)])
+        mock_context.request_context.lifespan_context = SupabaseContext(backend=backend)
+
+        small = await read_table_rows(ctx=mock_context, table_name="t", max_bytes=200)
+        everything = await read_table_rows(
+            ctx=mock_context, table_name="t", max_bytes=0, limit=20, order_by="id"
+        )
+
+        assert small["truncated"] is True and len(small["rows"]) == 2
+        assert len(everything) == 20
+
+    @pytest.mark.asyncio
+    async def test_truncated_plain_read(self):
+        """Test that a plain read over the budget keeps its order and is read once."""
+        # Create mock context over rows ordered by a column with NULLs
+        mock_context = MagicMock(spec=Context)
+        rows = [{"id": n, "due": None if n % 2 else n, "body": "x" * 50} for n in range(1, 11)]
+        backend = ListBackend(rows)
+        mock_context.request_context.lifespan_context = SupabaseContext(backend=backend)
+
+        result = await read_table_rows(
+            ctx=mock_context, table_name="t", order_by="due", ascending=False, max_bytes=200
+        )
+
+        # Verify the rows that fit, in the read's own order, and no cursor
+        assert result == {"rows": [rows[0], rows[2]], "next_cursor": None, "truncated": True}
+        assert len(backend.reads) == 1
+        assert backend.reads[0].order_keys == ["due"]
+
+    @pytest.mark.asyncio
+    async def test_without_cursor_key_column(self):
+        """Test that rows without the cursor key are truncated without a cursor."""
+        # Create mock context
+        mock_context = MagicMock(spec=Context)
+        backend = ListBackend([{"name": "x" * 50} for _ in range(10)])
+        mock_context.request_context.lifespan_context = SupabaseContext(backend=backend)
+
+        result = await read_table_rows(ctx=mock_context, table_name="t", max_bytes=200)
+
+        assert result == {"rows": [{"name": "x" * 50}] * 3, "next_cursor": None, "truncated": True}
@@ -0,0 +1,306 @@
+"""
+Tests for the read_table_rows result cache.
+
+This module contains tests for:
+- CacheConfig
+- cache_key canonicalization
+- QueryCache TTL, LRU and byte limits
+- Invalidation by writes
+- Coalescing of concurrent identical reads
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+from supabase_mcp.backends.base import ReadQuery
+from supabase_mcp.cache import CacheConfig, QueryCache, cache_key, disjoint
+
+
+class Clock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def loader(rows=None):
+    """Create a loader returning fixed rows."""
+    return AsyncMock(return_value=rows if rows is not None else [{"id": 1}])
+
+
+class TestCacheConfig:
+    """Tests for reading cache settings."""
+
+    def test_disabled_by_default(self):
+        """Test that caching is off unless a TTL is configured."""
+        assert CacheConfig.from_env({}).enabled is False
+
+    def test_reads_table_ttls(self):
+        """Test that per-table TTLs override the default."""
+        config = CacheConfig.from_env({
+            "SUPABASE_MCP_CACHE_TTL": "5",
+            "SUPABASE_MCP_CACHE_TABLES": '{"countries": 3600, "events": 0}',
+        })
+
+        assert config.ttl_for("countries") == 3600
+        assert config.ttl_for("events") == 0
+        assert config.ttl_for("users") == 5
+
+    def test_rejects_malformed_tables(self):
+        """Test that invalid per-table JSON raises ValueError."""
+        with pytest.raises(ValueError, match="SUPABASE_MCP_CACHE_TABLES"):
+            CacheConfig.from_env({"SUPABASE_MCP_CACHE_TABLES": "[1, 2]"})
+
+
+class TestCacheKey:
+    """Tests for query canonicalization."""
+
+    def test_equivalent_queries_share_a_key(self):
+        """Test that column whitespace and filter order do not matter."""
+        a = ReadQuery(table="users", columns="id, name", filters={"a": 1, "b": True})
+        b = ReadQuery(table="users", columns="id,name", filters={"b": True, "a": 1},
+                      ascending=False)
+        assert cache_key(a) == cache_key(b)
+
+    def test_different_queries_differ(self):
+        """Test that limits and filter values are part of the key."""
+        base = ReadQuery(table="users", filters={"a": 1})
+        assert cache_key(base) != cache_key(ReadQuery(table="users", filters={"a": "1"}))
+        assert cache_key(base) != cache_key(ReadQuery(table="users", filters={"a": 1}, limit=5))
+
+
+class TestQueryCache:
+    """Tests for cache behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_hit_until_expiry(self):
+        """Test that a cached read is served until its TTL passes."""
+        clock = Clock()
+        cache = QueryCache(CacheConfig(ttl=10), clock=clock)
+        load = loader()
+        query = ReadQuery(table="users")
+
+        await cache.get_or_load(query, load)
+        await cache.get_or_load(query, load)
+        clock.now = 11
+        await cache.get_or_load(query, load)
+
+        assert load.await_count == 2
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 2, 1)
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_by_entries(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = QueryCache(CacheConfig(ttl=60, max_entries=2))
+        a, b, c = (ReadQuery(table="users", limit=n) for n in (1, 2, 3))
+
+        await cache.get_or_load(a, loader())
+        await cache.get_or_load(b, loader())
+        await cache.get_or_load(a, loader())  # a is now most recently used
+        await cache.get_or_load(c, loader())
+
+        load = loader()
+        await cache.get_or_load(a, load)
+        await cache.get_or_load(b, load)
+        assert load.await_count == 1  # only b was evicted
+        assert cache.stats()["evictions"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_byte_limit(self):
+        """Test that total bytes stay under the limit and oversized results are skipped."""
+        cache = QueryCache(CacheConfig(ttl=60, max_bytes=40))
+        small = [{"id": 1}]  # 11 bytes of JSON
+        for n in range(5):
+            await cache.get_or_load(ReadQuery(table="users", limit=n + 1), loader(small))
+        await cache.get_or_load(ReadQuery(table="big"), loader([{"x": "y" * 100}]))
+
+        stats = cache.stats()
+        assert stats["bytes"] <= 40
+        assert stats["entries"] == 3
+        assert stats["oversized"] == 1
+
+    @pytest.mark.asyncio
+    async def test_table_policy_disables(self):
+        """Test that a table with TTL 0 is never cached."""
+        cache = QueryCache(CacheConfig(ttl=60, table_ttls={"events": 0}))
+        load = loader()
+        for _ in range(2):
+            await cache.get_or_load(ReadQuery(table="events"), load)
+
+        assert load.await_count == 2
+        assert cache.stats()["misses"] == 0
+
+
+class TestInvalidation:
+    """Tests for dropping cached reads a write could have changed."""
+
+    def test_disjoint(self):
+        """Test that only contradicting equality filters prove disjointness."""
+        assert disjoint({"status": "open"}, {"status": "closed"})
+        assert disjoint({"id": 5}, {"id": "6"})
+        assert not disjoint({"id": 5}, {"id": "5.0"})
+        assert not disjoint({"status": "open"}, {"id": 1})  # status unknown
+        assert not disjoint({}, {"id": 1})
+        assert not disjoint(
+            {"at": "2024-01-01T00:00:00Z"}, {"at": "2024-01-01T00:00:00+00:00"}
+        )
+        # Only equality conditions can prove disjointness
+        assert disjoint({"status": {"eq": "open"}}, {"status": "closed"})
+        assert not disjoint({"amount": {"gt": 5}}, {"amount": 1})
+        assert not disjoint({"or": [{"status": "open"}, {"id": 1}]}, {"status": "closed"})
+
+    @pytest.mark.asyncio
+    async def test_naive_and_aware_timestamps_overlap(self):
+        """Test that a naive timestamp is never proven to differ from an aware one."""
+        cache = QueryCache(CacheConfig(ttl=60))
+        query = ReadQuery(table="events", filters={"at": "2024-01-01T00:00:00"})
+        await cache.get_or_load(query, loader())
+
+        # Verify the same instant with an offset still drops the read
+        assert not disjoint({"at": "2024-01-01T00:00:00"}, {"at": "2024-01-01T00:00:00+00:00"})
+        assert not disjoint({"at": "2024-01-01T00:00:00Z"}, {"at": "2024-06-01T00:00:00"})
+        assert cache.invalidate("events", [{"at": "2024-01-01T00:00:00+00:00"}]) == 1
+
+    @pytest.mark.asyncio
+    async def test_scoped_to_table_and_filters(self):
+        """Test that a write drops only reads it could have changed."""
+        cache = QueryCache(CacheConfig(ttl=60))
+        reads = {
+            "open": ReadQuery(table="orders", filters={"status": "open"}),
+            "closed": ReadQuery(table="orders", filters={"status": "closed"}),
+            "all": ReadQuery(table="orders"),
+            "users": ReadQuery(table="users"),
+        }
+        for query in reads.values():
+            await cache.get_or_load(query, loader())
+
+        dropped = cache.invalidate("orders", [{"id": 9, "status": "open"}])
+
+        # Verify the closed orders and users reads survived
+        assert dropped == 2
+        load = loader()
+        await cache.get_or_load(reads["closed"], load)
+        await cache.get_or_load(reads["users"], load)
+        load.assert_not_awaited()
+        await cache.get_or_load(reads["open"], load)
+        load.assert_awaited_once()
+        assert cache.stats()["invalidated"] == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_rows_drop_table(self):
+        """Test that a write without row patterns drops every read of the table."""
+        cache = QueryCache(CacheConfig(ttl=60))
+        await cache.get_or_load(ReadQuery(table="orders", filters={"id": 1}), loader())
+        await cache.get_or_load(ReadQuery(table="users"), loader())
+
+        assert cache.invalidate("orders") == 1
+        assert cache.stats()["entries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_read_overlapping_write_not_cached(self):
+        """Test that a read in flight during a write is not stored."""
+        cache = QueryCache(CacheConfig(ttl=60))
+        query = ReadQuery(table="orders")
+
+        async def load_during_write(q):
+            cache.invalidate("orders", [{"id": 1}])
+            return [{"id": 1}]
+
+        await cache.get_or_load(query, load_during_write)
+
+        assert cache.stats()["entries"] == 0
+
+
+class Gate:
+    """Loader that blocks until released and counts its calls."""
+
+    def __init__(self, rows=None):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.rows = rows if rows is not None else [{"id": 1}]
+
+    async def __call__(self, query):
+        self.calls += 1
+        await self.release.wait()
+        return self.rows
+
+
+class TestCoalescing:
+    """Tests for sharing one load between concurrent identical reads."""
+
+    @pytest.mark.asyncio
+    async def test_identical_reads_share_a_load(self):
+        """Test that concurrent identical reads make one request, even uncached."""
+        cache = QueryCache()
+        gate = Gate()
+        reads = [
+            asyncio.create_task(cache.get_or_load(ReadQuery(table="users"), gate))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+        gate.release.set()
+
+        results = await asyncio.gather(*reads)
+
+        assert gate.calls == 1
+        assert all(rows == [{"id": 1}] for rows in results)
+        assert cache.stats()["coalesced"] == 4
+        assert cache.stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_are_shared(self):
+        """Test that waiters receive the loading call's error."""
+        cache = QueryCache()
+
+        async def failing(query):
+            await asyncio.sleep(0)
+            raise RuntimeError("boom")
+
+        reads = [
+            asyncio.create_task(cache.get_or_load(ReadQuery(table="users"), failing))
+            for _ in range(2)
+        ]
+        results = await asyncio.gather(*reads, return_exceptions=True)
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_hands_over(self):
+        """Test that a waiter loads itself when the shared load is cancelled."""
+        cache = QueryCache()
+        gate = Gate()
+        leader = asyncio.create_task(cache.get_or_load(ReadQuery(table="users"), gate))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(cache.get_or_load(ReadQuery(table="users"), gate))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        gate.release.set()
+
+        assert await follower == [{"id": 1}]
+        assert gate.calls == 2
+        assert leader.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_read_after_write_does_not_join(self):
+        """Test that a read starting after a write does not share an older load."""
+        cache = QueryCache()
+        gate = Gate()
+        first = asyncio.create_task(cache.get_or_load(ReadQuery(table="users"), gate))
+        await asyncio.sleep(0)
+        cache.invalidate("users", [{"id": 1}])
+        second = asyncio.create_task(cache.get_or_load(ReadQuery(table="users"), gate))
+        await asyncio.sleep(0)
+        gate.release.set()
+
+        await asyncio.gather(first, second)
+
+        assert gate.calls == 2
+        assert cache.stats()["coalesced"] == 0
@@ -0,0 +1,237 @@
+"""
+Tests for the Realtime change feed.
+
+This module contains tests for:
+- ChangeFeedConfig
+- Applying change events to the result cache
+- Subscribing through a local websocket stand-in for Supabase Realtime
+"""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import pytest
+from unittest.mock import AsyncMock
+from realtime import AsyncRealtimeClient
+
+from supabase_mcp.backends.base import ReadQuery
+from supabase_mcp.cache import CacheConfig, QueryCache
+from supabase_mcp.change_feed import ChangeFeed, ChangeFeedConfig
+
+
+def change(kind, record=None, old=None, table="orders", committed=None):
+    """Build a postgres_changes payload as Realtime delivers it."""
+    return {
+        "ids": [1],
+        "data": {
+            "schema": "public",
+            "table": table,
+            "type": kind,
+            "record": record or {},
+            "old_record": old or {},
+            "commit_timestamp": committed,
+        },
+    }
+
+
+async def cached(cache, query, rows):
+    """Store rows in the cache for a query."""
+    await cache.get_or_load(query, AsyncMock(return_value=rows))
+
+
+class TestChangeFeedConfig:
+    """Tests for reading change feed settings."""
+
+    def test_disabled_by_default(self):
+        """Test that the feed is off unless tables are configured."""
+        assert ChangeFeedConfig.from_env({}).enabled is False
+
+    def test_reads_tables(self):
+        """Test that tables, schema and URL are read."""
+        config = ChangeFeedConfig.from_env({
+            "SUPABASE_MCP_REALTIME_TABLES": "orders, users",
+            "SUPABASE_MCP_REALTIME_SCHEMA": "sales",
+            "SUPABASE_URL": "https://example.supabase.co",
+        })
+
+        assert config.tables == ["orders", "users"]
+        assert config.schema == "sales"
+        assert config.url == "https://example.supabase.co/realtime/v1"
+
+    def test_realtime_url(self):
+        """Test that the default URL is the project's Realtime endpoint unless overridden."""
+        config = ChangeFeedConfig.from_env({"SUPABASE_URL": "https://example.supabase.co/"})
+        client = AsyncRealtimeClient(config.url, "key")
+
+        # Verify the client connects where Supabase serves Realtime
+        assert client.url.startswith("wss://example.supabase.co/realtime/v1/websocket")
+        assert ChangeFeedConfig.from_env({
+            "SUPABASE_URL": "https://example.supabase.co",
+            "SUPABASE_MCP_REALTIME_URL": "ws://localhost:4000/socket",
+        }).url == "ws://localhost:4000/socket"
+        assert ChangeFeedConfig.from_env({}).url is None
+
+
+class TestHandle:
+    """Tests for applying change events to the cache."""
+
+    @pytest.mark.asyncio
+    async def test_update_patches_in_place(self):
+        """Test that an update to a cached row replaces it without a reload."""
+        cache = QueryCache(CacheConfig(ttl=60))
+        query = ReadQuery(table="orders", columns="id,status", filters={"customer": 3})
+        await cached(cache, query, [{"id": 1, "status": "open"}, {"id": 2, "status": "open"}])
+        feed = ChangeFeed(cache, ChangeFeedConfig(tables=["orders"]))
+
+        feed.handle(change(
+            "UPDATE",
+            record={"id": 2, "customer": 3, "status": "closed", "total": 9},
+            old={"id": 2},
+        ))
+
+        # Verify the cached read now holds the new value, projected to its columns
+        load = AsyncMock()
+        rows = await cache.get_or_load(query, load)
+        load.assert_not_awaited()
+        assert rows == [{"id": 1, "status": "open"}, {"id": 2, "status": "closed"}]
+        assert feed.stats()["patched"] == 1
+
+    @pytest.mark.asyncio
+    async def test_update_leaving_filter_invalidates(self):
+        """Test that a row moving out of a cached read's filter drops the read."""
+        cache = QueryCache(CacheConfig(ttl=60))
+        await cached(cache, ReadQuery(table="orders", filters={"status": "open"}), [{"id": 1}])
+        feed = ChangeFeed(cache, ChangeFeedConfig(tables=["orders"]))
+
+        feed.handle(change("UPDATE", record={"id": 1, "status": "closed"}, old={"id": 1}))
+
+        assert cache.stats()["entries"] == 0
+        assert feed.stats()["invalidated"] == 1
+
+    @pytest.mark.asyncio
+    async def test_insert_and_delete_invalidate(self):
+        """Test that inserts and deletes drop only reads they could change."""
+        cache = QueryCache(CacheConfig(ttl=60))
+        await cached(cache, ReadQuery(table="orders", filters={"status": "open"}), [])
+        await cached(cache, ReadQuery(table="orders", filters={"id": 5}), [{"id": 5}])
+        feed = ChangeFeed(cache, ChangeFeedConfig(tables=["orders"]))
+
+        feed.handle(change("INSERT", record={"id": 7, "status": "closed"}))
+        assert cache.stats()["entries"] == 2
+
+        feed.handle(change("DELETE", old={"id": 6}))
+        assert cache.stats()["entries"] == 1
+
+    def test_reports_lag(self):
+        """Test that commit-to-cache lag is measured from commit_timestamp."""
+        committed = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        feed = ChangeFeed(
+            QueryCache(), ChangeFeedConfig(tables=["orders"]),
+            clock=lambda: committed.timestamp() + 0.25,
+        )
+
+        feed.handle(change(
+            "INSERT", record={"id": 1}, committed=committed.isoformat().replace("+00:00", "Z")
+        ))
+
+        assert feed.stats()["lag_ms"] == {"last": 250.0, "mean": 250.0, "max": 250.0}
+
+    def test_ignores_other_tables(self):
+        """Test that events for tables that are not followed are ignored."""
+        feed = ChangeFeed(QueryCache(), ChangeFeedConfig(tables=["orders"]))
+
+        feed.handle(change("INSERT", record={"id": 1}, table="users"))
+
+        assert feed.stats()["ignored"] == 1
+
+
+class RealtimeStandIn:
+    """Minimal Phoenix socket that acknowledges joins and emits synthetic changes."""
+
+    def __init__(self):
+        self.sockets = []
+        self.topic = None
+        self.joined = asyncio.Event()
+
+    async def handler(self, websocket):
+        self.sockets.append(websocket)
+        async for raw in websocket:
+            message = json.loads(raw)
+            if message["event"] == "phx_join":
+                self.topic = message["topic"]
+                bindings = message["payload"]["config"]["postgres_changes"]
+                await websocket.send(json.dumps({
+                    "topic": self.topic,
+                    "event": "phx_reply",
+                    "ref": message["ref"],
+                    "payload": {
+                        "status": "ok",
+                        "response": {
+                            "postgres_changes": [
+                                {"id": n + 1, **binding} for n, binding in enumerate(bindings)
+                            ]
+                        },
+                    },
+                }))
+                self.joined.set()
+
+    async def emit(self, data):
+        for websocket in self.sockets:
+            await websocket.send(json.dumps({
+                "topic": self.topic,
+                "event": "postgres_changes",
+                "ref": None,
+                "payload": {"ids": [1], "data": data},
+            }))
+
+
+class TestStandInSubscription:
+    """Tests for the feed against a local websocket stand-in."""
+
+    @pytest.mark.asyncio
+    async def test_events_reach_the_cache(self):
+        """Test that the feed subscribes, resyncs and applies streamed changes."""
+        websockets_server = pytest.importorskip("websockets.asyncio.server")
+        stand_in = RealtimeStandIn()
+        async with websockets_server.serve(stand_in.handler, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            cache = QueryCache(CacheConfig(ttl=60))
+            query = ReadQuery(table="orders", filters={"status": "open"})
+            feed = ChangeFeed(
+                cache,
+                ChangeFeedConfig(tables=["orders"], url=f"http://127.0.0.1:{port}"),
+                key="service-key",
+            )
+            feed.start()
+            try:
+                await asyncio.wait_for(stand_in.joined.wait(), 5)
+                for _ in range(100):
+                    if feed.subscribed:
+                        break
+                    await asyncio.sleep(0.01)
+                assert feed.stats()["resyncs"] == 1
+
+                # Cache a read, then emit an insert that belongs in it
+                await cached(cache, query, [])
+                await stand_in.emit({
+                    "schema": "public",
+                    "table": "orders",
+                    "type": "INSERT",
+                    "record": {"id": 1, "status": "open"},
+                    "old_record": {},
+                    "commit_timestamp": datetime.now(timezone.utc).isoformat(),
+                })
+                for _ in range(100):
+                    if feed.stats()["events"]:
+                        break
+                    await asyncio.sleep(0.01)
+
+                # Verify the read was dropped and the lag was measured
+                stats = feed.stats()
+                assert stats["events"] == 1
+                assert stats["invalidated"] == 1
+                assert stats["lag_ms"]["last"] is not None
+                assert cache.stats()["entries"] == 0
+            finally:
+                await feed.aclose()
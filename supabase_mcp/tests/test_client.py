@@ -0,0 +1,93 @@
+"""
+Tests for client construction and fast-start mode.
+
+This module contains tests for:
+- fast_start_enabled
+- create_postgrest_client
+- postgrest_of
+- Keeping heavy supabase sub-packages off the import path
+"""
+
+import subprocess
+import sys
+
+import pytest
+from unittest.mock import MagicMock
+
+from supabase_mcp.client import (
+    create_postgrest_client,
+    fast_start_enabled,
+    postgrest_of,
+)
+from supabase_mcp.pool import PoolConfig, PooledPostgrestClient
+
+HEAVY_MODULES = ["supabase", "realtime", "storage3", "gotrue", "supafunc", "websockets"]
+
+
+class TestFastStartEnabled:
+    """Tests for reading the fast-start flag."""
+
+    def test_disabled_by_default(self):
+        """Test that fast-start is off when the variable is unset."""
+        assert fast_start_enabled({}) is False
+
+    def test_enabled_by_variable(self):
+        """Test that fast-start can be switched on."""
+        assert fast_start_enabled({"SUPABASE_MCP_FAST_START": "1"}) is True
+
+
+class TestCreatePostgrestClient:
+    """Tests for the PostgREST-only fast-start client."""
+
+    @pytest.mark.asyncio
+    async def test_builds_authenticated_pooled_client(self):
+        """Test that the client targets the REST endpoint with the service key."""
+        client = create_postgrest_client(
+            "https://example.supabase.co", "service-key", PoolConfig(max_connections=4)
+        )
+
+        assert isinstance(client, PooledPostgrestClient)
+        assert str(client.session.base_url) == "https://example.supabase.co/rest/v1/"
+        assert client.session.headers["apiKey"] == "service-key"
+        assert client.session.headers["Authorization"] == "Bearer service-key"
+        assert client.pool.max_connections == 4
+        await client.aclose()
+
+    def test_rejects_invalid_url(self):
+        """Test that a malformed URL fails fast with ValueError."""
+        with pytest.raises(ValueError):
+            create_postgrest_client("example.supabase.co", "key", PoolConfig())
+
+
+class TestPostgrestOf:
+    """Tests for locating the PostgREST client behind a server client."""
+
+    @pytest.mark.asyncio
+    async def test_returns_postgrest_client_unchanged(self):
+        """Test that a PostgREST-only client is returned as-is."""
+        client = create_postgrest_client("https://example.supabase.co", "k", PoolConfig())
+
+        assert postgrest_of(client) is client
+        await client.aclose()
+
+    def test_returns_supabase_postgrest_attribute(self):
+        """Test that a supabase client's postgrest attribute is returned."""
+        supabase = MagicMock()
+
+        assert postgrest_of(supabase) is supabase.postgrest
+
+
+class TestImportFootprint:
+    """Tests that importing the server stays cheap."""
+
+    def test_server_import_skips_heavy_packages(self):
+        """Test that importing the server module does not import supabase sub-clients."""
+        code = (
+            "import sys, supabase_mcp.server; "
+            f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == "[]"
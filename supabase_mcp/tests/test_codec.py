@@ -0,0 +1,224 @@
+"""
+Tests for the JSON codecs.
+
+This module contains tests for:
+- Selecting the codec from SUPABASE_MCP_JSON_CODEC
+- Encoding datetimes, Decimals and UUIDs, and the orjson fallbacks
+- Decoding PostgREST responses through the codec transport, behind env proxies
+- Sending tool results as one JSON text block with orjson, and as FastMCP does with json
+"""
+
+import asyncio
+import datetime
+import json
+import uuid
+from contextlib import asynccontextmanager
+from decimal import Decimal
+
+import httpx
+import pytest
+from mcp.shared.memory import create_connected_server_and_client_session
+from mcp.types import TextContent
+
+from supabase_mcp.app import SupabaseMCP
+from supabase_mcp.codec import CodecTransport, JSONCodec, OrjsonCodec, json_codec, to_content
+from supabase_mcp.pool import PoolConfig, build_http_client, pool_stats
+from supabase_mcp.server import SupabaseContext
+
+orjson = pytest.importorskip("orjson")
+
+ROW = {
+    "id": 1,
+    "at": datetime.datetime(2024, 1, 2, 3, 4, 5, 6, tzinfo=datetime.timezone.utc),
+    "day": datetime.date(2024, 1, 2),
+    "price": Decimal("12.50"),
+    "units": Decimal("3"),
+    "ref": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "tags": {"a"},
+}
+
+EXPECTED = {
+    "id": 1,
+    "at": "2024-01-02T03:04:05.000006+00:00",
+    "day": "2024-01-02",
+    "price": 12.5,
+    "units": 3,
+    "ref": "12345678-1234-5678-1234-567812345678",
+    "tags": ["a"],
+}
+
+
+class TestJsonCodec:
+    """Tests for selecting the codec."""
+
+    def test_default_prefers_orjson(self):
+        """Test that auto selects orjson when it is installed."""
+        assert json_codec({}).name == "orjson"
+        assert json_codec({"SUPABASE_MCP_JSON_CODEC": "json"}).name == "json"
+
+    def test_rejects_unknown_codec(self):
+        """Test that an unknown codec name is rejected."""
+        with pytest.raises(ValueError, match="must be one of auto, orjson, json"):
+            json_codec({"SUPABASE_MCP_JSON_CODEC": "ujson"})
+
+
+class TestEncoding:
+    """Tests for encoding values JSON has no type for."""
+
+    @pytest.mark.parametrize("codec", [JSONCodec(), OrjsonCodec()], ids=["json", "orjson"])
+    def test_postgrest_style_values(self, codec):
+        """Test that both codecs encode dates, Decimals and UUIDs like PostgREST."""
+        assert json.loads(codec.dumps([ROW])) == [EXPECTED]
+
+    def test_orjson_falls_back_to_json(self):
+        """Test that values orjson rejects are handled by the json module."""
+        codec = OrjsonCodec()
+
+        assert json.loads(codec.dumps({"big": 2 ** 70})) == {"big": 2 ** 70}
+        assert codec.loads(b"[1e400]") == [float("inf")]
+        assert codec.loads(b'{"id": 7}') == {"id": 7}
+
+    def test_invalid_json_raises_decode_error(self):
+        """Test that invalid documents raise json.JSONDecodeError, as PostgREST expects."""
+        with pytest.raises(json.JSONDecodeError):
+            OrjsonCodec().loads(b"not json")
+
+
+class RecordingCodec(JSONCodec):
+    """Codec that records what it decodes."""
+
+    name = "recording"
+
+    def __init__(self):
+        self.decoded = []
+
+    def loads(self, data):
+        self.decoded.append(data)
+        return super().loads(data)
+
+
+class TestCodecTransport:
+    """Tests for decoding response bodies with the codec."""
+
+    @pytest.mark.asyncio
+    async def test_response_json_uses_codec(self):
+        """Test that response.json() goes through the codec and the pool still reports."""
+        # Start a minimal keep-alive HTTP/1.1 server on localhost
+        async def serve(reader, writer):
+            while await reader.readuntil(b"\r\n\r\n"):
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 10\r\n\r\n[{\"id\":1}]")
+                await writer.drain()
+
+        server = await asyncio.start_server(serve, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        codec = RecordingCodec()
+        client = build_http_client(
+            PoolConfig(http2=False, max_connections=3), f"http://127.0.0.1:{port}", {},
+            codec=codec,
+        )
+
+        response = await client.get("/users")
+
+        # Verify the body was decoded by the codec
+        assert response.json() == [{"id": 1}]
+        assert codec.decoded == [b'[{"id":1}]']
+        assert client._transport._pool._max_connections == 3
+        assert pool_stats(client)["idle"] == 1
+        await client.aclose()
+        server.close()
+
+    @pytest.mark.asyncio
+    async def test_environment_proxies_apply(self, monkeypatch):
+        """Test that the codec transport honours the proxy environment variables as httpx does."""
+        monkeypatch.setenv("HTTPS_PROXY", "http://proxy.internal:3128")
+        monkeypatch.setenv("NO_PROXY", "localhost")
+        client = build_http_client(
+            PoolConfig(), "https://example.supabase.co/rest/v1", {}, codec=OrjsonCodec()
+        )
+
+        # Verify HTTPS goes through a proxied codec transport and NO_PROXY hosts do not
+        proxied = client._transport_for_url(httpx.URL("https://example.supabase.co/rest/v1"))
+        assert isinstance(proxied, CodecTransport)
+        assert proxied is not client._transport
+        assert proxied._pool._proxy_url.host == b"proxy.internal"
+        assert client._transport_for_url(httpx.URL("https://localhost/")) is client._transport
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_json_codec_keeps_httpx_transport(self, monkeypatch):
+        """Test that the json codec leaves httpx to build its transports and proxies."""
+        monkeypatch.setenv("HTTPS_PROXY", "http://proxy.internal:3128")
+        client = build_http_client(
+            PoolConfig(), "https://example.supabase.co/rest/v1", {}, codec=JSONCodec()
+        )
+
+        transport = client._transport_for_url(httpx.URL("https://example.supabase.co/"))
+        assert not isinstance(client._transport, CodecTransport)
+        assert transport._pool._proxy_url.host == b"proxy.internal"
+        await client.aclose()
+
+
+class TestToolResults:
+    """Tests for encoding tool results as MCP content."""
+
+    def test_list_is_one_text_block(self):
+        """Test that a list result is one JSON array, not one block per row."""
+        content = to_content([ROW, ROW], OrjsonCodec())
+
+        assert len(content) == 1
+        assert json.loads(content[0].text) == [EXPECTED, EXPECTED]
+
+    def test_strings_none_and_content_pass_through(self):
+        """Test that strings are sent as is and content objects are left to FastMCP."""
+        block = TextContent(type="text", text="hi")
+
+        assert to_content("plain", JSONCodec())[0].text == "plain"
+        assert to_content(None, JSONCodec()) == []
+        assert to_content([block, block], JSONCodec()) == [block, block]
+
+    @pytest.mark.asyncio
+    async def test_server_sends_one_block(self):
+        """Test that a tool called over MCP returns its rows in a single text block."""
+        # Create a server whose lifespan selects the orjson codec
+        @asynccontextmanager
+        async def lifespan(server):
+            yield SupabaseContext(codec=OrjsonCodec())
+
+        server = SupabaseMCP("test", lifespan=lifespan)
+
+        @server.tool()
+        async def rows() -> list:
+            return [{"id": n, "price": Decimal("1.5")} for n in range(3)]
+
+        async with create_connected_server_and_client_session(server._mcp_server) as client:
+            result = await client.call_tool("rows", {})
+
+        # Verify the rows arrive as one JSON array
+        assert not result.isError
+        assert len(result.content) == 1
+        assert json.loads(result.content[0].text) == [
+            {"id": n, "price": 1.5} for n in range(3)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_json_codec_keeps_fastmcp_content(self):
+        """Test that with the json codec a list result keeps one text block per item."""
+        # Create a server whose lifespan selects the json codec
+        @asynccontextmanager
+        async def lifespan(server):
+            yield SupabaseContext(codec=JSONCodec())
+
+        server = SupabaseMCP("test", lifespan=lifespan)
+
+        @server.tool()
+        async def rows() -> list:
+            return [{"id": n} for n in range(3)]
+
+        async with create_connected_server_and_client_session(server._mcp_server) as client:
+            result = await client.call_tool("rows", {})
+
+        # Verify FastMCP's format: each row in its own block
+        assert not result.isError
+        assert [json.loads(block.text) for block in result.content] == [
+            {"id": n} for n in range(3)
+        ]
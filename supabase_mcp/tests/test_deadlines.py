@@ -0,0 +1,81 @@
+"""
+Tests for tool call deadlines.
+
+This module contains tests for:
+- DeadlineConfig
+- Deadlines.scope
+"""
+
+import asyncio
+
+import anyio
+import pytest
+
+from supabase_mcp.deadlines import DeadlineConfig, Deadlines, ToolTimeoutError
+
+
+class TestDeadlineConfig:
+    """Tests for reading and resolving deadlines."""
+
+    def test_reads_default_and_per_tool(self):
+        """Test that the default and per-tool variables are applied."""
+        config = DeadlineConfig.from_env({
+            "SUPABASE_MCP_TIMEOUT": "10",
+            "SUPABASE_MCP_TIMEOUT_READ_TABLE_ROWS": "60",
+            "SUPABASE_MCP_TIMEOUT_DELETE_TABLE_RECORDS": "0",
+        })
+
+        assert config.resolve("create_table_records") == 10
+        assert config.resolve("read_table_rows") == 60
+        assert config.resolve("delete_table_records") is None
+
+    def test_override_is_bounded(self):
+        """Test that a caller cannot exceed the maximum or pass a non-positive value."""
+        config = DeadlineConfig(default=30, max_timeout=120)
+
+        assert config.resolve("read_table_rows", 90) == 90
+        with pytest.raises(ValueError):
+            config.resolve("read_table_rows", 121)
+        with pytest.raises(ValueError):
+            config.resolve("read_table_rows", 0)
+
+    def test_rejects_negative(self):
+        """Test that a negative deadline raises ValueError."""
+        with pytest.raises(ValueError, match="SUPABASE_MCP_TIMEOUT"):
+            DeadlineConfig.from_env({"SUPABASE_MCP_TIMEOUT": "-1"})
+
+
+class TestDeadlineScope:
+    """Tests for enforcing deadlines."""
+
+    @pytest.mark.asyncio
+    async def test_timeout_cancels_work(self):
+        """Test that work past the deadline is cancelled and reported."""
+        deadlines = Deadlines(DeadlineConfig(default=0.05))
+        finished = False
+
+        with pytest.raises(ToolTimeoutError, match="read_table_rows"):
+            async with deadlines.scope("read_table_rows"):
+                await anyio.sleep(1)
+                finished = True
+
+        assert finished is False
+        assert deadlines.stats()["timed_out"] == {"read_table_rows": 1}
+
+    @pytest.mark.asyncio
+    async def test_outside_cancellation_is_counted(self):
+        """Test that an MCP cancellation propagates and is counted."""
+        deadlines = Deadlines()
+
+        async def call():
+            async with deadlines.scope("read_table_rows"):
+                await anyio.sleep(1)
+
+        task = asyncio.ensure_future(call())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert deadlines.stats()["cancelled"] == {"read_table_rows": 1}
+        assert deadlines.stats()["timed_out"] == {}
@@ -0,0 +1,175 @@
+"""
+Tests for embedded resources.
+
+This module contains tests for:
+- Parsing and validating embed specs
+- Rendering embeds as a PostgREST select list and query parameters
+- read_table_rows passing embeds to the backend and past the cache
+- The postgres backend rejecting embeds
+"""
+
+import pytest
+from unittest.mock import MagicMock
+from mcp.server.fastmcp import Context
+from postgrest import AsyncPostgrestClient
+
+from supabase_mcp.backends.base import Backend, ReadQuery
+from supabase_mcp.backends.postgrest import PostgrestBackend, embed_select
+from supabase_mcp.backends.sql import build_select
+from supabase_mcp.cache import CacheConfig, QueryCache
+from supabase_mcp.embeds import Embed, parse_embeds
+from supabase_mcp.server import SupabaseContext, read_table_rows
+
+ORDERS = [{"id": 1, "customer": {"name": "Ada"}}, {"id": 2, "customer": None}]
+
+
+class RecordingBackend(Backend):
+    """Backend that records the queries it runs and returns ORDERS."""
+
+    name = "recording"
+
+    def __init__(self):
+        self.queries = []
+
+    async def read(self, query):
+        self.queries.append(query)
+        return ORDERS
+
+    async def insert(self, table, records):
+        raise NotImplementedError
+
+    async def update(self, table, updates, filters):
+        raise NotImplementedError
+
+    async def delete(self, table, filters):
+        raise NotImplementedError
+
+
+def request_for(query):
+    """Build the PostgREST request for a read query without sending it."""
+    client = AsyncPostgrestClient("http://localhost")
+    return PostgrestBackend(lambda: client)._select(query)
+
+
+class TestParseEmbeds:
+    """Tests for parsing embed specs."""
+
+    def test_defaults_and_nesting(self):
+        """Test that only the table is required and nested embeds are parsed."""
+        embeds = parse_embeds([
+            {"table": "customers"},
+            {"table": "items", "alias": "lines", "limit": 5,
+             "embed": [{"table": "products", "columns": "name"}]},
+        ])
+
+        assert embeds[0] == Embed(table="customers")
+        assert embeds[1].path == "lines"
+        assert embeds[1].embeds == [Embed(table="products", columns="name")]
+        assert parse_embeds(None) == []
+
+    @pytest.mark.parametrize("specs, message", [
+        ({"table": "customers"}, "must be a list"),
+        (["customers"], "Embed must be an object"),
+        ([{"columns": "name"}], "Embed table must be"),
+        ([{"table": "customers; drop"}], "Embed table must be"),
+        ([{"table": "customers", "hint": "a(b)"}], "Embed hint must be"),
+        ([{"table": "customers", "limit": 0}], "positive integer"),
+        ([{"table": "customers", "join": "inner"}], "Unknown embed keys: join"),
+        ([{"table": "customers", "filters": {"status": {"in": "open"}}}], "needs a list"),
+        ([{"table": "customers"}, {"table": "customers"}], "give one an alias"),
+    ])
+    def test_rejects_invalid(self, specs, message):
+        """Test that malformed embeds are rejected before any request."""
+        with pytest.raises(ValueError, match=message):
+            parse_embeds(specs)
+
+
+class TestPostgrestEmbeds:
+    """Tests for the PostgREST rendering of embeds."""
+
+    def test_select_list(self):
+        """Test aliases, hints, inner joins and nesting in the select list."""
+        embeds = parse_embeds([
+            {"table": "customers", "alias": "buyer", "hint": "buyer_id", "inner": True,
+             "columns": "name"},
+            {"table": "items", "embed": [{"table": "products", "columns": "sku"}]},
+        ])
+
+        assert embed_select("id,total", embeds) == (
+            "id,total,buyer:customers!buyer_id!inner(name),items(*,products(sku))"
+        )
+
+    def test_filters_order_and_limit_apply_to_the_embed(self):
+        """Test that embed parameters are prefixed with the embed's path."""
+        query = ReadQuery(
+            table="customers",
+            filters={"tier": "gold"},
+            limit=10,
+            embeds=parse_embeds([{
+                "table": "orders",
+                "filters": {"amount": {"gte": 100}, "or": [{"status": "open"}, {"status": "held"}]},
+                "order_by": "created_at",
+                "ascending": False,
+                "limit": 3,
+                "embed": [{"table": "items", "alias": "lines", "filters": {"qty": 1}}],
+            }]),
+        )
+
+        params = request_for(query).params
+
+        # Verify the parent and embed parameters are separate
+        assert params["select"] == "*,orders(*,lines:items(*))"
+        assert params["tier"] == "eq.gold"
+        assert params["limit"] == "10"
+        assert params["orders.amount"] == "gte.100"
+        assert params["orders.or"] == '(status.eq."open",status.eq."held")'
+        assert params["orders.order"] == "created_at.desc"
+        assert params["orders.limit"] == "3"
+        assert params["orders.lines.qty"] == "eq.1"
+
+
+class TestReadTableRowsEmbeds:
+    """Tests for embeds through the read_table_rows tool."""
+
+    @pytest.mark.asyncio
+    async def test_embeds_reach_the_backend_uncached(self):
+        """Test that embeds are parsed into the query and bypass the cache."""
+        # Create mock context with caching enabled
+        mock_context = MagicMock(spec=Context)
+        backend = RecordingBackend()
+        mock_context.request_context.lifespan_context = SupabaseContext(
+            backend=backend, cache=QueryCache(CacheConfig(ttl=60))
+        )
+        embed = [{"table": "customers", "columns": "name", "alias": "customer"}]
+
+        for _ in range(2):
+            result = await read_table_rows(ctx=mock_context, table_name="orders", embed=embed)
+
+        # Verify each call went to the backend with the parsed embed
+        assert result == ORDERS
+        assert len(backend.queries) == 2
+        assert backend.queries[0].embeds == [
+            Embed(table="customers", columns="name", alias="customer")
+        ]
+
+    @pytest.mark.asyncio
+    async def test_invalid_embed_is_rejected(self):
+        """Test that an invalid embed fails the call before reading."""
+        # Create mock context
+        mock_context = MagicMock(spec=Context)
+        backend = RecordingBackend()
+        mock_context.request_context.lifespan_context = SupabaseContext(backend=backend)
+
+        with pytest.raises(ValueError, match="Unknown embed keys"):
+            await read_table_rows(
+                ctx=mock_context, table_name="orders", embed=[{"table": "x", "on": "id"}]
+            )
+        assert backend.queries == []
+
+
+def test_postgres_backend_rejects_embeds():
+    """Test that SQL reads refuse embeds instead of dropping them."""
+    query = ReadQuery(table="orders", embeds=[Embed(table="customers")])
+
+    with pytest.raises(ValueError, match="need the postgrest backend"):
+        build_select(query, {"id": "bigint"})
@@ -0,0 +1,161 @@
+"""
+Tests for result formats.
+
+This module contains tests for:
+- Encoding rows in the compact format and decoding them back
+- Dictionary encoding of low-cardinality text columns
+- Applying a format to list, page and write results
+- The format argument of read_table_rows and create_table_records
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from mcp.server.fastmcp import Context
+
+from supabase_mcp.encoding import (
+    MAX_DICTIONARY_SIZE,
+    check_format,
+    compact,
+    expand,
+    formatted,
+)
+from supabase_mcp.server import SupabaseContext, create_table_records, read_table_rows
+
+ROWS = [
+    {"id": 1, "status": "open", "note": "a"},
+    {"id": 2, "status": "paid", "note": None},
+    {"id": 3, "status": "open", "note": "c"},
+    {"id": 4, "status": None, "note": "d"},
+]
+
+
+class TestCompact:
+    """Tests for the compact encoding."""
+
+    def test_columns_and_dictionaries(self):
+        """Test that rows become arrays and repeated text values become indexes."""
+        result = compact(ROWS)
+
+        assert result == {
+            "columns": ["id", "status", "note"],
+            "rows": [[1, 0, "a"], [2, 1, None], [3, 0, "c"], [4, None, "d"]],
+            "dictionaries": {"status": ["open", "paid"]},
+        }
+
+    def test_round_trip(self):
+        """Test that expand restores the rows, with missing keys as null."""
+        rows = ROWS + [{"id": 5, "extra": True}]
+
+        decoded = expand(compact(rows))
+
+        assert decoded[:4] == [{**row, "extra": None} for row in ROWS]
+        assert decoded[4] == {"id": 5, "status": None, "note": None, "extra": True}
+
+    def test_dictionary_thresholds(self):
+        """Test that unique, high-cardinality and non-text columns are left as values."""
+        many = [{"code": f"c{n % (MAX_DICTIONARY_SIZE + 1)}"} for n in range(1000)]
+        numbers = [{"n": n % 2} for n in range(10)]
+
+        assert "dictionaries" not in compact(many)
+        assert "dictionaries" not in compact(numbers)
+        assert "dictionaries" not in compact(ROWS, dictionaries=False)
+        assert "dictionaries" not in compact([{"s": "x"}])
+
+    def test_empty(self):
+        """Test that no rows encode to empty columns and rows."""
+        assert compact([]) == {"columns": [], "rows": []}
+
+
+class TestFormatted:
+    """Tests for applying a format to tool results."""
+
+    def test_rows_format_is_unchanged(self):
+        """Test that the default format returns the result as is."""
+        assert formatted(ROWS, "rows") is ROWS
+
+    def test_page_keeps_its_other_keys(self):
+        """Test that a page's rows are replaced and its cursor and count kept."""
+        result = formatted({"rows": ROWS[:1], "next_cursor": "abc", "count": 9}, "compact")
+
+        assert result == {
+            "rows": [[1, "open", "a"]],
+            "columns": ["id", "status", "note"],
+            "next_cursor": "abc",
+            "count": 9,
+        }
+
+    def test_write_data_field(self):
+        """Test that a write result's data field is compacted in place."""
+        result = formatted({"data": ROWS[:1], "count": 1}, "compact", key="data")
+
+        assert result == {
+            "data": {"columns": ["id", "status", "note"], "rows": [[1, "open", "a"]]},
+            "count": 1,
+        }
+
+    def test_check_format(self):
+        """Test that unknown formats are rejected."""
+        assert check_format("compact") == "compact"
+        with pytest.raises(ValueError, match="format must be one of rows, compact"):
+            check_format("csv")
+
+
+class TestFormatArgument:
+    """Tests for the format argument of the tools."""
+
+    @pytest.mark.asyncio
+    async def test_read_compact(self):
+        """Test that a compact read returns columns and row arrays."""
+        # Create mock context
+        mock_context = MagicMock(spec=Context)
+        mock_supabase = MagicMock()
+        mock_context.request_context.lifespan_context = SupabaseContext(client=mock_supabase)
+        mock_response = MagicMock()
+        mock_response.data = ROWS
+        mock_supabase.table.return_value.select.return_value.execute = AsyncMock(
+            return_value=mock_response
+        )
+
+        result = await read_table_rows(ctx=mock_context, table_name="orders", format="compact")
+
+        # Verify the rows decode to what the default format returns
+        assert result["columns"] == ["id", "status", "note"]
+        assert expand(result) == ROWS
+
+    @pytest.mark.asyncio
+    async def test_unknown_format_is_rejected_before_reading(self):
+        """Test that an invalid format fails without a request."""
+        # Create mock context
+        mock_context = MagicMock(spec=Context)
+        mock_supabase = MagicMock()
+        mock_context.request_context.lifespan_context = SupabaseContext(client=mock_supabase)
+
+        with pytest.raises(ValueError, match="format must be one of"):
+            await read_table_rows(ctx=mock_context, table_name="orders", format="csv")
+
+        # Verify no request was made
+        mock_supabase.table.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_create_compact(self):
+        """Test that a compact write result compacts its data field."""
+        # Create mock context
+        mock_context = MagicMock(spec=Context)
+        mock_supabase = MagicMock()
+        mock_context.request_context.lifespan_context = SupabaseContext(client=mock_supabase)
+        mock_response = MagicMock()
+        mock_response.data = [{"id": 1, "name": "John"}]
+        mock_supabase.table.return_value.insert.return_value.execute = AsyncMock(
+            return_value=mock_response
+        )
+
+        result = await create_table_records(
+            ctx=mock_context, table_name="users", records={"name": "John"}, format="compact"
+        )
+
+        # Verify the data field holds the compact encoding
+        assert result == {
+            "data": {"columns": ["id", "name"], "rows": [[1, "John"]]},
+            "count": 1,
+            "status": "success",
+        }
@@ -0,0 +1,374 @@
+"""
+Tests for partitioned table exports.
+
+This module contains tests for:
+- Reading the export settings from the environment and confining output paths
+- Splitting integer, numeric and timestamp key spans into ranges
+- export_table writing every row once, in key order
+- Resuming an export after a partition fails
+- CSV and Parquet output and the reported schema
+"""
+
+import csv
+import json
+import operator
+import os
+
+import pytest
+from unittest.mock import MagicMock
+from mcp.server.fastmcp import Context
+
+from supabase_mcp.backends.base import Backend
+from supabase_mcp.export import ExportConfig, export_path, partition_filters, split_range
+from supabase_mcp.export_formats import file_format_of, merge_type, value_type
+from supabase_mcp.filters import Condition, parse_filters
+from supabase_mcp.server import SupabaseContext, export_table
+
+_OPS = {"eq": operator.eq, "gt": operator.gt, "gte": operator.ge,
+        "lt": operator.lt, "lte": operator.le}
+
+
+def _matches(row, items):
+    """Evaluate parsed filters made of comparisons and "and" groups."""
+    for item in items:
+        if isinstance(item, Condition):
+            value = row[item.column]
+            if value is None or not _OPS[item.op](value, item.value):
+                return False
+        elif not _matches(row, item.items):
+            return False
+    return True
+
+
+def _conditions(items):
+    """Flatten parsed filters into their conditions."""
+    for item in items:
+        if isinstance(item, Condition):
+            yield item
+        else:
+            yield from _conditions(item.items)
+
+
+class TableBackend(Backend):
+    """Backend serving filtered, keyset-paginated reads of an in-memory table."""
+
+    name = "table"
+
+    def __init__(self, rows, fail_from=None):
+        self.rows = rows
+        self.fail_from = fail_from
+        self.reads = []
+
+    async def read(self, query):
+        self.reads.append(query)
+        items = parse_filters(query.filters)
+        lower = [c.value for c in _conditions(items) if c.op == "gte"]
+        if self.fail_from is not None and self.fail_from in lower:
+            raise ConnectionError("connection reset")
+        rows = [row for row in self.rows if _matches(row, items)]
+        keys = query.order_keys
+        # Sort NULLs last ascending and first descending, as Postgres does
+        rows.sort(key=lambda row: [(row[k] is None, row[k] or 0) for k in keys],
+                  reverse=not query.ascending)
+        if query.after is not None:
+            rows = [row for row in rows if [row[k] for k in keys] > query.after]
+        columns = None if query.columns == "*" else query.columns.split(",")
+        rows = [{k: v for k, v in row.items() if columns is None or k in columns}
+                for row in rows]
+        return rows[:query.limit] if query.limit else rows
+
+    async def insert(self, table, records):
+        raise NotImplementedError
+
+    async def update(self, table, updates, filters):
+        raise NotImplementedError
+
+    async def delete(self, table, filters):
+        raise NotImplementedError
+
+
+def export_context(tmp_path, backend, **config):
+    """Create a mock MCP context exporting from a backend into tmp_path."""
+    mock_context = MagicMock(spec=Context)
+    mock_context.request_context.lifespan_context = SupabaseContext(
+        backend=backend,
+        exports=ExportConfig(directory=str(tmp_path), **{"chunk_size": 7, **config}),
+    )
+    return mock_context
+
+
+def read_lines(path):
+    """Read the rows of an NDJSON file."""
+    with open(path, encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle]
+
+
+class TestExportConfig:
+    """Tests for export settings and paths."""
+
+    def test_from_env(self):
+        """Test the defaults and that sizes must be positive."""
+        assert ExportConfig.from_env({}) == ExportConfig("exports", 8, 4, 5000)
+        assert ExportConfig.from_env({"SUPABASE_MCP_EXPORT_DIR": "/data"}).directory == "/data"
+        with pytest.raises(ValueError, match="SUPABASE_MCP_EXPORT_CONCURRENCY"):
+            ExportConfig.from_env({"SUPABASE_MCP_EXPORT_CONCURRENCY": "0"})
+
+    @pytest.mark.parametrize("path", ["", "/etc/passwd", "../out.ndjson", "a/../../b", "."])
+    def test_paths_stay_in_directory(self, tmp_path, path):
+        """Test that absolute paths and paths leaving the directory are refused."""
+        with pytest.raises(ValueError):
+            export_path(str(tmp_path), path)
+
+    def test_path_in_directory(self, tmp_path):
+        """Test that relative paths resolve below the directory."""
+        assert export_path(str(tmp_path), "a/b.ndjson") == str(tmp_path / "a" / "b.ndjson")
+
+
+class TestSplitRange:
+    """Tests for splitting key spans."""
+
+    def test_integers(self):
+        """Test equal integer ranges, and fewer ranges for a narrow span."""
+        assert split_range(1, 100, 4) == [1, 26, 51, 76, 100]
+        assert split_range(1, 3, 8) == [1, 2, 3]
+        assert split_range(5, 5, 8) == [5, 5]
+
+    def test_numeric_and_timestamps(self):
+        """Test that numeric and timestamp spans split evenly, keeping the ends."""
+        assert split_range(0.5, 2.5, 2) == [0.5, 1.5, 2.5]
+        assert split_range("2024-01-01T00:00:00+00:00", "2024-01-03T00:00:00+00:00", 2) == [
+            "2024-01-01T00:00:00+00:00", "2024-01-02T00:00:00+00:00",
+            "2024-01-03T00:00:00+00:00",
+        ]
+
+    def test_unsplittable(self):
+        """Test that text and boolean keys are refused."""
+        with pytest.raises(ValueError, match="integer, numeric or timestamp"):
+            split_range("alice", "bob", 4, "name")
+        with pytest.raises(ValueError, match="boolean"):
+            split_range(False, True, 2)
+
+    def test_partition_filters(self):
+        """Test that only the last range includes its upper bound."""
+        bounds = [1, 5, 9]
+        assert partition_filters(None, "id", bounds, 0) == {"id": {"gte": 1, "lt": 5}}
+        assert partition_filters({"kind": "a"}, "id", bounds, 1) == {
+            "and": [{"kind": "a"}, {"id": {"gte": 5, "lte": 9}}]
+        }
+
+
+class TestExportTable:
+    """Tests for the export_table tool."""
+
+    @pytest.mark.asyncio
+    async def test_export_in_key_order(self, tmp_path):
+        """Test that every matching row is written once, in key order."""
+        # Create mock context over 100 rows with a non-unique key
+        rows = [{"id": i, "day": i // 10, "kind": "ab"[i % 2]} for i in range(100)]
+        mock_context = export_context(tmp_path, TableBackend(rows), concurrency=2)
+
+        result = await export_table(
+            ctx=mock_context, table_name="events", path="out/events.ndjson",
+            key_column="day", filters={"kind": "a"}, partitions=4,
+        )
+
+        # Verify the file holds the even ids ordered by day then id
+        assert read_lines(result["path"]) == [row for row in rows if row["kind"] == "a"]
+        assert (result["rows"], result["partitions"], result["complete"]) == (50, 4, True)
+        assert result["bytes"] == os.path.getsize(result["path"])
+        assert os.listdir(tmp_path / "out") == ["events.ndjson"]
+
+    @pytest.mark.asyncio
+    async def test_empty_and_existing(self, tmp_path):
+        """Test an empty export, and that existing files are kept unless overwritten."""
+        mock_context = export_context(tmp_path, TableBackend([]))
+
+        result = await export_table(ctx=mock_context, table_name="events", path="e.ndjson")
+        assert (result["rows"], result["bytes"], result["complete"]) == (0, 0, True)
+
+        with pytest.raises(ValueError, match="already exists"):
+            await export_table(ctx=mock_context, table_name="events", path="e.ndjson")
+        await export_table(
+            ctx=mock_context, table_name="events", path="e.ndjson", overwrite=True
+        )
+
+    @pytest.mark.asyncio
+    async def test_null_keys(self, tmp_path):
+        """Test that a key column with NULLs is refused rather than skipped."""
+        rows = [{"id": 1, "at": None}, {"id": 2, "at": 5}]
+        mock_context = export_context(tmp_path, TableBackend(rows))
+
+        with pytest.raises(ValueError, match="NULL"):
+            await export_table(
+                ctx=mock_context, table_name="events", path="e.ndjson", key_column="at"
+            )
+
+    @pytest.mark.asyncio
+    async def test_resume_failed_partition(self, tmp_path):
+        """Test that a failed partition is reported and resuming reads only it."""
+        # Create mock context whose third partition fails
+        rows = [{"id": i} for i in range(1, 101)]
+        backend = TableBackend(rows, fail_from=51)
+        mock_context = export_context(tmp_path, backend)
+
+        result = await export_table(
+            ctx=mock_context, table_name="events", path="e.ndjson", partitions=4
+        )
+
+        # Verify the partitions before the failure are written and the rest kept
+        assert result["complete"] is False
+        assert result["failed"] == [
+            {"partition": 2, "from": 51, "to": 76, "error": "ConnectionError: connection reset"}
+        ]
+        assert [row["id"] for row in read_lines(result["path"])] == list(range(1, 51))
+        assert result["rows"] == 75
+
+        with pytest.raises(ValueError, match="resume=True"):
+            await export_table(ctx=mock_context, table_name="events", path="e.ndjson")
+        with pytest.raises(ValueError, match="other arguments"):
+            await export_table(
+                ctx=mock_context, table_name="events", path="e.ndjson", columns="id",
+                resume=True,
+            )
+
+        # Verify resuming reads only the failed range and completes the file in order
+        backend.fail_from = None
+        backend.reads.clear()
+        result = await export_table(
+            ctx=mock_context, table_name="events", path="e.ndjson", resume=True
+        )
+        assert (result["complete"], result["resumed"], result["rows"]) == (True, 3, 100)
+        assert all(q.filters == {"id": {"gte": 51, "lt": 76}} for q in backend.reads)
+        assert [row["id"] for row in read_lines(result["path"])] == list(range(1, 101))
+        assert os.listdir(tmp_path) == ["e.ndjson"]
+
+
+class TestFormats:
+    """Tests for CSV and Parquet exports and their schema."""
+
+    ROWS = [
+        {"id": i, "price": 1.5 if i % 2 else 2, "paid": i % 3 == 0,
+         "at": f"2024-01-{i:02d}T10:00:00+00:00", "day": f"2024-01-{i:02d}",
+         "tags": {"n": i} if i % 5 else None}
+        for i in range(1, 21)
+    ]
+
+    def test_file_format_of(self):
+        """Test that the format follows the extension unless given, and is validated."""
+        assert file_format_of("a/out.CSV", None) == "csv"
+        assert file_format_of("out.jsonl", None) == "ndjson"
+        assert file_format_of("out.csv", "NDJSON") == "ndjson"
+        with pytest.raises(ValueError, match="file_format must be one of"):
+            file_format_of("out", "xlsx")
+
+    def test_types(self):
+        """Test naming value types and merging disagreeing ones."""
+        assert [value_type(v) for v in (1, 1.5, True, None, "x", [1])] == [
+            "integer", "number", "boolean", "null", "string", "json"
+        ]
+        assert value_type("2024-01-02") == "date"
+        assert value_type("2024-01-02T03:04:05") == "timestamp"
+        assert value_type("2024-01-02 03:04:05.5+02:00") == "timestamptz"
+        assert value_type("2024-13-02") == "string"
+        assert merge_type("integer", "number") == "number"
+        assert merge_type("null", "date") == "date"
+        assert merge_type("date", "string") == "string"
+        assert merge_type("integer", "string") == "json"
+
+    @pytest.mark.asyncio
+    async def test_csv(self, tmp_path):
+        """Test a CSV export with one header, empty NULLs and JSON objects."""
+        mock_context = export_context(tmp_path, TableBackend(self.ROWS), concurrency=2)
+
+        result = await export_table(
+            ctx=mock_context, table_name="events", path="events.csv", partitions=3
+        )
+
+        # Verify the header, the values and the schema
+        with open(result["path"], newline="", encoding="utf-8") as handle:
+            lines = list(csv.reader(handle))
+        assert lines[0] == ["id", "price", "paid", "at", "day", "tags"]
+        assert lines[1] == ["1", "1.5", "false", "2024-01-01T10:00:00+00:00", "2024-01-01",
+                            json.dumps({"n": 1})]
+        assert lines[5][5] == ""
+        assert [int(line[0]) for line in lines[1:]] == list(range(1, 21))
+        assert result["format"] == "csv"
+        assert result["schema"] == [
+            {"name": "id", "type": "integer"}, {"name": "price", "type": "number"},
+            {"name": "paid", "type": "boolean"}, {"name": "at", "type": "timestamptz"},
+            {"name": "day", "type": "date"}, {"name": "tags", "type": "json"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_csv_resume_keeps_one_header(self, tmp_path):
+        """Test that a resumed CSV export continues without a second header."""
+        backend = TableBackend([{"id": i} for i in range(1, 101)], fail_from=51)
+        mock_context = export_context(tmp_path, backend)
+        await export_table(ctx=mock_context, table_name="events", path="e.csv", partitions=4)
+
+        backend.fail_from = None
+        result = await export_table(
+            ctx=mock_context, table_name="events", path="e.csv", resume=True
+        )
+
+        # Verify one header followed by every row in order
+        with open(result["path"], newline="", encoding="utf-8") as handle:
+            lines = list(csv.reader(handle))
+        assert lines == [["id"]] + [[str(i)] for i in range(1, 101)]
+        assert result["complete"] is True
+
+    @pytest.mark.asyncio
+    async def test_parquet(self, tmp_path):
+        """Test a typed, compressed Parquet export with one row group per chunk."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        mock_context = export_context(tmp_path, TableBackend(self.ROWS), concurrency=2)
+
+        result = await export_table(
+            ctx=mock_context, table_name="events", path="events.parquet", partitions=3
+        )
+
+        # Verify the column types, the values and the compression
+        assert (result["format"], result["rows"], result["complete"]) == ("parquet", 20, True)
+        table = pq.read_table(result["path"])
+        assert [str(t) for t in table.schema.types] == [
+            "int64", "double", "bool", "timestamp[us, tz=UTC]", "date32[day]", "string"
+        ]
+        assert table.column("id").to_pylist() == list(range(1, 21))
+        assert table.column("tags").to_pylist()[:5] == [
+            json.dumps({"n": i}) for i in range(1, 5)
+        ] + [None]
+        metadata = pq.ParquetFile(result["path"]).metadata
+        assert metadata.num_row_groups > 1
+        assert metadata.row_group(0).column(0).compression == "ZSTD"
+        assert os.listdir(tmp_path) == ["events.parquet"]
+        assert result["bytes"] == os.path.getsize(result["path"])
+
+    @pytest.mark.asyncio
+    async def test_parquet_failed_partition(self, tmp_path):
+        """Test that a Parquet file is only written once every partition is read."""
+        pytest.importorskip("pyarrow")
+        backend = TableBackend([{"id": i} for i in range(1, 101)], fail_from=51)
+        mock_context = export_context(tmp_path, backend)
+
+        result = await export_table(
+            ctx=mock_context, table_name="events", path="e.parquet", partitions=4
+        )
+        assert (result["complete"], result["bytes"], result["rows"]) == (False, 0, 75)
+
+        backend.fail_from = None
+        result = await export_table(
+            ctx=mock_context, table_name="events", path="e.parquet", resume=True
+        )
+        assert (result["complete"], result["rows"]) == (True, 100)
+        assert result["schema"] == [{"name": "id", "type": "integer"}]
+
+    @pytest.mark.asyncio
+    async def test_empty_parquet(self, tmp_path):
+        """Test that an empty Parquet export still writes a readable file."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        mock_context = export_context(tmp_path, TableBackend([]))
+
+        result = await export_table(ctx=mock_context, table_name="events", path="e.parquet")
+
+        assert (result["rows"], result["schema"], result["complete"]) == (0, [], True)
+        assert pq.read_table(result["path"]).num_rows == 0
@@ -0,0 +1,196 @@
+"""
+Tests for the filter expression grammar.
+
+This module contains tests for:
+- Parsing and validating filters
+- The PostgREST query strings filters compile to
+- The SQL filters compile to for the postgres backend
+"""
+
+import pytest
+from postgrest import AsyncPostgrestClient
+
+from supabase_mcp.backends.base import ReadQuery
+from supabase_mcp.backends.sql import build_delete, build_select
+from supabase_mcp.backends.postgrest import apply_filters
+from supabase_mcp.filters import (
+    Condition,
+    Group,
+    equalities,
+    filter_columns,
+    only_equalities,
+    parse_filters,
+)
+
+TYPES = {
+    "id": "bigint", "status": "text", "created_at": "timestamp with time zone",
+    "tags": "text[]", "meta": "jsonb", "name": "text", "priority": "integer",
+}
+
+
+def query_string(filters):
+    """Compile filters onto a real PostgREST request and return its query string."""
+    request = AsyncPostgrestClient("http://localhost").table("orders").select("*")
+    return str(apply_filters(request, filters).params)
+
+
+class TestParseFilters:
+    """Tests for parsing filter expressions."""
+
+    def test_plain_values_are_equalities(self):
+        """Test that the original column-value form still means equality."""
+        assert parse_filters({"status": "open", "deleted_at": None}) == [
+            Condition("status", "eq", "open"),
+            Condition("deleted_at", "is", "null"),
+        ]
+
+    def test_operator_maps_and_range(self):
+        """Test that operator maps expand and range becomes inclusive bounds."""
+        assert parse_filters({"priority": {"gt": 1, "range": [None, 5]}}) == [
+            Condition("priority", "gt", 1),
+            Condition("priority", "lte", 5),
+        ]
+
+    def test_groups_nest_and_flatten(self):
+        """Test that or/and groups nest and redundant levels are removed."""
+        items = parse_filters({
+            "or": [{"status": "open"}, {"priority": {"gte": 3}, "name": {"ilike": "%a%"}}],
+            "and": [{"id": {"neq": 1}}],
+        })
+
+        assert items == [
+            Group("or", [
+                Condition("status", "eq", "open"),
+                Group("and", [
+                    Condition("priority", "gte", 3), Condition("name", "ilike", "%a%"),
+                ]),
+            ]),
+            Condition("id", "neq", 1),
+        ]
+
+    def test_json_object_literal_is_equality(self):
+        """Test that a dictionary that is not an operator map is compared as a value."""
+        assert parse_filters({"meta": {"k": 1}}) == [Condition("meta", "eq", {"k": 1})]
+
+    @pytest.mark.parametrize("filters, message", [
+        ({"status": {"in": "open"}}, "needs a list"),
+        ({"status": {"is": "maybe"}}, "null, true, false"),
+        ({"priority": {"range": [1]}}, r"\[low, high\]"),
+        ({"name": {"like": 5}}, "pattern"),
+        ({"or": []}, "at least one"),
+        ({"a,b": 1}, "Invalid filter column"),
+        ({"priority": {"gt": None}}, "needs a value"),
+    ])
+    def test_rejects_invalid(self, filters, message):
+        """Test that malformed filters raise ValueError."""
+        with pytest.raises(ValueError, match=message):
+            parse_filters(filters)
+
+    def test_equalities(self):
+        """Test that only top-level equalities pin columns."""
+        filters = {"status": "open", "priority": {"gt": 1}, "or": [{"id": 1}, {"id": 2}]}
+
+        assert equalities(filters) == {"status": "open"}
+        assert only_equalities(filters) is False
+        assert only_equalities({"status": {"eq": "open"}}) is True
+
+    def test_filter_columns(self):
+        """Test that columns are collected from nested groups too."""
+        filters = {"status": "open", "or": [{"id": 1}, {"and": [{"due": {"lt": 3}}]}]}
+
+        assert filter_columns(filters) == {"status", "id", "due"}
+        assert filter_columns(None) == set()
+
+
+class TestPostgrestFilters:
+    """Tests for the PostgREST query strings generated from filters."""
+
+    def test_comparisons(self):
+        """Test that operators become column=op.value parameters."""
+        assert query_string({
+            "created_at": {"gte": "2024-01-01", "lt": "2024-02-01"},
+            "status": {"neq": "void"},
+            "active": True,
+        }) == (
+            "select=%2A&created_at=gte.2024-01-01&created_at=lt.2024-02-01"
+            "&status=neq.void&active=eq.True"
+        )
+
+    def test_in_is_like_contains(self):
+        """Test the list, null, pattern and containment operators."""
+        assert query_string({
+            "status": {"in": ["open", "on,hold"]},
+            "deleted_at": {"is": None},
+            "name": {"ilike": "%smith%"},
+            "tags": {"contains": ["a", "b"]},
+            "meta": {"contains": {"k": 1}},
+        }) == (
+            "select=%2A&status=in.%28%22open%22%2C%22on%2Chold%22%29"
+            "&deleted_at=is.null&name=ilike.%25smith%25"
+            "&tags=cs.%7B%22a%22%2C%22b%22%7D&meta=cs.%7B%22k%22%3A+1%7D"
+        )
+
+    def test_or_group(self):
+        """Test that an or group becomes a quoted logic tree."""
+        request = AsyncPostgrestClient("http://localhost").table("orders").select("*")
+        request = apply_filters(request, {
+            "or": [{"status": "open"}, {"priority": {"gte": 3}, "id": {"in": [1, 2]}}],
+        })
+
+        assert request.params["or"] == (
+            '(status.eq."open",and(priority.gte."3",id.in.("1","2")))'
+        )
+
+    def test_several_or_groups_are_combined(self):
+        """Test that two or groups are ANDed inside one tree."""
+        request = AsyncPostgrestClient("http://localhost").table("orders").select("*")
+        request = apply_filters(request, {
+            "or": [{"a": 1}, {"b": 2}],
+            "and": [{"or": [{"c": 3}, {"d": 4}]}],
+        })
+
+        assert request.params.get_list("or") == [
+            '(and(or(a.eq."1",b.eq."2"),or(c.eq."3",d.eq."4")))'
+        ]
+
+
+class TestSqlFilters:
+    """Tests for the SQL generated from filters."""
+
+    def test_operators(self):
+        """Test that every operator compiles to bound SQL."""
+        sql, args = build_select(ReadQuery(table="orders", columns="id", filters={
+            "created_at": {"range": ["2024-01-01", "2024-02-01"]},
+            "status": {"in": ["open", "held"]},
+            "name": {"ilike": "%a%"},
+            "tags": {"contains": ["x"]},
+            "priority": {"is": None},
+        }), TYPES)
+
+        assert sql == (
+            'SELECT "id" FROM "orders" WHERE '
+            '"created_at" >= $1::text::timestamp with time zone '
+            'AND "created_at" <= $2::text::timestamp with time zone '
+            'AND "status" = ANY($3::text::text[]) '
+            'AND "name"::text ILIKE $4::text::text '
+            'AND "tags" @> $5::text::text[] AND "priority" IS NULL'
+        )
+        assert args == ["2024-01-01", "2024-02-01", '{"open","held"}', "%a%", '{"x"}']
+
+    def test_in_rejects_array_columns(self):
+        """Test that "in" on an array column is refused rather than cast to text[][]."""
+        with pytest.raises(ValueError, match="array column 'tags'"):
+            build_select(ReadQuery(table="orders", filters={"tags": {"in": [["x"], ["y"]]}}),
+                         TYPES)
+
+    def test_groups(self):
+        """Test that or/and groups are parenthesized."""
+        sql, args = build_delete("orders", {
+            "or": [{"status": "void"}, {"priority": {"lt": 0}, "meta": {"contains": {"k": 1}}}],
+        }, TYPES)
+
+        assert sql == (
+            'DELETE FROM "orders" WHERE ("status" = $1::text::text OR '
+            '("priority" < $2::text::integer AND "meta" @> $3::text::jsonb)) RETURNING *'
+        )
+        assert args == ["void", "0", '{"k": 1}']
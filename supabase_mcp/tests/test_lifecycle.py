@@ -0,0 +1,156 @@
+"""
+Tests for graceful shutdown support.
+
+This module contains tests for:
+- CallTracker admission, draining and metrics
+- close_client
+- The shutdown sequence
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from supabase_mcp.lifecycle import (
+    CallTracker,
+    ShuttingDownError,
+    close_client,
+    shutdown,
+)
+
+
+class TestCallTracker:
+    """Tests for tracking and draining tool calls."""
+
+    @pytest.mark.asyncio
+    async def test_tracks_in_flight_calls(self):
+        """Test that calls are counted while running and after completion."""
+        tracker = CallTracker()
+
+        async with tracker.track("read_table_rows"):
+            assert tracker.in_flight == 1
+
+        assert tracker.in_flight == 0
+        assert tracker.stats()["started"] == 1
+        assert tracker.stats()["completed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_drain_waits_for_in_flight_calls(self):
+        """Test that drain waits for a running call and reports it as completed."""
+        tracker = CallTracker()
+        release = asyncio.Event()
+
+        async def slow_call():
+            async with tracker.track("update_table_records"):
+                await release.wait()
+
+        task = asyncio.create_task(slow_call())
+        await asyncio.sleep(0)
+        drain = asyncio.create_task(tracker.drain(timeout=5))
+        await asyncio.sleep(0.05)
+
+        # Verify the drain is still waiting on the running call
+        assert not drain.done()
+        release.set()
+        report = await drain
+        await task
+
+        assert report.in_flight_at_start == 1
+        assert report.completed == 1
+        assert report.abandoned == 0
+        assert report.timed_out is False
+
+    @pytest.mark.asyncio
+    async def test_rejects_calls_after_drain(self):
+        """Test that new calls are refused once shutdown has started."""
+        tracker = CallTracker()
+        await tracker.drain(timeout=1)
+
+        with pytest.raises(ShuttingDownError):
+            async with tracker.track("create_table_records"):
+                pass
+
+        assert tracker.stats()["rejected"] == 1
+        assert tracker.stats()["accepting"] is False
+
+    @pytest.mark.asyncio
+    async def test_drain_deadline_abandons_stuck_calls(self):
+        """Test that drain gives up at the deadline and reports abandoned calls."""
+        tracker = CallTracker()
+
+        async def stuck_call():
+            async with tracker.track("read_table_rows"):
+                await asyncio.sleep(10)
+
+        task = asyncio.create_task(stuck_call())
+        await asyncio.sleep(0)
+        report = await tracker.drain(timeout=0.05)
+
+        assert report.timed_out is True
+        assert report.abandoned == 1
+        assert tracker.stats()["last_drain"]["abandoned"] == 1
+        task.cancel()
+
+
+class TestCloseClient:
+    """Tests for closing the Supabase client's transports."""
+
+    @pytest.mark.asyncio
+    async def test_closes_created_components(self):
+        """Test that PostgREST, auth and a connected realtime socket are closed."""
+        client = MagicMock()
+        client._postgrest.aclose = AsyncMock()
+        client.auth.close = AsyncMock()
+        client.realtime.is_connected = True
+        client.realtime.close = AsyncMock()
+
+        closed = await close_client(client)
+
+        assert closed == ["postgrest", "auth", "realtime"]
+        client._postgrest.aclose.assert_awaited_once()
+        client.realtime.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_skips_components_never_created(self):
+        """Test that a lazily-built PostgREST client is not created just to close it."""
+        client = MagicMock()
+        client._postgrest = None
+        client.auth.close = AsyncMock()
+        client.realtime.is_connected = False
+
+        assert await close_client(client) == ["auth"]
+
+    @pytest.mark.asyncio
+    async def test_failure_does_not_block_other_components(self):
+        """Test that one failing transport does not stop the others closing."""
+        client = MagicMock()
+        client._postgrest.aclose = AsyncMock(side_effect=RuntimeError("boom"))
+        client.auth.close = AsyncMock()
+        client.realtime.is_connected = False
+
+        assert await close_client(client) == ["auth"]
+
+
+class TestShutdown:
+    """Tests for the full shutdown sequence."""
+
+    @pytest.mark.asyncio
+    async def test_runs_hooks_then_closes_client(self):
+        """Test that hooks flush before transports close, even if a hook fails."""
+        order = []
+        client = MagicMock()
+        client._postgrest.aclose = AsyncMock(side_effect=lambda: order.append("close"))
+        client.auth = None
+        client.realtime = None
+
+        async def failing_hook():
+            order.append("failing")
+            raise RuntimeError("flush failed")
+
+        async def flush_hook():
+            order.append("flush")
+
+        report = await shutdown(CallTracker(), client, [failing_hook, flush_hook], 1)
+
+        assert order == ["failing", "flush", "close"]
+        assert report.completed == 0
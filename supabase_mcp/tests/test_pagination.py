@@ -0,0 +1,153 @@
+"""
+Tests for keyset pagination.
+
+This module contains tests for:
+- Cursor encoding and validation
+- prepare_page and finish_page
+- The keyset filters generated for PostgREST and Postgres
+"""
+
+from dataclasses import replace
+
+import pytest
+from postgrest import AsyncPostgrestClient
+
+from supabase_mcp.backends.base import ReadQuery
+from supabase_mcp.backends.sql import build_select
+from supabase_mcp.backends.postgrest import apply_keyset
+from supabase_mcp.pagination import (
+    DEFAULT_PAGE_SIZE,
+    Cursor,
+    decode_cursor,
+    encode_cursor,
+    finish_page,
+    prepare_page,
+)
+
+
+class TestCursor:
+    """Tests for cursor tokens."""
+
+    def test_round_trip(self):
+        """Test that a cursor decodes to what was encoded."""
+        cursor = Cursor(["created_at", "id"], False, ["2024-01-01T00:00:00+00:00", 7], "abc")
+        assert decode_cursor(encode_cursor(cursor)) == cursor
+
+    def test_rejects_garbage(self):
+        """Test that malformed tokens raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            decode_cursor("not-a-cursor")
+
+
+class TestPreparePage:
+    """Tests for turning reads into page reads."""
+
+    def test_first_page(self):
+        """Test ordering, default page size and added key columns."""
+        page, keys, added = prepare_page(
+            ReadQuery(table="orders", columns="status", order_by="created_at"), "id", None
+        )
+
+        assert keys == ["created_at", "id"]
+        assert added == ["created_at", "id"]
+        assert page.columns == "status,created_at,id"
+        assert (page.order_by, page.tiebreaker, page.after) == ("created_at", "id", None)
+        assert page.limit == DEFAULT_PAGE_SIZE
+
+    def test_next_page_round_trip(self):
+        """Test that a full page yields a cursor that resumes after its last row."""
+        query = ReadQuery(table="orders", columns="status", filters={"status": "paid"}, limit=2)
+        page, keys, added = prepare_page(query, "id", None)
+        result = finish_page(page, [{"id": 1, "status": "paid"}, {"id": 5, "status": "paid"}],
+                             keys, added)
+
+        assert result["rows"] == [{"status": "paid"}, {"status": "paid"}]
+        next_page, _, _ = prepare_page(query, "id", result["next_cursor"])
+        assert next_page.after == [5]
+
+    def test_last_page_has_no_cursor(self):
+        """Test that a short page ends pagination."""
+        page, keys, added = prepare_page(ReadQuery(table="orders", limit=10), "id", None)
+        assert finish_page(page, [{"id": 1}], keys, added)["next_cursor"] is None
+
+    def test_cursor_for_other_query_rejected(self):
+        """Test that a cursor cannot be replayed with different filters."""
+        page, keys, added = prepare_page(ReadQuery(table="orders", limit=1), "id", None)
+        token = finish_page(page, [{"id": 1}], keys, added)["next_cursor"]
+
+        with pytest.raises(ValueError, match="different"):
+            prepare_page(ReadQuery(table="orders", filters={"status": "paid"}), "id", token)
+
+    def test_null_ordering_value(self):
+        """Test that a NULL order_by value resumes the NULL rows, and a NULL key is refused."""
+        query = ReadQuery(table="orders", order_by="shipped_at", limit=1)
+        page, keys, added = prepare_page(query, "id", None)
+        token = finish_page(page, [{"id": 1, "shipped_at": None}], keys, added)["next_cursor"]
+
+        assert prepare_page(query, "id", token)[0].after == [None, 1]
+        with pytest.raises(ValueError, match="NULL"):
+            finish_page(page, [{"id": None, "shipped_at": None}], keys, added)
+
+
+class TestKeysetFilters:
+    """Tests for the backend-specific keyset predicates."""
+
+    def test_postgrest_single_key(self):
+        """Test that a single key becomes a gt filter."""
+        request = AsyncPostgrestClient("http://localhost").table("orders").select("*")
+        request = apply_keyset(request, ["id"], [100], True)
+        assert request.params["id"] == "gt.100"
+
+    def test_postgrest_composite_key(self):
+        """Test that two keys expand into a quoted or/and tree."""
+        request = AsyncPostgrestClient("http://localhost").table("orders").select("*")
+        request = apply_keyset(request, ["created_at", "id"], ["2024-01-01 00:00,x", 9], False)
+        assert request.params["or"] == (
+            '(created_at.lt."2024-01-01 00:00,x",'
+            'and(created_at.eq."2024-01-01 00:00,x",id.lt."9"))'
+        )
+
+    def test_postgres_row_comparison(self):
+        """Test that Postgres uses a row comparison over both keys."""
+        query = ReadQuery(
+            table="orders", order_by="created_at", tiebreaker="id", after=["2024-01-01", 9],
+            filters={"status": "paid"}, limit=50,
+        )
+        sql, args = build_select(query, {"id": "bigint", "created_at": "timestamptz",
+                                         "status": "text"})
+
+        assert sql == (
+            'SELECT * FROM "orders" WHERE "status" = $1::text::text AND (("created_at", "id") > '
+            '($2::text::timestamptz, $3::text::bigint) OR "created_at" IS NULL) '
+            'ORDER BY "created_at" ASC NULLS LAST, "id" ASC NULLS LAST LIMIT $4::text::bigint'
+        )
+        assert args == ["paid", "2024-01-01", "9", "50"]
+
+    def test_postgrest_null_branches(self):
+        """Test that PostgREST pages reach rows whose ordering column is NULL."""
+        client = AsyncPostgrestClient("http://localhost")
+
+        request = apply_keyset(client.table("orders").select("*"), ["shipped_at", "id"],
+                               ["2024-01-01", 9], True)
+        assert request.params["or"].endswith(',shipped_at.is.null)')
+        request = apply_keyset(client.table("orders").select("*"), ["shipped_at", "id"],
+                               [None, 9], True)
+        assert (request.params["shipped_at"], request.params["id"]) == ("is.null", "gt.9")
+        request = apply_keyset(client.table("orders").select("*"), ["shipped_at", "id"],
+                               [None, 9], False)
+        assert request.params["or"] == '(shipped_at.not.is.null,id.lt."9")'
+
+    def test_postgres_null_branches(self):
+        """Test that Postgres pages reach rows whose ordering column is NULL."""
+        types = {"id": "bigint", "shipped_at": "timestamptz"}
+        query = ReadQuery(table="orders", order_by="shipped_at", tiebreaker="id",
+                          after=[None, 9], limit=50)
+
+        sql, args = build_select(query, types)
+        assert '"shipped_at" IS NULL AND "id" > $1::text::bigint' in sql
+        assert args == ["9", "50"]
+        sql, _ = build_select(replace(query, ascending=False), types)
+        assert '("shipped_at" IS NOT NULL OR "id" < $1::text::bigint)' in sql
+        sql, _ = build_select(replace(query, ascending=False, after=["2024-01-01", 9]), types)
+        assert "IS NULL" not in sql
+        assert 'ORDER BY "shipped_at" DESC NULLS FIRST' in sql
@@ -0,0 +1,292 @@
+"""
+Tests for query plans.
+
+This module contains tests for:
+- Reading the cost limit from the environment
+- Summarizing JSON plans and flagging costly ones
+- The PostgREST backend asking for plans with the plan media type
+- explain_query, and the cost limit on read_table_rows and the write tools
+- The postgres backend against a live database (set TEST_DATABASE_URL to run)
+"""
+
+import json
+import logging
+import os
+
+import httpx
+import pytest
+from unittest.mock import MagicMock
+from mcp.server.fastmcp import Context
+from postgrest import AsyncPostgrestClient
+
+from supabase_mcp.backends import PostgresConfig, PostgrestBackend, ReadQuery
+from supabase_mcp.backends.base import Backend
+from supabase_mcp.cache import CacheConfig, QueryCache
+from supabase_mcp.plans import PlanConfig, check_operation, cost_warning, summarize
+from supabase_mcp.server import (
+    SupabaseContext, delete_table_records, explain_query, read_table_rows
+)
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+SEQ_PLAN = {
+    "Plan": {
+        "Node Type": "Limit", "Startup Cost": 0.0, "Total Cost": 4250.5, "Plan Rows": 10,
+        "Plans": [{
+            "Node Type": "Seq Scan", "Relation Name": "events", "Total Cost": 4250.5,
+            "Plan Rows": 5000, "Filter": "(user_id = 7)",
+        }],
+    },
+}
+
+INDEX_PLAN = {
+    "Plan": {
+        "Node Type": "Index Scan", "Relation Name": "events", "Index Name": "events_pkey",
+        "Startup Cost": 0.42, "Total Cost": 8.44, "Plan Rows": 1, "Actual Rows": 1,
+    },
+    "Planning Time": 0.06,
+    "Execution Time": 0.03,
+}
+
+
+class PlanBackend(Backend):
+    """Backend that returns a fixed plan and records reads and explains."""
+
+    name = "plans"
+
+    def __init__(self, plan):
+        self.plan = plan
+        self.explained = []
+        self.reads = 0
+
+    async def explain(self, operation, query, updates=None, analyze=False):
+        self.explained.append((operation, query.table, updates, analyze))
+        return self.plan
+
+    async def read(self, query):
+        self.reads += 1
+        return [{"id": 1}]
+
+    async def insert(self, table, records):
+        raise NotImplementedError
+
+    async def update(self, table, updates, filters):
+        raise NotImplementedError
+
+    async def delete(self, table, filters):
+        return [{"id": 1}]
+
+
+def plan_context(plan, **config):
+    """Create a mock MCP context over a PlanBackend."""
+    mock_context = MagicMock(spec=Context)
+    backend = PlanBackend(plan)
+    mock_context.request_context.lifespan_context = SupabaseContext(
+        backend=backend, plans=PlanConfig(**config)
+    )
+    return mock_context, backend
+
+
+class TestPlanConfig:
+    """Tests for the cost limit configuration."""
+
+    def test_defaults_and_env(self):
+        """Test that the limit is off by default and variables set it."""
+        assert PlanConfig.from_env({}) == PlanConfig(max_cost=0.0, action="warn")
+        config = PlanConfig.from_env({
+            "SUPABASE_MCP_MAX_QUERY_COST": "1000", "SUPABASE_MCP_QUERY_COST_ACTION": "Refuse"
+        })
+        assert config == PlanConfig(max_cost=1000.0, action="refuse")
+
+    @pytest.mark.parametrize("env, message", [
+        ({"SUPABASE_MCP_MAX_QUERY_COST": "-1"}, "must not be negative"),
+        ({"SUPABASE_MCP_QUERY_COST_ACTION": "block"}, "warn, refuse"),
+    ])
+    def test_rejects_invalid(self, env, message):
+        """Test that malformed variables are rejected."""
+        with pytest.raises(ValueError, match=message):
+            PlanConfig.from_env(env)
+
+
+class TestSummarize:
+    """Tests for summarizing plans."""
+
+    def test_scans_and_costs(self):
+        """Test that nested scans are listed with their filters and indexes."""
+        summary = summarize(SEQ_PLAN)
+
+        assert summary == {
+            "node_type": "Limit", "startup_cost": 0.0, "total_cost": 4250.5, "rows": 10,
+            "scans": [{"node_type": "Seq Scan", "table": "events", "rows": 5000,
+                       "filter": "(user_id = 7)"}],
+        }
+
+    def test_analyze_timings(self):
+        """Test that ANALYZE figures are reported when present."""
+        summary = summarize(INDEX_PLAN)
+
+        assert summary["scans"][0]["index"] == "events_pkey"
+        assert (summary["actual_rows"], summary["execution_ms"]) == (1, 0.03)
+
+    def test_cost_warning(self):
+        """Test that only plans over a configured limit are flagged."""
+        assert cost_warning(summarize(SEQ_PLAN), PlanConfig()) is None
+        assert cost_warning(summarize(INDEX_PLAN), PlanConfig(max_cost=100)) is None
+        assert cost_warning(summarize(SEQ_PLAN), PlanConfig(max_cost=100)) == (
+            "Estimated cost 4250 exceeds SUPABASE_MCP_MAX_QUERY_COST (100); "
+            "sequential scan of events"
+        )
+
+    def test_analyze_is_only_for_reads(self):
+        """Test that ANALYZE, which runs the query, is refused for writes."""
+        check_operation("read", True)
+        with pytest.raises(ValueError, match="only allowed for reads"):
+            check_operation("delete", True)
+        with pytest.raises(ValueError, match="operation must be one of"):
+            check_operation("insert", False)
+
+
+class TestPostgrestExplain:
+    """Tests for plans through PostgREST."""
+
+    @staticmethod
+    def backend(handler):
+        """Build a PostgREST backend whose requests go to a handler."""
+        client = AsyncPostgrestClient("http://localhost")
+        client.session = httpx.AsyncClient(
+            base_url="http://localhost", transport=httpx.MockTransport(handler)
+        )
+        return PostgrestBackend(lambda: client)
+
+    @pytest.mark.asyncio
+    async def test_plan_request(self):
+        """Test that the request the operation would send is asked for as a plan."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json=[SEQ_PLAN])
+
+        backend = self.backend(handler)
+        query = ReadQuery(table="events", filters={"user_id": 7}, limit=10)
+
+        plan = await backend.explain("read", query, analyze=True)
+        await backend.explain("update", query, {"seen": True})
+
+        # Verify the plan is returned and both requests carry the plan media type
+        assert plan == SEQ_PLAN
+        read, update = requests
+        assert read.method == "GET"
+        assert read.headers["Accept"] == "application/vnd.pgrst.plan+json; options=analyze"
+        assert read.url.params["user_id"] == "eq.7"
+        assert update.method == "PATCH"
+        assert update.headers["Accept"] == "application/vnd.pgrst.plan+json"
+        assert json.loads(update.content) == {"seen": True}
+
+    @pytest.mark.asyncio
+    async def test_plans_disabled(self):
+        """Test that a server without db-plan-enabled gets an actionable error."""
+        backend = self.backend(lambda request: httpx.Response(406, json={
+            "code": "PGRST107",
+            "message": "None of these media types are available: "
+                       "application/vnd.pgrst.plan+json",
+        }))
+
+        with pytest.raises(ValueError, match="db-plan-enabled"):
+            await backend.explain("read", ReadQuery(table="events"))
+
+
+class TestExplainTools:
+    """Tests for explain_query and the cost limit on other tools."""
+
+    @pytest.mark.asyncio
+    async def test_explain_query(self):
+        """Test the summary, warning and full plan of explain_query."""
+        # Create mock context with a cost limit
+        mock_context, backend = plan_context(SEQ_PLAN, max_cost=1000)
+
+        result = await explain_query(
+            ctx=mock_context, table_name="events", filters={"user_id": 7}, limit=10
+        )
+
+        # Verify the read was planned, not run
+        assert backend.explained == [("read", "events", None, False)]
+        assert backend.reads == 0
+        assert result["total_cost"] == 4250.5
+        assert "sequential scan of events" in result["warning"]
+        assert result["plan"] == SEQ_PLAN
+
+    @pytest.mark.asyncio
+    async def test_refuse_costly_read(self):
+        """Test that a read over the limit is refused before it runs."""
+        # Create mock context that refuses costly queries
+        mock_context, backend = plan_context(SEQ_PLAN, max_cost=1000, action="refuse")
+
+        with pytest.raises(ValueError, match="Refusing this read of 'events'"):
+            await read_table_rows(ctx=mock_context, table_name="events", limit=10)
+        assert backend.reads == 0
+
+        with pytest.raises(ValueError, match="Refusing this delete"):
+            await delete_table_records(ctx=mock_context, table_name="events", filters={"id": 1})
+
+    @pytest.mark.asyncio
+    async def test_warn_and_unlimited(self, caplog):
+        """Test that warn logs and runs the read, and no limit skips planning."""
+        # Create mock context that warns about costly queries
+        mock_context, backend = plan_context(SEQ_PLAN, max_cost=1000)
+
+        with caplog.at_level(logging.WARNING, logger="supabase_mcp.plans"):
+            assert await read_table_rows(ctx=mock_context, table_name="events") == [{"id": 1}]
+        assert "exceeds SUPABASE_MCP_MAX_QUERY_COST" in caplog.text
+
+        mock_context, backend = plan_context(SEQ_PLAN)
+        await read_table_rows(ctx=mock_context, table_name="events")
+        assert backend.explained == []
+
+    @pytest.mark.asyncio
+    async def test_cache_hits_are_not_planned(self):
+        """Test that only a cache miss pays for planning a read."""
+        # Create mock context with a cost limit and the result cache on
+        mock_context, backend = plan_context(INDEX_PLAN, max_cost=1000)
+        app = mock_context.request_context.lifespan_context
+        app.cache = QueryCache(CacheConfig(ttl=60))
+
+        for _ in range(3):
+            await read_table_rows(ctx=mock_context, table_name="events", limit=10)
+
+        # Verify the first read was planned and run, and the others served from the cache
+        assert (len(backend.explained), backend.reads) == (1, 1)
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+class TestPostgresExplainLive:
+    """Tests for plans from a real database."""
+
+    @pytest.mark.asyncio
+    async def test_index_and_seq_scans(self):
+        """Test that a primary key lookup uses the index and a text filter scans."""
+        from supabase_mcp.backends import PostgresBackend
+
+        backend = await PostgresBackend.connect(PostgresConfig(TEST_DATABASE_URL, 1, 1))
+        try:
+            await backend.pool.execute(
+                "DROP TABLE IF EXISTS mcp_test_plans;"
+                "CREATE TABLE mcp_test_plans (id bigint PRIMARY KEY, name text);"
+                "INSERT INTO mcp_test_plans SELECT g, 'n' || g FROM generate_series(1, 5000) g;"
+                "ANALYZE mcp_test_plans"
+            )
+
+            by_id = await backend.explain(
+                "read", ReadQuery(table="mcp_test_plans", filters={"id": 7}), analyze=True
+            )
+            by_name = await backend.explain(
+                "delete", ReadQuery(table="mcp_test_plans", filters={"name": "n7"})
+            )
+
+            assert summarize(by_id)["scans"][0]["index"] == "mcp_test_plans_pkey"
+            assert summarize(by_id)["actual_rows"] == 1
+            assert summarize(by_name)["scans"][0]["node_type"] == "Seq Scan"
+            assert await backend.pool.fetchval("SELECT count(*) FROM mcp_test_plans") == 5000
+        finally:
+            await backend.pool.execute("DROP TABLE IF EXISTS mcp_test_plans")
+            await backend.aclose()
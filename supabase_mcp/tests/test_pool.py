@@ -0,0 +1,116 @@
+"""
+Tests for the HTTP connection pool configuration.
+
+This module contains tests for:
+- PoolConfig.from_env
+- build_http_client
+- pool_stats
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from supabase_mcp.pool import PoolConfig, build_http_client, pool_stats
+
+
+class TestPoolConfig:
+    """Tests for reading the pool configuration from the environment."""
+
+    def test_defaults_when_unset(self):
+        """Test that unset variables fall back to the defaults."""
+        assert PoolConfig.from_env({}) == PoolConfig()
+
+    def test_reads_all_variables(self):
+        """Test that every variable is parsed into the configuration."""
+        config = PoolConfig.from_env({
+            "SUPABASE_POOL_MAX_CONNECTIONS": "50",
+            "SUPABASE_POOL_MAX_KEEPALIVE": "10",
+            "SUPABASE_POOL_KEEPALIVE_EXPIRY": "60",
+            "SUPABASE_HTTP2": "false",
+            "SUPABASE_CONNECT_TIMEOUT": "2.5",
+            "SUPABASE_READ_TIMEOUT": "30",
+            "SUPABASE_WRITE_TIMEOUT": "15",
+            "SUPABASE_POOL_TIMEOUT": "1",
+        })
+
+        assert config == PoolConfig(
+            max_connections=50,
+            max_keepalive_connections=10,
+            keepalive_expiry=60.0,
+            http2=False,
+            connect_timeout=2.5,
+            read_timeout=30.0,
+            write_timeout=15.0,
+            pool_timeout=1.0,
+        )
+
+    def test_rejects_malformed_values(self):
+        """Test that malformed numbers and booleans raise ValueError."""
+        with pytest.raises(ValueError) as excinfo:
+            PoolConfig.from_env({"SUPABASE_POOL_MAX_CONNECTIONS": "lots"})
+        assert "SUPABASE_POOL_MAX_CONNECTIONS" in str(excinfo.value)
+
+        with pytest.raises(ValueError):
+            PoolConfig.from_env({"SUPABASE_HTTP2": "maybe"})
+
+    def test_rejects_keepalive_above_max_connections(self):
+        """Test that keep-alive connections cannot exceed the pool size."""
+        with pytest.raises(ValueError):
+            PoolConfig.from_env({
+                "SUPABASE_POOL_MAX_CONNECTIONS": "5",
+                "SUPABASE_POOL_MAX_KEEPALIVE": "6",
+            })
+
+
+class TestBuildHttpClient:
+    """Tests for building the pooled httpx client."""
+
+    @pytest.mark.asyncio
+    async def test_applies_limits_and_timeouts(self):
+        """Test that limits, timeouts and headers reach the httpx client."""
+        config = PoolConfig(max_connections=3, max_keepalive_connections=2, read_timeout=9)
+        client = build_http_client(config, "https://example.com/rest/v1", {"apiKey": "k"})
+
+        assert client.timeout.read == 9
+        assert client.timeout.connect == config.connect_timeout
+        assert client.headers["apiKey"] == "k"
+        assert client._transport._pool._max_connections == 3
+        assert client._transport._pool._max_keepalive_connections == 2
+        await client.aclose()
+
+
+class TestPoolStats:
+    """Tests for reporting pool statistics."""
+
+    @pytest.mark.asyncio
+    async def test_counts_idle_connection_after_request(self):
+        """Test that a finished request leaves one idle keep-alive connection."""
+        # Start a minimal keep-alive HTTP/1.1 server on localhost
+        async def serve(reader, writer):
+            while await reader.readuntil(b"\r\n\r\n"):
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n[]")
+                await writer.drain()
+
+        server = await asyncio.start_server(serve, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        client = build_http_client(PoolConfig(http2=False), f"http://127.0.0.1:{port}", {})
+
+        # Verify a fresh pool is empty
+        assert pool_stats(client)["open"] == 0
+
+        await client.get("/users")
+
+        # Verify the connection is kept open and idle for reuse
+        assert pool_stats(client) == {
+            "open": 1, "idle": 1, "active": 0, "http2": 0, "in_flight": 0, "waiting": 0
+        }
+        await client.aclose()
+        server.close()
+
+    def test_tolerates_transport_without_pool(self):
+        """Test that a transport without a connection pool reports zeros."""
+        client = httpx.AsyncClient(transport=httpx.MockTransport(lambda r: None))
+
+        assert pool_stats(client)["open"] == 0
@@ -0,0 +1,231 @@
+"""
+Tests for retries and the circuit breaker.
+
+This module contains tests for:
+- classify
+- ResilienceConfig
+- CircuitBreaker
+- ResilientBackend
+"""
+
+import random
+
+import httpx
+import pytest
+from postgrest import APIError
+
+from supabase_mcp.backends.base import Backend, ReadQuery
+from supabase_mcp.resilience import (
+    TRANSIENT,
+    UNSENT,
+    CircuitBreaker,
+    CircuitOpenError,
+    ResilienceConfig,
+    ResilientBackend,
+    classify,
+)
+
+FAST = ResilienceConfig(max_attempts=3, base_delay=0, max_delay=0, breaker_threshold=2)
+
+
+class ScriptedBackend(Backend):
+    """Backend that raises the scripted errors in order, then succeeds."""
+
+    name = "scripted"
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def _next(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return [{"id": 1}]
+
+    async def read(self, query):
+        return await self._next()
+
+    async def insert(self, table, records):
+        return await self._next()
+
+    async def update(self, table, updates, filters):
+        return await self._next()
+
+    async def delete(self, table, filters):
+        return await self._next()
+
+
+class Clock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestClassify:
+    """Tests for failure classification."""
+
+    def test_http_errors(self):
+        """Test that connect failures are unsent and read failures transient."""
+        assert classify(httpx.ConnectError("refused")) == UNSENT
+        assert classify(httpx.PoolTimeout("busy")) == UNSENT
+        assert classify(httpx.ReadTimeout("slow")) == TRANSIENT
+
+    def test_postgrest_errors(self):
+        """Test PostgREST codes, SQLSTATEs and raw HTTP statuses."""
+        assert classify(APIError({"code": "PGRST001", "message": "no connection"})) == UNSENT
+        assert classify(APIError({"code": "40001", "message": "serialization"})) == UNSENT
+        assert classify(APIError({"code": 503, "message": "JSON could not be generated"})) == TRANSIENT
+        assert classify(APIError({"code": 429, "message": "JSON could not be generated"})) == UNSENT
+        assert classify(APIError({"code": "23505", "message": "duplicate key"})) is None
+        assert classify(APIError({"code": "PGRST116", "message": "no rows"})) is None
+
+    def test_other_errors_are_permanent(self):
+        """Test that unknown exceptions are never retried."""
+        assert classify(ValueError("bad filter")) is None
+
+
+class TestResilienceConfig:
+    """Tests for reading retry and breaker settings."""
+
+    def test_defaults(self):
+        """Test that unset variables use the defaults."""
+        assert ResilienceConfig.from_env({}) == ResilienceConfig()
+
+    def test_rejects_zero_attempts(self):
+        """Test that at least one attempt is required."""
+        with pytest.raises(ValueError, match="SUPABASE_MCP_RETRY_ATTEMPTS"):
+            ResilienceConfig.from_env({"SUPABASE_MCP_RETRY_ATTEMPTS": "0"})
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Test that delays stay within the exponential ceiling and the cap."""
+        config = ResilienceConfig(base_delay=0.1, max_delay=0.5)
+        rng = random.Random(1)
+        delays = [config.backoff(retry, rng) for retry in range(10)]
+        assert all(0 <= delay <= 0.5 for delay in delays)
+        assert config.backoff(0, rng) <= 0.1
+
+
+class TestCircuitBreaker:
+    """Tests for the breaker's state machine."""
+
+    def test_opens_fails_fast_and_recovers(self):
+        """Test closed -> open -> half-open -> closed transitions."""
+        clock = Clock()
+        breaker = CircuitBreaker("scripted", threshold=2, reset_timeout=10, clock=clock)
+        for _ in range(2):
+            breaker.release(breaker.acquire(), failed=True)
+        assert breaker.state == "open"
+
+        # Calls fail fast while open
+        with pytest.raises(CircuitOpenError):
+            breaker.acquire()
+
+        # After the reset timeout one probe is admitted
+        clock.now = 10
+        assert breaker.acquire() is True
+        with pytest.raises(CircuitOpenError):
+            breaker.acquire()
+        breaker.release(True, failed=False)
+
+        assert breaker.stats() == {
+            "state": "closed", "consecutive_failures": 0, "trips": 1, "rejected": 2
+        }
+
+    def test_failed_probe_reopens(self):
+        """Test that a failing half-open probe reopens the breaker."""
+        clock = Clock()
+        breaker = CircuitBreaker("scripted", threshold=1, reset_timeout=5, clock=clock)
+        breaker.release(breaker.acquire(), failed=True)
+        clock.now = 5
+        breaker.release(breaker.acquire(), failed=True)
+        assert breaker.state == "open"
+        assert breaker.opened_at == 5
+
+    def test_threshold_zero_disables(self):
+        """Test that a zero threshold never opens the breaker."""
+        breaker = CircuitBreaker("scripted", threshold=0, reset_timeout=5)
+        for _ in range(10):
+            breaker.release(breaker.acquire(), failed=True)
+        assert breaker.state == "closed"
+
+
+class TestResilientBackend:
+    """Tests for retrying backend calls."""
+
+    @pytest.mark.asyncio
+    async def test_read_retries_transient_failures(self):
+        """Test that reads recover from transient errors."""
+        inner = ScriptedBackend(httpx.ReadTimeout("slow"), httpx.ConnectError("refused"))
+        backend = ResilientBackend(inner, ResilienceConfig(base_delay=0, max_delay=0))
+
+        assert await backend.read(ReadQuery(table="users")) == [{"id": 1}]
+        assert inner.calls == 3
+        assert backend.stats()["retries"] == {"attempted": 2, "recovered": 1, "exhausted": 0}
+
+    @pytest.mark.asyncio
+    async def test_insert_not_retried_after_possible_execution(self):
+        """Test that an insert whose request may have executed is not replayed."""
+        inner = ScriptedBackend(httpx.ReadTimeout("slow"))
+        backend = ResilientBackend(inner, FAST)
+
+        with pytest.raises(httpx.ReadTimeout):
+            await backend.insert("users", {"name": "x"})
+        assert inner.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_insert_retried_when_unsent(self):
+        """Test that an insert is retried when the request never reached the server."""
+        inner = ScriptedBackend(httpx.ConnectError("refused"))
+        backend = ResilientBackend(inner, FAST)
+
+        assert await backend.insert("users", {"name": "x"}) == [{"id": 1}]
+        assert inner.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_update_of_a_filtered_column_not_retried(self):
+        """Test that an update whose filters test a column it sets is not replayed."""
+        # A replay after a committed attempt would match no rows and report a miss
+        inner = ScriptedBackend(httpx.ReadTimeout("slow"))
+        backend = ResilientBackend(inner, FAST)
+
+        with pytest.raises(httpx.ReadTimeout):
+            await backend.update(
+                "orders", {"status": "done"}, {"or": [{"status": "pending"}, {"id": 1}]}
+            )
+        assert inner.calls == 1
+
+        # Verify unsent failures still retry, and so do updates of other columns
+        inner = ScriptedBackend(httpx.ConnectError("refused"), httpx.ReadTimeout("slow"))
+        backend = ResilientBackend(inner, ResilienceConfig(base_delay=0, max_delay=0))
+        assert await backend.update("orders", {"status": "done"}, {"id": 1}) == [{"id": 1}]
+        assert inner.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_permanent_errors_not_retried(self):
+        """Test that client errors surface immediately and keep the breaker closed."""
+        inner = ScriptedBackend(APIError({"code": "42703", "message": "no such column"}))
+        backend = ResilientBackend(inner, FAST)
+
+        with pytest.raises(APIError):
+            await backend.read(ReadQuery(table="users"))
+        assert inner.calls == 1
+        assert backend.breaker.state == "closed"
+
+    @pytest.mark.asyncio
+    async def test_breaker_opens_during_outage(self):
+        """Test that an outage opens the breaker and later calls fail fast."""
+        inner = ScriptedBackend(*[httpx.ConnectError("down")] * 10)
+        backend = ResilientBackend(inner, FAST)
+
+        # Two failed attempts open the breaker, stopping the retry loop
+        with pytest.raises(CircuitOpenError):
+            await backend.read(ReadQuery(table="users"))
+        with pytest.raises(CircuitOpenError):
+            await backend.delete("users", {"id": 1})
+        assert inner.calls == 2
+        assert backend.stats()["breaker"]["state"] == "open"
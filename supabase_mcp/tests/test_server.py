@@ -5,12 +5,15 @@ This module contains tests for:
 - The Supabase lifespan context manager
 - MCP tools for interacting with Supabase tables:
   - read_table_rows
+  - count_table_rows
   - create_table_records
   - update_table_records
   - delete_table_records
 """
 
+import asyncio
 import os
+import time
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from typing import Dict, List, Any
@@ -20,10 +23,16 @@ from supabase_mcp.server import (
     supabase_lifespan,
     SupabaseContext,
     read_table_rows,
+    count_table_rows,
     create_table_records,
     update_table_records,
     delete_table_records,
+    get_server_stats,
 )
+from postgrest.types import CountMethod
+from supabase_mcp.cache import CacheConfig, QueryCache
+from supabase_mcp.deadlines import ToolTimeoutError
+from supabase_mcp.pool import PoolConfig, PooledPostgrestClient
 
 
 class TestSupabaseLifespan:
@@ -37,9 +46,14 @@ class TestSupabaseLifespan:
             "SUPABASE_URL": "https://example.supabase.co",
             "SUPABASE_SERVICE_KEY": "mock-service-key"
         }):
-            # Mock the create_client function
-            with patch("supabase_mcp.server.create_client") as mock_create_client:
+            # Mock the acreate_client coroutine
+            with patch(
+                "supabase.acreate_client", new_callable=AsyncMock
+            ) as mock_create_client:
                 mock_client = MagicMock()
+                mock_client.rest_url = "https://example.supabase.co/rest/v1"
+                mock_client.options.headers = {"apiKey": "mock-service-key"}
+                mock_client.options.schema = "public"
                 mock_create_client.return_value = mock_client
                 
                 # Mock FastMCP server
@@ -51,12 +65,74 @@ class TestSupabaseLifespan:
                     assert isinstance(context, SupabaseContext)
                     assert context.client == mock_client
                     
-                # Verify create_client was called with correct parameters
-                mock_create_client.assert_called_once_with(
+                    # Check that the pooled PostgREST client was attached
+                    assert isinstance(mock_client._postgrest, PooledPostgrestClient)
+                    assert context.pool == PoolConfig()
+                    
+                # Verify shutdown drained calls and closed the PostgREST client
+                assert context.calls.accepting is False
+                assert context.client._postgrest.session.is_closed
+                    
+                # Verify acreate_client was awaited with correct parameters
+                mock_create_client.assert_awaited_once_with(
                     "https://example.supabase.co", 
                     "mock-service-key"
                 )
 
+    @pytest.mark.asyncio
+    async def test_lifespan_fast_start_defers_client(self):
+        """Test that fast-start mode builds the client on first use only."""
+        with patch.dict(os.environ, {
+            "SUPABASE_URL": "https://example.supabase.co",
+            "SUPABASE_SERVICE_KEY": "mock-service-key",
+            "SUPABASE_MCP_FAST_START": "true"
+        }):
+            with patch(
+                "supabase.acreate_client", new_callable=AsyncMock
+            ) as mock_create_client:
+                mock_server = MagicMock(spec=FastMCP)
+                
+                async with supabase_lifespan(mock_server) as context:
+                    # Check that no client exists until a tool asks for one
+                    assert context.client is None
+                    client = context.get_client()
+                    assert isinstance(client, PooledPostgrestClient)
+                    assert context.get_client() is client
+                
+                # Verify the full supabase client was never created
+                mock_create_client.assert_not_awaited()
+                assert client.session.is_closed
+
+    def test_get_client_without_factory(self):
+        """Test that a context without a client or factory raises RuntimeError."""
+        with pytest.raises(RuntimeError):
+            SupabaseContext().get_client()
+
+    @pytest.mark.asyncio
+    async def test_lifespan_postgres_backend(self):
+        """Test that the postgres backend only needs DATABASE_URL and is closed on exit."""
+        with patch.dict(os.environ, {
+            "SUPABASE_MCP_BACKEND": "postgres",
+            "DATABASE_URL": "postgresql://localhost/postgres"
+        }, clear=True):
+            with patch(
+                "supabase_mcp.context.PostgresBackend.connect", new_callable=AsyncMock
+            ) as mock_connect:
+                mock_backend = MagicMock()
+                mock_backend.aclose = AsyncMock()
+                mock_connect.return_value = mock_backend
+                mock_server = MagicMock(spec=FastMCP)
+                
+                async with supabase_lifespan(mock_server) as context:
+                    # Check that tools will run against the postgres backend,
+                    # through retries and shape recording
+                    assert context.get_backend().inner.inner is mock_backend
+                    assert context.client is None
+                
+                # Verify the pool was configured from the environment and closed
+                assert mock_connect.await_args.args[0].dsn == "postgresql://localhost/postgres"
+                mock_backend.aclose.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_lifespan_missing_env_vars(self):
         """Test that lifespan raises ValueError when environment variables are missing."""
@@ -80,20 +156,22 @@ class TestSupabaseLifespan:
 class TestReadTableRows:
     """Tests for the read_table_rows MCP tool."""
 
-    def test_read_table_rows_basic(self):
+    @pytest.mark.asyncio
+    async def test_read_table_rows_basic(self):
         """Test basic functionality of read_table_rows."""
         # Create mock context
         mock_context = MagicMock(spec=Context)
         mock_supabase = MagicMock()
-        mock_context.request_context.lifespan_context.client = mock_supabase
+        mock_context.request_context.lifespan_context = SupabaseContext(client=mock_supabase)
         
         # Mock the Supabase query builder
         mock_query = MagicMock()
         mock_supabase.table.return_value.select.return_value = mock_query
+        mock_query.execute = AsyncMock()
         mock_query.execute.return_value.data = [{"id": 1, "name": "Test"}]
         
         # Call the function
-        result = read_table_rows(
+        result = await read_table_rows(
             ctx=mock_context,
             table_name="users",
             columns="id,name"
@@ -105,23 +183,25 @@ class TestReadTableRows:
         # Verify the query was built correctly
         mock_supabase.table.assert_called_once_with("users")
         mock_supabase.table.return_value.select.assert_called_once_with("id,name")
-        mock_query.execute.assert_called_once()
+        mock_query.execute.assert_awaited_once()
 
-    def test_read_table_rows_with_filters(self):
+    @pytest.mark.asyncio
+    async def test_read_table_rows_with_filters(self):
         """Test read_table_rows with filters applied."""
         # Create mock context
         mock_context = MagicMock(spec=Context)
         mock_supabase = MagicMock()
-        mock_context.request_context.lifespan_context.client = mock_supabase
+        mock_context.request_context.lifespan_context = SupabaseContext(client=mock_supabase)
         
         # Mock the Supabase query builder
         mock_query = MagicMock()
         mock_supabase.table.return_value.select.return_value = mock_query
         mock_query.eq.return_value = mock_query
+        mock_query.execute = AsyncMock()
         mock_query.execute.return_value.data = [{"id": 1, "name": "Test", "active": True}]
         
         # Call the function with filters
-        result = read_table_rows(
+        result = await read_table_rows(
             ctx=mock_context,
             table_name="users",
             filters={"active": True}
@@ -133,27 +213,29 @@ class TestReadTableRows:
         # Verify the query was built correctly
         mock_supabase.table.assert_called_once_with("users")
         mock_query.eq.assert_called_once_with("active", True)
-        mock_query.execute.assert_called_once()
+        mock_query.execute.assert_awaited_once()
 
-    def test_read_table_rows_with_ordering_and_limit(self):
+    @pytest.mark.asyncio
+    async def test_read_table_rows_with_ordering_and_limit(self):
         """Test read_table_rows with ordering and limit."""
         # Create mock context
         mock_context = MagicMock(spec=Context)
         mock_supabase = MagicMock()
-        mock_context.request_context.lifespan_context.client = mock_supabase
+        mock_context.request_context.lifespan_context = SupabaseContext(client=mock_supabase)
         
         # Mock the Supabase query builder
         mock_query = MagicMock()
         mock_supabase.table.return_value.select.return_value = mock_query
         mock_query.order.return_value = mock_query
         mock_query.limit.return_value = mock_query
+        mock_query.execute = AsyncMock()
         mock_query.execute.return_value.data = [
             {"id": 1, "created_at": "2023-01-01"},
             {"id": 2, "created_at": "2023-01-02"}
         ]
         
         # Call the function with ordering and limit
-        result = read_table_rows(
+        result = await read_table_rows(
             ctx=mock_context,
             table_name="users",
             order_by="created_at",
@@ -169,28 +251,30 @@ class TestReadTableRows:
         
         # Verify the query was built correctly
         mock_supabase.table.assert_called_once_with("users")
-        mock_query.order.assert_called_once_with("created_at", ascending=True)
+        mock_query.order.assert_called_once_with("created_at", desc=False)
         mock_query.limit.assert_called_once_with(2)
-        mock_query.execute.assert_called_once()
+        mock_query.execute.assert_awaited_once()
 
-    def test_read_table_rows_with_descending_order(self):
+    @pytest.mark.asyncio
+    async def test_read_table_rows_with_descending_order(self):
         """Test read_table_rows with descending order."""
         # Create mock context
         mock_context = MagicMock(spec=Context)
         mock_supabase = MagicMock()
-        mock_context.request_context.lifespan_context.client = mock_supabase
+        mock_context.request_context.lifespan_context = SupabaseContext(client=mock_supabase)
 
         # Mock the Supabase query builder
         mock_query = MagicMock()
         mock_supabase.table.return_value.select.return_value = mock_query
         mock_query.order.return_value = mock_query
+        mock_query.execute = AsyncMock()
         mock_query.execute.return_value.data = [
             {"id": 2, "created_at": "2023-01-02"},
             {"id": 1, "created_at": "2023-01-01"}
         ]
 
         # Call the function with descending order
-        result = read_table_rows(
+        result = await read_table_rows(
             ctx=mock_context,
             table_name="users",
             order_by="created_at",
@@ -205,27 +289,253 @@ class TestReadTableRows:
 
         # Verify the query was built correctly with descending order
         mock_supabase.table.assert_called_once_with("users")
-        mock_query.order.assert_called_once_with("created_at", ascending=False)
-        mock_query.execute.assert_called_once()
+        mock_query.order.assert_called_once_with("created_at", desc=True)
+        mock_query.execute.assert_awaited_once()
+
+
+class TestReadTableRowsPagination:
+    """Tests for keyset pagination in read_table_rows."""
+
+    @pytest.mark.asyncio
+    async def test_paginate_returns_cursor(self):
+        """Test that a full page returns a cursor that filters the next page."""
+        # Create mock context
+        mock_context = MagicMock(spec=Context)
+        mock_supabase = MagicMock()
+        mock_context.request_context.lifespan_context = SupabaseContext(client=mock_supabase)
+        
+        # Mock the Supabase query builder
+        mock_query = MagicMock()
+        mock_supabase.table.return_value.select.return_value = mock_query
+        mock_query.order.return_value = mock_query
+        mock_query.limit.return_value = mock_query
+        mock_query.filter.return_value = mock_query
+        mock_query.execute = AsyncMock()
+        mock_query.execute.return_value.data = [{"id": 1}, {"id": 2}]
+        
+        # Read the first page
+        first = await read_table_rows(
+            ctx=mock_context, table_name="users", limit=2, paginate=True
+        )
+        
+        # Verify the page and that no keyset filter was applied yet
+        assert first["rows"] == [{"id": 1}, {"id": 2}]
+        assert first["next_cursor"]
+        mock_query.filter.assert_not_called()
+        mock_query.order.assert_called_once_with("id", desc=False)
+        
+        # Read the next page with the cursor
+        mock_query.execute.return_value.data = [{"id": 3}]
+        second = await read_table_rows(
+            ctx=mock_context, table_name="users", limit=2, cursor=first["next_cursor"]
+        )
+        
+        # Verify the next page resumed after id 2 and is the last page
+        mock_query.filter.assert_called_once_with("id", "gt", 2)
+        assert second == {"rows": [{"id": 3}], "next_cursor": None}
+
+
+class TestCounts:
+    """Tests for count_table_rows and counted reads."""
+
+    @pytest.mark.asyncio
+    async def test_count_is_a_head_request(self):
+        """Test that counting sends a filtered HEAD request and returns only the count."""
+        # Create mock context
+        mock_context = MagicMock(spec=Context)
+        mock_supabase = MagicMock()
+        mock_context.request_context.lifespan_context = SupabaseContext(client=mock_supabase)
+        
+        # Mock the Supabase query builder
+        mock_query = MagicMock()
+        mock_supabase.table.return_value.select.return_value = mock_query
+        mock_query.eq.return_value = mock_query
+        mock_query.execute = AsyncMock(return_value=MagicMock(data=[], count=1234))
+        
+        result = await count_table_rows(
+            ctx=mock_context, table_name="orders", filters={"status": "open"}, count="planned"
+        )
+        
+        # Verify the count came from a HEAD request with Prefer: count=planned
+        assert result == {"count": 1234, "method": "planned"}
+        mock_supabase.table.return_value.select.assert_called_once_with(
+            "*", count=CountMethod.planned, head=True
+        )
+        mock_query.eq.assert_called_once_with("status", "open")
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_method(self):
+        """Test that an unknown count method is rejected before any request."""
+        # Create mock context
+        mock_context = MagicMock(spec=Context)
+        mock_supabase = MagicMock()
+        mock_context.request_context.lifespan_context = SupabaseContext(client=mock_supabase)
+        
+        with pytest.raises(ValueError, match="count must be one of"):
+            await count_table_rows(ctx=mock_context, table_name="orders", count="rough")
+        mock_supabase.table.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_read_attaches_count_from_one_request(self):
+        """Test that a counted read takes the total from the same response."""
+        # Create mock context with caching enabled
+        mock_context = MagicMock(spec=Context)
+        mock_supabase = MagicMock()
+        app = SupabaseContext(client=mock_supabase, cache=QueryCache(CacheConfig(ttl=60)))
+        mock_context.request_context.lifespan_context = app
+        
+        # Mock the Supabase query builder
+        mock_query = MagicMock()
+        mock_supabase.table.return_value.select.return_value = mock_query
+        mock_query.order.return_value = mock_query
+        mock_query.limit.return_value = mock_query
+        mock_query.execute = AsyncMock(
+            return_value=MagicMock(data=[{"id": 1}, {"id": 2}], count=40)
+        )
+        
+        plain = await read_table_rows(ctx=mock_context, table_name="users", limit=2, count="exact")
+        paged = await read_table_rows(
+            ctx=mock_context, table_name="users", limit=2, paginate=True, count="exact"
+        )
+        
+        # Verify both reads asked for the count, bypassed the cache and used one request each
+        assert plain == {"rows": [{"id": 1}, {"id": 2}], "count": 40}
+        assert paged["count"] == 40 and paged["next_cursor"]
+        mock_supabase.table.return_value.select.assert_called_with("*", count=CountMethod.exact)
+        assert mock_query.execute.await_count == 2
+        assert app.cache.stats()["entries"] == 0
+
+
+class TestReadTableRowsCache:
+    """Tests for serving read_table_rows from the result cache."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_read_is_cached(self):
+        """Test that an identical read within the TTL does not reach Supabase."""
+        # Create mock context with caching enabled
+        mock_context = MagicMock(spec=Context)
+        mock_supabase = MagicMock()
+        app = SupabaseContext(client=mock_supabase, cache=QueryCache(CacheConfig(ttl=60)))
+        mock_context.request_context.lifespan_context = app
+        
+        # Mock the Supabase query builder
+        mock_query = MagicMock()
+        mock_supabase.table.return_value.select.return_value = mock_query
+        mock_query.eq.return_value = mock_query
+        mock_query.execute = AsyncMock()
+        mock_query.execute.return_value.data = [{"id": 1}]
+        
+        # Read twice with equivalent arguments
+        first = await read_table_rows(
+            ctx=mock_context, table_name="users", columns="id, name", filters={"a": 1}
+        )
+        second = await read_table_rows(
+            ctx=mock_context, table_name="users", columns="id,name", filters={"a": 1}
+        )
+        
+        # Verify only one request was made and the hit was counted
+        assert first == second == [{"id": 1}]
+        mock_query.execute.assert_awaited_once()
+        stats = await get_server_stats(ctx=mock_context)
+        assert stats["cache"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_write_invalidates_affected_reads(self):
+        """Test that a read after an update sees the update."""
+        # Create mock context with caching enabled
+        mock_context = MagicMock(spec=Context)
+        mock_supabase = MagicMock()
+        app = SupabaseContext(client=mock_supabase, cache=QueryCache(CacheConfig(ttl=60)))
+        mock_context.request_context.lifespan_context = app
+        
+        # Mock the Supabase read and update operations
+        mock_query = MagicMock()
+        mock_supabase.table.return_value.select.return_value = mock_query
+        mock_query.eq.return_value = mock_query
+        mock_query.execute = AsyncMock()
+        mock_query.execute.return_value.data = [{"id": 1, "status": "open"}]
+        mock_update = mock_supabase.table.return_value.update.return_value
+        mock_update.eq.return_value = mock_update
+        mock_update.execute = AsyncMock()
+        mock_update.execute.return_value.data = [{"id": 1, "customer": 3, "status": "closed"}]
+        
+        # Cache reads of open orders and of another customer's orders
+        for filters in ({"status": "open"}, {"customer": 7}):
+            await read_table_rows(ctx=mock_context, table_name="orders", filters=filters)
+        
+        # Close order 1 of customer 3
+        await update_table_records(
+            ctx=mock_context,
+            table_name="orders",
+            updates={"status": "closed"},
+            filters={"id": 1},
+        )
+        mock_query.execute.return_value.data = []
+        open_orders = await read_table_rows(
+            ctx=mock_context, table_name="orders", filters={"status": "open"}
+        )
+        
+        # Verify the open orders read was reloaded; the other read is still cached
+        assert open_orders == []
+        assert mock_query.execute.await_count == 3
+        assert app.cache.stats()["entries"] == 2
+
+
+class TestReadTableRowsCoalescing:
+    """Tests for sharing one request between concurrent identical reads."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_reads_share_a_request(self):
+        """Test that identical concurrent reads reach Supabase once."""
+        # Create mock context with caching disabled
+        mock_context = MagicMock(spec=Context)
+        mock_supabase = MagicMock()
+        app = SupabaseContext(client=mock_supabase)
+        mock_context.request_context.lifespan_context = app
+        
+        # Mock a slow Supabase query
+        mock_query = MagicMock()
+        mock_supabase.table.return_value.select.return_value = mock_query
+        mock_query.eq.return_value = mock_query
+        
+        async def slow_execute():
+            await asyncio.sleep(0.01)
+            return MagicMock(data=[{"id": 1}])
+        
+        mock_query.execute = AsyncMock(side_effect=slow_execute)
+        
+        # Read the same slice three times at once
+        results = await asyncio.gather(*[
+            read_table_rows(ctx=mock_context, table_name="users", filters={"a": 1})
+            for _ in range(3)
+        ])
+        
+        # Verify one request was made and two calls were coalesced
+        assert results == [[{"id": 1}]] * 3
+        mock_query.execute.assert_awaited_once()
+        assert app.cache.stats()["coalesced"] == 2
 
 
 class TestCreateTableRecords:
     """Tests for the create_table_records MCP tool."""
 
-    def test_create_single_record(self):
+    @pytest.mark.asyncio
+    async def test_create_single_record(self):
         """Test creating a single record."""
         # Create mock context
         mock_context = MagicMock(spec=Context)
         mock_supabase = MagicMock()
-        mock_context.request_context.lifespan_context.client = mock_supabase
+        mock_context.request_context.lifespan_context = SupabaseContext(client=mock_supabase)
         
         # Mock the Supabase insert operation
         mock_response = MagicMock()
         mock_response.data = [{"id": 1, "name": "John", "email": "john@example.com"}]
-        mock_supabase.table.return_value.insert.return_value.execute.return_value = mock_response
+        mock_supabase.table.return_value.insert.return_value.execute = AsyncMock(
+            return_value=mock_response
+        )
         
         # Call the function with a single record
-        result = create_table_records(
+        result = await create_table_records(
             ctx=mock_context,
             table_name="users",
             records={"name": "John", "email": "john@example.com"}
@@ -244,12 +554,13 @@ class TestCreateTableRecords:
             {"name": "John", "email": "john@example.com"}
         )
 
-    def test_create_multiple_records(self):
+    @pytest.mark.asyncio
+    async def test_create_multiple_records(self):
         """Test creating multiple records."""
         # Create mock context
         mock_context = MagicMock(spec=Context)
         mock_supabase = MagicMock()
-        mock_context.request_context.lifespan_context.client = mock_supabase
+        mock_context.request_context.lifespan_context = SupabaseContext(client=mock_supabase)
         
         # Mock the Supabase insert operation
         mock_response = MagicMock()
@@ -257,7 +568,9 @@ class TestCreateTableRecords:
             {"id": 1, "name": "John", "email": "john@example.com"},
             {"id": 2, "name": "Jane", "email": "jane@example.com"}
         ]
-        mock_supabase.table.return_value.insert.return_value.execute.return_value = mock_response
+        mock_supabase.table.return_value.insert.return_value.execute = AsyncMock(
+            return_value=mock_response
+        )
         
         # Records to insert
         records = [
@@ -266,7 +579,7 @@ class TestCreateTableRecords:
         ]
         
         # Call the function with multiple records
-        result = create_table_records(
+        result = await create_table_records(
             ctx=mock_context,
             table_name="users",
             records=records
@@ -286,20 +599,23 @@ class TestCreateTableRecords:
         mock_supabase.table.assert_called_once_with("users")
         mock_supabase.table.return_value.insert.assert_called_once_with(records)
 
-    def test_create_record_error_handling(self):
+    @pytest.mark.asyncio
+    async def test_create_record_error_handling(self):
         """Test error handling when creating records."""
         # Create mock context
         mock_context = MagicMock(spec=Context)
         mock_supabase = MagicMock()
-        mock_context.request_context.lifespan_context.client = mock_supabase
+        mock_context.request_context.lifespan_context = SupabaseContext(client=mock_supabase)
         
         # Mock the Supabase insert operation with empty data (error case)
         mock_response = MagicMock()
         mock_response.data = None
-        mock_supabase.table.return_value.insert.return_value.execute.return_value = mock_response
+        mock_supabase.table.return_value.insert.return_value.execute = AsyncMock(
+            return_value=mock_response
+        )
         
         # Call the function
-        result = create_table_records(
+        result = await create_table_records(
             ctx=mock_context,
             table_name="users",
             records={"name": "John", "email": "john@example.com"}
@@ -316,23 +632,25 @@ class TestCreateTableRecords:
 class TestUpdateTableRecords:
     """Tests for the update_table_records MCP tool."""
 
-    def test_update_records(self):
+    @pytest.mark.asyncio
+    async def test_update_records(self):
         """Test updating records with filters."""
         # Create mock context
         mock_context = MagicMock(spec=Context)
         mock_supabase = MagicMock()
-        mock_context.request_context.lifespan_context.client = mock_supabase
+        mock_context.request_context.lifespan_context = SupabaseContext(client=mock_supabase)
         
         # Mock the Supabase update operation
         mock_query = MagicMock()
         mock_supabase.table.return_value.update.return_value = mock_query
         mock_query.eq.return_value = mock_query
+        mock_query.execute = AsyncMock()
         mock_query.execute.return_value.data = [
             {"id": 1, "name": "John Updated", "is_active": True}
         ]
         
         # Call the function
-        result = update_table_records(
+        result = await update_table_records(
             ctx=mock_context,
             table_name="users",
             updates={"name": "John Updated"},
@@ -350,25 +668,27 @@ class TestUpdateTableRecords:
         mock_supabase.table.assert_called_once_with("users")
         mock_supabase.table.return_value.update.assert_called_once_with({"name": "John Updated"})
         mock_query.eq.assert_called_once_with("id", 1)
-        mock_query.execute.assert_called_once()
+        mock_query.execute.assert_awaited_once()
 
-    def test_update_records_multiple_filters(self):
+    @pytest.mark.asyncio
+    async def test_update_records_multiple_filters(self):
         """Test updating records with multiple filters."""
         # Create mock context
         mock_context = MagicMock(spec=Context)
         mock_supabase = MagicMock()
-        mock_context.request_context.lifespan_context.client = mock_supabase
+        mock_context.request_context.lifespan_context = SupabaseContext(client=mock_supabase)
         
         # Mock the Supabase update operation
         mock_query = MagicMock()
         mock_supabase.table.return_value.update.return_value = mock_query
         mock_query.eq.return_value = mock_query
+        mock_query.execute = AsyncMock()
         mock_query.execute.return_value.data = [
             {"id": 1, "name": "John Updated", "is_active": True, "role": "admin"}
         ]
         
         # Call the function with multiple filters
-        result = update_table_records(
+        result = await update_table_records(
             ctx=mock_context,
             table_name="users",
             updates={"name": "John Updated"},
@@ -386,23 +706,25 @@ class TestUpdateTableRecords:
         mock_supabase.table.assert_called_once_with("users")
         mock_supabase.table.return_value.update.assert_called_once_with({"name": "John Updated"})
         assert mock_query.eq.call_count == 2
-        mock_query.execute.assert_called_once()
+        mock_query.execute.assert_awaited_once()
 
-    def test_update_records_no_matches(self):
+    @pytest.mark.asyncio
+    async def test_update_records_no_matches(self):
         """Test updating records when no records match the filters."""
         # Create mock context
         mock_context = MagicMock(spec=Context)
         mock_supabase = MagicMock()
-        mock_context.request_context.lifespan_context.client = mock_supabase
+        mock_context.request_context.lifespan_context = SupabaseContext(client=mock_supabase)
         
         # Mock the Supabase update operation with empty data
         mock_query = MagicMock()
         mock_supabase.table.return_value.update.return_value = mock_query
         mock_query.eq.return_value = mock_query
+        mock_query.execute = AsyncMock()
         mock_query.execute.return_value.data = []
         
         # Call the function
-        result = update_table_records(
+        result = await update_table_records(
             ctx=mock_context,
             table_name="users",
             updates={"name": "John Updated"},
@@ -420,23 +742,25 @@ class TestUpdateTableRecords:
 class TestDeleteTableRecords:
     """Tests for the delete_table_records MCP tool."""
 
-    def test_delete_records(self):
+    @pytest.mark.asyncio
+    async def test_delete_records(self):
         """Test deleting records with filters."""
         # Create mock context
         mock_context = MagicMock(spec=Context)
         mock_supabase = MagicMock()
-        mock_context.request_context.lifespan_context.client = mock_supabase
+        mock_context.request_context.lifespan_context = SupabaseContext(client=mock_supabase)
         
         # Mock the Supabase delete operation
         mock_query = MagicMock()
         mock_supabase.table.return_value.delete.return_value = mock_query
         mock_query.eq.return_value = mock_query
+        mock_query.execute = AsyncMock()
         mock_query.execute.return_value.data = [
             {"id": 1, "name": "John", "is_active": False}
         ]
         
         # Call the function
-        result = delete_table_records(
+        result = await delete_table_records(
             ctx=mock_context,
             table_name="users",
             filters={"id": 1}
@@ -453,26 +777,28 @@ class TestDeleteTableRecords:
         mock_supabase.table.assert_called_once_with("users")
         mock_supabase.table.return_value.delete.assert_called_once()
         mock_query.eq.assert_called_once_with("id", 1)
-        mock_query.execute.assert_called_once()
+        mock_query.execute.assert_awaited_once()
 
-    def test_delete_records_multiple_filters(self):
+    @pytest.mark.asyncio
+    async def test_delete_records_multiple_filters(self):
         """Test deleting records with multiple filters."""
         # Create mock context
         mock_context = MagicMock(spec=Context)
         mock_supabase = MagicMock()
-        mock_context.request_context.lifespan_context.client = mock_supabase
+        mock_context.request_context.lifespan_context = SupabaseContext(client=mock_supabase)
         
         # Mock the Supabase delete operation
         mock_query = MagicMock()
         mock_supabase.table.return_value.delete.return_value = mock_query
         mock_query.eq.return_value = mock_query
+        mock_query.execute = AsyncMock()
         mock_query.execute.return_value.data = [
             {"id": 1, "name": "John", "is_active": False, "role": "user"},
             {"id": 2, "name": "Jane", "is_active": False, "role": "user"}
         ]
         
         # Call the function with multiple filters
-        result = delete_table_records(
+        result = await delete_table_records(
             ctx=mock_context,
             table_name="users",
             filters={"is_active": False, "role": "user"}
@@ -492,23 +818,25 @@ class TestDeleteTableRecords:
         mock_supabase.table.assert_called_once_with("users")
         mock_supabase.table.return_value.delete.assert_called_once()
         assert mock_query.eq.call_count == 2
-        mock_query.execute.assert_called_once()
+        mock_query.execute.assert_awaited_once()
 
-    def test_delete_records_no_matches(self):
+    @pytest.mark.asyncio
+    async def test_delete_records_no_matches(self):
         """Test deleting records when no records match the filters."""
         # Create mock context
         mock_context = MagicMock(spec=Context)
         mock_supabase = MagicMock()
-        mock_context.request_context.lifespan_context.client = mock_supabase
+        mock_context.request_context.lifespan_context = SupabaseContext(client=mock_supabase)
         
         # Mock the Supabase delete operation with empty data
         mock_query = MagicMock()
         mock_supabase.table.return_value.delete.return_value = mock_query
         mock_query.eq.return_value = mock_query
+        mock_query.execute = AsyncMock()
         mock_query.execute.return_value.data = []
         
         # Call the function
-        result = delete_table_records(
+        result = await delete_table_records(
             ctx=mock_context,
             table_name="users",
             filters={"id": 999}  # Non-existent ID
@@ -520,3 +848,96 @@ class TestDeleteTableRecords:
             "count": 0,
             "status": "error"
         }
+
+
+class TestToolDeadlines:
+    """Tests for per-call deadlines on the tools."""
+
+    @pytest.mark.asyncio
+    async def test_timeout_cancels_request(self):
+        """Test that a slow request is cancelled when timeout_seconds passes."""
+        # Create mock context
+        mock_context = MagicMock(spec=Context)
+        mock_supabase = MagicMock()
+        app = SupabaseContext(client=mock_supabase)
+        mock_context.request_context.lifespan_context = app
+
+        # The request never completes on its own
+        cancelled = asyncio.Event()
+
+        async def hanging_execute():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        mock_supabase.table.return_value.select.return_value.execute = hanging_execute
+
+        # Call the function with a short deadline
+        with pytest.raises(ToolTimeoutError):
+            await read_table_rows(ctx=mock_context, table_name="users", timeout_seconds=0.05)
+
+        # Verify the in-flight request was cancelled and the call finished
+        assert cancelled.is_set()
+        assert app.calls.in_flight == 0
+        assert app.deadlines.stats()["timed_out"] == {"read_table_rows": 1}
+
+
+class TestGetServerStats:
+    """Tests for the get_server_stats MCP tool."""
+
+    @pytest.mark.asyncio
+    async def test_reports_pool_stats_and_config(self):
+        """Test that pool statistics and configuration are reported."""
+        # Create a context with a real pooled PostgREST client
+        postgrest = PooledPostgrestClient(
+            "https://example.supabase.co/rest/v1", pool=PoolConfig(max_connections=7)
+        )
+        mock_supabase = MagicMock()
+        mock_supabase.postgrest = postgrest
+        mock_context = MagicMock(spec=Context)
+        mock_context.request_context.lifespan_context = SupabaseContext(
+            client=mock_supabase, pool=postgrest.pool
+        )
+
+        # Call the function
+        result = await get_server_stats(ctx=mock_context)
+
+        # Verify an unused pool reports no connections
+        assert result["pool"]["open"] == 0
+        assert result["pool"]["waiting"] == 0
+        assert result["pool"]["config"]["max_connections"] == 7
+        await postgrest.aclose()
+
+
+class TestConcurrentToolCalls:
+    """Tests that tool calls overlap instead of blocking the event loop."""
+
+    @pytest.mark.asyncio
+    async def test_reads_run_concurrently(self):
+        """Test that slow reads awaited together finish in roughly one round trip."""
+        # Create mock context
+        mock_context = MagicMock(spec=Context)
+        mock_supabase = MagicMock()
+        mock_context.request_context.lifespan_context = SupabaseContext(client=mock_supabase)
+
+        # Each execute takes 100ms, simulating a PostgREST round trip
+        async def slow_execute():
+            await asyncio.sleep(0.1)
+            return MagicMock(data=[{"id": 1}])
+
+        mock_query = MagicMock()
+        mock_supabase.table.return_value.select.return_value = mock_query
+        mock_query.execute = slow_execute
+
+        # Run ten reads at once
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(read_table_rows(ctx=mock_context, table_name="users") for _ in range(10))
+        )
+        elapsed = time.perf_counter() - start
+
+        # Verify all calls completed and overlapped
+        assert results == [[{"id": 1}]] * 10
+        assert elapsed < 0.5
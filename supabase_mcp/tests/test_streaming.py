@@ -0,0 +1,133 @@
+"""
+Tests for streaming reads.
+
+This module contains tests for:
+- stream_rows
+- The stream_table_rows MCP tool
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from mcp.server.fastmcp import Context
+
+from supabase_mcp.backends.base import Backend, ReadQuery
+from supabase_mcp.server import SupabaseContext, stream_table_rows
+from supabase_mcp.streaming import stream_rows
+
+
+class ListBackend(Backend):
+    """In-memory backend that honours filters, keyset order and limits."""
+
+    name = "list"
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.reads = []
+
+    async def read(self, query):
+        self.reads.append(query)
+        keys = query.order_keys
+        rows = [r for r in self.rows
+                if all(r[c] == v for c, v in (query.filters or {}).items())]
+        rows.sort(key=lambda r: [r[k] for k in keys], reverse=not query.ascending)
+        if query.after is not None:
+            after = query.after
+            if query.ascending:
+                rows = [r for r in rows if [r[k] for k in keys] > after]
+            else:
+                rows = [r for r in rows if [r[k] for k in keys] < after]
+        return [dict(r) for r in rows[:query.limit]]
+
+    async def insert(self, table, records):
+        raise NotImplementedError
+
+    async def update(self, table, updates, filters):
+        raise NotImplementedError
+
+    async def delete(self, table, filters):
+        raise NotImplementedError
+
+
+ROWS = [{"id": i, "group": i % 2} for i in range(1, 26)]
+
+
+class TestStreamRows:
+    """Tests for chunked reads."""
+
+    @pytest.mark.asyncio
+    async def test_emits_every_row_in_chunks(self):
+        """Test that all matching rows arrive in order, chunk_size at a time."""
+        backend = ListBackend(ROWS)
+        chunks = []
+
+        async def emit(chunk, rows, streamed):
+            chunks.append((chunk, [r["id"] for r in rows], streamed))
+
+        summary = await stream_rows(
+            backend, ReadQuery(table="t", filters={"group": 1}), emit, chunk_size=5
+        )
+
+        assert [c[1] for c in chunks] == [[1, 3, 5, 7, 9], [11, 13, 15, 17, 19], [21, 23, 25]]
+        assert [c[2] for c in chunks] == [5, 10, 13]
+        assert summary["rows_streamed"] == 13
+        assert summary["chunks"] == 3
+        assert summary["complete"] is True
+        assert summary["next_cursor"] is None
+        # Every round trip is bounded by the chunk size
+        assert all(read.limit == 5 for read in backend.reads)
+
+    @pytest.mark.asyncio
+    async def test_max_rows_returns_resumable_cursor(self):
+        """Test that stopping at max_rows yields a cursor that resumes the stream."""
+        backend = ListBackend(ROWS)
+        seen = []
+
+        async def emit(chunk, rows, streamed):
+            seen.extend(r["id"] for r in rows)
+
+        first = await stream_rows(backend, ReadQuery(table="t"), emit, 4, max_rows=10)
+        assert seen == list(range(1, 11))
+        assert first["complete"] is False
+
+        second = await stream_rows(
+            backend, ReadQuery(table="t"), emit, 4, cursor=first["next_cursor"]
+        )
+        assert seen == list(range(1, 26))
+        assert second["complete"] is True
+
+    @pytest.mark.asyncio
+    async def test_rejects_bad_chunk_size(self):
+        """Test that a non-positive chunk size raises ValueError."""
+        with pytest.raises(ValueError):
+            await stream_rows(ListBackend([]), ReadQuery(table="t"), AsyncMock(), 0)
+
+
+class TestStreamTableRowsTool:
+    """Tests for the stream_table_rows MCP tool."""
+
+    @pytest.mark.asyncio
+    async def test_sends_chunks_as_notifications(self):
+        """Test that chunks become log notifications with progress reports."""
+        # Create mock context
+        mock_context = MagicMock(spec=Context)
+        mock_context.request_id = "7"
+        mock_context.session.send_log_message = AsyncMock()
+        mock_context.report_progress = AsyncMock()
+        mock_context.request_context.lifespan_context = SupabaseContext(
+            backend=ListBackend(ROWS)
+        )
+
+        # Call the function
+        result = await stream_table_rows(
+            ctx=mock_context, table_name="t", columns="group", chunk_size=10
+        )
+
+        # Verify the summary and the notifications
+        assert result["rows_streamed"] == 25
+        calls = mock_context.session.send_log_message.await_args_list
+        assert len(calls) == 3
+        assert calls[0].kwargs["logger"] == "supabase_mcp.stream"
+        assert calls[0].kwargs["data"]["request_id"] == "7"
+        assert calls[0].kwargs["data"]["rows"][0] == {"group": 1}
+        mock_context.report_progress.assert_awaited_with(25, None)
@@ -0,0 +1,34 @@
+"""
+MCP tools, registered on the application when this package is imported.
+
+- read: read_table_rows, count_table_rows, stream_table_rows, aggregate_table
+- batch: batch_read
+- explain: explain_query
+- advice: index_advice
+- export: export_table
+- write: create_table_records, update_table_records, delete_table_records
+- stats: get_server_stats
+"""
+
+from .advice import index_advice
+from .batch import batch_read
+from .explain import explain_query
+from .export import export_table
+from .read import aggregate_table, count_table_rows, read_table_rows, stream_table_rows
+from .stats import get_server_stats
+from .write import create_table_records, delete_table_records, update_table_records
+
+__all__ = [
+    "aggregate_table",
+    "batch_read",
+    "count_table_rows",
+    "create_table_records",
+    "delete_table_records",
+    "explain_query",
+    "export_table",
+    "get_server_stats",
+    "index_advice",
+    "read_table_rows",
+    "stream_table_rows",
+    "update_table_records",
+]
@@ -0,0 +1,66 @@
+"""
+Tool that suggests indexes for the query shapes the server has run.
+"""
+
+from typing import Any, Dict, Optional
+
+from mcp.server.fastmcp import Context
+
+from ..advisor import advise
+from ..app import mcp
+
+
+@mcp.tool()
+async def index_advice(
+    ctx: Context,
+    table_name: Optional[str] = None,
+    limit: int = 10,
+    min_calls: int = 1,
+    timeout_seconds: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Suggest indexes for the filters and orderings that tool calls have spent the most time on.
+
+    Use this tool after a workload has run to find which indexes would speed it up.
+    The server records the shape of each read, count, aggregate, update and delete: the
+    table, the columns filtered for equality or by range, and the columns ordered by.
+    Shapes an existing index already serves are left out, and the rest are turned into
+    CREATE INDEX statements ranked by the total time their calls took. Review the
+    statements before running them; each index also slows down writes to its table.
+
+    On the postgrest backend the index catalog cannot be read, so "indexed" is None and
+    suggestions may name indexes that already exist.
+
+    Args:
+        ctx: The MCP context
+        table_name: Only advise on this table (default: None for all tables)
+        limit: Maximum suggestions returned (default: 10)
+        min_calls: Ignore shapes called fewer times than this (default: 1)
+        timeout_seconds: Deadline for this call; the request is cancelled if it is exceeded
+            (default: the server's configured timeout for this tool)
+
+    Returns:
+        Dictionary with the "advice", each with the "table", index "columns", "ddl",
+        the "calls", "total_ms" and "mean_ms" of the shapes it serves, their
+        "operations" and number of "shapes"; and how many "shapes" were considered,
+        were already "indexed" or had no column to index ("unindexable")
+
+    Example:
+        To see the top suggestions: index_advice()
+        For one table: index_advice(table_name="events", min_calls=10)
+    """
+    app = ctx.request_context.lifespan_context
+    backend = app.get_backend()
+
+    async with app.tool_call("index_advice", timeout_seconds):
+        if limit < 1 or min_calls < 1:
+            raise ValueError("limit and min_calls must be at least 1")
+        shapes = {
+            shape: stats for shape, stats in app.shapes.shapes.items()
+            if table_name is None or shape.table == table_name
+        }
+        try:
+            indexes = await backend.indexes(sorted({shape.table for shape in shapes}))
+        except NotImplementedError:
+            indexes = None
+        return advise(shapes, indexes, limit, min_calls)
@@ -0,0 +1,83 @@
+"""
+Tool that runs several reads in one call.
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+from mcp.server.fastmcp import Context
+
+from ..app import mcp
+from ..batch import batch_keys, run_batch
+from .read import read_table_rows
+
+# Reason: specs are validated and coerced like the arguments of a read_table_rows call
+_READ_TOOL = mcp._tool_manager.get_tool("read_table_rows")
+
+# Arguments a read spec may pass on to read_table_rows
+_READ_ARGUMENTS = frozenset(_READ_TOOL.fn_metadata.arg_model.model_fields)
+
+
+@mcp.tool()
+async def batch_read(
+    ctx: Context,
+    reads: List[Dict[str, Any]],
+    max_concurrency: Optional[int] = None,
+    timeout_seconds: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Run several independent reads concurrently in one call.
+
+    Use this tool instead of consecutive read_table_rows calls when you need several
+    lookups that do not depend on each other, such as a user, their orders and their
+    last five tickets. Each read is an object with the arguments of read_table_rows
+    (table_name, columns, filters, limit, order_by, ascending, count, format, ...) and
+    an optional "key" naming its result. The reads run at the same time, so the batch
+    takes about as long as its slowest read. A read that fails reports its error in
+    its own entry; the other reads still return their results.
+
+    Args:
+        ctx: The MCP context
+        reads: The reads to run, each with at least a table_name
+        max_concurrency: Reads running at the same time (default and maximum: the
+            server's SUPABASE_MCP_BATCH_CONCURRENCY)
+        timeout_seconds: Deadline for the whole batch; unfinished reads are cancelled
+            if it is exceeded (default: the server's configured timeout for this tool)
+
+    Returns:
+        Dictionary with "results", mapping each read's key (or its position in the
+        list, as a string) to {"data": <read_table_rows result>, "ms": duration} or
+        {"error": message, "ms": duration}, and the batch's total "ms"
+
+    Example:
+        batch_read(reads=[
+            {"key": "user", "table_name": "users", "filters": {"id": 7}},
+            {"key": "orders", "table_name": "orders", "filters": {"user_id": 7}, "limit": 20},
+            {"key": "tickets", "table_name": "tickets", "filters": {"user_id": 7},
+             "order_by": "created_at", "ascending": False, "limit": 5},
+        ])
+    """
+    app = ctx.request_context.lifespan_context
+
+    async with app.tool_call("batch_read", timeout_seconds):
+        keys = batch_keys(reads, app.batch.max_reads)
+        concurrency = app.batch.max_concurrency
+        if max_concurrency is not None:
+            if max_concurrency < 1:
+                raise ValueError("max_concurrency must be at least 1")
+            concurrency = min(max_concurrency, concurrency)
+
+        async def read(spec: Dict[str, Any]) -> Any:
+            arguments = {name: value for name, value in spec.items() if name != "key"}
+            unknown = sorted(set(arguments) - _READ_ARGUMENTS)
+            if unknown:
+                raise ValueError(f"Unknown read arguments: {', '.join(unknown)}")
+            if "table_name" not in arguments:
+                raise ValueError("Each read needs a table_name")
+            metadata = _READ_TOOL.fn_metadata
+            parsed = metadata.arg_model.model_validate(metadata.pre_parse_json(arguments))
+            return await read_table_rows(ctx, **{name: getattr(parsed, name) for name in arguments})
+
+        start = time.perf_counter()
+        results = await run_batch(reads, keys, read, concurrency)
+        return {"results": results, "ms": round((time.perf_counter() - start) * 1000, 3)}
@@ -0,0 +1,92 @@
+"""
+Tool that shows how Postgres would run a read, update or delete.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from mcp.server.fastmcp import Context
+
+from ..app import mcp
+from ..backends import ReadQuery
+from ..embeds import parse_embeds
+from ..plans import check_operation, cost_warning, summarize
+
+
+@mcp.tool()
+async def explain_query(
+    ctx: Context,
+    table_name: str,
+    operation: str = "read",
+    columns: str = "*",
+    filters: Optional[Dict[str, Any]] = None,
+    limit: Optional[int] = None,
+    order_by: Optional[str] = None,
+    ascending: bool = True,
+    embed: Optional[List[Dict[str, Any]]] = None,
+    updates: Optional[Dict[str, Any]] = None,
+    analyze: bool = False,
+    timeout_seconds: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Show the Postgres query plan of a read, update or delete without running it.
+
+    Use this tool before reading from or writing to a large table to check that the
+    query uses an index instead of scanning every row. It takes the same arguments as
+    read_table_rows (operation="read"), update_table_records (operation="update", with
+    updates and filters) or delete_table_records (operation="delete", with filters),
+    and returns the plan Postgres chose with its estimated cost and rows. Each entry of
+    "scans" is a table read by the plan: "Seq Scan" reads every row of the table, an
+    "Index Scan" or "Bitmap Heap Scan" only the rows the index finds. Costs are in the
+    planner's arbitrary units; compare them between queries rather than reading them
+    as milliseconds.
+
+    Pass analyze=True to also run a read and report the actual rows and time taken.
+
+    Args:
+        ctx: The MCP context
+        table_name: Name of the table
+        operation: "read", "update" or "delete" (default: "read")
+        columns: Columns a read selects (default: "*")
+        filters: Filter expression, in the same form as read_table_rows (default: None)
+        limit: Maximum rows a read returns (default: None)
+        order_by: Column a read is ordered by (default: None)
+        ascending: Whether a read is in ascending order (default: True)
+        embed: Related tables a read embeds, as in read_table_rows (default: None)
+        updates: Column-value pairs an update sets (default: None)
+        analyze: Run the read and report actual rows and timings (default: False)
+        timeout_seconds: Deadline for this call; the request is cancelled if it is exceeded
+            (default: the server's configured timeout for this tool)
+
+    Returns:
+        Dictionary with the top plan node's "node_type", "startup_cost", "total_cost" and
+        estimated "rows", the "scans", with analyze the "actual_rows", "planning_ms" and
+        "execution_ms", a "warning" when the cost exceeds the server's
+        SUPABASE_MCP_MAX_QUERY_COST, and the full "plan"
+
+    Example:
+        To check a filtered read:
+            explain_query(table_name="events", filters={"user_id": 7}, order_by="created_at")
+        To time it: explain_query(table_name="events", filters={"user_id": 7}, analyze=True)
+        To check a delete: explain_query(table_name="events", operation="delete",
+            filters={"created_at": {"lt": "2024-01-01"}})
+    """
+    app = ctx.request_context.lifespan_context
+    backend = app.get_backend()
+
+    async with app.tool_call("explain_query", timeout_seconds):
+        check_operation(operation, analyze)
+        query = ReadQuery(
+            table=table_name,
+            columns=columns,
+            filters=filters,
+            order_by=order_by,
+            ascending=ascending,
+            limit=limit,
+            embeds=parse_embeds(embed),
+        )
+        plan = await backend.explain(operation, query, updates, analyze)
+        summary = summarize(plan)
+        warning = cost_warning(summary, app.plans)
+        if warning:
+            summary["warning"] = warning
+        return {**summary, "plan": plan}
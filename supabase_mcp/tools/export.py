@@ -0,0 +1,109 @@
+"""
+Tool that exports a table to an NDJSON, CSV or Parquet file, reading key ranges concurrently.
+"""
+
+from typing import Any, Dict, Optional
+
+from mcp.server.fastmcp import Context
+
+from ..app import mcp
+from ..export import export_partitioned, export_path
+from ..export_formats import file_format_of
+
+
+@mcp.tool()
+async def export_table(
+    ctx: Context,
+    table_name: str,
+    path: str,
+    key_column: str = "id",
+    cursor_key: str = "id",
+    columns: str = "*",
+    filters: Optional[Dict[str, Any]] = None,
+    file_format: Optional[str] = None,
+    partitions: Optional[int] = None,
+    resume: bool = False,
+    overwrite: bool = False,
+    timeout_seconds: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Export the rows of a table to a file on the server instead of returning them.
+
+    Use this tool when a large table, or a large filtered part of one, is needed for
+    analysis outside the conversation: the rows are written to a file and only its
+    path, row count, size and schema are returned. The span of key_column is split
+    into equal ranges that are read concurrently, and the rows are written in
+    key_column order, page by page, so the server's memory use stays flat.
+
+    The file is NDJSON (one JSON object per line), CSV (a header row; NULL is an empty
+    field, objects and arrays are JSON text) or Parquet (columnar, zstd-compressed,
+    typed from the schema; needs pyarrow on the server). The format follows the
+    path's extension (.csv, .parquet, otherwise NDJSON) unless file_format is given.
+
+    key_column must be an integer, numeric or timestamp column without NULLs, ideally
+    the primary key or an indexed column that grows with inserts, such as created_at.
+    If it is not unique, cursor_key must name a unique column to order rows sharing a
+    key value.
+
+    If some partitions fail, the rest are still saved, "complete" is False and
+    "failed" lists the failed key ranges. Call again with the same arguments and
+    resume=True to read only the missing partitions. Large exports can take longer
+    than the default deadline; pass a larger timeout_seconds. An export cut short by
+    its deadline can be resumed the same way.
+
+    Args:
+        ctx: The MCP context
+        table_name: Name of the table to export
+        path: Output file, relative to the server's export directory
+        key_column: Column the table is split on (default: "id")
+        cursor_key: Unique column ordering rows with equal key_column values
+            (default: "id")
+        columns: Comma-separated list of columns to export (default: "*")
+        filters: Filter expression selecting the rows, in the same form as
+            read_table_rows (default: None)
+        file_format: "ndjson", "csv" or "parquet" (default: None to go by the
+            path's extension)
+        partitions: Key ranges to split the table into (default: the server's
+            SUPABASE_MCP_EXPORT_PARTITIONS)
+        resume: Continue an unfinished export to the same path (default: False)
+        overwrite: Replace an existing file at path (default: False)
+        timeout_seconds: Deadline for this call; the request is cancelled if it is exceeded
+            (default: the server's configured timeout for this tool)
+
+    Returns:
+        Dictionary with the absolute "path", the "format", the "rows" and "bytes"
+        written, the "schema" as a list of {"name", "type"} with types integer, number,
+        boolean, string, date, timestamp, timestamptz, json or null, the number of
+        "partitions" and how many were "resumed" from an earlier call, the "seconds"
+        and "rows_per_second" of this call, whether the export is "complete", and the
+        "failed" partitions with their key range and error
+
+    Example:
+        To export a table: export_table(table_name="events", path="events.ndjson",
+            timeout_seconds=300)
+        To export last year's orders by date as Parquet: export_table(
+            table_name="orders", path="orders-2024.parquet", key_column="created_at",
+            filters={"created_at": {"gte": "2024-01-01", "lt": "2025-01-01"}})
+        To finish an export that failed part way: export_table(table_name="events",
+            path="events.ndjson", resume=True)
+    """
+    app = ctx.request_context.lifespan_context
+    backend = app.get_backend()
+
+    async with app.tool_call("export_table", timeout_seconds):
+        output = export_path(app.exports.directory, path)
+        return await export_partitioned(
+            backend,
+            app.exports,
+            app.codec,
+            output,
+            table_name,
+            key=key_column,
+            cursor_key=cursor_key,
+            columns=columns,
+            filters=filters,
+            file_format=file_format_of(output, file_format),
+            partitions=partitions,
+            resume=resume,
+            overwrite=overwrite,
+        )
@@ -0,0 +1,354 @@
+"""
+Tools that read from tables: rows, streams, counts and aggregates.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from mcp.server.fastmcp import Context
+
+from ..app import mcp
+from ..backends import COUNT_METHODS, Aggregate, AggregateQuery, ReadQuery
+from ..budget import rows_within
+from ..embeds import parse_embeds
+from ..encoding import check_format, formatted
+from ..pagination import finish_page, prepare_page
+from ..plans import enforce_cost
+from ..streaming import stream_rows
+
+
+def _count_method(count: str) -> str:
+    """Validate a count method argument."""
+    if count not in COUNT_METHODS:
+        raise ValueError(f"count must be one of {', '.join(COUNT_METHODS)}, got {count!r}")
+    return count
+
+
+@mcp.tool()
+async def read_table_rows(
+    ctx: Context,
+    table_name: str,
+    columns: str = "*",
+    filters: Optional[Dict[str, Any]] = None,
+    limit: Optional[int] = None,
+    order_by: Optional[str] = None,
+    ascending: bool = True,
+    timeout_seconds: Optional[float] = None,
+    paginate: bool = False,
+    cursor: Optional[str] = None,
+    cursor_key: str = "id",
+    count: Optional[str] = None,
+    max_bytes: Optional[int] = None,
+    format: str = "rows",
+    embed: Optional[List[Dict[str, Any]]] = None
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Read rows from a Supabase table with optional filtering, ordering, and limiting.
+    
+    Use this tool to query data from a specific table in the Supabase database.
+    You can select specific columns, filter rows based on conditions, limit the number
+    of results, and order the results.
+    
+    Filters run in the database. A plain value tests equality; a dictionary of operators
+    (eq, neq, gt, gte, lt, lte, in, like, ilike, is, range, contains) applies each of
+    them, and "or"/"and" combine lists of filters, e.g.
+    {"created_at": {"gte": "2024-01-01"}, "or": [{"status": "open"}, {"priority": {"gt": 3}}]}.
+    
+    To page through a large table, pass paginate=True. The result then holds "rows"
+    and a "next_cursor"; repeat the same call with cursor=next_cursor to get the next
+    page, until next_cursor is null. Each page costs the same however deep it is.
+    
+    Pass count="exact", "planned" or "estimated" to also get the number of rows matching
+    the filters, ignoring limit and cursor; the result is then a dictionary with "rows"
+    and "count". Such reads bypass the result cache.
+    
+    Responses are limited to a byte budget (max_bytes, or the server's default). When
+    the rows do not fit, the result is a dictionary with the rows that fit and
+    "truncated": true. A plain read then has a null "next_cursor"; to get every row,
+    read with paginate=True, whose pages carry a "next_cursor" that continues exactly
+    after the last row sent.
+    
+    Pass format="compact" for a smaller result: "columns" names the columns once and
+    "rows" holds each row as an array of values in that order. Text columns with few
+    distinct values are listed once under "dictionaries" and rows hold indexes into
+    those lists. With compact, a plain read also returns a dictionary.
+    
+    To get related rows in the same call, pass embed: a list of related tables reached
+    through foreign keys, each {"table": ..., "columns": ...} with optional "alias",
+    "hint" (the foreign key to use when there are several), "inner" (drop rows without
+    a matching related row), "filters", "order_by", "ascending", "limit" and a nested
+    "embed". Each row then holds its related row as an object (e.g. an order's
+    customer) or its related rows as a list (e.g. a customer's orders). Use this
+    instead of one read per row. Embeds need the postgrest backend and bypass the
+    result cache.
+    
+    If the server sets a query cost limit, reads whose planned cost exceeds it may be
+    refused; explain_query shows a read's plan and cost.
+    
+    If the server enables its result cache, repeated identical reads within the cache
+    TTL are answered without a round trip to Supabase. Writes made with this server's
+    create, update and delete tools are always visible to the reads that follow them.
+    
+    Args:
+        ctx: The MCP context
+        table_name: Name of the table to read from
+        columns: Comma-separated list of columns to select (default: "*" for all columns)
+        filters: Filter expression; column-value pairs test equality (default: None)
+        limit: Maximum number of rows to return (default: None)
+        order_by: Column to order results by (default: None)
+        ascending: Whether to sort in ascending order (default: True)
+        timeout_seconds: Deadline for this call; the request is cancelled if it is exceeded
+            (default: the server's configured timeout for this tool)
+        paginate: Return one page with a cursor for the next (default: False)
+        cursor: The next_cursor from the previous page; implies paginate (default: None)
+        cursor_key: Unique column that breaks ties in the page order (default: "id")
+        count: Also return the total number of matching rows, counted with this method
+            (default: None)
+        max_bytes: Byte budget for the returned rows, 0 for none (default: the server's
+            SUPABASE_MCP_MAX_RESPONSE_BYTES)
+        format: "rows" for one object per row or "compact" for column arrays
+            (default: "rows")
+        embed: Related tables to return with each row (default: None)
+        
+    Returns:
+        List of dictionaries, each representing a row from the table, or when paginating,
+        counting, truncating or compacting a dictionary with "rows" and "next_cursor",
+        "count", "truncated", "columns" and "dictionaries" as applicable
+        
+    Example:
+        To get all users: read_table_rows(table_name="users")
+        To get specific columns: read_table_rows(table_name="users", columns="id,name,email")
+        To filter rows: read_table_rows(table_name="users", filters={"is_active": True})
+        To filter with operators:
+            read_table_rows(table_name="orders", filters={"status": {"in": ["open", "held"]}})
+        To limit results: read_table_rows(table_name="users", limit=10)
+        To order results: read_table_rows(table_name="users", order_by="created_at", ascending=False)
+        To page through results: read_table_rows(table_name="users", paginate=True, limit=100)
+        To get a page and the total: read_table_rows(table_name="users", limit=20, count="exact")
+        To get orders with their customer:
+            read_table_rows(table_name="orders", embed=[{"table": "customers", "columns": "name"}])
+        To get customers with their last three orders:
+            read_table_rows(table_name="customers", embed=[{"table": "orders",
+                "order_by": "created_at", "ascending": False, "limit": 3}])
+    """
+    app = ctx.request_context.lifespan_context
+    backend = app.get_backend()
+    
+    async with app.tool_call("read_table_rows", timeout_seconds):
+        query = ReadQuery(
+            table=table_name,
+            columns=columns,
+            filters=filters,
+            order_by=order_by,
+            ascending=ascending,
+            limit=limit,
+            embeds=parse_embeds(embed),
+        )
+        check_format(format)
+        method = _count_method(count) if count is not None else None
+        budget = app.max_response_bytes if max_bytes is None else max_bytes
+        if budget < 0:
+            raise ValueError("max_bytes must not be negative")
+    
+        async def read(q: ReadQuery) -> List[Dict[str, Any]]:
+            # Reason: planned here so only cache misses pay for the EXPLAIN round trip
+            await enforce_cost(backend, app.plans, "read", q)
+            return await backend.read(q)
+    
+        async def load(q: ReadQuery) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+            if method is None:
+                return await app.cache.get_or_load(q, read), None
+            # Reason: a cached page next to a fresh total could disagree with it
+            await enforce_cost(backend, app.plans, "read", q)
+            return await backend.read_counted(q, method)
+    
+        def respond(result: Any, total: Optional[int]) -> Any:
+            if method is not None:
+                result = {**(result if isinstance(result, dict) else {"rows": result}),
+                          "count": total}
+            return formatted(result, format)
+    
+        if paginate or cursor:
+            # Resume after the cursor's last row instead of using OFFSET
+            page, keys, added = prepare_page(query, cursor_key, cursor)
+            rows, total = await load(page)
+            return respond(finish_page(page, rows, keys, added, budget), total)
+    
+        # Execute the query (or serve it from the cache) and return the data
+        rows, total = await load(query)
+        fit = rows_within(rows, budget)
+        if fit < len(rows):
+            # Reason: a plain read has no keyset order to resume from; paginate=True
+            # reads in that order from the start, so its pages carry cursors
+            result = {"rows": rows[:fit], "next_cursor": None, "truncated": True}
+            return respond(result, total)
+        return respond(rows, total)
+
+
+@mcp.tool()
+async def count_table_rows(
+    ctx: Context,
+    table_name: str,
+    filters: Optional[Dict[str, Any]] = None,
+    count: str = "exact",
+    timeout_seconds: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Count the rows of a Supabase table that match the filters, without reading them.
+    
+    Use this tool to learn how big a table or a filtered slice of it is before reading
+    it. "exact" counts every matching row, which scans them; on very large tables use
+    "planned", the query planner's estimate, which returns in milliseconds whatever the
+    table size, or "estimated", which is exact for small results and planned otherwise.
+    
+    Args:
+        ctx: The MCP context
+        table_name: Name of the table to count
+        filters: Filter expression selecting the rows, in the same form as
+            read_table_rows (default: None for the whole table)
+        count: "exact", "planned" or "estimated" (default: "exact")
+        timeout_seconds: Deadline for this call; the request is cancelled if it is exceeded
+            (default: the server's configured timeout for this tool)
+        
+    Returns:
+        Dictionary with the "count" and the "method" used
+        
+    Example:
+        To count open orders: count_table_rows(table_name="orders", filters={"status": "open"})
+        To size a huge table: count_table_rows(table_name="events", count="planned")
+    """
+    app = ctx.request_context.lifespan_context
+    backend = app.get_backend()
+    
+    async with app.tool_call("count_table_rows", timeout_seconds):
+        method = _count_method(count)
+        total = await backend.count(ReadQuery(table=table_name, filters=filters), method)
+        return {"count": total, "method": method}
+
+
+@mcp.tool()
+async def stream_table_rows(
+    ctx: Context,
+    table_name: str,
+    columns: str = "*",
+    filters: Optional[Dict[str, Any]] = None,
+    order_by: Optional[str] = None,
+    ascending: bool = True,
+    chunk_size: int = 1000,
+    max_rows: Optional[int] = None,
+    cursor: Optional[str] = None,
+    cursor_key: str = "id",
+    timeout_seconds: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Stream rows from a Supabase table in chunks instead of one large result.
+    
+    Use this tool for reads too large to return at once. Rows are fetched chunk_size at
+    a time and each chunk is sent as soon as it arrives, as a log message notification
+    from the "supabase_mcp.stream" logger whose data holds the request_id, the chunk
+    number and the rows. Progress notifications report the running row count when the
+    request has a progress token. The tool result is a summary.
+    
+    Args:
+        ctx: The MCP context
+        table_name: Name of the table to read from
+        columns: Comma-separated list of columns to select (default: "*" for all columns)
+        filters: Filter expression; column-value pairs test equality (default: None)
+        order_by: Column to order results by (default: None, i.e. by cursor_key)
+        ascending: Whether to sort in ascending order (default: True)
+        chunk_size: Rows fetched and sent per chunk (default: 1000)
+        max_rows: Stop after this many rows (default: None for all rows)
+        cursor: The next_cursor of a previous stream, to resume it (default: None)
+        cursor_key: Unique column that breaks ties in the row order (default: "id")
+        timeout_seconds: Deadline for this call; the request is cancelled if it is exceeded
+            (default: the server's configured timeout for this tool)
+        
+    Returns:
+        Dictionary with rows_streamed, chunks, seconds, whether the read is complete,
+        and a next_cursor to resume from when it stopped at max_rows
+        
+    Example:
+        To stream a whole table: stream_table_rows(table_name="events", chunk_size=5000)
+    """
+    app = ctx.request_context.lifespan_context
+    backend = app.get_backend()
+    
+    async def emit(chunk: int, rows: List[Dict[str, Any]], streamed: int) -> None:
+        await ctx.session.send_log_message(
+            level="info",
+            data={"request_id": ctx.request_id, "chunk": chunk, "rows": rows},
+            logger="supabase_mcp.stream",
+        )
+        await ctx.report_progress(streamed, max_rows)
+    
+    async with app.tool_call("stream_table_rows", timeout_seconds):
+        query = ReadQuery(
+            table=table_name,
+            columns=columns,
+            filters=filters,
+            order_by=order_by,
+            ascending=ascending,
+        )
+        return await stream_rows(
+            backend, query, emit, chunk_size, cursor_key, max_rows, cursor
+        )
+
+
+@mcp.tool()
+async def aggregate_table(
+    ctx: Context,
+    table_name: str,
+    aggregates: List[str],
+    group_by: Optional[List[str]] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    limit: Optional[int] = None,
+    timeout_seconds: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """
+    Compute counts, sums, averages, minimums and maximums in the database.
+    
+    Use this tool instead of reading rows to answer questions such as "how many orders
+    per status" or "total revenue per customer". Only the aggregated rows are returned:
+    one row per distinct combination of the group_by columns, or a single row without
+    group_by. Result columns are the group_by columns followed by each aggregate, named
+    "count" for count(*) and function_column (e.g. "sum_amount") otherwise.
+    
+    Args:
+        ctx: The MCP context
+        table_name: Name of the table to aggregate
+        aggregates: Aggregates to compute, each "count", "count(column)", "sum(column)",
+            "avg(column)", "min(column)" or "max(column)"
+        group_by: Columns to group by (default: None for one row over all matching rows)
+        filters: Filter expression selecting the rows, in the same form as
+            read_table_rows (default: None)
+        limit: Maximum number of groups to return (default: None)
+        timeout_seconds: Deadline for this call; the request is cancelled if it is exceeded
+            (default: the server's configured timeout for this tool)
+        
+    Returns:
+        List of dictionaries, one per group, ordered by the group_by columns
+        
+    Example:
+        To count orders per status:
+            aggregate_table(table_name="orders", aggregates=["count"], group_by=["status"])
+        To total this year's revenue per customer:
+            aggregate_table(
+                table_name="orders",
+                aggregates=["sum(amount)", "avg(amount)"],
+                group_by=["customer_id"],
+                filters={"created_at": {"gte": "2024-01-01"}}
+            )
+    """
+    app = ctx.request_context.lifespan_context
+    backend = app.get_backend()
+    
+    async with app.tool_call("aggregate_table", timeout_seconds):
+        if not aggregates:
+            raise ValueError("aggregate_table requires at least one aggregate")
+        query = AggregateQuery(
+            table=table_name,
+            aggregates=[Aggregate.parse(spec) for spec in aggregates],
+            group_by=list(group_by or []),
+            filters=filters,
+            limit=limit,
+        )
+        return await backend.aggregate(query)
@@ -0,0 +1,55 @@
+"""
+Tool that reports the server's runtime statistics.
+"""
+
+from dataclasses import asdict
+from typing import Any, Dict
+
+from mcp.server.fastmcp import Context
+
+from ..app import mcp
+from ..client import postgrest_of
+from ..pool import pool_stats
+
+
+@mcp.tool()
+async def get_server_stats(ctx: Context) -> Dict[str, Any]:
+    """
+    Report runtime statistics about the server's connection to Supabase.
+    
+    Use this tool to check how the HTTP connection pool is being used, for example
+    to decide whether SUPABASE_POOL_MAX_CONNECTIONS needs to be raised.
+    
+    Args:
+        ctx: The MCP context
+        
+    Returns:
+        Dictionary with a "pool" section containing open, idle, active and HTTP/2
+        connection counts, requests in flight and waiting, whether the client has been
+        created yet, and the pool configuration,
+        a "calls" section with in-flight/completed/rejected tool call counters and
+        the last shutdown drain, a "deadlines" section with configured deadlines and
+        timeout/cancellation counts per tool, a "cache" section with read cache
+        hit/miss/eviction counts and bytes held, a "realtime" section with change feed
+        events and lag (None when the feed is off), a "shapes" section with the query
+        shapes recorded for index_advice, and a "backend" section with the active
+        backend's metrics
+    """
+    app = ctx.request_context.lifespan_context
+    
+    # Report an empty pool rather than building a client in fast-start mode
+    session = postgrest_of(app.client).session if app.client is not None else None
+    
+    return {
+        "pool": {
+            **pool_stats(session),
+            "client_created": app.client is not None,
+            "config": asdict(app.pool),
+        },
+        "calls": app.calls.stats(),
+        "deadlines": app.deadlines.stats(),
+        "cache": app.cache.stats(),
+        "realtime": app.change_feed.stats() if app.change_feed else None,
+        "shapes": app.shapes.stats(),
+        "backend": app.get_backend().stats(),
+    }
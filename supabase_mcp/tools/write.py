@@ -0,0 +1,205 @@
+"""
+Tools that create, update and delete table records.
+
+Each write drops the cached reads it could have changed, even when the write
+fails part way, so reads that follow a write always see it.
+"""
+
+from typing import Any, Dict, List, Optional, Union
+
+from mcp.server.fastmcp import Context
+
+from ..app import mcp
+from ..backends import ReadQuery
+from ..encoding import check_format, formatted
+from ..filters import equalities
+from ..plans import enforce_cost
+
+
+@mcp.tool()
+async def create_table_records(
+    ctx: Context,
+    table_name: str,
+    records: Union[Dict[str, Any], List[Dict[str, Any]]],
+    timeout_seconds: Optional[float] = None,
+    format: str = "rows"
+) -> Dict[str, Any]:
+    """
+    Create one or multiple records in a Supabase table.
+    
+    Use this tool to insert new data into a specific table in the Supabase database.
+    You can insert a single record or multiple records at once.
+    
+    Args:
+        ctx: The MCP context
+        table_name: Name of the table to insert records into
+        records: A dictionary for a single record or a list of dictionaries for multiple records
+        timeout_seconds: Deadline for this call; the request is cancelled if it is exceeded
+            (default: the server's configured timeout for this tool)
+        format: "rows" for data as a list of objects, or "compact" for a columns header
+            and rows as arrays (default: "rows")
+        
+    Returns:
+        Dictionary containing the created records and metadata
+        
+    Example:
+        To create a single record:
+            create_table_records(
+                table_name="users",
+                records={"name": "John Doe", "email": "john@example.com"}
+            )
+            
+        To create multiple records:
+            create_table_records(
+                table_name="users",
+                records=[
+                    {"name": "John Doe", "email": "john@example.com"},
+                    {"name": "Jane Smith", "email": "jane@example.com"}
+                ]
+            )
+    """
+    app = ctx.request_context.lifespan_context
+    backend = app.get_backend()
+    
+    async with app.tool_call("create_table_records", timeout_seconds):
+        check_format(format)
+        # Insert the records, then drop cached reads the new rows could appear in
+        data = None
+        try:
+            data = await backend.insert(table_name, records)
+        finally:
+            written = data or (records if isinstance(records, list) else [records])
+            app.cache.invalidate(table_name, written)
+    
+        # Return the response
+        return formatted({
+            "data": data,
+            "count": len(data) if data else 0,
+            "status": "success" if data else "error"
+        }, format, key="data")
+
+
+@mcp.tool()
+async def update_table_records(
+    ctx: Context,
+    table_name: str,
+    updates: Dict[str, Any],
+    filters: Dict[str, Any],
+    timeout_seconds: Optional[float] = None,
+    format: str = "rows"
+) -> Dict[str, Any]:
+    """
+    Update records in a Supabase table that match the specified filters.
+    
+    Use this tool to modify existing data in a specific table in the Supabase database.
+    You provide the new values and filter conditions to identify which records to update.
+    
+    Args:
+        ctx: The MCP context
+        table_name: Name of the table to update records in
+        updates: Dictionary of column-value pairs with the new values
+        filters: Filter expression selecting the rows to update, in the same form as
+            read_table_rows
+        timeout_seconds: Deadline for this call; the request is cancelled if it is exceeded
+            (default: the server's configured timeout for this tool)
+        format: "rows" for data as a list of objects, or "compact" for a columns header
+            and rows as arrays (default: "rows")
+        
+    Returns:
+        Dictionary containing the updated records and metadata
+        
+    Example:
+        To update all active users' status:
+            update_table_records(
+                table_name="users",
+                updates={"status": "premium"},
+                filters={"is_active": True}
+            )
+    """
+    app = ctx.request_context.lifespan_context
+    backend = app.get_backend()
+    
+    async with app.tool_call("update_table_records", timeout_seconds):
+        check_format(format)
+        await enforce_cost(
+            backend, app.plans, "update", ReadQuery(table=table_name, filters=filters), updates
+        )
+        # Execute the query, then drop cached reads the rows could have left or joined
+        equal = equalities(filters)
+        data = None
+        try:
+            data = await backend.update(table_name, updates, filters)
+        finally:
+            if data is None:
+                touched = [equal, {**equal, **updates}]
+            else:
+                # Columns that were not updated held the same values before the write
+                before = [{**{k: v for k, v in row.items() if k not in updates}, **equal}
+                          for row in data]
+                touched = before + data
+            app.cache.invalidate(table_name, touched)
+    
+        # Return the response
+        return formatted({
+            "data": data,
+            "count": len(data) if data else 0,
+            "status": "success" if data else "error"
+        }, format, key="data")
+
+
+@mcp.tool()
+async def delete_table_records(
+    ctx: Context,
+    table_name: str,
+    filters: Dict[str, Any],
+    timeout_seconds: Optional[float] = None,
+    format: str = "rows"
+) -> Dict[str, Any]:
+    """
+    Delete records from a Supabase table that match the specified filters.
+    
+    Use this tool to remove data from a specific table in the Supabase database.
+    You provide filter conditions to identify which records to delete.
+    
+    Args:
+        ctx: The MCP context
+        table_name: Name of the table to delete records from
+        filters: Filter expression selecting the rows to delete, in the same form as
+            read_table_rows
+        timeout_seconds: Deadline for this call; the request is cancelled if it is exceeded
+            (default: the server's configured timeout for this tool)
+        format: "rows" for data as a list of objects, or "compact" for a columns header
+            and rows as arrays (default: "rows")
+        
+    Returns:
+        Dictionary containing the deleted records and metadata
+        
+    Example:
+        To delete inactive users:
+            delete_table_records(
+                table_name="users",
+                filters={"is_active": False}
+            )
+    """
+    app = ctx.request_context.lifespan_context
+    backend = app.get_backend()
+    
+    async with app.tool_call("delete_table_records", timeout_seconds):
+        check_format(format)
+        await enforce_cost(
+            backend, app.plans, "delete", ReadQuery(table=table_name, filters=filters)
+        )
+        # Execute the query, then drop cached reads the rows could have been in
+        equal = equalities(filters)
+        data = None
+        try:
+            data = await backend.delete(table_name, filters)
+        finally:
+            app.cache.invalidate(table_name, data if data is not None else [equal])
+    
+        # Return the response
+        return formatted({
+            "data": data,
+            "count": len(data) if data else 0,
+            "status": "success" if data else "error"
+        }, format, key="data")